@@ -0,0 +1,117 @@
+"""Benchmark: TicketStore vs the session DataFrame CRUD approach.
+
+Runs the same mixed sequence of creates, reads, updates and deletes against
+both implementations. The DataFrame baseline reproduces the old Data
+Manager page: concat to create, boolean masks to read/update/delete and an
+`astype(dtypes)` on every rerun. The store renders its DataFrame view every
+`--render-every` operations, like a page rerun showing the table.
+
+Usage:
+    python benchmarks/bench_ticket_store.py --ops 10000 --tickets 10000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ticket_store import TicketStore
+
+PRIORITIES = ["Low", "Medium", "High"]
+STATUSES = ["Open", "In Progress", "Closed"]
+
+
+def make_tickets(count: int) -> pd.DataFrame:
+    """Build a tickets frame shaped like DATA/it_tickets.csv."""
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        "ticket_id": [f"TCK-{1001 + i:04d}" for i in range(count)],
+        "title": rng.choice(["Email outage", "Password reset request", "Printer configuration"], count),
+        "priority": rng.choice(PRIORITIES, count),
+        "status": rng.choice(STATUSES, count),
+        "assignee": rng.choice(["alice", "bob", "charlie"], count),
+        "created_date": "2025-11-01",
+    })
+
+
+def make_ops(count: int, seed: int = 7) -> list:
+    """Build a mixed operation sequence (25% each of create/read/update/delete)."""
+    rng = np.random.default_rng(seed)
+    return list(rng.choice(["create", "read", "update", "delete"], count))
+
+
+def run_dataframe(df: pd.DataFrame, ops: list, render_every: int) -> float:
+    """Replay the operations the way the old page did."""
+    rng = np.random.default_rng(11)
+    data = df.copy()
+    dtypes = df.dtypes
+    started = time.perf_counter()
+    for i, op in enumerate(ops):
+        ticket_id = data["ticket_id"].iloc[rng.integers(len(data))]
+        if op == "create":
+            last_num = int(data["ticket_id"].iloc[-1].split("-")[-1])
+            new_ticket = {"ticket_id": f"TCK-{last_num + 1:04d}", "title": "New", "priority": "Low",
+                          "status": "Open", "assignee": "bob", "created_date": "2025-11-05"}
+            data = pd.concat([data, pd.DataFrame([new_ticket])], ignore_index=True)
+        elif op == "read":
+            data[data["ticket_id"] == ticket_id].iloc[0]
+        elif op == "update":
+            idx = data[data["ticket_id"] == ticket_id].index[0]
+            data.loc[idx, "status"] = "Closed"
+            data.loc[idx, "priority"] = "High"
+        else:
+            data = data[data["ticket_id"] != ticket_id]
+        if i % render_every == 0:
+            data = data.astype(dtypes)
+    return time.perf_counter() - started
+
+
+def run_store(df: pd.DataFrame, ops: list, render_every: int) -> float:
+    """Replay the operations against a TicketStore."""
+    rng = np.random.default_rng(11)
+    store = TicketStore(df)
+    ids = store.ids()
+    started = time.perf_counter()
+    for i, op in enumerate(ops):
+        ticket_id = ids[rng.integers(len(ids))]
+        if ticket_id not in store:
+            continue
+        if op == "create":
+            ids.append(store.create("New", "Low", "Open", "bob", "2025-11-05"))
+        elif op == "read":
+            store.get(ticket_id)
+        elif op == "update":
+            store.update(ticket_id, status="Closed", priority="High")
+        else:
+            store.delete(ticket_id)
+        if i % render_every == 0:
+            store.to_frame()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=10_000)
+    parser.add_argument("--tickets", type=int, default=10_000)
+    parser.add_argument("--render-every", type=int, default=10)
+    args = parser.parse_args()
+
+    df = make_tickets(args.tickets)
+    ops = make_ops(args.ops)
+    baseline = run_dataframe(df, ops, args.render_every)
+    store = run_store(df, ops, args.render_every)
+
+    print(f"{args.ops:,} CRUD ops on {args.tickets:,} tickets (render every {args.render_every} ops)\n")
+    print(f"{'approach':<22}{'total (s)':>10}{'per op (us)':>13}")
+    for label, seconds in (("session DataFrame", baseline), ("TicketStore", store)):
+        print(f"{label:<22}{seconds:>10.2f}{seconds / args.ops * 1e6:>13.1f}")
+    print(f"\nSpeedup: {baseline / store:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
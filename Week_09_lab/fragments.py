@@ -0,0 +1,40 @@
+"""Timed fragments: widgets inside a fragment rerun only that fragment.
+
+`st.fragment` is stable from Streamlit 1.37; older versions (1.33-1.36)
+call it `st.experimental_fragment`.
+"""
+import functools
+import time
+from typing import Callable
+
+import streamlit as st
+
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+def start_page_timer(page: str) -> None:
+    """Mark the start of a full script run."""
+    st.session_state[f"{page}_run_started"] = time.perf_counter()
+
+
+def finish_page_timer(page: str) -> None:
+    """Store how long the full script run took (ms)."""
+    started = st.session_state.pop(f"{page}_run_started", time.perf_counter())
+    st.session_state[f"{page}_run_ms"] = (time.perf_counter() - started) * 1000
+
+
+def timed_fragment(page: str) -> Callable:
+    """Make a function a fragment that shows its rerun time next to the full page's."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            full_ms = st.session_state.get(f"{page}_run_ms")
+            # Only fragment-only reruns happen without a pending page timer
+            if full_ms is not None and f"{page}_run_started" not in st.session_state:
+                st.caption(f"⏱ Section rerun: {elapsed_ms:.1f} ms (full page rerun: {full_ms:.1f} ms)")
+            return result
+        return fragment(wrapper)
+    return decorator
@@ -0,0 +1,96 @@
+"""Incremental top-K counters for the assignee leaderboards.
+
+Counts are exact; the K largest are kept in a min-heap, so an update is
+O(log K) and reading the board sorts only K entries instead of running
+`value_counts` over every ticket on each render.
+"""
+import heapq
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class TopK:
+    """Exact counters with an incrementally maintained top K.
+
+    Decrementing a key on the board can let an outside key overtake it;
+    the board is then rebuilt from the counters on the next read.
+    """
+
+    def __init__(self, k: int = 20):
+        """Create an empty board keeping the k largest counters."""
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self._counts: Dict[Hashable, int] = {}
+        self._members: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, Hashable]] = []  # (count, key); outdated entries are skipped
+        self._stale = False
+
+    def update(self, key: Hashable, delta: int = 1) -> None:
+        """Add delta (which may be negative) to a key's counter."""
+        if delta == 0:
+            return
+        count = self._counts.get(key, 0) + delta
+        if count:
+            self._counts[key] = count
+        else:
+            del self._counts[key]
+
+        if key in self._members and delta < 0:
+            self._stale = True
+        if self._stale:
+            return
+
+        if key in self._members:
+            self._members[key] = count
+            heapq.heappush(self._heap, (count, key))
+        elif count > 0 and (len(self._members) < self.k or count > self._floor()):
+            if len(self._members) >= self.k:
+                self._members.pop(heapq.heappop(self._heap)[1])
+            self._members[key] = count
+            heapq.heappush(self._heap, (count, key))
+
+        if len(self._heap) > 2 * self.k + 32:
+            self._heap = [(count, key) for key, count in self._members.items()]
+            heapq.heapify(self._heap)
+
+    def _floor(self) -> int:
+        """Smallest count on the board, dropping outdated heap entries."""
+        heap = self._heap
+        while heap and self._members.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0]
+
+    def _rebuild(self) -> None:
+        """Recompute the board from all counters."""
+        best = heapq.nlargest(self.k, self._counts.items(), key=lambda item: item[1])
+        self._members = {key: count for key, count in best if count > 0}
+        self._heap = [(count, key) for key, count in self._members.items()]
+        heapq.heapify(self._heap)
+        self._stale = False
+
+    def top(self, k: Optional[int] = None, deltas: Optional[Dict[Hashable, int]] = None) -> List[Tuple[Hashable, int]]:
+        """Return (key, count) pairs, largest first.
+
+        `deltas` are pending changes (e.g. a session's uncommitted edits)
+        applied to the result without touching the counters. While k plus
+        the number of changed keys fits on the board only board members and
+        changed keys are scored; otherwise every counter is.
+        """
+        if self._stale:
+            self._rebuild()
+        k = self.k if k is None else k
+        deltas = deltas or {}
+        if k + len(deltas) <= self.k:
+            candidates = set(self._members) | set(deltas)
+        else:
+            candidates = set(self._counts) | set(deltas)
+        scored = [(key, self._counts.get(key, 0) + deltas.get(key, 0)) for key in candidates]
+        ranked = sorted((item for item in scored if item[1] > 0), key=lambda item: (-item[1], str(item[0])))
+        return ranked[:k]
+
+    def count(self, key: Hashable) -> int:
+        """Return a key's current counter."""
+        return self._counts.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._counts)
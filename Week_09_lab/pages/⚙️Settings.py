@@ -1,5 +1,6 @@
 import streamlit as st
 from session_state import init_session
+from session_memory import MB, memory_totals, session_bytes
 
 st.set_page_config(page_title="Settings", page_icon="⚙️", layout="wide")
 
@@ -109,6 +110,18 @@ with tab_security:
     
     st.write("**Active Sessions**")
     st.info("📍 **Current Session**\n - Device: Windows PC\n - IP: 192.168.1.100\n - Last Active: Just now")
+
+    # Approximate session_state memory (measured at the start of each page run)
+    own = session_bytes()
+    totals = memory_totals()
+    st.caption(
+        f"Session state: {sum(own.values()) / MB:.2f} MB in {len(own)} keys · "
+        f"all sessions: {totals['total_bytes'] / MB:.1f} MB across {totals['sessions']} · "
+        f"{totals['evicted_keys']} table pagers evicted"
+    )
+    with st.expander("Memory per key"):
+        st.dataframe({"key": list(own), "KB": [round(size / 1024, 1) for size in own.values()]},
+                     use_container_width=True)
     
     if st.button("🚪 Logout"):
         st.session_state.logged_in = False
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from session_state import init_session
+from shared_data import get_session_tickets
+from paginated_table import paginated_table
 from pathlib import Path
 
 st.set_page_config(page_title="Analytics", page_icon="📊", layout="wide")
@@ -20,11 +22,12 @@ st.success(f"Logged in as: **{st.session_state.username}**")
 # Load IT tickets data for analytics
 data_path = Path(__file__).parent.parent / "DATA" / "it_tickets.csv"
 
-if data_path.exists():
-    df = pd.read_csv(data_path)
-else:
+# Shared across sessions (parsed once per file version), plus this
+# session's uncommitted Data Manager edits
+sample_df = None
+if not data_path.exists():
     # Create sample data
-    df = pd.DataFrame({
+    sample_df = pd.DataFrame({
         "ticket_id": [f"TCK-{1001+i}" for i in range(15)],
         "title": ["Email outage", "Network down", "Password reset", "Printer error", "Software update",
                   "Email outage", "Network down", "Password reset", "Printer error", "Software update",
@@ -35,6 +38,9 @@ else:
         "created_date": pd.date_range("2025-11-01", periods=15, freq="D").astype(str)
     })
 
+tickets = get_session_tickets(data_path, fallback=sample_df)
+df = tickets.to_frame()
+
 st.subheader("Ticket Statistics")
 
 # KPI metrics
@@ -104,13 +110,24 @@ with tab_priority:
 
 with tab_assignee:
     st.subheader("Workload by Assignee")
+    # Read from the store's incremental top-K boards (no value_counts per rerun)
+    top_n = st.slider("Assignees shown", 3, 20, 10)
+    open_counts = tickets.top_assignees(closed=False, k=top_n)
+    closed_counts = tickets.top_assignees(closed=True, k=top_n)
+    
+    col1, col2 = st.columns(2)
     
-    assignee_counts = df["assignee"].value_counts()
-    st.bar_chart(assignee_counts)
+    with col1:
+        st.write("**Open workload** (not closed)")
+        st.bar_chart(open_counts)
+    
+    with col2:
+        st.write("**Closed tickets leaderboard**")
+        st.bar_chart(closed_counts)
     
     st.write("**Assignee Workload**")
-    for assignee, count in assignee_counts.items():
-        st.write(f"- {assignee}: {count} tickets")
+    for assignee, count in open_counts.items():
+        st.write(f"- {assignee}: {count} open tickets")
 
 st.divider()
 
@@ -139,7 +156,7 @@ filtered_df = df[
     (df["priority"].isin(priority_filter))
 ]
 
-st.dataframe(filtered_df, use_container_width=True)
+paginated_table(df, key="detailed_tickets", filters={"status": status_filter, "priority": priority_filter})
 
 st.divider()
 
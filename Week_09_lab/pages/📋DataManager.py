@@ -7,9 +7,13 @@ Data is loaded from Week_08_Lab/DATA/it_tickets.csv for demo purposes.
 import streamlit as st
 import pandas as pd
 from session_state import init_session
+from shared_data import commit_session_tickets, get_session_tickets
+from paginated_table import paginated_table
+from fragments import finish_page_timer, start_page_timer, timed_fragment
 from pathlib import Path
 
 st.set_page_config(page_title="Data Manager", page_icon="📊", layout="wide")
+start_page_timer("data_manager")
 
 init_session()
 
@@ -40,30 +44,49 @@ if not data_path.exists():
     }
     df = pd.DataFrame(sample_data)
 else:
-    df = pd.read_csv(data_path)
-    # ticket_id is already a string in TCK-#### format, keep it as is
-
-# Initialize session state for CRUD operations
-if "tickets_data" not in st.session_state:
-    st.session_state.tickets_data = df.copy()
-else:
-    # Ensure consistent data types in session state
-    st.session_state.tickets_data = st.session_state.tickets_data.astype(df.dtypes)
+    df = None
+
+# The parsed CSV is shared by every session in the process; this session's
+# edits live in a copy-on-write overlay until they are committed
+store = get_session_tickets(data_path, fallback=df)
+
+pending = store.pending_changes()
+if pending:
+    col_pending, col_commit, col_discard = st.columns([3, 1, 1])
+    col_pending.info(f"📝 {pending} uncommitted change(s) in this session")
+    if data_path.exists() and col_commit.button("💾 Commit Changes", type="primary"):
+        committed = commit_session_tickets(data_path)
+        st.success(f"✅ {committed} change(s) saved to {data_path.name}")
+        st.rerun()
+    if col_discard.button("↩️ Discard Changes"):
+        store.discard()
+        st.rerun()
 
 # Tabs for CRUD operations
 tab_read, tab_create, tab_update, tab_delete = st.tabs(["📖 Read", "➕ Create", "✏️ Update", "❌ Delete"])
 
 # ===== READ TAB =====
-with tab_read:
-    st.subheader("View All Tickets")
-    st.dataframe(st.session_state.tickets_data, use_container_width=True)
+# Each table is a fragment: paging or changing a filter reruns only that
+# table, not the login check, data loading and the other tabs
+
+
+@timed_fragment("data_manager")
+def all_tickets_table(store):
+    """All tickets, paged."""
+    paginated_table(store.to_frame(), key="all_tickets")
+
+
+@timed_fragment("data_manager")
+def filtered_tickets_table(store):
+    """Status/priority filters and the matching tickets."""
+    tickets_df = store.to_frame()
     
     # Filter by status and priority
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Filter by Status")
-        statuses = st.session_state.tickets_data["status"].unique().tolist()
+        statuses = tickets_df["status"].unique().tolist()
         selected_status = st.selectbox("Select Status:", ["All"] + sorted(statuses))
     
     with col2:
@@ -71,18 +94,24 @@ with tab_read:
         selected_priority = st.selectbox("Select Priority:", ["All", "High", "Medium", "Low"])
     
     # Apply filters
-    filtered_df = st.session_state.tickets_data.copy()
+    filters = {}
     
     if selected_status != "All":
-        filtered_df = filtered_df[filtered_df["status"] == selected_status]
+        filters["status"] = [selected_status]
     
     if selected_priority != "All":
-        filtered_df = filtered_df[filtered_df["priority"] == selected_priority]
+        filters["priority"] = [selected_priority]
     
-    st.dataframe(filtered_df, use_container_width=True)
-    st.info(f"Found {len(filtered_df)} tickets matching filters")
+    matches = paginated_table(tickets_df, key="filtered_tickets", filters=filters)
+    st.info(f"Found {matches} tickets matching filters")
+
+
+with tab_read:
+    st.subheader("View All Tickets")
+    all_tickets_table(store)
+    filtered_tickets_table(store)
     
-    st.metric(label="Total Tickets", value=len(st.session_state.tickets_data))
+    st.metric(label="Total Tickets", value=len(store))
 
 
 # ===== CREATE TAB =====
@@ -99,26 +128,8 @@ with tab_create:
             if not new_title or not new_assignee:
                 st.error("Please fill in all fields.")
             else:
-                # Get next ticket ID by extracting number from TCK-#### and incrementing
-                last_id_str = st.session_state.tickets_data["ticket_id"].iloc[-1]
-                last_num = int(last_id_str.split("-")[-1])  # Extract number from "TCK-1005"
-                next_num = last_num + 1
-                next_id = f"TCK-{next_num:04d}"
-                
-                from datetime import date
-                new_ticket = {
-                    "ticket_id": next_id,
-                    "title": new_title,
-                    "priority": new_priority,
-                    "status": new_status,
-                    "assignee": new_assignee,
-                    "created_date": str(date.today()),
-                }
-                
-                st.session_state.tickets_data = pd.concat(
-                    [st.session_state.tickets_data, pd.DataFrame([new_ticket])],
-                    ignore_index=True
-                )
+                # IDs come from a monotonic sequence, so deleted IDs are never reused
+                next_id = store.create(new_title, new_priority, new_status, new_assignee)
                 st.success(f"✅ Ticket {next_id} created successfully!")
                 st.balloons()
 
@@ -127,16 +138,15 @@ with tab_create:
 with tab_update:
     st.subheader("Update Ticket")
     
-    if len(st.session_state.tickets_data) == 0:
+    if len(store) == 0:
         st.warning("No tickets available to update.")
     else:
         # Select ticket to update
-        ticket_ids = st.session_state.tickets_data["ticket_id"].tolist()
+        ticket_ids = store.ids()
         selected_ticket_id = st.selectbox("Select Ticket ID to Update:", ticket_ids, key="update_ticket_id")
         
         # Get the ticket data
-        ticket_idx = st.session_state.tickets_data[st.session_state.tickets_data["ticket_id"] == selected_ticket_id].index[0]
-        ticket = st.session_state.tickets_data.loc[ticket_idx]
+        ticket = store.get(selected_ticket_id)
         
         with st.form("update_ticket_form"):
             updated_title = st.text_input("Title", value=ticket["title"])
@@ -145,10 +155,13 @@ with tab_update:
             updated_assignee = st.text_input("Assignee", value=ticket["assignee"])
             
             if st.form_submit_button("Save Changes"):
-                st.session_state.tickets_data.loc[ticket_idx, "title"] = updated_title
-                st.session_state.tickets_data.loc[ticket_idx, "priority"] = updated_priority
-                st.session_state.tickets_data.loc[ticket_idx, "status"] = updated_status
-                st.session_state.tickets_data.loc[ticket_idx, "assignee"] = updated_assignee
+                store.update(
+                    selected_ticket_id,
+                    title=updated_title,
+                    priority=updated_priority,
+                    status=updated_status,
+                    assignee=updated_assignee,
+                )
                 
                 st.success(f"✅ Ticket {selected_ticket_id} updated successfully!")
 
@@ -157,18 +170,18 @@ with tab_update:
 with tab_delete:
     st.subheader("Delete Ticket")
     
-    if len(st.session_state.tickets_data) == 0:
+    if len(store) == 0:
         st.warning("No tickets available to delete.")
     else:
-        ticket_ids = st.session_state.tickets_data["ticket_id"].tolist()
+        ticket_ids = store.ids()
         selected_delete_id = st.selectbox("Select Ticket ID to Delete:", ticket_ids, key="delete_ticket_id")
         
-        ticket_to_delete = st.session_state.tickets_data[st.session_state.tickets_data["ticket_id"] == selected_delete_id].iloc[0]
+        ticket_to_delete = store.get(selected_delete_id)
         st.info(f"**Ticket #{selected_delete_id}**: {ticket_to_delete['title']}")
         
         if st.button("⚠️ Confirm Delete", type="secondary"):
-            st.session_state.tickets_data = st.session_state.tickets_data[
-                st.session_state.tickets_data["ticket_id"] != selected_delete_id
-            ]
+            store.delete(selected_delete_id)
             st.success(f"✅ Ticket #{selected_delete_id} deleted successfully!")
             st.rerun()
+
+finish_page_timer("data_manager")
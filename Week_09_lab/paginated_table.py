@@ -0,0 +1,81 @@
+"""Paginated tables for the ticket pages.
+
+Only the rows of the visible page are sent to the browser. Filtering and
+sorting produce an array of row positions that is cached per view, so
+turning pages just slices it.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+NO_SORT = "(original order)"
+
+
+class FramePager:
+    """Pages of a DataFrame with cached filter/sort orders."""
+
+    def __init__(self, df: pd.DataFrame, max_orders: int = 8):
+        self.df = df
+        self.max_orders = max_orders
+        self._orders: Dict[Tuple, np.ndarray] = {}
+
+    def positions(self, sort: Optional[str], descending: bool,
+                  filters: Optional[Dict[str, List]]) -> np.ndarray:
+        """Return the row positions of the view, computing them once."""
+        key = (sort, descending, tuple(sorted((c, tuple(v)) for c, v in (filters or {}).items())))
+        if key not in self._orders:
+            mask = np.ones(len(self.df), dtype=bool)
+            for column, values in (filters or {}).items():
+                mask &= self.df[column].isin(list(values)).to_numpy()
+            positions = np.flatnonzero(mask)
+            if sort is not None:
+                order = self.df[sort].iloc[positions].reset_index(drop=True).sort_values(
+                    ascending=not descending, kind="stable"
+                ).index.to_numpy()
+                positions = positions[order]
+            if len(self._orders) >= self.max_orders:
+                self._orders.pop(next(iter(self._orders)))
+            self._orders[key] = positions
+        return self._orders[key]
+
+    def nbytes(self) -> int:
+        """Bytes held by the cached orders (the frame belongs to the caller)."""
+        return sum(positions.nbytes for positions in self._orders.values())
+
+    def page(self, positions: np.ndarray, number: int, size: int) -> pd.DataFrame:
+        """Return page `number` (0-based) of a view."""
+        return self.df.iloc[positions[number * size:(number + 1) * size]]
+
+
+def paginated_table(df: pd.DataFrame, key: str, filters: Optional[Dict[str, List]] = None,
+                    page_sizes: Sequence[int] = (25, 50, 100)) -> int:
+    """Render one page of `df` with sort and page controls.
+
+    Returns the number of rows matching the filters.
+    """
+    pager = st.session_state.get(f"{key}_pager")
+    if pager is None or pager.df is not df:
+        pager = FramePager(df)
+        st.session_state[f"{key}_pager"] = pager
+
+    col_sort, col_order, col_size = st.columns([3, 2, 2])
+    sort = col_sort.selectbox("Sort by", [NO_SORT] + list(df.columns), key=f"{key}_sort")
+    order = col_order.radio("Order", ["Ascending", "Descending"], key=f"{key}_order", horizontal=True)
+    size = col_size.selectbox("Rows per page", list(page_sizes), key=f"{key}_size")
+
+    positions = pager.positions(None if sort == NO_SORT else sort, order == "Descending", filters)
+    pages = max(1, -(-len(positions) // size))
+
+    # Go back to the first page when the view changes
+    view = (sort, order, size, repr(filters))
+    if st.session_state.get(f"{key}_view") != view:
+        st.session_state[f"{key}_view"] = view
+        st.session_state[f"{key}_page"] = 1
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+
+    number = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    st.dataframe(pager.page(positions, int(number) - 1, size), use_container_width=True)
+    return len(positions)
@@ -0,0 +1,168 @@
+"""Approximate memory accounting for st.session_state, with per-session and global budgets.
+
+`track_session()` (called by `init_session` on every page run) measures
+each key of the current session. When the session is over its budget
+(SESSION_MEMORY_MB, default 64) or all sessions together are over theirs
+(SESSION_MEMORY_TOTAL_MB, default 512), table pagers (`*_pager`, rebuilt
+by paginated_table on the next run) are evicted from the current session,
+least recently changed first. Other keys are only counted.
+`memory_totals()` returns the totals of all open sessions for monitoring.
+
+Sessions the server no longer holds are dropped from the totals at most
+every SWEEP_INTERVAL seconds.
+"""
+import fnmatch
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # moved in Streamlit 1.38
+    from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+MB = 2 ** 20
+EVICTABLE = ("*_pager",)
+SAMPLE_SIZE = 256
+SWEEP_INTERVAL = 60.0
+
+# session id -> key -> (bytes, signature, last changed)
+_usage: Dict[str, Dict[str, Tuple[int, Tuple, float]]] = {}
+_evictions = {"keys": 0, "bytes": 0}
+_last_sweep = 0.0
+_lock = threading.Lock()
+
+
+def estimate_bytes(value: Any, _seen: Optional[set] = None, _depth: int = 0) -> int:
+    """Approximate the memory held by a value (shared references count once)."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    nbytes = getattr(value, "nbytes", None)
+    if callable(nbytes):
+        return int(nbytes())  # objects that report only what they own
+    if type(value).__module__.startswith("pandas") and hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(nbytes, int):
+        return sys.getsizeof(value) + (nbytes if getattr(value, "base", None) is None else 0)
+
+    size = sys.getsizeof(value)
+    if _depth >= 16 or isinstance(value, (str, bytes, int, float)):
+        return size
+    if isinstance(value, dict):
+        items = list(value.keys()) + list(value.values())
+    elif isinstance(value, (list, tuple, set)):
+        items = list(value)
+    elif hasattr(value, "__dict__"):
+        items = list(vars(value).values())
+    else:
+        return size
+    if not items:
+        return size
+    sample = items if len(items) <= SAMPLE_SIZE else items[::len(items) // SAMPLE_SIZE][:SAMPLE_SIZE]
+    return size + sum(estimate_bytes(item, seen, _depth + 1) for item in sample) * len(items) // len(sample)
+
+
+def _live_session_ids() -> Optional[set]:
+    """Ids of the sessions the Streamlit server holds (None without a server)."""
+    try:
+        from streamlit.runtime import Runtime
+        if not Runtime.exists():
+            return None
+        return {info.session.id for info in Runtime.instance()._session_mgr.list_sessions()}
+    except (ImportError, AttributeError, RuntimeError):
+        return None
+
+
+def _sweep() -> None:
+    """Drop closed sessions from the totals (at most every SWEEP_INTERVAL seconds)."""
+    global _last_sweep
+    now = time.monotonic()
+    if now - _last_sweep < SWEEP_INTERVAL:
+        return
+    _last_sweep = now
+    live = _live_session_ids()
+    if live is not None:
+        with _lock:
+            for session_id in [sid for sid in _usage if sid not in live]:
+                del _usage[session_id]
+
+
+def track_session(budget_mb: Optional[float] = None, total_budget_mb: Optional[float] = None) -> List[str]:
+    """Measure this session's state and evict cold pagers while over a budget.
+
+    Returns the evicted keys.
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return []
+    budget = (budget_mb if budget_mb is not None else float(os.getenv("SESSION_MEMORY_MB", "64"))) * MB
+    total_budget = (total_budget_mb if total_budget_mb is not None
+                    else float(os.getenv("SESSION_MEMORY_TOTAL_MB", "512"))) * MB
+    _sweep()
+
+    now = time.time()
+    with _lock:
+        old = _usage.get(ctx.session_id, {})
+
+    usage = {}
+    for key in list(st.session_state.keys()):
+        value = st.session_state[key]
+        try:
+            signature = (id(value), len(value))
+        except TypeError:
+            signature = (id(value), None)
+        previous = old.get(key)
+        if previous is not None and previous[1] == signature:
+            usage[key] = previous
+        else:
+            usage[key] = (estimate_bytes(value), signature, now)
+
+    own = sum(size for size, _, _ in usage.values())
+    with _lock:
+        others = sum(size for sid, keys in _usage.items() if sid != ctx.session_id for size, _, _ in keys.values())
+    evicted = []
+    excess = max(own - budget, own + others - total_budget)
+    for _, key in sorted((changed, key) for key, (_, _, changed) in usage.items()):
+        if excess <= 0:
+            break
+        if any(fnmatch.fnmatchcase(key, pattern) for pattern in EVICTABLE):
+            del st.session_state[key]
+            excess -= usage[key][0]
+            evicted.append(key)
+            with _lock:
+                _evictions["keys"] += 1
+                _evictions["bytes"] += usage.pop(key)[0]
+
+    with _lock:
+        _usage[ctx.session_id] = usage
+    return evicted
+
+
+def session_bytes() -> Dict[str, int]:
+    """Bytes per key of the current session, largest first."""
+    ctx = get_script_run_ctx()
+    with _lock:
+        usage = dict(_usage.get(ctx.session_id, {})) if ctx else {}
+    return dict(sorted(((key, size) for key, (size, _, _) in usage.items()), key=lambda item: -item[1]))
+
+
+def memory_totals() -> Dict[str, Any]:
+    """Totals of all open sessions: sessions, total_bytes, evictions, per_session."""
+    with _lock:
+        per_session = {sid: sum(size for size, _, _ in usage.values()) for sid, usage in _usage.items()}
+        evictions = dict(_evictions)
+    return {
+        "sessions": len(per_session),
+        "total_bytes": sum(per_session.values()),
+        "evicted_keys": evictions["keys"],
+        "evicted_bytes": evictions["bytes"],
+        "per_session": per_session,
+    }
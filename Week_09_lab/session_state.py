@@ -2,6 +2,7 @@
 from typing import Dict
 import streamlit as st
 import users
+from session_memory import track_session
 
 
 def init_session() -> None:
@@ -12,7 +13,11 @@ def init_session() -> None:
     - logged_in: bool
     - username: str
     - flash: list[str] (optional transient messages)
+
+    Also accounts the session's memory and evicts cold table pagers when
+    it is over budget (see session_memory).
     """
+    track_session()
     if "users" not in st.session_state:
         st.session_state.users = users.load_users()
     else:
@@ -0,0 +1,66 @@
+"""Process-wide shared ticket data for the Week 9 pages.
+
+Each version of the tickets CSV (identified by path, modification time and
+size) is parsed once per Streamlit process and shared read-only between
+all sessions via `st.cache_resource`. A session's uncommitted edits live in
+its own TicketOverlay in `st.session_state`, and `commit_session_tickets`
+writes them back to the CSV, which makes the next rerun load the new
+version.
+"""
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import streamlit as st
+
+from ticket_store import TicketOverlay, TicketStore
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_version(path: str, mtime_ns: int, size: int) -> TicketStore:
+    """Parse one version of a tickets CSV (cached per process)."""
+    store = TicketStore.from_csv(Path(path))
+    store.freeze()
+    return store
+
+
+def get_shared_store(path: Path) -> TicketStore:
+    """Return the shared, read-only store for the current version of a CSV."""
+    stat = path.stat()
+    return _load_version(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def get_session_tickets(path: Path, fallback: Optional[pd.DataFrame] = None) -> TicketOverlay:
+    """Return this session's overlay on the shared ticket data.
+
+    If the CSV doesn't exist, the fallback DataFrame becomes a per-session
+    base instead. The overlay is moved onto the newest file version when
+    another session has committed.
+    """
+    if path.exists():
+        base = get_shared_store(path)
+    else:
+        if "ticket_sample_base" not in st.session_state:
+            sample = TicketStore(fallback)
+            sample.freeze()
+            st.session_state.ticket_sample_base = sample
+        base = st.session_state.ticket_sample_base
+
+    overlay = st.session_state.get("ticket_overlay")
+    if overlay is None:
+        overlay = TicketOverlay(base)
+        st.session_state.ticket_overlay = overlay
+    elif overlay.base is not base:
+        overlay.rebase(base)
+    return overlay
+
+
+def commit_session_tickets(path: Path) -> int:
+    """Persist this session's edits to the CSV and start a fresh overlay.
+
+    Returns the number of committed ticket changes.
+    """
+    overlay = get_session_tickets(path)
+    count = overlay.commit(path, lambda: get_shared_store(path))
+    st.session_state.ticket_overlay = TicketOverlay(get_shared_store(path))
+    return count
@@ -0,0 +1,427 @@
+"""Indexed ticket store and per-session overlays for the ticket pages.
+
+Tickets are stored column-wise in preallocated arrays with a dict from
+ticket_id to row slot, so create, read, update and delete are O(1) instead
+of DataFrame concat / boolean-mask scans. Deleted slots are tombstoned and
+compacted in bulk. New IDs come from a monotonic sequence (IDs of deleted
+tickets are never reused). The DataFrame view used for display is only
+rebuilt when it is requested after a change, in one vectorized step.
+Open and closed tickets per assignee are kept in incremental top-K
+boards, updated on every write, for the Analytics leaderboards.
+
+A frozen TicketStore can be shared by every session in the process; each
+session records its uncommitted edits in a TicketOverlay on top of it, so
+per-session memory grows with the number of edits, not the dataset size.
+Commits are serialized by a process-wide lock and always apply the edits
+to the file's current version.
+"""
+import sys
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from leaderboard import TopK
+
+FIELDS = ["ticket_id", "title", "priority", "status", "assignee", "created_date"]
+EDITABLE_FIELDS = ["title", "priority", "status", "assignee"]
+CLOSED_STATUS = "Closed"
+
+# Held while an overlay is written back, so commits from sessions never interleave
+_commit_lock = threading.Lock()
+
+
+def _id_number(ticket_id: str) -> int:
+    """Extract the number from an ID like "TCK-1005" (-1 if there is none)."""
+    suffix = str(ticket_id).rsplit("-", 1)[-1]
+    return int(suffix) if suffix.isdigit() else -1
+
+
+class TicketStore:
+    """Tickets keyed by ticket_id with a lazily rebuilt DataFrame view."""
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, prefix: str = "TCK-", width: int = 4):
+        """Create a store, optionally seeded from a DataFrame of tickets.
+
+        Raises ValueError if the DataFrame has duplicate ticket IDs.
+        """
+        self.prefix = prefix
+        self.width = width
+        self._columns: Dict[str, np.ndarray] = {field: np.empty(16, dtype=object) for field in FIELDS}
+        self._alive = np.zeros(16, dtype=bool)
+        self._slots: Dict[str, int] = {}
+        self._size = 0
+        self._next_number = 1
+        self._view: Optional[pd.DataFrame] = None
+        self._view_rows: Optional[Dict[str, int]] = None
+        self._frozen = False
+        # Tickets per assignee, keyed by whether the ticket is closed
+        self._boards = {False: TopK(), True: TopK()}
+        if df is not None:
+            self._load(df)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "TicketStore":
+        """Create a store from a tickets CSV."""
+        return cls(pd.read_csv(path, dtype=str, keep_default_na=False))
+
+    def _load(self, df: pd.DataFrame) -> None:
+        """Copy every row of a DataFrame into the column arrays."""
+        if df["ticket_id"].duplicated().any():
+            raise ValueError("Duplicate ticket IDs in data")
+        count = len(df)
+        self._reserve(count)
+        for field in FIELDS:
+            if field in df.columns:
+                self._columns[field][:count] = df[field].astype(str).to_numpy()
+        self._alive[:count] = True
+        self._slots = {ticket_id: slot for slot, ticket_id in enumerate(self._columns["ticket_id"][:count])}
+        self._size = count
+        numbers = [_id_number(ticket_id) for ticket_id in self._slots]
+        self._next_number = max(numbers, default=0) + 1
+        closed = self._columns["status"][:count] == CLOSED_STATUS
+        counts = pd.Series(closed).groupby([closed, self._columns["assignee"][:count]]).size()
+        for (is_closed, assignee), tickets in counts.items():
+            self._boards[bool(is_closed)].update(assignee, int(tickets))
+
+    def _reserve(self, extra: int) -> None:
+        """Grow the arrays (doubling) so `extra` more rows fit."""
+        capacity = len(self._alive)
+        needed = self._size + extra
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for field, values in self._columns.items():
+            grown = np.empty(capacity, dtype=object)
+            grown[:self._size] = values[:self._size]
+            self._columns[field] = grown
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._alive = alive
+
+    def _compact(self) -> None:
+        """Drop tombstoned slots once they make up half of the used rows."""
+        live = self._alive[:self._size]
+        for field, values in self._columns.items():
+            kept = values[:self._size][live]
+            values[:len(kept)] = kept
+            values[len(kept):self._size] = None
+        self._size = len(self._slots)
+        self._alive[:] = False
+        self._alive[:self._size] = True
+        self._slots = {ticket_id: slot for slot, ticket_id in enumerate(self._columns["ticket_id"][:self._size])}
+
+    def freeze(self) -> None:
+        """Make the store read-only so it can be shared between sessions."""
+        self._frozen = True
+
+    def _check_writable(self) -> None:
+        """Raise RuntimeError if the store has been frozen."""
+        if self._frozen:
+            raise RuntimeError("Shared ticket data is read-only; edit through a TicketOverlay")
+
+    def next_id(self) -> str:
+        """Get the ID the next created ticket will receive."""
+        return f"{self.prefix}{self._next_number:0{self.width}d}"
+
+    def create(self, title: str, priority: str, status: str, assignee: str,
+               created_date: Optional[str] = None) -> str:
+        """Add a ticket and return its new ID."""
+        self._check_writable()
+        ticket_id = self.next_id()
+        self._next_number += 1
+        self._reserve(1)
+        slot = self._size
+        values = {
+            "ticket_id": ticket_id,
+            "title": title,
+            "priority": priority,
+            "status": status,
+            "assignee": assignee,
+            "created_date": created_date or str(date.today()),
+        }
+        for field, value in values.items():
+            self._columns[field][slot] = value
+        self._count(slot, 1)
+        self._alive[slot] = True
+        self._slots[ticket_id] = slot
+        self._size += 1
+        self._view = None
+        return ticket_id
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, str]]:
+        """Return a ticket as a dict, or None if it doesn't exist."""
+        slot = self._slots.get(ticket_id)
+        if slot is None:
+            return None
+        return {field: values[slot] for field, values in self._columns.items()}
+
+    def update(self, ticket_id: str, **fields: str) -> None:
+        """Change editable fields of a ticket.
+
+        Raises KeyError for an unknown ticket and ValueError for fields that
+        can't be edited.
+        """
+        self._check_writable()
+        slot = self._slots.get(ticket_id)
+        if slot is None:
+            raise KeyError(f"Ticket {ticket_id} not found")
+        invalid = [name for name in fields if name not in EDITABLE_FIELDS]
+        if invalid:
+            raise ValueError(f"Fields cannot be edited: {invalid}")
+        self._count(slot, -1)
+        for field, value in fields.items():
+            self._columns[field][slot] = value
+        self._count(slot, 1)
+        self._view = None
+
+    def delete(self, ticket_id: str) -> None:
+        """Remove a ticket. Raises KeyError if it doesn't exist."""
+        self._check_writable()
+        slot = self._slots.pop(ticket_id, None)
+        if slot is None:
+            raise KeyError(f"Ticket {ticket_id} not found")
+        self._count(slot, -1)
+        self._alive[slot] = False
+        if len(self._slots) * 2 < self._size:
+            self._compact()
+        self._view = None
+
+    def _count(self, slot: int, delta: int) -> None:
+        """Add a ticket's slot to (or remove it from) its assignee board."""
+        closed = self._columns["status"][slot] == CLOSED_STATUS
+        self._boards[closed].update(self._columns["assignee"][slot], delta)
+
+    def top_assignees(self, closed: bool, k: int = 10,
+                      deltas: Optional[Dict[str, int]] = None) -> pd.Series:
+        """Return ticket counts of the k busiest assignees, largest first.
+
+        Args:
+            closed: Count closed tickets (True) or all others (False)
+            k: Number of assignees
+            deltas: Pending count changes per assignee to apply on top
+        """
+        board = self._boards[closed].top(k, deltas)
+        return pd.Series(dict(board), dtype="int64", name="Tickets").rename_axis("Assignee")
+
+    def ids(self) -> List[str]:
+        """Return all ticket IDs in creation order."""
+        return list(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self._slots
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the tickets as a DataFrame.
+
+        The frame is rebuilt at most once per batch of writes and reused
+        until the next change; copy it before modifying it.
+        """
+        if self._view is None:
+            live = self._alive[:self._size]
+            self._view = pd.DataFrame(
+                {field: values[:self._size][live] for field, values in self._columns.items()}
+            )
+            self._view_rows = None
+        return self._view
+
+    def view_rows(self) -> Dict[str, int]:
+        """Map ticket IDs to their row in `to_frame()` (built once per view)."""
+        frame = self.to_frame()
+        if self._view_rows is None:
+            self._view_rows = {ticket_id: row for row, ticket_id in enumerate(frame["ticket_id"])}
+        return self._view_rows
+
+
+class TicketOverlay:
+    """Copy-on-write layer of one session's uncommitted ticket edits.
+
+    Reads fall through to the shared base store; writes only touch the
+    overlay. Created and updated tickets are stored as dicts, deleted ones
+    as None.
+    """
+
+    def __init__(self, base: TicketStore):
+        """Create an empty overlay on top of a (frozen) base store."""
+        self.base = base
+        self._changes: Dict[str, Optional[Dict[str, str]]] = {}
+        self._next_number = base._next_number
+
+    def rebase(self, base: TicketStore) -> None:
+        """Move the overlay onto a newer base, e.g. after another session committed.
+
+        Edits to tickets that no longer exist are dropped and created
+        tickets whose IDs were taken in the meantime get fresh IDs.
+        """
+        changes = {}
+        self._next_number = max(self._next_number, base._next_number)
+        for ticket_id, ticket in self._changes.items():
+            if ticket_id in self.base:
+                if ticket_id in base:
+                    changes[ticket_id] = ticket
+            elif ticket_id in base:
+                new_id = self.next_id()
+                self._next_number += 1
+                changes[new_id] = dict(ticket, ticket_id=new_id)
+            else:
+                changes[ticket_id] = ticket
+        self.base = base
+        self._changes = changes
+
+    def next_id(self) -> str:
+        """Get the ID the next created ticket will receive."""
+        return f"{self.base.prefix}{self._next_number:0{self.base.width}d}"
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the edits (the shared base is not counted)."""
+        return sys.getsizeof(self._changes) + sum(
+            sys.getsizeof(ticket) + sum(sys.getsizeof(value) for value in ticket.values())
+            for ticket in self._changes.values() if ticket
+        )
+
+    def create(self, title: str, priority: str, status: str, assignee: str,
+               created_date: Optional[str] = None) -> str:
+        """Add a ticket to the overlay and return its new ID."""
+        ticket_id = self.next_id()
+        self._next_number += 1
+        self._changes[ticket_id] = {
+            "ticket_id": ticket_id,
+            "title": title,
+            "priority": priority,
+            "status": status,
+            "assignee": assignee,
+            "created_date": created_date or str(date.today()),
+        }
+        return ticket_id
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, str]]:
+        """Return a ticket as a dict, or None if it doesn't exist."""
+        if ticket_id in self._changes:
+            ticket = self._changes[ticket_id]
+            return dict(ticket) if ticket is not None else None
+        return self.base.get(ticket_id)
+
+    def update(self, ticket_id: str, **fields: str) -> None:
+        """Change editable fields of a ticket, copying it into the overlay first.
+
+        Raises KeyError for an unknown ticket and ValueError for fields that
+        can't be edited.
+        """
+        ticket = self.get(ticket_id)
+        if ticket is None:
+            raise KeyError(f"Ticket {ticket_id} not found")
+        invalid = [name for name in fields if name not in EDITABLE_FIELDS]
+        if invalid:
+            raise ValueError(f"Fields cannot be edited: {invalid}")
+        ticket.update(fields)
+        self._changes[ticket_id] = ticket
+
+    def delete(self, ticket_id: str) -> None:
+        """Remove a ticket. Raises KeyError if it doesn't exist."""
+        if self.get(ticket_id) is None:
+            raise KeyError(f"Ticket {ticket_id} not found")
+        if ticket_id in self.base:
+            self._changes[ticket_id] = None
+        else:
+            del self._changes[ticket_id]
+
+    def top_assignees(self, closed: bool, k: int = 10) -> pd.Series:
+        """Return the base store's assignee board with this session's edits applied.
+
+        Only the edited tickets are re-counted, so this costs O(K + edits).
+        """
+        deltas: Dict[str, int] = {}
+        for ticket_id, ticket in self._changes.items():
+            for version, delta in ((self.base.get(ticket_id), -1), (ticket, 1)):
+                if version is not None and (version["status"] == CLOSED_STATUS) == closed:
+                    deltas[version["assignee"]] = deltas.get(version["assignee"], 0) + delta
+        return self.base.top_assignees(closed, k, {key: d for key, d in deltas.items() if d})
+
+    def pending_changes(self) -> int:
+        """Return the number of tickets created, updated or deleted."""
+        return len(self._changes)
+
+    def discard(self) -> None:
+        """Drop every uncommitted edit."""
+        self._changes = {}
+        self._next_number = self.base._next_number
+
+    def ids(self) -> List[str]:
+        """Return all visible ticket IDs, base tickets first."""
+        base_ids = [t for t in self.base.ids() if self._changes.get(t, True) is not None]
+        return base_ids + [t for t in self._changes if t not in self.base]
+
+    def __len__(self) -> int:
+        deleted = sum(ticket is None for ticket in self._changes.values())
+        created = sum(t not in self.base for t in self._changes)
+        return len(self.base) - deleted + created
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return self.get(ticket_id) is not None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the tickets with this session's edits applied.
+
+        Without edits this is the shared base frame itself (no copy). Updates
+        copy only the columns whose values they change; the other columns
+        share the base frame's arrays. Deletes and creates need new rows, so
+        they rebuild every column once. Do not modify the result.
+        """
+        frame = self.base.to_frame()
+        if not self._changes:
+            return frame
+
+        rows = self.base.view_rows()
+        updated = {rows[t]: ticket for t, ticket in self._changes.items() if ticket is not None and t in rows}
+        deleted = [rows[t] for t, ticket in self._changes.items() if ticket is None]
+        created = [ticket for t, ticket in self._changes.items() if t not in rows]
+
+        positions = np.fromiter(updated, dtype=np.int64, count=len(updated))
+        columns = {}
+        for field in FIELDS:
+            values = frame[field].to_numpy()
+            if field in EDITABLE_FIELDS and len(positions):
+                edited = np.array([ticket[field] for ticket in updated.values()], dtype=object)
+                if (values[positions] != edited).any():
+                    values = values.copy()
+                    values[positions] = edited
+            columns[field] = values
+        if deleted:
+            keep = np.ones(len(frame), dtype=bool)
+            keep[deleted] = False
+            columns = {field: values[keep] for field, values in columns.items()}
+
+        result = pd.DataFrame(columns, copy=False)
+        if created:
+            result = pd.concat([result, pd.DataFrame.from_records(created, columns=FIELDS)], ignore_index=True)
+        return result
+
+    def commit(self, path: Path, latest: Callable[[], TicketStore]) -> int:
+        """Write the edits on top of the latest file version, atomically.
+
+        Commits are serialized; the latest version is loaded inside the lock,
+        so edits committed by another session in the meantime are kept.
+
+        Args:
+            path: Tickets CSV to write
+            latest: Loads the store holding the file's current contents
+
+        Returns:
+            Number of committed ticket changes
+        """
+        with _commit_lock:
+            current = latest()
+            if current is not self.base:
+                self.rebase(current)
+            count = self.pending_changes()
+            tmp = path.with_suffix(".tmp")
+            self.to_frame().to_csv(tmp, index=False)
+            tmp.replace(path)
+        return count
@@ -12,14 +12,20 @@ Pathway: Data Science with cyber incident analytics
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.session_state import init_session, is_logged_in, get_current_user
+from app.lazy_imports import lazy_import
+from app.session_state import enforce_memory_budget, init_session, is_logged_in, get_current_user
+from app.components.memory_panel import render_memory_panel
+from app.components.profiler_panel import begin_rerun, end_rerun, render_profiler_panel
+from app.profiling import span
+
+# Only the logged-in view uses pandas; the login form never loads it
+pd = lazy_import("pandas")
 
 # Configure page
 st.set_page_config(
@@ -28,6 +34,7 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+begin_rerun("home")
 
 # Custom CSS
 st.markdown("""
@@ -79,7 +86,8 @@ if not is_logged_in():
         if st.button("Log In", type="primary"):
             from app.services.auth_service import login_user
             try:
-                success, message = login_user(username, password)
+                with span("auth: login"):
+                    success, message = login_user(username, password)
                 if success:
                     st.session_state.logged_in = True
                     st.session_state.username = username
@@ -117,7 +125,7 @@ else:
     
     tabs = st.tabs(["📊 Overview", "📈 Analytics", "🔍 Data Explorer"])
     
-    with tabs[0]:
+    with tabs[0], span("home: overview"):
         st.subheader("Dashboard Overview")
         
         col1, col2, col3, col4 = st.columns(4)
@@ -157,7 +165,7 @@ else:
             - System check passed
             """)
     
-    with tabs[1]:
+    with tabs[1], span("home: analytics"):
         st.subheader("Analytics & Insights")
         
         st.markdown("### Sample Analytics")
@@ -183,7 +191,7 @@ else:
         )
         st.line_chart(chart_data.set_index("Month"))
     
-    with tabs[2]:
+    with tabs[2], span("home: data explorer"):
         st.subheader("Data Explorer")
         
         st.markdown("### Load and Explore Datasets")
@@ -207,4 +215,9 @@ else:
                 "Status": ["Success", "Success", "Failed", "Success", "Success"]
             }
         )
-        st.dataframe(sample_df, use_container_width=True)
\ No newline at end of file
+        st.dataframe(sample_df, use_container_width=True)
+
+enforce_memory_budget()
+end_rerun()
+render_profiler_panel()
+render_memory_panel()
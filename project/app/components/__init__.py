@@ -0,0 +1 @@
+# Components Package Init
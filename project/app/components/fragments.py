@@ -0,0 +1,117 @@
+"""Fragment helpers with rerun timing for Streamlit pages (Week 9).
+
+A widget inside a fragment only reruns that fragment, not the whole page
+script (auth checks, data loading and every other chart). `st.fragment`
+is stable from Streamlit 1.37; older versions (1.33-1.36) provide it as
+`st.experimental_fragment`.
+
+Each page and fragment run is timed and kept in session state, so a page
+can show what a filter change costs now compared with a full rerun. A
+timed fragment is also a span of the rerun profile (app.profiling), and a
+fragment-only rerun gets a profile of its own.
+"""
+
+import time
+import functools
+import streamlit as st
+from typing import Callable, Dict, Optional
+
+from app.components.profiler_panel import begin_fragment_rerun, end_rerun
+from app.profiling import span
+
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+_TIMINGS_KEY = "rerun_timings"
+
+
+def _timings() -> Dict[str, Dict[str, float]]:
+    """Get this session's timings: name -> {"last": ms, "runs": n, "total": ms}."""
+    if _TIMINGS_KEY not in st.session_state:
+        st.session_state[_TIMINGS_KEY] = {}
+    return st.session_state[_TIMINGS_KEY]
+
+
+def record_timing(name: str, elapsed_ms: float) -> None:
+    """Record one run of a page or fragment.
+
+    Args:
+        name: Page or fragment name
+        elapsed_ms: Run time in milliseconds
+    """
+    entry = _timings().setdefault(name, {"last": 0.0, "runs": 0, "total": 0.0})
+    entry["last"] = elapsed_ms
+    entry["runs"] += 1
+    entry["total"] += elapsed_ms
+
+
+def get_timing(name: str) -> Optional[Dict[str, float]]:
+    """Get the recorded timings of a page or fragment (None if it never ran)."""
+    return _timings().get(name)
+
+
+def start_page_timer(page: str) -> None:
+    """Mark the start of a full script run of a page."""
+    st.session_state[f"{_TIMINGS_KEY}_{page}_start"] = time.perf_counter()
+
+
+def finish_page_timer(page: str) -> float:
+    """Record the full script run started by start_page_timer.
+
+    Returns:
+        Elapsed milliseconds
+    """
+    started = st.session_state.pop(f"{_TIMINGS_KEY}_{page}_start", time.perf_counter())
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    record_timing(page, elapsed_ms)
+    return elapsed_ms
+
+
+def timed_fragment(name: str, page: Optional[str] = None) -> Callable:
+    """Turn a function into a fragment whose runs are timed.
+
+    Fragment-only reruns show a caption comparing their cost with the
+    page's last full rerun.
+
+    Args:
+        name: Fragment name used for the timings
+        page: Page name passed to start_page_timer (optional)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            own_profile = begin_fragment_rerun(f"{page or name} (fragment)")
+            started = time.perf_counter()
+            with span(name):
+                result = func(*args, **kwargs)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            record_timing(name, elapsed_ms)
+
+            full = get_timing(page) if page else None
+            # A full run is in progress while its page timer is pending
+            partial = page is not None and f"{_TIMINGS_KEY}_{page}_start" not in st.session_state
+            if partial and full:
+                st.caption(
+                    f"⏱ Rerun of this section: {elapsed_ms:.1f} ms "
+                    f"(full page rerun: {full['last']:.1f} ms)"
+                )
+            if own_profile:
+                end_rerun()
+            return result
+        return fragment(wrapper)
+    return decorator
+
+
+def render_timings(title: str = "⏱ Rerun timings") -> None:
+    """Show this session's page and fragment timings in an expander."""
+    timings = _timings()
+    if not timings:
+        return
+    with st.expander(title):
+        for name, entry in timings.items():
+            st.caption(
+                f"{name}: last {entry['last']:.1f} ms · "
+                f"avg {entry['total'] / entry['runs']:.1f} ms over {entry['runs']} runs"
+            )
@@ -0,0 +1,37 @@
+"""Admin sidebar panel for session-state memory (Week 9).
+
+Shows the process-wide totals from SessionMemoryManager.stats() (sessions,
+resident and spilled bytes against the budgets, keys shed so far) and the
+current session's keys by size. Call after enforce_memory_budget().
+"""
+
+import streamlit as st
+
+from app.lazy_imports import lazy_import
+from app.session_memory import MB, get_session_memory
+from app.session_state import current_session_id, is_admin
+
+pd = lazy_import("pandas")
+
+
+def render_memory_panel() -> None:
+    """Show session-state memory in the sidebar (admins only)."""
+    if not is_admin():
+        return
+    memory = get_session_memory()
+    stats = memory.stats()
+    with st.sidebar.expander("🧠 Session memory"):
+        col1, col2 = st.columns(2)
+        col1.metric("Sessions", stats["sessions"])
+        col2.metric("Resident", f"{stats['resident_bytes'] / MB:,.1f} MB",
+                    help=f"Budget {stats['global_budget'] / MB:,.0f} MB for all sessions, "
+                         f"{stats['session_budget'] / MB:,.0f} MB per session")
+        st.caption(f"Spilled to disk: {stats['spilled_bytes'] / MB:,.1f} MB · "
+                   f"{stats['evictions']} evictions, {stats['spills']} spills, {stats['restores']} restores")
+
+        usage = memory.session_usage(current_session_id() or "")
+        if usage:
+            keys = pd.DataFrame.from_dict(usage, orient="index").rename_axis("key")
+            keys["MB"] = keys.pop("bytes") / MB
+            st.caption("This session")
+            st.dataframe(keys.style.format({"MB": "{:.3f}"}), use_container_width=True)
@@ -0,0 +1,96 @@
+"""Paginated table component for Streamlit pages (Week 9).
+
+Only the visible page is fetched and sent to the browser, so a table over
+ten million rows renders as fast as one over a hundred. Sorting and
+filtering run in the data layer (see app.services.pagination).
+"""
+
+import time
+import streamlit as st
+import pandas as pd
+from typing import Optional, Sequence, Union
+
+from app.services.pagination import FramePageSource, Filters, PageSource, Paginator
+from app.session_state import set_value
+
+PAGE_SIZES = (25, 50, 100, 250)
+NO_SORT = "(original order)"
+
+
+def _get_paginator(source: Union[PageSource, pd.DataFrame], key: str, page_size: int) -> Paginator:
+    """Get this table's Paginator from session state, replacing it if the data changed."""
+    state_key = f"{key}_paginator"
+    paginator = st.session_state.get(state_key)
+    if isinstance(source, pd.DataFrame):
+        if paginator is None or getattr(paginator.source, "df", None) is not source:
+            paginator = Paginator(FramePageSource(source), page_size)
+    elif paginator is None or paginator.source is not source:
+        paginator = Paginator(source, page_size)
+    set_value(state_key, paginator)  # marks it recently used for the memory budget
+    return paginator
+
+
+def paginated_table(source: Union[PageSource, pd.DataFrame], key: str,
+                    filters: Optional[Filters] = None, page_sizes: Sequence[int] = PAGE_SIZES,
+                    default_sort: Optional[str] = None, descending: bool = False) -> pd.DataFrame:
+    """Render one page of a table with sort and page controls.
+
+    Args:
+        source: PageSource (e.g. DataService.page_source) or a DataFrame
+        key: Unique widget key for this table
+        filters: Column -> allowed values, applied by the source
+        page_sizes: Page size choices
+        default_sort: Column sorted by initially (optional)
+        descending: Initial sort direction
+
+    Returns:
+        The rows on the current page
+    """
+    paginator = _get_paginator(source, key, page_sizes[0])
+    columns = paginator.source.columns()
+    sort_options = [NO_SORT] + columns
+
+    sort_col, direction_col, size_col = st.columns([3, 2, 2])
+    with sort_col:
+        sort = st.selectbox(
+            "Sort by", sort_options, key=f"{key}_sort",
+            index=sort_options.index(default_sort) if default_sort in columns else 0
+        )
+    with direction_col:
+        direction = st.radio(
+            "Order", ["Ascending", "Descending"], key=f"{key}_direction",
+            index=int(descending), horizontal=True
+        )
+    with size_col:
+        page_size = st.selectbox("Rows per page", list(page_sizes), key=f"{key}_page_size")
+
+    paginator.configure(
+        page_size=page_size,
+        sort=None if sort == NO_SORT else sort,
+        descending=direction == "Descending",
+        filters=filters,
+    )
+
+    # Jump back to the first page whenever the view changes
+    view = (page_size, sort, direction, repr(sorted((filters or {}).items())))
+    if st.session_state.get(f"{key}_view") != view:
+        st.session_state[f"{key}_view"] = view
+        st.session_state[f"{key}_page"] = 1
+
+    started = time.perf_counter()
+    total = paginator.total_rows()
+    pages = paginator.page_count()
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+
+    page_number = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    rows = paginator.get_page(int(page_number) - 1)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    st.dataframe(rows, use_container_width=True)
+    first = (int(page_number) - 1) * page_size
+    st.caption(
+        f"Rows {min(first + 1, total):,}–{first + len(rows):,} of {total:,} · "
+        f"fetched in {elapsed_ms:.1f} ms · page cache {paginator.hits} hits / {paginator.misses} misses"
+    )
+    return rows
@@ -0,0 +1,150 @@
+"""Rerun profiler: per-session profile buffer and admin sidebar panel (Week 9).
+
+Pages call `begin_rerun(page)` at the top of the script and
+`end_rerun()` at the bottom. While profiling is on, every span recorded in
+between (see app.profiling) ends up in a RerunProfile kept in a ring
+buffer of the session's last RING_SIZE reruns. The admin-only sidebar
+panel shows p50/p95 run times per page, p95 per span, and a flame-style
+chart of one rerun.
+
+Profiling is off unless an admin switches it on for their session in the
+panel, or APP_PROFILING=1 is set for every session; when it is off no
+profile is started and spans cost one context-variable lookup.
+"""
+
+import os
+from collections import deque
+from datetime import datetime
+from typing import Deque, List
+
+import streamlit as st
+
+from app.lazy_imports import lazy_import
+from app.profiling import RerunProfile, current_profile, percentile, start_profile, stop_profile
+from app.session_state import is_admin
+
+alt = lazy_import("altair")
+pd = lazy_import("pandas")
+
+RING_SIZE = 50
+
+_PROFILES_KEY = "rerun_profiles"
+_ENABLED_KEY = "profiling_enabled"
+
+
+def profiling_enabled() -> bool:
+    """Whether this session's reruns are profiled."""
+    return os.getenv("APP_PROFILING", "") in ("1", "true") or st.session_state.get(_ENABLED_KEY, False)
+
+
+def _profiles() -> Deque[RerunProfile]:
+    """Get this session's ring buffer of finished profiles."""
+    if _PROFILES_KEY not in st.session_state:
+        st.session_state[_PROFILES_KEY] = deque(maxlen=RING_SIZE)
+    return st.session_state[_PROFILES_KEY]
+
+
+def begin_rerun(page: str) -> None:
+    """Start profiling this script run if profiling is on.
+
+    A run cut short by st.rerun() never reaches end_rerun; its profile is
+    still active in the script thread and is kept here instead.
+
+    Args:
+        page: Page name the profile is filed under
+    """
+    end_rerun()
+    if profiling_enabled():
+        start_profile(page)
+
+
+def end_rerun() -> None:
+    """Finish this run's profile and keep it in the session's ring buffer."""
+    profile = stop_profile()
+    if profile is not None:
+        _profiles().append(profile)
+
+
+def begin_fragment_rerun(name: str) -> bool:
+    """Profile a fragment-only rerun (no page profile is active then).
+
+    Returns:
+        True if a profile was started (the caller must call end_rerun)
+    """
+    if current_profile() is not None or not profiling_enabled():
+        return False
+    start_profile(name)
+    return True
+
+
+def _page_summary(profiles: List[RerunProfile]) -> "pd.DataFrame":
+    """Run counts and p50/p95/max run time per page."""
+    rows = []
+    for page in dict.fromkeys(p.page for p in profiles):
+        totals = [p.total_ms for p in profiles if p.page == page]
+        rows.append({
+            "page": page, "runs": len(totals), "p50 ms": percentile(totals, 50),
+            "p95 ms": percentile(totals, 95), "max ms": max(totals),
+        })
+    return pd.DataFrame(rows).set_index("page")
+
+
+def _span_summary(profiles: List[RerunProfile]) -> "pd.DataFrame":
+    """p95 and share of run time per span name, over the given profiles."""
+    per_span = {}
+    for profile in profiles:
+        for name, ms in profile.span_totals().items():
+            per_span.setdefault(name, []).append(ms)
+        per_span.setdefault("(outside spans)", []).append(profile.unaccounted_ms())
+    total = sum(p.total_ms for p in profiles) or 1.0
+    rows = [{
+        "span": name, "calls": len(values), "p95 ms": percentile(values, 95),
+        "share": sum(values) / total,
+    } for name, values in per_span.items()]
+    return pd.DataFrame(rows).set_index("span").sort_values("share", ascending=False)
+
+
+def _flame_chart(profile: RerunProfile):
+    """Icicle chart of one rerun: depth downwards, time across."""
+    spans = pd.DataFrame(profile.spans, columns=["span", "depth", "start", "end"])
+    spans["ms"] = (spans["end"] - spans["start"]).round(2)
+    return alt.Chart(spans).mark_bar(stroke="white").encode(
+        x=alt.X("start:Q", title="ms since rerun start"),
+        x2="end:Q",
+        y=alt.Y("depth:O", title=None, axis=None),
+        color=alt.Color("span:N", legend=None),
+        tooltip=["span", "ms", "depth"],
+    ).properties(height=40 + 28 * (int(spans["depth"].max()) + 1))
+
+
+def render_profiler_panel() -> None:
+    """Show the profiler in the sidebar (admins only; call after end_rerun)."""
+    if not is_admin():
+        return
+    with st.sidebar.expander("⏱ Rerun profiler"):
+        # Kept outside the widget's own state so pages without the panel don't reset it
+        st.session_state[_ENABLED_KEY] = st.toggle(
+            "Profile my reruns", value=st.session_state.get(_ENABLED_KEY, False),
+            help=f"Keeps the last {RING_SIZE} reruns of this session",
+        )
+        profiles = [p for p in _profiles() if p.total_ms is not None]
+        if not profiles:
+            st.caption("No profiled reruns yet; rerun a page with profiling on.")
+            return
+
+        st.caption("Run time per page")
+        st.dataframe(_page_summary(profiles).style.format("{:.1f}", subset=["p50 ms", "p95 ms", "max ms"]),
+                     use_container_width=True)
+
+        pages = list(dict.fromkeys(p.page for p in profiles))
+        page = st.selectbox("Page", pages, index=len(pages) - 1, key="profiler_page")
+        page_profiles = [p for p in profiles if p.page == page]
+        st.caption("Spans (p95 per rerun, share of total run time)")
+        st.dataframe(_span_summary(page_profiles).style.format({"p95 ms": "{:.1f}", "share": "{:.0%}"}),
+                     use_container_width=True)
+
+        labels = [f"{datetime.fromtimestamp(p.started_at):%H:%M:%S} · {p.total_ms:.0f} ms" for p in page_profiles]
+        chosen = st.selectbox("Rerun", range(len(page_profiles)), index=len(page_profiles) - 1,
+                              format_func=labels.__getitem__, key="profiler_rerun")
+        if page_profiles[chosen].spans:
+            st.altair_chart(_flame_chart(page_profiles[chosen]), use_container_width=True)
@@ -0,0 +1,84 @@
+"""Lazy imports for heavy modules (Week 9).
+
+Every Streamlit rerun executes the page script from the top, and the first
+run in a fresh worker pays for every module it imports. `lazy_import`
+returns a stand-in module that imports the real one on first attribute
+access, so a page can keep `pd = lazy_import("pandas")` at the top while
+the login form, which never touches pandas, stays fast:
+
+    pd = lazy_import("pandas")      # nothing imported yet
+    df = pd.DataFrame(rows)         # pandas is imported here, once
+
+Use `is_available` for optional dependencies: it checks that a module is
+installed without importing it.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any, List
+
+
+class LazyModule(ModuleType):
+    """Module stand-in that imports the real module on first use."""
+
+    def __init__(self, name: str):
+        """Initialize the stand-in.
+
+        Args:
+            name: Dotted module name, e.g. "pandas" or "pyarrow.parquet"
+        """
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        """Import the real module (once) and return it."""
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for attributes not set on the stand-in itself
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Get a module without importing it until it is used.
+
+    Args:
+        name: Dotted module name
+
+    Returns:
+        The module itself if it is already imported, otherwise a
+        LazyModule (a missing module raises ModuleNotFoundError on first
+        use, not here)
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def is_available(name: str) -> bool:
+    """Check whether a top-level module is installed, without importing it.
+
+    Args:
+        name: Top-level module name, e.g. "openai"
+
+    Returns:
+        True if the module can be imported
+    """
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
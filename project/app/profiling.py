@@ -0,0 +1,175 @@
+"""Span timing for page reruns (Week 9).
+
+A page script starts a RerunProfile at the top of a run and stops it at
+the end; in between, named spans (a `with span("load incidents"):` block
+or a function decorated with `@timed("data: load_csv")`) are recorded
+with their nesting depth and start/end offsets, which is enough for a
+flame-style breakdown of where the rerun went: auth check, data load,
+aggregation or rendering.
+
+The active profile lives in a context variable, so each Streamlit script
+thread records only its own run. When no profile is active (profiling
+disabled, or code running outside a page such as benchmarks and worker
+threads) `span` returns a shared no-op object and `timed` calls straight
+through: one context-variable lookup per call.
+"""
+
+import contextvars
+import functools
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+_current: contextvars.ContextVar = contextvars.ContextVar("rerun_profile", default=None)
+
+
+class RerunProfile:
+    """Spans recorded during one run of a page script."""
+
+    def __init__(self, page: str):
+        """Start an empty profile.
+
+        Args:
+            page: Page (or fragment) the run belongs to
+        """
+        self.page = page
+        self.started_at = time.time()
+        self.total_ms: Optional[float] = None
+        self.spans: List[Tuple[str, int, float, float]] = []  # (name, depth, start ms, end ms)
+        self._origin = time.perf_counter()
+        self._depth = 0
+
+    def finish(self) -> float:
+        """Stop the clock.
+
+        Returns:
+            Run time in milliseconds
+        """
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self._origin) * 1000
+        return self.total_ms
+
+    def span_totals(self) -> Dict[str, float]:
+        """Get the time spent in each span name (nested calls counted once)."""
+        totals: Dict[str, float] = {}
+        open_until: Dict[str, float] = {}
+        for name, _, start, end in sorted(self.spans, key=lambda s: (s[2], s[1])):
+            if start >= open_until.get(name, -1.0):
+                totals[name] = totals.get(name, 0.0) + end - start
+                open_until[name] = end
+        return totals
+
+    def unaccounted_ms(self) -> float:
+        """Get the run time not covered by any top-level span."""
+        covered = sum(end - start for _, depth, start, end in self.spans if depth == 0)
+        return max((self.total_ms or 0.0) - covered, 0.0)
+
+
+class _Span:
+    """A span being timed inside the active profile."""
+
+    __slots__ = ("name", "profile", "depth", "start")
+
+    def __init__(self, name: str, profile: RerunProfile):
+        self.name = name
+        self.profile = profile
+
+    def __enter__(self) -> "_Span":
+        self.depth = self.profile._depth
+        self.profile._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        end = time.perf_counter()
+        profile = self.profile
+        profile._depth -= 1
+        origin = profile._origin
+        profile.spans.append((self.name, self.depth, (self.start - origin) * 1000, (end - origin) * 1000))
+        return False
+
+
+class _NoSpan:
+    """Stand-in used when no profile is active."""
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Time a block as a span of the active profile.
+
+    Args:
+        name: Span name shown in the breakdown
+
+    Returns:
+        Context manager (a no-op when no profile is active)
+    """
+    profile = _current.get()
+    return _NO_SPAN if profile is None else _Span(name, profile)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Time every call of a function as a span of the active profile.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            with _Span(label, profile):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_profile(page: str) -> RerunProfile:
+    """Make a new profile active for the current script run (replacing any other)."""
+    profile = RerunProfile(page)
+    _current.set(profile)
+    return profile
+
+
+def stop_profile() -> Optional[RerunProfile]:
+    """Finish and deactivate the active profile.
+
+    Returns:
+        The finished profile, or None if none was active
+    """
+    profile = _current.get()
+    if profile is not None:
+        profile.finish()
+        _current.set(None)
+    return profile
+
+
+def current_profile() -> Optional[RerunProfile]:
+    """Get the active profile (None when profiling is off)."""
+    return _current.get()
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Get the q-th percentile (0-100) of values by the nearest-rank method.
+
+    Raises:
+        ValueError: If values is empty
+    """
+    if not values:
+        raise ValueError("No values")
+    ordered = sorted(values)
+    rank = max(int(-(-q * len(ordered) // 100)), 1)  # ceil(q / 100 * n)
+    return ordered[min(rank, len(ordered)) - 1]
@@ -0,0 +1,482 @@
+"""Correlation and group comparison engine for Custom Analysis (Week 8).
+
+Both analyses run over a source in row chunks converted to contiguous
+float64 matrices, so memory is bounded by the chunk size, not by the
+number of rows:
+
+- Pearson correlation accumulates pairwise sums, sums of squares and the
+  cross-product matrix (one BLAS matmul per chunk) over values shifted by
+  the first chunk's means, which keeps the one-pass formulas stable.
+  Missing values are handled pairwise.
+- Spearman correlation is Pearson over ranks. For an in-memory frame the
+  ranks are exact; for a chunked source a first pass builds a mergeable
+  quantile summary per column (one bulk sort per chunk) and the second
+  pass correlates ranks interpolated from it (approximate ranks, within
+  about 0.1% of the row count). Each column is ranked over all of its
+  present values, so with missing values the result differs slightly
+  from pandas, which re-ranks the complete rows of every pair.
+- Group comparison accumulates count, sum, sum of squares, min and max per
+  group and metric, then reports each group against the rest of the rows
+  (difference, Cohen's d, Welch's t).
+
+AnalysisService derives numeric metrics from the incidents and tickets
+datasets and caches every result per dataset version. Metric frames are
+saved with snapshots (app.services.snapshots) and restored at boot while
+their dataset is unchanged.
+"""
+
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+CORRELATION_METHODS = ["pearson", "spearman"]
+
+# Rows per chunk are chosen so one chunk's float matrix stays near this size
+CHUNK_BYTES = 64 * 1024 * 1024
+
+# A callable returning a fresh iterator of chunks (Spearman needs two passes)
+ChunkSource = Callable[[], Iterable[pd.DataFrame]]
+
+SEVERITY_SCORES = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+PRIORITY_SCORES = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+RESOLVED_STATUSES = ("Resolved", "Closed")
+
+
+def rows_per_chunk(n_columns: int, chunk_bytes: int = CHUNK_BYTES) -> int:
+    """Get how many rows of n float64 columns fit in chunk_bytes."""
+    return max(1_000, chunk_bytes // (8 * max(n_columns, 1)))
+
+
+def _chunks(source: Union[pd.DataFrame, ChunkSource], columns: List[str],
+            chunk_bytes: int) -> Iterable[pd.DataFrame]:
+    """Iterate over a frame in row slices, or over a chunk source."""
+    if isinstance(source, pd.DataFrame):
+        step = rows_per_chunk(len(columns), chunk_bytes)
+        return (source.iloc[start:start + step] for start in range(0, len(source), step))
+    return source()
+
+
+def _as_matrix(chunk: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """Convert chunk columns to a contiguous float64 matrix (NaN for missing)."""
+    return np.ascontiguousarray(chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+class _PairwiseMoments:
+    """Pairwise-complete sums needed for a correlation matrix."""
+
+    def __init__(self, k: int):
+        self.shift: Optional[np.ndarray] = None
+        self.n = np.zeros((k, k))
+        self.sums = np.zeros((k, k))      # [i, j]: sum of x_i where x_i and x_j are present
+        self.squares = np.zeros((k, k))   # [i, j]: sum of x_i² where both are present
+        self.products = np.zeros((k, k))  # [i, j]: sum of x_i·x_j where both are present
+
+    def update(self, values: np.ndarray) -> None:
+        """Fold one chunk (rows × k) into the sums."""
+        if len(values) == 0:
+            return
+        if self.shift is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if np.isnan(values).any() \
+                    else values.mean(axis=0)
+        values = values - self.shift
+        present = ~np.isnan(values)
+        if present.all():
+            self.n += len(values)
+            self.sums += values.sum(axis=0)[:, None]
+            self.squares += np.einsum("ij,ij->j", values, values)[:, None]
+            self.products += values.T @ values
+        else:
+            mask = present.astype(np.float64)
+            values = np.where(present, values, 0.0)
+            self.n += mask.T @ mask
+            self.sums += values.T @ mask
+            self.squares += (values * values).T @ mask
+            self.products += values.T @ values
+
+    def correlation(self) -> np.ndarray:
+        """Get the Pearson correlation matrix (NaN where undefined)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = self.products - self.sums * self.sums.T / self.n
+            var_i = self.squares - self.sums ** 2 / self.n
+            var_j = var_i.T
+            corr = covariance / np.sqrt(var_i * var_j)
+        corr[(self.n < 2) | (var_i <= 0) | (var_j <= 0)] = np.nan
+        np.fill_diagonal(corr, np.where(np.diag(self.n) >= 2, 1.0, np.nan))
+        return np.clip(corr, -1.0, 1.0)
+
+
+class _RankSummary:
+    """Mergeable per-column quantile summary used for approximate ranks.
+
+    Each chunk is sorted column-wise in one NumPy call and reduced to
+    `points` evenly spaced order statistics, each weighted by its share of
+    the chunk. Every `merge_every` chunks the stored summaries are merged
+    into one of `4 * points` points, so memory stays bounded.
+    """
+
+    def __init__(self, k: int, points: int = 512, merge_every: int = 16):
+        self.k = k
+        self.points = points
+        self.merge_every = merge_every
+        self.values: List[np.ndarray] = []   # k × m order statistics per entry
+        self.weights: List[np.ndarray] = []  # k × m weights per entry
+
+    def update(self, values: np.ndarray) -> None:
+        """Summarize one chunk (rows × k)."""
+        if len(values) == 0:
+            return
+        ordered = np.sort(values.T, axis=1)  # NaN sorts last
+        counts = (~np.isnan(ordered)).sum(axis=1)
+        # The middle element of each of `points` equal slices
+        positions = (np.arange(self.points) + 0.5)[None, :] * counts[:, None] / self.points - 0.5
+        positions = np.clip(np.round(positions), 0, None).astype(np.int64)
+        self.values.append(np.take_along_axis(ordered, positions, axis=1))
+        self.weights.append(np.repeat(counts[:, None] / self.points, self.points, axis=1))
+        if len(self.values) >= self.merge_every:
+            self._compact(4 * self.points)
+
+    def _merged(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get column i's distinct values and their total weights."""
+        values = np.concatenate([entry[i] for entry in self.values])
+        weights = np.concatenate([entry[i] for entry in self.weights])
+        keep = (weights > 0) & ~np.isnan(values)
+        values, weights = values[keep], weights[keep]
+        distinct, inverse = np.unique(values, return_inverse=True)
+        return distinct, np.bincount(inverse, weights=weights, minlength=len(distinct))
+
+    def _compact(self, size: int) -> None:
+        """Replace the stored entries with one summary of `size` points per column."""
+        values = np.full((self.k, size), np.nan)
+        weights = np.zeros((self.k, size))
+        for i in range(self.k):
+            distinct, totals = self._merged(i)
+            if len(distinct) == 0:
+                continue
+            cumulative = np.cumsum(totals)
+            targets = (np.arange(size) + 0.5) * cumulative[-1] / size
+            values[i] = distinct[np.minimum(np.searchsorted(cumulative, targets), len(distinct) - 1)]
+            weights[i] = cumulative[-1] / size
+        self.values, self.weights = [values], [weights]
+
+    def rank_tables(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Get per-column (value, mid-rank fraction) interpolation tables."""
+        tables = []
+        for i in range(self.k):
+            distinct, totals = self._merged(i)
+            cumulative = np.cumsum(totals)
+            # Tied values share the average of the ranks they span
+            mid_ranks = (cumulative - totals / 2) / cumulative[-1] if len(distinct) else cumulative
+            tables.append((distinct, mid_ranks))
+        return tables
+
+
+def correlation_matrix(source: Union[pd.DataFrame, ChunkSource], columns: List[str],
+                       method: str = "pearson", chunk_bytes: int = CHUNK_BYTES) -> pd.DataFrame:
+    """Compute a correlation matrix chunk by chunk.
+
+    Args:
+        source: DataFrame or callable returning an iterator of chunks
+        columns: Numeric columns to correlate
+        method: "pearson" or "spearman"
+        chunk_bytes: Target size of one chunk's float matrix
+
+    Returns:
+        Square DataFrame of correlations indexed by column
+
+    Raises:
+        ValueError: If the method is unknown or no columns are given
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method '{method}'")
+    if not columns:
+        raise ValueError("No columns to correlate")
+
+    moments = _PairwiseMoments(len(columns))
+    if method == "pearson":
+        for chunk in _chunks(source, columns, chunk_bytes):
+            moments.update(_as_matrix(chunk, columns))
+    elif isinstance(source, pd.DataFrame):
+        # Exact average ranks; NaN stays NaN and is skipped pairwise
+        ranks = source[columns].rank(method="average")
+        for chunk in _chunks(ranks, columns, chunk_bytes):
+            moments.update(_as_matrix(chunk, columns))
+    else:
+        summary = _RankSummary(len(columns))
+        for chunk in _chunks(source, columns, chunk_bytes):
+            summary.update(_as_matrix(chunk, columns))
+        tables = summary.rank_tables()
+        for chunk in _chunks(source, columns, chunk_bytes):
+            columns_first = np.ascontiguousarray(_as_matrix(chunk, columns).T)
+            # Interpolating sorted values is several times faster than
+            # random lookups; the ranks are scattered back afterwards
+            order = np.argsort(columns_first, axis=1)
+            ordered = np.take_along_axis(columns_first, order, axis=1)
+            for i, (distinct, mid_ranks) in enumerate(tables):
+                ordered[i] = np.interp(ordered[i], distinct, mid_ranks) if len(distinct) else np.nan
+            ranks = np.empty_like(columns_first)
+            np.put_along_axis(ranks, order, ordered, axis=1)
+            ranks[np.isnan(columns_first)] = np.nan
+            moments.update(ranks.T)
+
+    return pd.DataFrame(moments.correlation(), index=columns, columns=columns)
+
+
+def compare_groups(source: Union[pd.DataFrame, ChunkSource], by: str, metrics: List[str],
+                   chunk_bytes: int = CHUNK_BYTES) -> pd.DataFrame:
+    """Compare metric distributions between the groups of one column.
+
+    Args:
+        source: DataFrame or callable returning an iterator of chunks
+        by: Column whose values define the groups
+        metrics: Numeric columns to compare
+        chunk_bytes: Target size of one chunk's float matrix
+
+    Returns:
+        DataFrame indexed by (group, metric) with count, mean, std, min,
+        max, and versus the other groups: diff_vs_rest, cohens_d, welch_t
+
+    Raises:
+        ValueError: If no metrics are given
+    """
+    if not metrics:
+        raise ValueError("No metrics to compare")
+
+    shift: Optional[np.ndarray] = None
+    parts = []
+    for chunk in _chunks(source, metrics + [by], chunk_bytes):
+        if len(chunk) == 0:
+            continue
+        values = _as_matrix(chunk, metrics)
+        if shift is None:
+            with np.errstate(invalid="ignore"):
+                shift = np.nan_to_num(np.nanmean(values, axis=0))
+        shifted = pd.DataFrame(values - shift, columns=metrics, index=chunk.index)
+        groups = shifted.groupby(chunk[by].astype(str), sort=False)
+        parts.append(pd.concat({
+            "count": groups.count(),
+            "sum": groups.sum(),
+            "squares": (shifted ** 2).groupby(chunk[by].astype(str), sort=False).sum(),
+            "min": groups.min(),
+            "max": groups.max(),
+        }, axis=1))
+
+    if not parts:
+        return pd.DataFrame(columns=["count", "mean", "std", "min", "max", "diff_vs_rest", "cohens_d", "welch_t"])
+
+    combined = pd.concat(parts)
+    grouped = combined.groupby(level=0, sort=True)
+    summed, lowest, highest = grouped.sum(), grouped.min(), grouped.max()
+    totals = pd.concat(
+        [summed[["count", "sum", "squares"]], lowest[["min"]], highest[["max"]]], axis=1
+    ).stack(level=1, future_stack=True)
+    totals.index.names = [by, "metric"]
+
+    offsets = pd.Series(shift, index=metrics).reindex(totals.index.get_level_values("metric")).to_numpy()
+    n, s, q = totals["count"], totals["sum"], totals["squares"]
+    all_n = n.groupby(level="metric").transform("sum")
+    all_s = s.groupby(level="metric").transform("sum")
+    all_q = q.groupby(level="metric").transform("sum")
+    rest_n, rest_s, rest_q = all_n - n, all_s - s, all_q - q
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / n
+        var = (q - s ** 2 / n) / (n - 1)
+        rest_mean = rest_s / rest_n
+        rest_var = (rest_q - rest_s ** 2 / rest_n) / (rest_n - 1)
+        pooled = np.sqrt(((n - 1) * var + (rest_n - 1) * rest_var) / (n + rest_n - 2))
+        result = pd.DataFrame({
+            "count": n.astype(np.int64),
+            "mean": mean + offsets,
+            "std": np.sqrt(var.clip(lower=0)),
+            "min": totals["min"] + offsets,
+            "max": totals["max"] + offsets,
+            "diff_vs_rest": mean - rest_mean,
+            "cohens_d": (mean - rest_mean) / pooled,
+            "welch_t": (mean - rest_mean) / np.sqrt(var / n + rest_var / rest_n),
+        })
+    return result.replace([np.inf, -np.inf], np.nan)
+
+
+def incident_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Derive numeric metrics from cyber incidents (group columns are kept)."""
+    dates = pd.to_datetime(df["date"], errors="coerce")
+    metrics = pd.DataFrame({
+        "severity_score": df["severity"].map(SEVERITY_SCORES),
+        "resolved": df["status"].isin(RESOLVED_STATUSES).astype(float),
+        "hour": dates.dt.hour,
+        "weekday": dates.dt.weekday,
+        "description_length": df["description"].fillna("").str.len() if "description" in df else np.nan,
+    }, index=df.index)
+    for column in ("responded_at", "resolved_at"):
+        if column in df:
+            metrics[f"hours_to_{column[:-3]}"] = (
+                pd.to_datetime(df[column], errors="coerce") - dates
+            ).dt.total_seconds() / 3600
+    groups = [c for c in ("severity", "status", "incident_type", "reported_by") if c in df]
+    return pd.concat([df[groups], metrics.astype(np.float64)], axis=1)
+
+
+def ticket_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Derive numeric metrics from IT tickets (group columns are kept)."""
+    created = pd.to_datetime(df["created_date"], errors="coerce")
+    metrics = pd.DataFrame({
+        "priority_score": df["priority"].map(PRIORITY_SCORES),
+        "open": (df["status"] == "Open").astype(float),
+        "age_days": (pd.Timestamp.now().normalize() - created).dt.days,
+        "created_weekday": created.dt.weekday,
+        "title_length": df["title"].fillna("").str.len(),
+    }, index=df.index)
+    groups = [c for c in ("priority", "status", "assignee") if c in df]
+    return pd.concat([df[groups], metrics.astype(np.float64)], axis=1)
+
+
+METRIC_BUILDERS: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    "cyber_incidents": incident_metrics,
+    "it_tickets": ticket_metrics,
+}
+
+
+class AnalysisService:
+    """Correlations and group comparisons over the platform datasets.
+
+    Metric frames and results are cached per dataset version (see
+    DataService.source_fingerprint), so reruns with the same selection
+    are free and any change to the data recomputes them.
+    """
+
+    def __init__(self, data_service: Any, max_results: int = 64):
+        """Initialize the AnalysisService.
+
+        Args:
+            data_service: DataService used to load datasets
+            max_results: Results kept in the LRU cache
+        """
+        self.data_service = data_service
+        self.max_results = max_results
+        self._frames: Dict[str, Tuple[Tuple, pd.DataFrame]] = {}
+        self._results: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def metrics(self, dataset: str) -> pd.DataFrame:
+        """Get the metrics frame of a dataset for its current version.
+
+        Raises:
+            ValueError: If the dataset has no metric builder
+        """
+        if dataset not in METRIC_BUILDERS:
+            raise ValueError(f"No metrics defined for '{dataset}'")
+        with self._lock:
+            build_lock = self._build_locks.setdefault(dataset, threading.Lock())
+        # One build per dataset at a time: a concurrent caller (e.g. the
+        # first request during warm-up) waits for it instead of repeating it
+        with build_lock:
+            version = self.data_service.source_fingerprint(dataset)
+            cached = self._frames.get(dataset)
+            if cached is None or cached[0] != version:
+                frame = METRIC_BUILDERS[dataset](self.data_service.table(dataset).collect())
+                cached = (version, frame)
+                self._frames[dataset] = cached
+            return cached[1]
+
+    def save_snapshot(self, store: Any) -> List[str]:
+        """Write metric frames to a snapshot, skipping those unchanged since the last one.
+
+        Args:
+            store: SnapshotStore to write to
+
+        Returns:
+            Snapshot keys of the cached metric frames
+        """
+        keys = []
+        for dataset, (version, frame) in list(self._frames.items()):
+            key = f"metrics:{dataset}"
+            meta = {"rows": len(frame)}
+            if store.unchanged(key, version, meta) or store.save(key, version, frame=frame, meta=meta):
+                keys.append(key)
+        return keys
+
+    def restore_snapshot(self, store: Any) -> int:
+        """Load metric frames whose dataset is unchanged from a snapshot.
+
+        Args:
+            store: SnapshotStore to read from
+
+        Returns:
+            Number of metric frames restored
+        """
+        restored = 0
+        for dataset in METRIC_BUILDERS:
+            key = f"metrics:{dataset}"
+            if key not in store.keys(key):
+                continue
+            with self._lock:
+                build_lock = self._build_locks.setdefault(dataset, threading.Lock())
+            with build_lock:
+                if dataset in self._frames:
+                    continue
+                version = self.data_service.source_fingerprint(dataset)
+                entry = store.load(key, version)
+                if entry is not None and entry.frame is not None:
+                    self._frames[dataset] = (version, entry.frame)
+                    restored += 1
+        return restored
+
+    def metric_columns(self, dataset: str) -> List[str]:
+        """Get the numeric metrics of a dataset."""
+        return self.metrics(dataset).select_dtypes("number").columns.tolist()
+
+    def group_columns(self, dataset: str) -> List[str]:
+        """Get the columns a dataset can be grouped by."""
+        return self.metrics(dataset).select_dtypes(exclude="number").columns.tolist()
+
+    def _cached(self, key: Tuple, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Serve a result from the LRU cache or compute and store it."""
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._results[key]
+        result = compute()
+        with self._lock:
+            self.stats["misses"] += 1
+            self._results[key] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return result
+
+    def correlation(self, dataset: str, metrics: List[str], method: str = "pearson") -> pd.DataFrame:
+        """Get the correlation matrix of selected metrics (see `correlation_matrix`)."""
+        frame = self.metrics(dataset)
+        key = ("correlation", dataset, self._frames[dataset][0], tuple(metrics), method)
+        return self._cached(key, lambda: correlation_matrix(frame, list(metrics), method))
+
+    def compare(self, dataset: str, by: str, metrics: List[str]) -> pd.DataFrame:
+        """Compare metrics between the groups of a column (see `compare_groups`)."""
+        frame = self.metrics(dataset)
+        key = ("compare", dataset, self._frames[dataset][0], by, tuple(metrics))
+        return self._cached(key, lambda: compare_groups(frame, by, list(metrics)))
+
+
+_analysis_service: Optional[AnalysisService] = None
+_analysis_service_lock = threading.Lock()
+
+
+def get_analysis_service() -> AnalysisService:
+    """Get the AnalysisService instance.
+
+    Returns:
+        The AnalysisService singleton
+    """
+    global _analysis_service
+    with _analysis_service_lock:
+        if _analysis_service is None:
+            from app.services.data_service import get_data_service
+            _analysis_service = AnalysisService(get_data_service())
+        return _analysis_service
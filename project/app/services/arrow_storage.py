@@ -0,0 +1,149 @@
+"""Arrow-backed string storage for cached datasets (Week 8).
+
+Free-text columns such as incident descriptions and ticket titles take far
+less memory as `string[pyarrow]` than as Python `object` strings, and
+vectorized string methods like `str.contains` run in Arrow compute kernels.
+Arrow-backed frames also hand their buffers to Feather/Parquet writers
+without conversion.
+
+pyarrow is optional: without it every helper keeps the object-dtype path.
+"""
+
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from app.lazy_imports import lazy_import
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# The file formats are only needed to read or write a cache file
+feather = lazy_import("pyarrow.feather")
+parquet = lazy_import("pyarrow.parquet")
+
+ARROW_STRING = "string[pyarrow]"
+
+
+def to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert object columns holding strings to `string[pyarrow]`.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        The converted DataFrame (unchanged if pyarrow is missing)
+    """
+    if not HAS_PYARROW:
+        return df
+
+    conversions = {
+        column: ARROW_STRING
+        for column in df.select_dtypes(include=["object"]).columns
+        if pd.api.types.infer_dtype(df[column], skipna=True) == "string"
+    }
+    return df.astype(conversions) if conversions else df
+
+
+def match_string_dtypes(new_rows: pd.DataFrame, like: pd.DataFrame) -> pd.DataFrame:
+    """Cast new rows' string columns to the dtypes used by an existing frame.
+
+    Keeps Arrow-backed columns Arrow-backed when rows are appended.
+    """
+    conversions = {
+        column: dtype for column, dtype in like.dtypes.items()
+        if isinstance(dtype, pd.StringDtype) and column in new_rows.columns
+    }
+    return new_rows.astype(conversions) if conversions else new_rows
+
+
+def _arrow_table(df: pd.DataFrame, metadata: Optional[Dict[str, str]] = None) -> "pa.Table":
+    """Get an Arrow table sharing the frame's Arrow buffers."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        merged = dict(table.schema.metadata or {})
+        merged.update({key.encode(): value.encode() for key, value in metadata.items()})
+        table = table.replace_schema_metadata(merged)
+    return table
+
+
+def write_frame(df: pd.DataFrame, path: Union[str, Path], metadata: Optional[Dict[str, str]] = None) -> None:
+    """Write a frame to Feather (.feather) or Parquet (.parquet).
+
+    Arrow-backed columns are handed over without copying into Python
+    objects.
+
+    Args:
+        df: DataFrame to write
+        path: Destination file; the suffix picks the format
+        metadata: Extra string key/values stored in the file schema
+
+    Raises:
+        ImportError: If pyarrow is not installed
+        ValueError: If the suffix is not .feather or .parquet
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for Feather/Parquet files")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = _arrow_table(df, metadata)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    if path.suffix == ".feather":
+        feather.write_feather(table, tmp, compression="lz4")
+    elif path.suffix == ".parquet":
+        parquet.write_table(table, tmp)
+    else:
+        raise ValueError(f"Unsupported file type '{path.suffix}'")
+    tmp.replace(path)
+
+
+def read_frame(path: Union[str, Path], arrow_strings: bool = True) -> pd.DataFrame:
+    """Read a Feather or Parquet file written by `write_frame`.
+
+    Args:
+        path: File to read
+        arrow_strings: Keep string columns Arrow-backed
+
+    Returns:
+        The DataFrame
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for Feather/Parquet files")
+
+    table = read_table(path)
+    mapper = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}.get
+    return table.to_pandas(types_mapper=mapper if arrow_strings else None)
+
+
+def read_table(path: Union[str, Path]) -> "pa.Table":
+    """Read a Feather or Parquet file as an Arrow table."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return parquet.read_table(path)
+    return feather.read_table(path)
+
+
+def read_metadata(path: Union[str, Path]) -> Dict[str, str]:
+    """Read the string metadata stored by `write_frame`.
+
+    Returns:
+        Metadata dictionary (empty if the file can't be read)
+    """
+    if not HAS_PYARROW:
+        return {}
+    try:
+        path = Path(path)
+        if path.suffix == ".parquet":
+            schema = parquet.read_schema(path)
+        else:
+            schema = feather.read_table(path, columns=[]).schema
+        return {key.decode(): value.decode() for key, value in (schema.metadata or {}).items()}
+    except (OSError, pa.ArrowInvalid):
+        return {}
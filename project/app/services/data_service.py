@@ -4,10 +4,40 @@ This module handles data loading and processing for analytics.
 References Week 8 data management patterns.
 """
 
+import sqlite3
 import pandas as pd
 import numpy as np
+from contextlib import closing
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Any, Optional, Dict, List
+
+from app.lazy_imports import lazy_import
+from app.services.indexing import ColumnIndex, build_indexes, intersect_positions
+from app.services.query import Query
+from app.services.rollups import TimeRollup
+from app.services.sketches import HyperLogLog
+from app.services.stats import IncrementalStats, summarize_columns
+from app.profiling import timed
+
+# Loaded on first use: Arrow storage pulls in pyarrow.parquet/feather and
+# parallel pulls in multiprocessing, which pages showing KPIs never need
+arrow_storage = lazy_import("app.services.arrow_storage")
+exports = lazy_import("app.services.exports")
+pagination = lazy_import("app.services.pagination")
+parallel = lazy_import("app.services.parallel")
+streaming = lazy_import("app.services.streaming")
+tailing = lazy_import("app.services.tailing")
+
+if TYPE_CHECKING:
+    from app.services.exports import ExportResult
+    from app.services.pagination import PageSource
+    from app.services.streaming import Aggregation, StreamingPipeline
+    from app.services.tailing import TailState
+
+# Resolved from this file so pages work from any working directory
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_DIR / "DATA"
+DB_PATH = PROJECT_DIR.parent / "Week_08_Lab" / "DATA" / "intelligence_platform.db"
 
 
 class DataService:
@@ -18,15 +48,35 @@ class DataService:
     
     def __init__(self):
         """Initialize the DataService."""
-        self.data_dir = Path("project/DATA")
+        self.data_dir = DATA_DIR
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self._cache = {}
+        self._indexes: Dict[str, Dict[str, ColumnIndex]] = {}
+        self._index_hits = 0
+        self._index_misses = 0
+        self._running_stats: Dict[str, IncrementalStats] = {}
+        self._sketches: Dict[str, Dict[str, bytes]] = {}
+        self._rollups: Dict[str, TimeRollup] = {}
+        self._tail_states: Dict[str, "TailState"] = {}
+        self._frame_fingerprints: Dict[str, tuple] = {}
+        self._page_sources: Dict[str, "PageSource"] = {}
+        self.arrow_strings = False
+        self.db_path = DB_PATH
     
-    def load_csv(self, filename: str) -> Optional[pd.DataFrame]:
+    @timed("data: load_csv")
+    def load_csv(self, filename: str, index_columns: Optional[List[str]] = None,
+                 arrow_strings: Optional[bool] = None) -> Optional[pd.DataFrame]:
         """Load a CSV file into a DataFrame.
         
+        With Arrow strings enabled (and pyarrow installed) text columns are
+        stored as `string[pyarrow]`, and a Feather copy of the frame is kept
+        under DATA/.cache so later loads of the unchanged file skip CSV
+        parsing entirely.
+        
         Args:
             filename: Name of CSV file in DATA folder
+            index_columns: Columns to build secondary indexes on (optional)
+            arrow_strings: Use Arrow-backed strings (default: self.arrow_strings)
             
         Returns:
             DataFrame if successful, None otherwise
@@ -40,14 +90,548 @@ class DataService:
         if not filepath.exists():
             raise FileNotFoundError(f"File not found: {filepath}")
         
+        use_arrow = (self.arrow_strings if arrow_strings is None else arrow_strings) and arrow_storage.HAS_PYARROW
+        
         try:
-            df = pd.read_csv(filepath)
-            self._cache[filename] = df
-            return df
+            size = filepath.stat().st_size
+            if use_arrow:
+                df = self._load_arrow(filename)
+            else:
+                df = pd.read_csv(filepath)
+            self._cache_frame(filename, df, size)
         except pd.errors.ParserError as e:
             raise ValueError(f"Invalid CSV format: {e}")
         except Exception as e:
             raise Exception(f"Error loading CSV: {e}")
+        
+        if index_columns:
+            self.build_index(filename, index_columns)
+        return df
+    
+    def _frame_cache_path(self, filename: str) -> Path:
+        """Get where the Feather copy of a dataset is kept."""
+        return self.data_dir / ".cache" / f"{filename}.feather"
+    
+    def _load_arrow(self, filename: str) -> pd.DataFrame:
+        """Load a CSV with Arrow strings, via its Feather copy when fresh."""
+        fingerprint = str(self._fingerprint(filename))
+        cache_path = self._frame_cache_path(filename)
+        if cache_path.exists() and arrow_storage.read_metadata(cache_path).get("source_fingerprint") == fingerprint:
+            return arrow_storage.read_frame(cache_path)
+        
+        df = arrow_storage.to_arrow_strings(pd.read_csv(self.data_dir / filename))
+        arrow_storage.write_frame(df, cache_path, metadata={"source_fingerprint": fingerprint})
+        return df
+    
+    def export_cached(self, filename: str, path: Path) -> Path:
+        """Write a cached dataset to a Feather or Parquet file.
+        
+        Arrow-backed columns are handed to the writer without conversion.
+        
+        Args:
+            filename: Name of the cached file
+            path: Destination ending in .feather or .parquet
+            
+        Returns:
+            The written path
+            
+        Raises:
+            ValueError: If the dataset isn't cached or the suffix is unsupported
+            ImportError: If pyarrow is not installed
+        """
+        df = self._cache.get(filename)
+        if df is None:
+            raise ValueError(f"Dataset '{filename}' is not cached")
+        arrow_storage.write_frame(df, path)
+        return Path(path)
+    
+    @timed("data: export")
+    def export(self, name: str, fmt: str = "csv", chunksize: int = 100_000) -> "ExportResult":
+        """Stream a dataset into a compressed export file.
+        
+        The source is the cached frame if `name` is cached, otherwise the
+        database table or the CSV file in DATA, read chunk by chunk.
+        
+        Args:
+            name: Cached filename, table name or CSV filename
+            fmt: Export format (see exports.EXPORT_FORMATS)
+            chunksize: Rows encoded per chunk
+            
+        Returns:
+            ExportResult holding the spooled file and throughput figures
+            
+        Raises:
+            FileNotFoundError: If no cached frame, table or CSV matches
+            ValueError: If the format is unknown
+        """
+        if name in self._cache:
+            chunks = exports.frame_chunks(self._cache[name], chunksize)
+        elif self.table(name).is_sql:
+            chunks = exports.table_chunks(self.db_path, name, chunksize)
+        else:
+            filename = name if name.endswith(".csv") else f"{name}.csv"
+            chunks = exports.csv_chunks(self.data_dir / filename, chunksize)
+        return exports.export_chunks(chunks, fmt)
+    
+    def page_source(self, name: str) -> "PageSource":
+        """Get a paginated source for a dataset, shared by all sessions.
+        
+        Database tables are paged with keyset SQL queries; cached frames and
+        CSV files are paged in memory (sort orders are cached with the
+        source until the dataset is invalidated).
+        
+        Args:
+            name: Cached filename, table name or CSV filename
+            
+        Returns:
+            PageSource for the dataset
+            
+        Raises:
+            FileNotFoundError: If no cached frame, table or CSV matches
+        """
+        source = self._page_sources.get(name)
+        if isinstance(source, pagination.FramePageSource) and source.df is not self._cache.get(name, source.df):
+            source = None
+        if source is None:
+            if name not in self._cache and self.table(name).is_sql:
+                source = pagination.SqlPageSource(self.db_path, name)
+            else:
+                filename = name if name in self._cache or name.endswith(".csv") else f"{name}.csv"
+                df = self._cache[filename] if filename in self._cache else self.load_csv(filename)
+                source = pagination.FramePageSource(df)
+            self._page_sources[name] = source
+        return source
+    
+    def _expand(self, patterns: List[str]) -> List[str]:
+        """Expand glob patterns into filenames relative to the DATA folder."""
+        filenames = []
+        for pattern in patterns:
+            if any(ch in pattern for ch in "*?["):
+                matches = sorted(self.data_dir.glob(pattern))
+                filenames.extend(path.relative_to(self.data_dir).as_posix() for path in matches)
+            else:
+                filenames.append(pattern)
+        return list(dict.fromkeys(filenames))
+    
+    @timed("data: load_many")
+    def load_many(self, filenames: List[str], workers: Optional[int] = None,
+                  use_processes: bool = False) -> Dict[str, pd.DataFrame]:
+        """Load several CSV files concurrently and cache each of them.
+        
+        Args:
+            filenames: Names or glob patterns (e.g. "shards/incidents_*.csv")
+            workers: Number of parallel parsers (default: CPU count, max 8)
+            use_processes: Parse in a process pool instead of threads
+            
+        Returns:
+            Dictionary of filename to DataFrame
+            
+        Raises:
+            FileNotFoundError: If a file doesn't exist
+            ValueError: If a file is not a valid CSV
+        """
+        filenames = self._expand(filenames)
+        paths = [self.data_dir / filename for filename in filenames]
+        for filepath in paths:
+            if not filepath.exists():
+                raise FileNotFoundError(f"File not found: {filepath}")
+        if not paths:
+            return {}
+        
+        sizes = [filepath.stat().st_size for filepath in paths]
+        workers = min(workers or parallel.default_workers(), len(paths))
+        with parallel.make_executor(workers, use_processes) as executor:
+            frames = list(executor.map(parallel.read_csv_file, paths))
+        
+        loaded = {}
+        for filename, df, size in zip(filenames, frames, sizes):
+            if self.arrow_strings:
+                df = arrow_storage.to_arrow_strings(df)
+            self._cache_frame(filename, df, size)
+            loaded[filename] = df
+        return loaded
+    
+    @timed("data: aggregate_glob")
+    def aggregate_glob(self, pattern: str, workers: Optional[int] = None,
+                       use_processes: bool = False, chunksize: int = 100_000,
+                       **aggregations: "Aggregation") -> Dict:
+        """Aggregate every file matching a glob pattern in parallel.
+        
+        Each file is streamed into its own copy of the aggregations and the
+        per-file partials are merged pairwise in the same pool, so e.g. a
+        group-by over monthly shards never loads a shard fully.
+        
+        Args:
+            pattern: Glob relative to the DATA folder (e.g. "incidents_*.csv")
+            workers: Number of parallel workers (default: CPU count, max 8)
+            use_processes: Use a process pool instead of threads
+            chunksize: Rows parsed per chunk
+            **aggregations: Name=Aggregation pairs used as templates
+            
+        Returns:
+            Dictionary of name to aggregated result
+            
+        Raises:
+            FileNotFoundError: If no file matches the pattern
+        """
+        paths = sorted(self.data_dir.glob(pattern))
+        if not paths:
+            raise FileNotFoundError(f"No files match: {self.data_dir / pattern}")
+        
+        pipelines = [streaming.StreamingPipeline(path, chunksize=chunksize) for path in paths]
+        templates = [
+            {name: agg.empty_copy() for name, agg in aggregations.items()}
+            for _ in paths
+        ]
+        
+        workers = min(workers or parallel.default_workers(), len(paths))
+        with parallel.make_executor(workers, use_processes) as executor:
+            partials = list(executor.map(parallel.aggregate_file, pipelines, templates))
+            merged = parallel.tree_reduce(executor, partials)
+        
+        return {name: agg.result() for name, agg in merged.items()}
+    
+    def table(self, name: str) -> Query:
+        """Start a lazy query over a database table or CSV dataset.
+        
+        Names ending in ".csv" always refer to files in the DATA folder.
+        Other names are looked up as tables in the Week 8 SQLite database
+        (queries are pushed down as SQL) and fall back to "<name>.csv".
+        
+        Args:
+            name: Table name or CSV filename
+            
+        Returns:
+            Query that runs on `.collect()`
+            
+        Raises:
+            FileNotFoundError: If neither a table nor a CSV file exists
+        """
+        if not name.endswith(".csv") and self.db_path.exists():
+            with closing(sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)) as conn:
+                found = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+                ).fetchone()
+            if found:
+                return Query(self, name, db_path=self.db_path)
+        
+        filename = name if name.endswith(".csv") else f"{name}.csv"
+        if filename not in self._cache and not (self.data_dir / filename).exists():
+            raise FileNotFoundError(f"No table or CSV named '{name}'")
+        return Query(self, filename)
+    
+    def _cache_frame(self, filename: str, df: pd.DataFrame, size: int) -> None:
+        """Replace a cache entry and remember how far into the file it goes.
+        
+        Args:
+            filename: Name of CSV file in DATA folder
+            df: Freshly parsed frame
+            size: File size observed before parsing
+        """
+        self.invalidate(filename)
+        self._cache[filename] = df
+        
+        filepath = self.data_dir / filename
+        if filepath.stat().st_size == size:
+            self._frame_fingerprints[filename] = self._fingerprint(filename)
+            state = tailing.TailState.capture(filepath, size, len(df))
+            if state is not None:
+                self._tail_states[filename] = state
+    
+    @timed("data: refresh_csv")
+    def refresh_csv(self, filename: str) -> pd.DataFrame:
+        """Bring a cached CSV up to date by parsing only appended bytes.
+        
+        New rows are appended to the cached frame and folded into its
+        indexes, running statistics, distinct-count sketches and rollups.
+        Falls back to a full reload when the file was rewritten or
+        truncated, or was never loaded.
+        
+        Args:
+            filename: Name of CSV file in DATA folder
+            
+        Returns:
+            The rows added to the cache by this refresh
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If file is not a valid CSV
+        """
+        filepath = self.data_dir / filename
+        if not filepath.exists():
+            raise FileNotFoundError(f"File not found: {filepath}")
+        
+        state = self._tail_states.get(filename)
+        df = self._cache.get(filename)
+        if df is None or state is None or state.rows != len(df) or state.is_rewritten(filepath):
+            return self._reload_all(filename)
+        
+        if filepath.stat().st_size == state.offset:
+            return df.iloc[0:0]
+        
+        new_rows = state.read_appended(filepath)
+        if not new_rows.empty:
+            self._append_rows(filename, new_rows)
+        return new_rows
+    
+    def _reload_all(self, filename: str) -> pd.DataFrame:
+        """Fully reload a file, keeping the indexes it had."""
+        index_columns = list(self._indexes.get(filename, {}))
+        return self.load_csv(filename, index_columns=index_columns or None)
+    
+    def _append_rows(self, filename: str, new_rows: pd.DataFrame) -> None:
+        """Append rows to a cached frame and everything derived from it."""
+        df = self._cache[filename]
+        start = len(df)
+        new_rows = arrow_storage.match_string_dtypes(new_rows, df)
+        self._cache[filename] = pd.concat([df, new_rows])
+        
+        for column, index in self._indexes.get(filename, {}).items():
+            index.append(new_rows[column], start)
+        
+        if filename in self._running_stats:
+            self.update_running_stats(filename, new_rows)
+        else:
+            self._fold_into_sketches(filename, new_rows)
+        
+        fingerprint = self._fingerprint(filename)
+        state = self._tail_states.get(filename)
+        if fingerprint is not None and state is not None and fingerprint[0] == state.offset:
+            self._frame_fingerprints[filename] = fingerprint
+        else:
+            self._frame_fingerprints.pop(filename, None)
+        
+        if filename in self._rollups:
+            self.update_rollup(filename, new_rows)
+    
+    def stream_csv(self, filename: str, chunksize: int = 100_000) -> "StreamingPipeline":
+        """Open a CSV file in out-of-core streaming mode.
+        
+        Nothing is read until the pipeline is run, and the file is never
+        materialized or cached as a whole.
+        
+        Args:
+            filename: Name of CSV file in DATA folder
+            chunksize: Rows parsed per chunk
+            
+        Returns:
+            StreamingPipeline over the file
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        return streaming.StreamingPipeline(self.data_dir / filename, chunksize=chunksize)
+    
+    @timed("data: build_index")
+    def build_index(self, filename: str, columns: List[str]) -> None:
+        """Build secondary indexes on columns of a cached dataset.
+        
+        Equality filters on indexed columns are then answered from the
+        index by `filter_data` instead of scanning the column.
+        
+        Args:
+            filename: Name of the cached file
+            columns: Columns to index
+            
+        Raises:
+            ValueError: If the dataset isn't cached or a column doesn't exist
+        """
+        df = self._cache.get(filename)
+        if df is None:
+            raise ValueError(f"Dataset '{filename}' is not cached")
+        
+        self._indexes.setdefault(filename, {}).update(build_indexes(df, columns))
+    
+    def get_indexes(self, filename: str) -> Dict[str, ColumnIndex]:
+        """Get the secondary indexes built for a cached dataset.
+        
+        Args:
+            filename: Name of the cached file
+            
+        Returns:
+            Dictionary of column name to ColumnIndex (empty if none)
+        """
+        return self._indexes.get(filename, {})
+    
+    def invalidate(self, filename: Optional[str] = None) -> None:
+        """Drop a cached dataset together with its indexes.
+        
+        Args:
+            filename: Name of the cached file (all datasets if omitted)
+        """
+        if filename is None:
+            self._cache.clear()
+            self._indexes.clear()
+            self._running_stats.clear()
+            self._sketches.clear()
+            self._rollups.clear()
+            self._tail_states.clear()
+            self._frame_fingerprints.clear()
+            self._page_sources.clear()
+        else:
+            self._cache.pop(filename, None)
+            self._indexes.pop(filename, None)
+            self._running_stats.pop(filename, None)
+            self._sketches.pop(filename, None)
+            self._rollups.pop(filename, None)
+            self._tail_states.pop(filename, None)
+            self._frame_fingerprints.pop(filename, None)
+            self._page_sources.pop(filename, None)
+    
+    def get_cache_stats(self) -> Dict:
+        """Get size and index information for cached datasets.
+        
+        Returns:
+            Dictionary with per-dataset stats and index hit/miss counters
+        """
+        datasets = {}
+        for filename, df in self._cache.items():
+            indexes = self._indexes.get(filename, {})
+            datasets[filename] = {
+                'rows': len(df),
+                'bytes': int(df.memory_usage(deep=True).sum()),
+                'indexes': {
+                    column: {
+                        'distinct': index.distinct_count(),
+                        'bytes': index.nbytes()
+                    }
+                    for column, index in indexes.items()
+                },
+                'sketch_bytes': sum(len(blob) for blob in self._sketches.get(filename, {}).values())
+            }
+        
+        return {
+            'datasets': datasets,
+            'index_hits': self._index_hits,
+            'index_misses': self._index_misses
+        }
+    
+    def _cached_name(self, df: pd.DataFrame) -> Optional[str]:
+        """Get the cache key of a cached DataFrame, if it is one."""
+        for filename, cached in self._cache.items():
+            if cached is df:
+                return filename
+        return None
+    
+    def _indexes_for(self, df: pd.DataFrame) -> Dict[str, ColumnIndex]:
+        """Get the indexes belonging to a cached DataFrame, if any."""
+        filename = self._cached_name(df)
+        return self._indexes.get(filename, {}) if filename else {}
+    
+    def _fingerprint(self, filename: str) -> Optional[tuple]:
+        """Get (size, mtime) of a DATA file, or None if it doesn't exist."""
+        filepath = self.data_dir / filename
+        if not filepath.exists():
+            return None
+        stat = filepath.stat()
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    @timed("data: source_fingerprint")
+    def source_fingerprint(self, name: str) -> tuple:
+        """Get a cheap summary of a table or CSV that changes whenever it does.
+        
+        For a database table this is ("sql", row count, max id, stat of the
+        database and WAL files); for a CSV ("csv", size, mtime).
+        
+        Args:
+            name: Table name or CSV filename
+            
+        Returns:
+            Fingerprint tuple
+        """
+        query = self.table(name)
+        if query.is_sql:
+            row = query.agg(rows="count", last_id=("id", "max")).collect()
+            wal_path = self.db_path.with_name(self.db_path.name + "-wal")
+            files = tuple(
+                (p.stat().st_size, p.stat().st_mtime_ns) for p in (self.db_path, wal_path) if p.exists()
+            )
+            return ("sql", int(row["rows"][0]), row["last_id"][0], files)
+        filename = name if name.endswith(".csv") else f"{name}.csv"
+        return ("csv",) + tuple(self._fingerprint(filename) or ())
+    
+    def _rollup_path(self, filename: str) -> Path:
+        """Get where a dataset's rollup is persisted."""
+        return self.data_dir / ".rollups" / f"{filename}.rollup"
+    
+    @timed("data: get_rollup")
+    def get_rollup(self, filename: str, time_column: str = "date",
+                   dimensions: tuple = ("severity", "status")) -> TimeRollup:
+        """Get minute/hour/day count rollups for a dataset.
+        
+        A rollup persisted by an earlier run is reused when the source file
+        is unchanged; otherwise it is rebuilt from the data and saved. A
+        rollup built from the cached frame is stamped with the file state
+        that frame was read at (none if it is not known to match the file),
+        so a frame that misses appended rows can't pass for current later.
+        
+        Args:
+            filename: Name of CSV file in DATA folder
+            time_column: Column holding event timestamps
+            dimensions: Columns to break counts down by
+            
+        Returns:
+            TimeRollup for the dataset
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If a column doesn't exist
+        """
+        dimensions = tuple(dimensions)
+        rollup = self._rollups.get(filename)
+        if rollup is not None and (rollup.time_column, rollup.dimensions) == (time_column, dimensions):
+            return rollup
+        
+        rollup = self._load_rollup(filename, time_column, dimensions)
+        if rollup is not None:
+            self._rollups[filename] = rollup
+            return rollup
+        
+        df = self._cache.get(filename)
+        if df is None:
+            df = self.load_csv(filename)
+        
+        rollup = TimeRollup(time_column, dimensions)
+        rollup.update(df)
+        rollup.source_fingerprint = self._frame_fingerprints.get(filename)
+        if rollup.source_fingerprint is not None:
+            rollup.save(self._rollup_path(filename))
+        self._rollups[filename] = rollup
+        return rollup
+    
+    def _load_rollup(self, filename: str, time_column: str, dimensions: tuple) -> Optional[TimeRollup]:
+        """Load a persisted rollup if it matches the file and settings."""
+        path = self._rollup_path(filename)
+        if not path.exists():
+            return None
+        try:
+            rollup = TimeRollup.load(path)
+        except (ValueError, OSError):
+            return None
+        expected = (self._fingerprint(filename), time_column, tuple(dimensions))
+        return rollup if (rollup.source_fingerprint, rollup.time_column, rollup.dimensions) == expected else None
+    
+    def update_rollup(self, filename: str, new_rows: pd.DataFrame) -> TimeRollup:
+        """Fold rows appended to the cached frame into its rollup and persist it.
+        
+        Without a rollup in memory one is built (or loaded) instead; it is
+        built from the cached frame, which already holds `new_rows`.
+        
+        Args:
+            filename: Name of CSV file in DATA folder
+            new_rows: Rows appended to the cached frame since the rollup was built
+            
+        Returns:
+            The updated TimeRollup
+        """
+        rollup = self._rollups.get(filename)
+        if rollup is None:
+            return self.get_rollup(filename)
+        rollup.update(new_rows)
+        rollup.source_fingerprint = self._frame_fingerprints.get(filename)
+        if rollup.source_fingerprint is not None:
+            rollup.save(self._rollup_path(filename))
+        return rollup
     
     def get_cached_data(self, filename: str) -> Optional[pd.DataFrame]:
         """Get cached data if available.
@@ -60,6 +644,7 @@ class DataService:
         """
         return self._cache.get(filename)
     
+    @timed("data: filter_data")
     def filter_data(self, df: pd.DataFrame, **filters) -> pd.DataFrame:
         """Filter DataFrame based on column criteria.
         
@@ -76,46 +661,273 @@ class DataService:
         if df is None or df.empty:
             raise ValueError("DataFrame is None or empty")
         
-        result = df.copy()
+        for column in filters:
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found in DataFrame")
+        
+        # Resolve indexed columns through position set intersection
+        indexes = self._indexes_for(df)
+        indexed = [column for column in filters if column in indexes]
+        if indexed:
+            self._index_hits += 1
+            positions = intersect_positions(
+                [indexes[column].lookup(filters[column]) for column in indexed]
+            )
+            result = df.iloc[positions].copy()
+        else:
+            if indexes:
+                self._index_misses += 1
+            result = df.copy()
         
         for column, value in filters.items():
-            if column not in result.columns:
-                raise ValueError(f"Column '{column}' not found in DataFrame")
-            result = result[result[column] == value]
+            if column not in indexed:
+                result = result[result[column] == value]
         
         return result
     
-    def get_summary_stats(self, df: pd.DataFrame, numeric_cols: Optional[List[str]] = None) -> Dict:
+    @timed("data: summary_stats")
+    def get_summary_stats(self, df: pd.DataFrame, numeric_cols: Optional[List[str]] = None,
+                          engine: str = "exact") -> Dict:
         """Get summary statistics for numeric columns.
         
+        The "approx" engine takes medians from TDigest sketches; for cached
+        datasets the sketches are kept with the cache entry, so reruns cost
+        no scan at all (see app/services/sketches.py for error bounds).
+        
         Args:
             df: DataFrame to analyze
             numeric_cols: Specific columns to analyze (optional)
+            engine: "exact" or "approx"
             
         Returns:
             Dictionary of statistics
             
         Raises:
-            ValueError: If DataFrame is empty
+            ValueError: If DataFrame is empty or the engine is unknown
         """
         if df is None or df.empty:
             raise ValueError("DataFrame is empty")
+        if engine not in ("exact", "approx"):
+            raise ValueError(f"Unknown stats engine '{engine}'")
         
         if numeric_cols is None:
             numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        columns = [col for col in numeric_cols if col in df.columns]
+        
+        if engine == "exact":
+            return summarize_columns(df, columns)
         
-        stats = {}
-        for col in numeric_cols:
-            if col in df.columns:
-                stats[col] = {
-                    'mean': df[col].mean(),
-                    'median': df[col].median(),
-                    'std': df[col].std(),
-                    'min': df[col].min(),
-                    'max': df[col].max()
-                }
+        filename = self._cached_name(df)
+        if filename is not None:
+            stats = self.get_running_stats(filename)
+            if all(col in stats.columns for col in columns):
+                return stats.summary(columns)
+        
+        stats = IncrementalStats(columns)
+        stats.update(df)
+        return stats.summary()
+    
+    def count_distinct(self, df: pd.DataFrame, columns: List[str], engine: str = "exact") -> Dict[str, int]:
+        """Count distinct values per column (e.g. unique analysts or sources).
+        
+        The "approx" engine uses HyperLogLog sketches (about 0.8% relative
+        error); for cached datasets the serialized sketches are stored with
+        the cache entry and reused on later calls.
+        
+        Args:
+            df: DataFrame to analyze
+            columns: Columns to count
+            engine: "exact" or "approx"
+            
+        Returns:
+            Dictionary of column name to distinct count
+            
+        Raises:
+            ValueError: If a column doesn't exist or the engine is unknown
+        """
+        if engine not in ("exact", "approx"):
+            raise ValueError(f"Unknown stats engine '{engine}'")
+        for column in columns:
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found in DataFrame")
+        
+        if engine == "exact":
+            return {column: int(df[column].nunique()) for column in columns}
+        
+        filename = self._cached_name(df)
+        blobs = self._sketches.setdefault(filename, {}) if filename else {}
+        counts = {}
+        for column in columns:
+            if column in blobs:
+                sketch = HyperLogLog.from_bytes(blobs[column])
+            else:
+                sketch = HyperLogLog()
+                sketch.update(df[column])
+                blobs[column] = sketch.to_bytes()
+            counts[column] = sketch.count()
+        return counts
+    
+    def get_running_stats(self, filename: str) -> IncrementalStats:
+        """Get incremental statistics for a cached dataset.
+        
+        The statistics are built once from the cached frame and afterwards
+        only updated with new rows via `update_running_stats`.
+        
+        Args:
+            filename: Name of the cached file
+            
+        Returns:
+            IncrementalStats over the dataset's numeric columns
+            
+        Raises:
+            ValueError: If the dataset isn't cached
+        """
+        stats = self._running_stats.get(filename)
+        if stats is None:
+            df = self._cache.get(filename)
+            if df is None:
+                raise ValueError(f"Dataset '{filename}' is not cached")
+            
+            stats = IncrementalStats(df.select_dtypes(include=[np.number]).columns.tolist())
+            stats.update(df)
+            self._running_stats[filename] = stats
         
         return stats
+    
+    def update_running_stats(self, filename: str, new_rows: pd.DataFrame) -> Dict:
+        """Fold newly appended rows into a dataset's running statistics.
+        
+        Args:
+            filename: Name of the cached file
+            new_rows: Rows appended since the last update
+            
+        Returns:
+            Updated dictionary of statistics
+        """
+        stats = self.get_running_stats(filename)
+        stats.update(new_rows)
+        self._fold_into_sketches(filename, new_rows)
+        return stats.summary()
+    
+    def _fold_into_sketches(self, filename: str, new_rows: pd.DataFrame) -> None:
+        """Update a dataset's stored distinct-count sketches with new rows."""
+        blobs = self._sketches.get(filename, {})
+        for column, blob in blobs.items():
+            if column in new_rows.columns:
+                sketch = HyperLogLog.from_bytes(blob)
+                sketch.update(new_rows[column])
+                blobs[column] = sketch.to_bytes()
+
+    
+    def save_snapshot(self, store: Any) -> List[str]:
+        """Write cached datasets with their indexes and sketches to a snapshot.
+        
+        Only frames known to match their file are written: each is stored
+        with the file's (size, mtime) at the time it was parsed or last
+        refreshed. Unchanged entries are not rewritten. A dataset's rollup
+        is stored in its entry when it was built from the same file state.
+        
+        Args:
+            store: SnapshotStore to write to
+            
+        Returns:
+            Keys of the snapshot entries for the cached datasets
+        """
+        keys = []
+        for filename, fingerprint in list(self._frame_fingerprints.items()):
+            df = self._cache.get(filename)
+            if df is None:
+                continue
+            indexes = dict(self._indexes.get(filename, {}))
+            sketches = dict(self._sketches.get(filename, {}))
+            rollup = self._rollups.get(filename)
+            rollup_current = rollup is not None and rollup.source_fingerprint == fingerprint
+            meta = {
+                "rows": len(df),
+                "dtypes": [repr(dtype) for dtype in df.dtypes],
+                "indexes": sorted(indexes),
+                "sketches": sorted(sketches),
+                "rollup": [rollup.time_column, list(rollup.dimensions)] if rollup is not None else None,
+                "rollup_stored": rollup_current,
+            }
+            key = f"data:{filename}"
+            if not store.unchanged(key, fingerprint, meta):
+                sections = {f"sketch:{column}": blob for column, blob in sketches.items()}
+                for column, index in indexes.items():
+                    try:
+                        sections[f"index:{column}"] = index.to_bytes()
+                    except ValueError:
+                        pass  # mixed-type column; rebuilt by build_index after a restore
+                if rollup_current:
+                    sections["rollup"] = rollup.to_bytes()
+                if not store.save(key, fingerprint, frame=df, sections=sections, meta=meta):
+                    continue
+            # A refresh that ran meanwhile makes this entry stale; drop it
+            if self._cache.get(filename) is df and self._frame_fingerprints.get(filename) == fingerprint:
+                keys.append(key)
+        return keys
+    
+    @staticmethod
+    def _restore_rollup(blob: Optional[bytes], fingerprint: tuple, time_column: str,
+                        dimensions: tuple) -> Optional[TimeRollup]:
+        """Deserialize a snapshotted rollup if it matches the file and settings."""
+        if blob is None:
+            return None
+        try:
+            rollup = TimeRollup.from_bytes(blob)
+        except ValueError:
+            return None
+        expected = (tuple(fingerprint), time_column, dimensions)
+        return rollup if (rollup.source_fingerprint, rollup.time_column, rollup.dimensions) == expected else None
+
+    def restore_snapshot(self, store: Any) -> int:
+        """Load cached datasets whose files are unchanged from a snapshot.
+        
+        Datasets already cached are left alone. Tail state is recaptured
+        from the file, so `refresh_csv` keeps parsing only appended bytes.
+        
+        Args:
+            store: SnapshotStore to read from
+            
+        Returns:
+            Number of datasets restored
+        """
+        restored = 0
+        for key in store.keys("data:"):
+            filename = key[len("data:"):]
+            fingerprint = self._fingerprint(filename)
+            if filename in self._cache or fingerprint is None:
+                continue
+            entry = store.load(key, fingerprint)
+            if entry is None or entry.frame is None:
+                continue
+            
+            df = entry.frame
+            self._cache[filename] = df
+            self._frame_fingerprints[filename] = fingerprint
+            state = tailing.TailState.capture(self.data_dir / filename, fingerprint[0], len(df))
+            if state is not None:
+                self._tail_states[filename] = state
+            for name, blob in entry.sections.items():
+                if name == "rollup":
+                    continue
+                kind, column = name.split(":", 1)
+                if kind == "sketch":
+                    self._sketches.setdefault(filename, {})[column] = blob
+                elif kind == "index":
+                    try:
+                        self._indexes.setdefault(filename, {})[column] = ColumnIndex.from_bytes(blob)
+                    except ValueError:
+                        pass
+            if entry.meta.get("rollup"):
+                time_column, dimensions = entry.meta["rollup"]
+                rollup = self._restore_rollup(entry.sections.get("rollup"), fingerprint, time_column, tuple(dimensions))
+                if rollup is None:
+                    rollup = self._load_rollup(filename, time_column, tuple(dimensions))
+                if rollup is not None:
+                    self._rollups[filename] = rollup
+            restored += 1
+        return restored
 
 
 # Create singleton instance
@@ -0,0 +1,98 @@
+"""Largest-Triangle-Three-Buckets downsampling for charts (Week 8).
+
+A line or area chart can't show more points than it has horizontal
+pixels, so long histories are reduced to a fixed point budget before they
+are sent to the browser. LTTB keeps the first and last points and, for
+each bucket in between, the point forming the largest triangle with the
+previously kept point and the average of the next bucket. Peaks, dips
+and the overall shape survive, and the payload stays bounded however
+long the history grows.
+
+The triangle areas of a bucket are computed in one NumPy operation; the
+loop over buckets is inherent to LTTB (each choice depends on the
+previous one) and runs once per output point, not per input point.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+# About one point per horizontal pixel of a full-width chart
+DEFAULT_MAX_POINTS = 1_000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Select the positions of the points LTTB keeps.
+
+    Args:
+        x: Increasing x values (numeric)
+        y: y values, same length as x
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted positions into x/y (all positions if threshold >= len(x)
+        or threshold < 3)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+
+    # threshold - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # The third point of bucket i's triangles is bucket i + 1's average
+    # (the last point for the final bucket)
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_frame(df: pd.DataFrame, max_points: int = DEFAULT_MAX_POINTS,
+                     columns: Optional[list] = None) -> pd.DataFrame:
+    """Reduce a chart frame to at most about `max_points` rows per column.
+
+    The index is the x axis (numeric or datetime) and must be sorted.
+    LTTB runs on each numeric column and the union of the kept rows is
+    returned, so every series keeps its own shape and the columns still
+    share one index.
+
+    Args:
+        df: Chart data indexed by x
+        max_points: Points to keep per series
+        columns: Series to downsample (default: all numeric columns)
+
+    Returns:
+        The kept rows (df itself if it is already small enough)
+    """
+    if len(df) <= max_points:
+        return df
+
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex):
+        x = index.asi8 - index.asi8[0]
+    elif pd.api.types.is_numeric_dtype(index):
+        x = index.to_numpy(dtype=np.float64)
+    else:
+        x = np.arange(len(df), dtype=np.float64)
+
+    columns = columns or list(df.select_dtypes("number").columns)
+    keep = np.unique(np.concatenate(
+        [lttb_indices(x, df[column].to_numpy(), max_points) for column in columns]
+    )) if columns else lttb_indices(x, x, max_points)
+    return df.iloc[keep]
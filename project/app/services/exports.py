@@ -0,0 +1,221 @@
+"""Streaming, compressed dataset exports (Week 8).
+
+Exports read their source (a cached frame, a SQLite table or a CSV file)
+in chunks and encode each chunk straight into a SpooledTemporaryFile,
+which stays in memory for small exports and rolls over to disk for large
+ones. The full table is never rendered as one Python string.
+
+Formats: plain/gzip/zstd CSV, Parquet (one row group per chunk) and
+newline-delimited JSON. zstd needs the optional `zstandard` package and
+Parquet needs pyarrow.
+"""
+
+import gzip
+import io
+import os
+import sqlite3
+import tempfile
+import time
+import pandas as pd
+from contextlib import closing
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+from app.services.arrow_storage import HAS_PYARROW
+from app.services.query import quote_identifier
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+if HAS_PYARROW:
+    import pyarrow as pa
+    import pyarrow.parquet as parquet
+
+# format -> (file extension, MIME type)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "csv.zst": (".csv.zst", "application/zstd"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "ndjson": (".ndjson", "application/x-ndjson"),
+}
+
+SPOOL_LIMIT = 32 * 1024 * 1024
+
+
+def available_formats() -> list:
+    """Get the export formats usable with the installed packages."""
+    return [
+        fmt for fmt in EXPORT_FORMATS
+        if (fmt != "csv.zst" or HAS_ZSTD) and (fmt != "parquet" or HAS_PYARROW)
+    ]
+
+
+def frame_chunks(df: pd.DataFrame, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Yield row slices of an in-memory DataFrame (views, not copies)."""
+    for start in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def table_chunks(db_path: Path, table: str, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Yield chunks of a SQLite table through a read-only connection."""
+    with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as conn:
+        yield from pd.read_sql_query(f"SELECT * FROM {quote_identifier(table)}", conn, chunksize=chunksize)
+
+
+def csv_chunks(filepath: Path, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Yield chunks of a CSV file."""
+    with pd.read_csv(filepath, chunksize=chunksize) as reader:
+        yield from reader
+
+
+class ExportResult:
+    """A finished export: the spooled file plus throughput figures."""
+
+    def __init__(self, file: BinaryIO, fmt: str, rows: int, size: int, elapsed: float):
+        """Initialize an ExportResult.
+
+        Args:
+            file: Spooled file positioned at the start
+            fmt: Export format key
+            rows: Rows written
+            size: Encoded size in bytes
+            elapsed: Export time in seconds
+        """
+        self.file = file
+        self.fmt = fmt
+        self.rows = rows
+        self.size = size
+        self.elapsed = elapsed
+
+    @property
+    def extension(self) -> str:
+        """File extension for the format."""
+        return EXPORT_FORMATS[self.fmt][0]
+
+    @property
+    def mime(self) -> str:
+        """MIME type for the format."""
+        return EXPORT_FORMATS[self.fmt][1]
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Export throughput in rows per second."""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        """Export throughput in encoded megabytes per second."""
+        return self.size / 1024 / 1024 / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def rolled_to_disk(self) -> bool:
+        """Whether the spooled file outgrew memory and moved to disk."""
+        return bool(getattr(self.file, "_rolled", False))
+
+    def nbytes(self) -> int:
+        """Memory held by the export (0 once it has rolled over to disk)."""
+        return 0 if self.rolled_to_disk else self.size
+
+    def reader(self) -> BinaryIO:
+        """Open a plain binary file over the export, from the start.
+
+        For consumers that take real file objects but not spooled files
+        (e.g. st.download_button). The export is moved to disk if it was
+        still in memory; close the reader before the result.
+
+        Returns:
+            A new read-only file object sharing the export's file
+        """
+        self.file.seek(0)
+        return io.open(os.dup(self.file.fileno()), "rb")
+
+    def close(self) -> None:
+        """Release the spooled file."""
+        self.file.close()
+
+    def __enter__(self) -> "ExportResult":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _Uncloseable(io.RawIOBase):
+    """Pass-through writer that leaves the underlying file open on close."""
+
+    def __init__(self, raw: BinaryIO):
+        self._raw = raw
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self._raw.write(data)
+
+
+def _text_writer(spool: BinaryIO, fmt: str):
+    """Wrap the spool in the format's compression and a UTF-8 text layer."""
+    if fmt == "csv.gz":
+        binary = gzip.GzipFile(fileobj=spool, mode="wb", compresslevel=6)
+    elif fmt == "csv.zst":
+        binary = zstandard.ZstdCompressor(level=3).stream_writer(spool, closefd=False)
+    else:
+        binary = _Uncloseable(spool)
+    return io.TextIOWrapper(binary, encoding="utf-8", newline="")
+
+
+def export_chunks(chunks: Iterable[pd.DataFrame], fmt: str = "csv",
+                  spool_limit: int = SPOOL_LIMIT) -> ExportResult:
+    """Encode chunks of a dataset into a spooled file.
+
+    Args:
+        chunks: DataFrame chunks with identical columns
+        fmt: One of EXPORT_FORMATS
+        spool_limit: Bytes kept in memory before spilling to disk
+
+    Returns:
+        ExportResult with the file rewound to the start
+
+    Raises:
+        ValueError: If the format is unknown
+        ImportError: If the format needs a package that isn't installed
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    if fmt == "csv.zst" and not HAS_ZSTD:
+        raise ImportError("zstandard is required for .csv.zst exports")
+    if fmt == "parquet" and not HAS_PYARROW:
+        raise ImportError("pyarrow is required for Parquet exports")
+
+    start = time.perf_counter()
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_limit, mode="w+b")
+    rows = 0
+
+    if fmt == "parquet":
+        writer = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = parquet.ParquetWriter(spool, table.schema, compression="snappy")
+            writer.write_table(table)
+            rows += len(chunk)
+        if writer is not None:
+            writer.close()
+    else:
+        text = _text_writer(spool, fmt)
+        for i, chunk in enumerate(chunks):
+            if fmt == "ndjson":
+                if len(chunk):
+                    text.write(chunk.to_json(orient="records", lines=True, date_format="iso"))
+            else:
+                chunk.to_csv(text, index=False, header=(i == 0))
+            rows += len(chunk)
+        text.close()
+
+    size = spool.tell()
+    spool.seek(0)
+    return ExportResult(spool, fmt, rows, size, time.perf_counter() - start)
@@ -0,0 +1,195 @@
+"""Secondary column indexes for cached datasets (Week 8).
+
+An index maps every distinct value of a column to the row positions that
+hold it, so repeated equality filters (e.g. severity="Critical") become a
+slice lookup instead of a full column scan. Indexes serialize to a
+versioned binary blob so they can be persisted with a snapshot.
+"""
+
+import struct
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+_INDEX_MAGIC = b"CIX1"
+_INDEX_HEADER = "<4sBHQQ"  # magic, value encoding, dtype name length, distinct values, positions
+_NUMERIC_VALUES, _STRING_VALUES = 0, 1
+
+
+class ColumnIndex:
+    """Inverted positions index for a single DataFrame column.
+
+    Values are factorized into sorted codes; row positions are stored grouped
+    by code with an offsets array marking where each value's group starts.
+    Positions inside a group are ascending, which keeps intersections cheap.
+    """
+
+    def __init__(self, series: pd.Series):
+        """Build the index from a column.
+
+        Args:
+            series: Column to index (missing values are not indexed)
+        """
+        codes, uniques = pd.factorize(series, sort=True)
+        valid = codes >= 0
+        order = np.argsort(codes, kind="stable")
+
+        self._values = pd.Index(uniques)
+        self._positions = order[valid[order]].astype(np.int64)
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        self._offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def lookup(self, value: Any) -> np.ndarray:
+        """Get the row positions holding a value.
+
+        Args:
+            value: Value to look up
+
+        Returns:
+            Sorted array of row positions (empty if the value is absent)
+        """
+        code = self._values.get_indexer([value])[0]
+        if code < 0:
+            return np.empty(0, dtype=np.int64)
+        return self._positions[self._offsets[code]:self._offsets[code + 1]]
+
+    def append(self, series: pd.Series, start: int) -> None:
+        """Extend the index with rows appended to the indexed column.
+
+        Existing value codes are kept and unseen values get new codes at
+        the end, so only the new rows are factorized.
+
+        Args:
+            series: Values of the appended rows
+            start: Row position of the first appended row
+        """
+        new_values = pd.Index(series.dropna().unique()).difference(self._values, sort=False)
+        if len(new_values):
+            self._values = self._values.append(new_values)
+
+        codes = self._values.get_indexer(series)
+        valid = codes >= 0
+        order = np.argsort(codes, kind="stable")
+        order = order[valid[order]]
+        new_counts = np.bincount(codes[valid], minlength=len(self._values))
+        old_counts = np.pad(np.diff(self._offsets), (0, len(self._values) + 1 - len(self._offsets)))
+        offsets = np.concatenate(([0], np.cumsum(old_counts + new_counts))).astype(np.int64)
+
+        positions = np.empty(offsets[-1], dtype=np.int64)
+        old_group = np.repeat(np.arange(len(old_counts)), old_counts)
+        old_rank = np.arange(len(old_group)) - np.repeat(self._offsets[:-1], old_counts[:len(self._offsets) - 1])
+        positions[offsets[old_group] + old_rank] = self._positions
+
+        new_group = codes[order]
+        new_starts = np.concatenate(([0], np.cumsum(new_counts)))[:-1]
+        new_rank = np.arange(len(order)) - new_starts[new_group]
+        positions[offsets[new_group] + old_counts[new_group] + new_rank] = order + start
+
+        self._positions = positions
+        self._offsets = offsets
+
+    def distinct_count(self) -> int:
+        """Get the number of distinct indexed values."""
+        return len(self._values)
+
+    def nbytes(self) -> int:
+        """Get the approximate memory used by the index in bytes."""
+        return int(self._positions.nbytes + self._offsets.nbytes + self._values.memory_usage(deep=True))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index to a versioned binary blob.
+
+        Numeric and datetime values are stored as raw arrays, string values
+        as UTF-8 with offsets.
+
+        Raises:
+            ValueError: If the values are neither numeric nor all strings
+        """
+        values = self._values
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufmM":
+            encoding, dtype = _NUMERIC_VALUES, values.dtype.str
+            payload = values.to_numpy().tobytes()
+        elif pd.api.types.infer_dtype(values, skipna=False) in ("string", "empty"):
+            encoding = _STRING_VALUES
+            dtype = f"string[{values.dtype.storage}]" if isinstance(values.dtype, pd.StringDtype) else "object"
+            encoded = [value.encode("utf-8") for value in values]
+            ends = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+            payload = np.concatenate(([0], ends)).astype("<i8").tobytes() + b"".join(encoded)
+        else:
+            raise ValueError(f"Can't serialize index values of dtype {values.dtype}")
+
+        dtype_name = dtype.encode()
+        header = struct.pack(_INDEX_HEADER, _INDEX_MAGIC, encoding, len(dtype_name), len(values), len(self._positions))
+        return (header + dtype_name + self._offsets.astype("<i8").tobytes()
+                + self._positions.astype("<i8").tobytes() + payload)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ColumnIndex":
+        """Deserialize an index produced by `to_bytes`.
+
+        Raises:
+            ValueError: If the blob is not a serialized ColumnIndex
+        """
+        size = struct.calcsize(_INDEX_HEADER)
+        if len(data) < size:
+            raise ValueError("Not a serialized ColumnIndex")
+        magic, encoding, name_length, distinct, count = struct.unpack_from(_INDEX_HEADER, data)
+        if magic != _INDEX_MAGIC or encoding not in (_NUMERIC_VALUES, _STRING_VALUES):
+            raise ValueError("Not a serialized ColumnIndex")
+        dtype = data[size:size + name_length].decode()
+        start = size + name_length
+        end = start + 8 * (distinct + 1) + 8 * count
+        if len(data) < end:
+            raise ValueError("Truncated ColumnIndex")
+
+        index = cls.__new__(cls)
+        index._offsets = np.frombuffer(data, dtype="<i8", count=distinct + 1, offset=start).astype(np.int64)
+        index._positions = np.frombuffer(data, dtype="<i8", count=count, offset=start + 8 * (distinct + 1)).astype(np.int64)
+        if encoding == _NUMERIC_VALUES:
+            index._values = pd.Index(np.frombuffer(data, dtype=np.dtype(dtype), count=distinct, offset=end))
+        else:
+            ends = np.frombuffer(data, dtype="<i8", count=distinct + 1, offset=end)
+            text = data[end + 8 * (distinct + 1):]
+            index._values = pd.Index([text[a:b].decode("utf-8") for a, b in zip(ends[:-1], ends[1:])], dtype=dtype)
+        if index._offsets[-1] != count:
+            raise ValueError("Corrupt ColumnIndex")
+        return index
+
+
+def intersect_positions(position_sets: List[np.ndarray]) -> np.ndarray:
+    """Intersect several sorted position arrays.
+
+    Args:
+        position_sets: Arrays of unique row positions
+
+    Returns:
+        Sorted positions present in every array
+    """
+    ordered = sorted(position_sets, key=len)
+    result = ordered[0]
+    for positions in ordered[1:]:
+        if len(result) == 0:
+            break
+        result = np.intersect1d(result, positions, assume_unique=True)
+    return result
+
+
+def build_indexes(df: pd.DataFrame, columns: List[str]) -> Dict[str, ColumnIndex]:
+    """Build indexes for several columns of a DataFrame.
+
+    Args:
+        df: DataFrame to index
+        columns: Columns to index
+
+    Returns:
+        Dictionary of column name to ColumnIndex
+
+    Raises:
+        ValueError: If a column doesn't exist
+    """
+    indexes = {}
+    for column in columns:
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found in DataFrame")
+        indexes[column] = ColumnIndex(df[column])
+    return indexes
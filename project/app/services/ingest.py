@@ -0,0 +1,428 @@
+"""Background ingestion of uploaded CSVs into SQLite (Week 8).
+
+Uploads are queued as IngestJobs and run on a small worker pool, so the
+Streamlit script thread returns immediately. Each job streams its file in
+chunks, validates every chunk against the table's schema and stages the
+valid rows in a temporary table. Only once the whole file has passed is
+the stage merged into the Week 8 database, in one transaction, so a
+failed or cancelled job leaves the table untouched. Pages poll
+`progress()` for rows staged and written, throughput and errors.
+
+Re-uploading a file doesn't duplicate rows. The merge matches rows on a
+natural key: a unique column of the table if the upload has one (upsert),
+else the schema's unique columns (existing rows are updated), else the
+whole row (rows already present are skipped).
+
+Uploads can only target a table that has both a validation schema (keyed
+by table name) and a table in the database; anything else is rejected
+before it is queued. The database keeps its rollback journal unless
+INGEST_WAL=1: WAL lets dashboards read during an ingest, but it is a
+persistent property of the file and leaves -wal/-shm files next to it.
+"""
+
+import itertools
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import pandas as pd
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.query import quote_identifier
+from app.services.validation import SCHEMAS, Schema
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+
+MAX_RECORDED_ERRORS = 20
+
+
+def connect_writer(db_path: Path, wal: bool = False) -> sqlite3.Connection:
+    """Open a connection tuned for bulk writes.
+
+    The busy timeout makes concurrent jobs wait for the write lock instead
+    of failing. With `wal`, readers (dashboards, queries) keep working
+    during an ingest; this switches the database file to WAL for good.
+    """
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def table_layout(conn: sqlite3.Connection, table: str) -> Tuple[List[str], List[str]]:
+    """Get a table's writable columns and its single-column unique keys.
+
+    Args:
+        conn: Database connection
+        table: Table name
+
+    Returns:
+        Tuple of (columns excluding the integer primary key, unique columns)
+
+    Raises:
+        ValueError: If the table doesn't exist
+    """
+    info = conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+    if not info:
+        raise ValueError(f"Table '{table}' not found")
+    columns = [row[1] for row in info if not (row[5] and row[2].upper() == "INTEGER")]
+
+    unique = []
+    for index in conn.execute(f"PRAGMA index_list({quote_identifier(table)})").fetchall():
+        if index[2]:
+            keys = conn.execute(f"PRAGMA index_info({quote_identifier(index[1])})").fetchall()
+            if len(keys) == 1:
+                unique.append(keys[0][2])
+    return columns, unique
+
+
+def upsert_statement(table: str, columns: List[str], key: Optional[str], source: Optional[str] = None) -> str:
+    """Build an INSERT (or upsert on `key`) statement for some columns.
+
+    Rows come from parameters, or from the same columns of the `source`
+    table in rowid order.
+    """
+    names = ", ".join(quote_identifier(c) for c in columns)
+    sql = f"INSERT INTO {quote_identifier(table)} ({names}) "
+    if source is None:
+        sql += f"VALUES ({', '.join('?' * len(columns))})"
+    else:
+        # WHERE true keeps ON CONFLICT from parsing as a join constraint
+        sql += f"SELECT {names} FROM {source} WHERE true ORDER BY rowid"
+    updates = [column for column in columns if column != key]
+    if key is not None and updates:
+        sql += (f" ON CONFLICT({quote_identifier(key)}) DO UPDATE SET "
+                + ", ".join(f"{quote_identifier(c)} = excluded.{quote_identifier(c)}" for c in updates))
+    elif key is not None:
+        sql += f" ON CONFLICT({quote_identifier(key)}) DO NOTHING"
+    return sql
+
+
+class IngestJob:
+    """One queued or running CSV ingest and its progress counters."""
+
+    def __init__(self, job_id: int, filename: str, table: str, path: Path, total_bytes: int):
+        """Initialize an IngestJob.
+
+        Args:
+            job_id: Job identifier
+            filename: Original upload name (for display)
+            table: Destination table
+            path: Spooled copy of the upload
+            total_bytes: Size of the upload
+        """
+        self.job_id = job_id
+        self.filename = filename
+        self.table = table
+        self.path = path
+        self.total_bytes = total_bytes
+        self.status = "queued"
+        self.rows_staged = 0
+        self.rows_written = 0
+        self.rows_rejected = 0
+        self.bytes_read = 0
+        self.errors: List[str] = []
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def _record(self, staged: int, written: int, rejected: int, bytes_read: int, errors: List[str]) -> None:
+        """Add one chunk's (or the merge's) counters."""
+        with self._lock:
+            self.rows_staged += staged
+            self.rows_written += written
+            self.rows_rejected += rejected
+            self.bytes_read = max(self.bytes_read, bytes_read)
+            self.errors.extend(errors[:MAX_RECORDED_ERRORS - len(self.errors)])
+
+    def _finish(self, status: str, error: Optional[str] = None) -> None:
+        """Mark the job finished."""
+        with self._lock:
+            self.status = status
+            self.finished_at = time.time()
+            if error:
+                self.errors.append(error)
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the job is queued or running."""
+        return self.status in ("queued", "running")
+
+    def progress(self) -> Dict[str, Any]:
+        """Get a snapshot of the job's progress.
+
+        Returns:
+            Dictionary with status, rows staged/written/rejected, fraction
+            done, rows per second, elapsed seconds and recorded errors
+        """
+        with self._lock:
+            end = self.finished_at or time.time()
+            elapsed = end - self.started_at if self.started_at else 0.0
+            done = self.status == "done"
+            return {
+                "job_id": self.job_id,
+                "filename": self.filename,
+                "table": self.table,
+                "status": self.status,
+                "rows_staged": self.rows_staged,
+                "rows_written": self.rows_written,
+                "rows_rejected": self.rows_rejected,
+                "fraction": 1.0 if done else min(self.bytes_read / self.total_bytes, 1.0) if self.total_bytes else 0.0,
+                "rows_per_sec": self.rows_staged / elapsed if elapsed > 0 else 0.0,
+                "elapsed": elapsed,
+                "errors": list(self.errors),
+            }
+
+
+class IngestManager:
+    """Queue of ingest jobs run with bounded concurrency."""
+
+    def __init__(self, db_path: Path, max_workers: int = 2, chunksize: int = 50_000, wal: bool = False):
+        """Initialize the IngestManager.
+
+        Args:
+            db_path: SQLite database to write to
+            max_workers: Jobs allowed to run at once; others wait queued
+            chunksize: Rows parsed, validated and staged per batch
+            wal: Switch the database to WAL journaling (see `connect_writer`)
+        """
+        self.db_path = Path(db_path)
+        self.chunksize = chunksize
+        self.wal = wal
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._jobs: Dict[int, IngestJob] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def targets(self) -> List[str]:
+        """Get the tables uploads can be ingested into.
+
+        Returns:
+            Schema keys (in SCHEMAS order) that name a table in the
+            database; empty if the database doesn't exist
+        """
+        if not self.db_path.exists():
+            return []
+        with closing(sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return [key for key in SCHEMAS if key in tables]
+
+    def submit(self, data: bytes, filename: str, table: str) -> int:
+        """Queue an uploaded CSV for ingestion.
+
+        The upload is spooled to a temporary file so the worker can stream
+        it without keeping a second copy in memory.
+
+        Args:
+            data: Raw CSV bytes
+            filename: Original upload name
+            table: Destination table
+
+        Returns:
+            The job ID
+
+        Raises:
+            FileNotFoundError: If the database doesn't exist
+            ValueError: If the table is not an ingest target (see `targets`)
+        """
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+        targets = self.targets()
+        if table not in targets:
+            raise ValueError(f"Can't ingest into '{table}' (targets: {', '.join(targets) or 'none'})")
+
+        with tempfile.NamedTemporaryFile(prefix="ingest_", suffix=".csv", delete=False) as f:
+            f.write(data)
+        with self._lock:
+            job = IngestJob(next(self._ids), filename, table, Path(f.name), len(data))
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job)
+        return job.job_id
+
+    def get_job(self, job_id: int) -> Optional[IngestJob]:
+        """Get a job by ID."""
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[IngestJob]:
+        """Get every job, newest first."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.job_id, reverse=True)
+
+    def cancel(self, job_id: int) -> bool:
+        """Ask a queued or running job to stop after its current chunk.
+
+        Nothing is written unless the job has already reached the merge.
+
+        Returns:
+            True if the job was active
+        """
+        job = self._jobs.get(job_id)
+        if job is None or not job.is_active:
+            return False
+        job._cancel.set()
+        return True
+
+    def _run(self, job: IngestJob) -> None:
+        """Worker entry point: stream, validate, stage and merge one file."""
+        try:
+            if job._cancel.is_set():
+                job._finish("cancelled")
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            job._finish("done" if self._ingest(job) else "cancelled")
+        except Exception as e:
+            job._finish("failed", f"{type(e).__name__}: {e}")
+        finally:
+            job.path.unlink(missing_ok=True)
+
+    def _ingest(self, job: IngestJob) -> bool:
+        """Stage a job's file chunk by chunk, then merge it in one transaction.
+
+        Returns:
+            False if the job was cancelled before the merge
+        """
+        schema = SCHEMAS.get(job.table)
+        conn = connect_writer(self.db_path, wal=self.wal)
+        stage = f"temp.{quote_identifier(f'ingest_stage_{job.job_id}')}"
+        try:
+            table_columns, unique = table_layout(conn, job.table)
+            columns = None
+            with job.path.open("rb") as f:
+                for chunk in pd.read_csv(f, chunksize=self.chunksize):
+                    if job._cancel.is_set():
+                        return False
+
+                    errors = []
+                    rejected = 0
+                    if schema is not None:
+                        result = schema.validate(chunk)
+                        if result.schema_errors:
+                            raise ValueError("; ".join(result.schema_errors))
+                        if result.invalid_count:
+                            bad = result.invalid_rows(chunk, limit=MAX_RECORDED_ERRORS)
+                            errors = [f"row {pos + 2}: {desc}" for pos, desc in zip(bad.index, bad["errors"])]
+                            rejected = result.invalid_count
+                            chunk = result.valid_rows(chunk)
+
+                    if columns is None:
+                        columns = [column for column in chunk.columns if column in table_columns]
+                        if not columns:
+                            raise ValueError(f"No columns of '{job.table}' found in {job.filename}")
+                        # Same column affinities as the table, so staged values compare like stored ones
+                        names = ", ".join(quote_identifier(c) for c in columns)
+                        conn.execute(f"CREATE TABLE {stage} AS SELECT {names} FROM {quote_identifier(job.table)} "
+                                     "WHERE 0")
+                    self._stage_chunk(conn, stage, columns, chunk)
+                    job._record(len(chunk), 0, rejected, f.tell(), errors)
+
+            if job._cancel.is_set():
+                return False
+            if columns is not None:
+                written, failed = self._merge(conn, job.table, stage, columns, unique, schema)
+                job._record(0, written, len(failed), job.total_bytes, failed)
+            return True
+        finally:
+            conn.close()  # drops the stage
+
+    @staticmethod
+    def _stage_chunk(conn: sqlite3.Connection, stage: str, columns: List[str], chunk: pd.DataFrame) -> None:
+        """Append a chunk's valid rows to the stage, keyed by CSV line number."""
+        frame = chunk[columns]
+        rows = frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+        names = ", ".join(["rowid"] + [quote_identifier(c) for c in columns])
+        with conn:
+            conn.executemany(f"INSERT INTO {stage} ({names}) VALUES ({', '.join('?' * (len(columns) + 1))})",
+                             [(position + 2, *row) for position, row in zip(chunk.index, rows)])
+
+    @staticmethod
+    def _merge(conn: sqlite3.Connection, table: str, stage: str, columns: List[str], unique: List[str],
+               schema: Optional[Schema]) -> Tuple[int, List[str]]:
+        """Write the staged rows into the table in a single transaction.
+
+        Rows are matched on the natural key described in the module
+        docstring. With a unique column, a batch that hits a constraint
+        violation is retried row by row so only the offending rows are
+        rejected; otherwise a violation fails the whole merge.
+
+        Returns:
+            Tuple of (rows written, error messages for rejected rows)
+        """
+        key = next((column for column in unique if column in columns), None)
+        if key is not None:
+            try:
+                with conn:
+                    return conn.execute(upsert_statement(table, columns, key, stage)).rowcount, []
+            except sqlite3.IntegrityError:
+                pass
+
+            sql = upsert_statement(table, columns, key)
+            names = ", ".join(quote_identifier(c) for c in columns)
+            errors = []
+            written = 0
+            with conn:
+                for line, *row in conn.execute(f"SELECT rowid, {names} FROM {stage} ORDER BY rowid"):
+                    try:
+                        conn.execute(sql, row)
+                        written += 1
+                    except sqlite3.IntegrityError as e:
+                        errors.append(f"row {line}: {e}")
+            return written, errors
+
+        schema_keys = [column for column, rule in (schema.columns.items() if schema else ())
+                       if rule.unique and column in columns]
+        keys = schema_keys or columns
+        target = quote_identifier(table)
+        names = ", ".join(quote_identifier(c) for c in columns)
+        key_names = ", ".join(quote_identifier(c) for c in keys)
+        written = 0
+        with conn:
+            if keys != columns:
+                # Last row per key wins, then it updates the rows already stored under that key
+                conn.execute(f"DELETE FROM {stage} WHERE rowid NOT IN "
+                             f"(SELECT max(rowid) FROM {stage} GROUP BY {key_names})")
+                updates = ", ".join(f"{quote_identifier(c)} = s.{quote_identifier(c)}" for c in columns if c not in keys)
+                matches = " AND ".join(f"{target}.{quote_identifier(c)} IS s.{quote_identifier(c)}" for c in keys)
+                written += conn.execute(f"UPDATE {target} SET {updates} FROM {stage} AS s WHERE {matches}").rowcount
+            # Insert the distinct rows not stored yet, in file order (EXCEPT is NULL-safe)
+            same = " AND ".join(f"s.{quote_identifier(c)} IS n.{quote_identifier(c)}" for c in columns)
+            picked = ", ".join(f"s.{quote_identifier(c)}" for c in columns)
+            written += conn.execute(
+                f"INSERT INTO {target} ({names}) SELECT {picked} FROM {stage} AS s "
+                f"JOIN (SELECT {names} FROM {stage} EXCEPT SELECT {names} FROM {target}) AS n ON {same} "
+                f"GROUP BY {picked} ORDER BY min(s.rowid)"
+            ).rowcount
+        return written, []
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+
+
+_ingest_manager: Optional[IngestManager] = None
+_ingest_manager_lock = threading.Lock()
+
+
+def get_ingest_manager() -> IngestManager:
+    """Get the IngestManager instance.
+
+    Created on first use so importing the module doesn't start threads.
+    INGEST_WAL=1 (or "true") switches the database to WAL journaling.
+
+    Returns:
+        The IngestManager singleton
+    """
+    global _ingest_manager
+    with _ingest_manager_lock:
+        if _ingest_manager is None:
+            from app.services.data_service import get_data_service
+            _ingest_manager = IngestManager(get_data_service().db_path,
+                                            wal=os.getenv("INGEST_WAL", "") in ("1", "true"))
+        return _ingest_manager
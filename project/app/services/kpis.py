@@ -0,0 +1,520 @@
+"""Incident KPIs from precomputed aggregates (Week 8).
+
+A KpiCube holds incident counts and response/resolution time sums per
+(day, severity, status, analyst). Every Dashboard filter (severity levels,
+date range) resolves against the cube instead of the raw rows, and new
+incidents are folded in with one small groupby. The cube also keeps an
+incremental leaderboard of analysts by resolved incidents (all time and
+trailing windows), read in O(K) instead of a breakdown and sort.
+
+KpiService keeps the cube in sync with the incidents store (a CSV in DATA
+or the Week 8 SQLite table). Results are kept in a bounded LRU cache with
+a TTL; when an entry expires the source is fingerprinted and, only if it
+changed, the cube is updated incrementally (appended rows) or rebuilt
+(anything else). For the SQLite table an append is recognised by row
+count and max id growing together, so an edit made in the same TTL window
+as an append is only picked up by the next rebuild (or
+`invalidate(rebuild=True)`). The cube is saved with snapshots
+(app.services.snapshots) and restored at boot while the source
+fingerprint is unchanged.
+"""
+
+import json
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.downsampling import downsample_frame
+from app.services.leaderboards import Leaderboard
+from app.services.snapshots import pack_sections, unpack_sections
+
+KPI_CUBE_FORMAT_VERSION = 2
+
+RESOLVED_STATUSES = ("Resolved", "Closed")
+
+DIMENSIONS = ["day", "severity", "status", "reported_by"]
+
+MEASURES = ["count", "response_hours", "response_n", "resolve_hours", "resolve_n"]
+
+# Analysts kept on each leaderboard and its trailing windows (days)
+LEADERBOARD_SIZE = 25
+LEADERBOARD_WINDOWS = (7, 30)
+
+
+def _hours_between(start: pd.Series, end: Optional[pd.Series]) -> pd.Series:
+    """Get hours from start to end (NaN where either is missing)."""
+    if end is None:
+        return pd.Series(np.nan, index=start.index)
+    return (pd.to_datetime(end, errors="coerce") - start).dt.total_seconds() / 3600
+
+
+class KpiCube:
+    """Incident measures pre-aggregated by day, severity, status and analyst.
+
+    Average response time needs a `responded_at` column and MTTR a
+    `resolved_at` column; without them those KPIs are reported as None.
+    """
+
+    def __init__(self, time_column: str = "date"):
+        """Initialize an empty cube.
+
+        Args:
+            time_column: Column holding the incident timestamp
+        """
+        self.time_column = time_column
+        self.rows_seen = 0
+        empty = pd.MultiIndex.from_arrays([[] for _ in DIMENSIONS], names=DIMENSIONS)
+        self._cells = pd.DataFrame({measure: pd.Series(dtype="float64") for measure in MEASURES}, index=empty)
+        self.leaderboard = Leaderboard(LEADERBOARD_SIZE, LEADERBOARD_WINDOWS)
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold new incidents into the cube.
+
+        Args:
+            df: New incident rows
+
+        Raises:
+            ValueError: If the time column is missing
+        """
+        if self.time_column not in df.columns:
+            raise ValueError(f"Column '{self.time_column}' not found in DataFrame")
+        if df.empty:
+            return
+
+        opened = pd.to_datetime(df[self.time_column], errors="coerce")
+        response = _hours_between(opened, df.get("responded_at"))
+        resolve = _hours_between(opened, df.get("resolved_at"))
+
+        frame = pd.DataFrame({
+            "day": opened.dt.floor("D"),
+            "severity": df.get("severity", pd.Series("Unknown", index=df.index)).fillna("Unknown").astype(str),
+            "status": df.get("status", pd.Series("Unknown", index=df.index)).fillna("Unknown").astype(str),
+            "reported_by": df.get("reported_by", pd.Series("Unknown", index=df.index)).fillna("Unknown").astype(str),
+            "count": 1.0,
+            "response_hours": response.fillna(0.0),
+            "response_n": response.notna().astype(float),
+            "resolve_hours": resolve.fillna(0.0),
+            "resolve_n": resolve.notna().astype(float),
+        })
+        frame = frame[frame["day"].notna()]
+        partial = frame.groupby(DIMENSIONS).sum()
+        self._cells = self._cells.add(partial, fill_value=0.0)
+        resolved = frame["status"].isin(RESOLVED_STATUSES)
+        if len(frame):
+            self.leaderboard.advance(frame["day"].max())
+        self.leaderboard.update_frame(frame.loc[resolved, "reported_by"], frame.loc[resolved, "day"])
+        self.rows_seen += len(df)
+
+    def _select(self, severities: Optional[Sequence[str]] = None,
+                start: Optional[Any] = None, end: Optional[Any] = None) -> pd.DataFrame:
+        """Get the cells matching the filters.
+
+        Args:
+            severities: Severity levels to keep (None for all)
+            start: First day to include (optional)
+            end: Last day to include (optional)
+        """
+        cells = self._cells
+        mask = np.ones(len(cells), dtype=bool)
+        if severities is not None:
+            mask &= cells.index.get_level_values("severity").isin(list(severities))
+        days = cells.index.get_level_values("day")
+        if start is not None:
+            mask &= days >= pd.Timestamp(start)
+        if end is not None:
+            mask &= days <= pd.Timestamp(end)
+        return cells[mask]
+
+    def kpis(self, severities: Optional[Sequence[str]] = None,
+             start: Optional[Any] = None, end: Optional[Any] = None) -> Dict[str, Optional[float]]:
+        """Get headline KPIs for a filter.
+
+        Returns:
+            Dictionary with total, critical, resolved, open,
+            avg_response_hours and mttr_hours (None without timing data)
+        """
+        cells = self._select(severities, start, end)
+        counts = cells["count"]
+        status = cells.index.get_level_values("status")
+        totals = cells[["response_hours", "response_n", "resolve_hours", "resolve_n"]].sum()
+        return {
+            "total": int(counts.sum()),
+            "critical": int(counts[cells.index.get_level_values("severity") == "Critical"].sum()),
+            "resolved": int(counts[status.isin(RESOLVED_STATUSES)].sum()),
+            "open": int(counts[~status.isin(RESOLVED_STATUSES)].sum()),
+            "avg_response_hours": float(totals["response_hours"] / totals["response_n"]) if totals["response_n"] else None,
+            "mttr_hours": float(totals["resolve_hours"] / totals["resolve_n"]) if totals["resolve_n"] else None,
+        }
+
+    def breakdown(self, by: str, severities: Optional[Sequence[str]] = None,
+                  start: Optional[Any] = None, end: Optional[Any] = None,
+                  resolved_only: bool = False) -> pd.Series:
+        """Get incident counts per value of one dimension.
+
+        Args:
+            by: "severity", "status" or "reported_by"
+            resolved_only: Count only resolved incidents
+
+        Returns:
+            Counts sorted in descending order
+
+        Raises:
+            ValueError: If `by` is not a cube dimension
+        """
+        if by not in DIMENSIONS or by == "day":
+            raise ValueError(f"Cannot break KPIs down by '{by}'")
+        cells = self._select(severities, start, end)
+        if resolved_only:
+            cells = cells[cells.index.get_level_values("status").isin(RESOLVED_STATUSES)]
+        counts = cells["count"].groupby(level=by).sum().astype(int)
+        return counts.sort_values(ascending=False)
+
+    def timeline(self, severities: Optional[Sequence[str]] = None,
+                 start: Optional[Any] = None, end: Optional[Any] = None) -> pd.DataFrame:
+        """Get daily incident and resolved counts.
+
+        Returns:
+            DataFrame indexed by day with Incidents and Resolved columns,
+            empty days filled with 0
+        """
+        cells = self._select(severities, start, end)
+        if cells.empty:
+            return pd.DataFrame({"Incidents": [], "Resolved": []}, index=pd.DatetimeIndex([], name="day"))
+        resolved = cells.index.get_level_values("status").isin(RESOLVED_STATUSES)
+        table = pd.DataFrame({
+            "Incidents": cells["count"].groupby(level="day").sum(),
+            "Resolved": cells["count"][resolved].groupby(level="day").sum(),
+        }).fillna(0).astype(int)
+        days = pd.date_range(table.index.min(), table.index.max(), freq="D", name="day")
+        return table.reindex(days, fill_value=0)
+
+    def cell_count(self) -> int:
+        """Get the number of non-empty cube cells."""
+        return len(self._cells)
+
+    def to_snapshot(self) -> Tuple[pd.DataFrame, bytes]:
+        """Split the cube into its cells and a versioned binary blob.
+
+        The cells are a plain frame (one row per cell) for the snapshot
+        store to write as Arrow; the blob holds the settings and the
+        struct-packed leaderboard.
+
+        Returns:
+            (cells frame, blob)
+
+        Raises:
+            ValueError: If the leaderboard can't be serialized
+        """
+        meta = {"version": KPI_CUBE_FORMAT_VERSION, "time_column": self.time_column, "rows_seen": self.rows_seen}
+        blob = pack_sections({"meta": json.dumps(meta).encode("utf-8"), "leaderboard": self.leaderboard.to_bytes()})
+        return self._cells.reset_index(), blob
+
+    @classmethod
+    def from_snapshot(cls, cells: pd.DataFrame, data: bytes) -> "KpiCube":
+        """Rebuild a cube from the output of `to_snapshot`.
+
+        Raises:
+            ValueError: If the blob or frame is not a serialized KpiCube
+        """
+        sections = unpack_sections(data)
+        try:
+            meta = json.loads(sections["meta"].decode("utf-8"))
+            if meta.get("version") != KPI_CUBE_FORMAT_VERSION:
+                raise ValueError("Unsupported KpiCube format")
+            cube = cls(meta["time_column"])
+            cube.rows_seen = int(meta["rows_seen"])
+            cube.leaderboard = Leaderboard.from_bytes(sections["leaderboard"])
+            cube._cells = cells.set_index(DIMENSIONS)[MEASURES].astype("float64")
+        except (KeyError, TypeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Not a serialized KpiCube: {e}") from e
+        return cube
+
+
+class KpiService:
+    """Cached, incrementally maintained KPIs over the incidents store."""
+
+    def __init__(self, data_service: Any, source: str = "cyber_incidents", ttl: float = 60.0,
+                 max_results: int = 128):
+        """Initialize the KpiService.
+
+        Args:
+            data_service: DataService used to reach the CSV or SQLite table
+            source: "<name>.csv" in DATA, or a table name (falls back to
+                "<name>.csv" when no such table exists)
+            ttl: Seconds a cached result is served before the source is
+                checked for changes
+            max_results: Results kept in the LRU cache
+        """
+        self.data_service = data_service
+        self.source = source
+        self.ttl = ttl
+        self.max_results = max_results
+        self._cube: Optional[KpiCube] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._last_id: Optional[int] = None
+        self._results: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._pending: Dict[Tuple, Future] = {}
+        self._generation = 0
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "rebuilds": 0, "incremental": 0}
+
+    def _is_sql(self) -> bool:
+        """Whether the source is a SQLite table."""
+        return self.data_service.table(self.source).is_sql
+
+    def _source_fingerprint(self) -> Tuple:
+        """Cheap summary of the source that changes whenever it does."""
+        return self.data_service.source_fingerprint(self.source)
+
+    def _rebuild(self) -> None:
+        """Build the cube from the full source."""
+        cube = KpiCube()
+        if self._is_sql():
+            df = self.data_service.table(self.source).collect()
+            self._last_id = int(df["id"].max()) if len(df) else 0
+        else:
+            filename = self.source if self.source.endswith(".csv") else f"{self.source}.csv"
+            df = self.data_service.get_cached_data(filename)
+            if df is None:
+                df = self.data_service.load_csv(filename)
+        cube.update(df)
+        self._cube = cube
+        self.stats["rebuilds"] += 1
+
+    def _catch_up(self, old: Optional[Tuple], new: Tuple) -> None:
+        """Fold appended rows into the cube, or rebuild if that's not possible."""
+        if self._cube is None or old is None or old[0] != new[0]:
+            self._rebuild()
+            return
+
+        if new[0] == "sql":
+            # Only pure appends (row count and max id grew together) are
+            # folded in; edits or deletes without new rows force a rebuild
+            appended = new[1] - old[1]
+            if appended <= 0 or new[2] is None or old[2] is None or new[2] - old[2] != appended:
+                self._rebuild()
+                return
+            # Bounded by the fingerprint's max id: rows inserted since are
+            # left for the next catch-up instead of being counted twice
+            new_rows = (self.data_service.table(self.source)
+                        .where("id", self._last_id, ">").where("id", int(new[2]), "<=").collect())
+            if len(new_rows) != appended:
+                self._rebuild()
+                return
+            self._last_id = int(new[2])
+        else:
+            filename = self.source if self.source.endswith(".csv") else f"{self.source}.csv"
+            new_rows = self.data_service.refresh_csv(filename)
+            if len(self.data_service.get_cached_data(filename)) != self._cube.rows_seen + len(new_rows):
+                self._rebuild()
+                return
+
+        self._cube.update(new_rows)
+        self.stats["incremental"] += 1
+
+    def cube(self) -> KpiCube:
+        """Get the cube, syncing it with the source at most once per TTL.
+
+        Returns:
+            The up-to-date KpiCube
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._cube is None or now - self._checked_at >= self.ttl:
+                fingerprint = self._source_fingerprint()
+                if self._cube is None or fingerprint != self._fingerprint:
+                    self._catch_up(self._fingerprint, fingerprint)
+                    self._fingerprint = fingerprint
+                    self._clear_results()
+                self._checked_at = now
+            return self._cube
+
+    def invalidate(self, rebuild: bool = False) -> None:
+        """Force a source check (and result recomputation) on the next call.
+
+        Args:
+            rebuild: Also rebuild the cube from the full source
+        """
+        with self._lock:
+            self._checked_at = 0.0
+            self._clear_results()
+            if rebuild:
+                self._cube = None
+
+    def save_snapshot(self, store: Any) -> List[str]:
+        """Write the cube to a snapshot unless it is unchanged since the last one.
+
+        Args:
+            store: SnapshotStore to write to
+
+        Returns:
+            The cube's snapshot key (none before the first build)
+        """
+        key = f"kpis:{self.source}"
+        with self._lock:
+            if self._cube is None or self._fingerprint is None:
+                return []
+            meta = {"rows": self._cube.rows_seen, "last_id": None if self._last_id is None else int(self._last_id)}
+            if not store.unchanged(key, self._fingerprint, meta):
+                try:
+                    cells, blob = self._cube.to_snapshot()
+                except ValueError:
+                    return []
+                if not store.save(key, self._fingerprint, frame=cells, sections={"cube": blob}, meta=meta):
+                    return []
+        return [key]
+
+    def restore_snapshot(self, store: Any) -> int:
+        """Load the cube from a snapshot taken of the current source.
+
+        Args:
+            store: SnapshotStore to read from
+
+        Returns:
+            1 if the cube was restored, else 0 (already built, no entry,
+            or the source changed)
+        """
+        key = f"kpis:{self.source}"
+        with self._lock:
+            if self._cube is not None or key not in store.keys(key):
+                return 0
+            fingerprint = self._source_fingerprint()
+            entry = store.load(key, fingerprint)
+            if entry is None or entry.frame is None or "cube" not in entry.sections:
+                return 0
+            try:
+                self._cube = KpiCube.from_snapshot(entry.frame, entry.sections["cube"])
+            except ValueError:
+                return 0
+            self._fingerprint = fingerprint
+            self._last_id = entry.meta.get("last_id")
+            self._checked_at = time.monotonic()
+            self._clear_results()
+            return 1
+
+    def _clear_results(self) -> None:
+        """Drop cached results; computations already running won't store theirs."""
+        self._results.clear()
+        self._pending = {}
+        self._generation += 1
+
+    def _cached(self, key: Tuple, compute: Callable[[KpiCube], Any]) -> Any:
+        """Serve a result from the LRU cache or compute and store it.
+
+        The computation runs outside the service lock (it reads the cube's
+        cells, which updates replace rather than modify), so slow filters
+        don't hold up cache hits. Callers asking for a key that is already
+        being computed wait for that result instead of computing it again.
+        """
+        cube = self.cube()
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._results[key]
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = Future()
+                generation = self._generation
+                self.stats["misses"] += 1
+            else:
+                generation = None
+        if generation is None:
+            return pending.result()
+
+        try:
+            result = compute(cube)
+        except BaseException as e:
+            with self._lock:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            if generation == self._generation:
+                self._results[key] = result
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+        pending.set_result(result)
+        return result
+
+    @staticmethod
+    def _filter_key(severities: Optional[Sequence[str]], start: Optional[Any], end: Optional[Any]) -> Tuple:
+        """Normalize filters into a hashable cache key."""
+        return (
+            tuple(sorted(severities)) if severities is not None else None,
+            pd.Timestamp(start) if start is not None else None,
+            pd.Timestamp(end) if end is not None else None,
+        )
+
+    def kpis(self, severities: Optional[Sequence[str]] = None,
+             start: Optional[Any] = None, end: Optional[Any] = None) -> Dict[str, Optional[float]]:
+        """Get headline KPIs (see `KpiCube.kpis`) for a filter."""
+        key = ("kpis",) + self._filter_key(severities, start, end)
+        return self._cached(key, lambda cube: cube.kpis(severities, start, end))
+
+    def breakdown(self, by: str, severities: Optional[Sequence[str]] = None,
+                  start: Optional[Any] = None, end: Optional[Any] = None,
+                  resolved_only: bool = False) -> pd.Series:
+        """Get counts per dimension value (see `KpiCube.breakdown`)."""
+        key = ("breakdown", by, resolved_only) + self._filter_key(severities, start, end)
+        return self._cached(key, lambda cube: cube.breakdown(by, severities, start, end, resolved_only))
+
+    def timeline(self, severities: Optional[Sequence[str]] = None,
+                 start: Optional[Any] = None, end: Optional[Any] = None,
+                 max_points: Optional[int] = None) -> pd.DataFrame:
+        """Get daily incident and resolved counts (see `KpiCube.timeline`).
+
+        With `max_points` the series is reduced with LTTB for charting;
+        the reduced series is cached per filter and point budget.
+        """
+        key = ("timeline",) + self._filter_key(severities, start, end)
+        if max_points is None:
+            return self._cached(key, lambda cube: cube.timeline(severities, start, end))
+        full = self.timeline(severities, start, end)
+        return self._cached(key + (max_points,), lambda cube: downsample_frame(full, max_points))
+
+    def top_analysts(self, window: Optional[int] = None, k: int = 10) -> pd.Series:
+        """Get analysts with the most resolved incidents.
+
+        Windows end at the newest incident day in the source.
+
+        Args:
+            window: Trailing window in days (one of LEADERBOARD_WINDOWS),
+                or None for all time
+            k: Number of analysts (at most LEADERBOARD_SIZE)
+
+        Returns:
+            Resolved counts indexed by analyst, largest first
+        """
+        board = self.cube().leaderboard.top(window, k)
+        return pd.Series(dict(board), dtype="int64", name="Resolved").rename_axis("Analyst")
+
+    def recent(self, limit: int = 5) -> pd.DataFrame:
+        """Get the most recent incidents from the source."""
+        return self.data_service.table(self.source).order_by("date", descending=True).limit(limit).collect()
+
+
+_kpi_service: Optional[KpiService] = None
+_kpi_service_lock = threading.Lock()
+
+
+def get_kpi_service() -> KpiService:
+    """Get the KpiService instance.
+
+    Returns:
+        The KpiService singleton
+    """
+    global _kpi_service
+    with _kpi_service_lock:
+        if _kpi_service is None:
+            from app.services.data_service import get_data_service
+            _kpi_service = KpiService(get_data_service())
+        return _kpi_service
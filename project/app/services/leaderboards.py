@@ -0,0 +1,341 @@
+"""Incremental top-K leaderboards (Week 8).
+
+A TopK keeps an exact counter per key plus its K largest counters in a
+min-heap, so folding in an event costs O(log K) and reading the board
+only sorts K entries, instead of a full `value_counts` and sort over the
+rows on every render. Analysts and assignees are few enough for exact
+counters; the heap is what keeps reads independent of the history.
+
+A Leaderboard adds time windows ("last 7 days") on top: events are also
+counted in per-day buckets, each window has its own TopK, and when the
+window end moves forward the buckets sliding out are subtracted from it.
+Buckets older than the longest window are dropped, so memory is bounded
+by the number of keys times the longest window in days.
+"""
+
+import heapq
+import struct
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+_LEADERBOARD_MAGIC = b"LDB1"
+# magic, k, window count, end day, key count, bucket entries, board counters, board members, key text length
+_LEADERBOARD_HEADER = "<4sIIqIIIIQ"
+_NO_END = np.iinfo(np.int64).min
+
+
+def _day_number(day: Any) -> int:
+    """Get the day a timestamp (or date string) falls on, as days since the epoch."""
+    return int(np.datetime64(pd.Timestamp(day).to_datetime64(), "D").astype(np.int64))
+
+
+class TopK:
+    """Exact counters with an incrementally maintained top K.
+
+    Decrementing a key that is on the board (a reopened incident, a
+    reassigned ticket) may let a key outside the board overtake it; the
+    board is then rebuilt from the counters on the next read, O(n log K)
+    once.
+    """
+
+    def __init__(self, k: int = 10):
+        """Initialize an empty TopK.
+
+        Args:
+            k: Number of keys kept on the board
+
+        Raises:
+            ValueError: If k is less than 1
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self._counts: Dict[Hashable, int] = {}
+        self._members: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, Hashable]] = []  # (count, key) of members; outdated entries are skipped
+        self._stale = False
+
+    def update(self, key: Hashable, delta: int = 1) -> None:
+        """Add delta (which may be negative) to a key's counter.
+
+        Args:
+            key: Counted key, e.g. an analyst name
+            delta: Change of the counter
+        """
+        if delta == 0:
+            return
+        count = self._counts.get(key, 0) + delta
+        if count:
+            self._counts[key] = count
+        else:
+            del self._counts[key]
+
+        if key in self._members and delta < 0:
+            self._stale = True
+        if self._stale:
+            return
+
+        if key in self._members:
+            self._members[key] = count
+            heapq.heappush(self._heap, (count, key))
+        elif count > 0 and (len(self._members) < self.k or count > self._floor()):
+            if len(self._members) >= self.k:
+                self._members.pop(heapq.heappop(self._heap)[1])
+            self._members[key] = count
+            heapq.heappush(self._heap, (count, key))
+
+        if len(self._heap) > 2 * self.k + 32:
+            self._heap = [(count, key) for key, count in self._members.items()]
+            heapq.heapify(self._heap)
+
+    def _floor(self) -> int:
+        """Get the smallest count on the board, dropping outdated heap entries."""
+        heap = self._heap
+        while heap and self._members.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0]
+
+    def _rebuild(self) -> None:
+        """Recompute the board from all counters."""
+        best = heapq.nlargest(self.k, self._counts.items(), key=lambda item: item[1])
+        self._members = {key: count for key, count in best if count > 0}
+        self._heap = [(count, key) for key, count in self._members.items()]
+        heapq.heapify(self._heap)
+        self._stale = False
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """Get the largest counters.
+
+        Args:
+            k: Number of entries (at most the board size; default all of it)
+
+        Returns:
+            (key, count) pairs, largest first (ties by key)
+        """
+        if self._stale:
+            self._rebuild()
+        ranked = sorted(self._members.items(), key=lambda item: (-item[1], str(item[0])))
+        return ranked[:k] if k is not None else ranked
+
+    def _restore(self, counts: Dict[Hashable, int], members: Sequence[Hashable], stale: bool) -> None:
+        """Replace every counter and the board members (see `Leaderboard.from_bytes`)."""
+        self._counts = {key: count for key, count in counts.items() if count}
+        self._members = {key: self._counts.get(key, 0) for key in members}
+        self._heap = [(count, key) for key, count in self._members.items()]
+        heapq.heapify(self._heap)
+        self._stale = stale
+
+    def count(self, key: Hashable) -> int:
+        """Get a key's current counter."""
+        return self._counts.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+class Leaderboard:
+    """Top-K counts over all time and over trailing windows of days.
+
+    Windows end at the latest day seen (or passed to `advance`), so a
+    quiet period does not empty a board until time is advanced explicitly.
+    """
+
+    def __init__(self, k: int = 10, windows: Sequence[int] = (7, 30)):
+        """Initialize an empty leaderboard.
+
+        Args:
+            k: Number of keys kept on each board
+            windows: Window lengths in days (the window of length w covers
+                the last w days up to and including the end day)
+
+        Raises:
+            ValueError: If a window is shorter than one day
+        """
+        if any(days < 1 for days in windows):
+            raise ValueError("Windows must be at least one day long")
+        self.k = k
+        self.windows = tuple(sorted(set(windows)))
+        self._all = TopK(k)
+        self._boards = {days: TopK(k) for days in self.windows}
+        self._buckets: Dict[int, Dict[Hashable, int]] = {}
+        self._end: Optional[int] = None
+
+    @property
+    def end(self) -> Optional[pd.Timestamp]:
+        """Last day covered by the windows (None before the first event)."""
+        return pd.Timestamp(self._end, unit="D") if self._end is not None else None
+
+    def update(self, key: Hashable, day: Any, delta: int = 1) -> None:
+        """Count an event (or take one back with a negative delta).
+
+        Args:
+            key: Counted key, e.g. an analyst name
+            day: When the event happened (anything pd.Timestamp accepts)
+            delta: Change of the key's count on that day
+        """
+        self._add(key, _day_number(day), delta)
+
+    def update_frame(self, keys: pd.Series, days: pd.Series, deltas: Optional[pd.Series] = None) -> None:
+        """Count many events at once, one update per distinct (day, key).
+
+        Args:
+            keys: Key of each event
+            days: Timestamp of each event (rows without one are skipped)
+            deltas: Change per event (default 1 each)
+        """
+        frame = pd.DataFrame({
+            "day": pd.to_datetime(days, errors="coerce").dt.floor("D"),
+            "key": keys.to_numpy(),
+            "delta": deltas.to_numpy() if deltas is not None else 1,
+        }).dropna(subset=["day", "key"])
+        if frame.empty:
+            return
+        totals = frame.groupby(["day", "key"], sort=True)["delta"].sum()
+        for (day, key), delta in totals.items():
+            self._add(key, _day_number(day), int(delta))
+
+    def _add(self, key: Hashable, day: int, delta: int) -> None:
+        """Apply one change to the all-time board and the windows covering it."""
+        if self._end is None or day > self._end:
+            self._advance_to(day)
+        self._all.update(key, delta)
+        if not self.windows or day <= self._end - self.windows[-1]:
+            return
+        bucket = self._buckets.setdefault(day, {})
+        bucket[key] = bucket.get(key, 0) + delta
+        for days, board in self._boards.items():
+            if day > self._end - days:
+                board.update(key, delta)
+
+    def advance(self, day: Any) -> None:
+        """Move the window end forward to a day (no-op if it is not later)."""
+        day = _day_number(day)
+        if self._end is None or day > self._end:
+            self._advance_to(day)
+
+    def _advance_to(self, end: int) -> None:
+        """Subtract the buckets sliding out of each window and drop expired ones."""
+        previous, self._end = self._end, end
+        if previous is None:
+            return
+        for days, board in self._boards.items():
+            for day in sorted(self._buckets):
+                if previous - days < day <= end - days:
+                    for key, count in self._buckets[day].items():
+                        board.update(key, -count)
+        if self.windows:
+            for day in [day for day in self._buckets if day <= end - self.windows[-1]]:
+                del self._buckets[day]
+
+    def top(self, window: Optional[int] = None, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """Get a board.
+
+        Args:
+            window: Window length in days (None for all time)
+            k: Number of entries (default the whole board)
+
+        Returns:
+            (key, count) pairs, largest first
+
+        Raises:
+            ValueError: If the window was not configured
+        """
+        if window is None:
+            return self._all.top(k)
+        if window not in self._boards:
+            raise ValueError(f"No {window}-day window (configured: {list(self.windows)})")
+        return self._boards[window].top(k)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the leaderboard to a versioned binary blob.
+
+        Keys are stored once as UTF-8 with offsets; the per-day buckets and
+        each board's counters and members refer to them by position.
+
+        Raises:
+            ValueError: If a key is not a string
+        """
+        boards = [self._all, *(self._boards[days] for days in self.windows)]
+        keys = list(dict.fromkeys([*(key for board in boards for key in (*board._counts, *board._members)),
+                                   *(key for bucket in self._buckets.values() for key in bucket)]))
+        if not all(isinstance(key, str) for key in keys):
+            raise ValueError("Only leaderboards with string keys can be serialized")
+        position = {key: i for i, key in enumerate(keys)}
+        buckets = [(day, position[key], count) for day, bucket in self._buckets.items() for key, count in bucket.items()]
+        counters = [(position[key], count) for board in boards for key, count in board._counts.items()]
+        members = [position[key] for board in boards for key in board._members]
+
+        encoded = [key.encode("utf-8") for key in keys]
+        offsets = np.concatenate(([0], np.cumsum([len(key) for key in encoded]))).astype("<i8")
+        header = struct.pack(_LEADERBOARD_HEADER, _LEADERBOARD_MAGIC, self.k, len(self.windows),
+                             _NO_END if self._end is None else self._end, len(keys), len(buckets), len(counters),
+                             len(members), int(offsets[-1]))
+        return b"".join([
+            header,
+            np.array(self.windows, dtype="<i4").tobytes(),
+            offsets.tobytes(),
+            np.array([day for day, _, _ in buckets], dtype="<i8").tobytes(),
+            np.array([key for _, key, _ in buckets], dtype="<i4").tobytes(),
+            np.array([count for _, _, count in buckets], dtype="<i8").tobytes(),
+            np.array([len(board._counts) for board in boards], dtype="<i4").tobytes(),
+            np.array([key for key, _ in counters], dtype="<i4").tobytes(),
+            np.array([count for _, count in counters], dtype="<i8").tobytes(),
+            np.array([len(board._members) for board in boards], dtype="<i4").tobytes(),
+            np.array(members, dtype="<i4").tobytes(),
+            np.array([board._stale for board in boards], dtype="<i1").tobytes(),
+            *encoded,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Leaderboard":
+        """Deserialize a leaderboard produced by `to_bytes`.
+
+        Raises:
+            ValueError: If the blob is not a serialized Leaderboard
+        """
+        size = struct.calcsize(_LEADERBOARD_HEADER)
+        if len(data) < size:
+            raise ValueError("Not a serialized Leaderboard")
+        (magic, k, window_count, end, key_count, bucket_count, counter_count, member_count,
+         text_length) = struct.unpack_from(_LEADERBOARD_HEADER, data)
+        if magic != _LEADERBOARD_MAGIC:
+            raise ValueError("Not a serialized Leaderboard")
+        board_count = window_count + 1
+        if len(data) != (size + 4 * window_count + 8 * (key_count + 1) + 20 * bucket_count + 12 * counter_count
+                         + 4 * member_count + 9 * board_count + text_length):
+            raise ValueError("Truncated Leaderboard")
+
+        def take(dtype: str, count: int) -> np.ndarray:
+            nonlocal offset
+            array = np.frombuffer(data, dtype=dtype, count=count, offset=offset).astype(np.int64)
+            offset += np.dtype(dtype).itemsize * count
+            return array
+
+        offset = size
+        windows, offsets = take("<i4", window_count), take("<i8", key_count + 1)
+        days, bucket_keys, bucket_counts = take("<i8", bucket_count), take("<i4", bucket_count), take("<i8", bucket_count)
+        counter_sizes, counter_keys, counter_values = (take("<i4", board_count), take("<i4", counter_count),
+                                                       take("<i8", counter_count))
+        member_sizes, members, stale = take("<i4", board_count), take("<i4", member_count), take("<i1", board_count)
+        text = data[offset:]
+        positions = np.concatenate((bucket_keys, counter_keys, members))
+        if ((np.diff(offsets) < 0).any() or offsets[-1] != len(text) or ((positions < 0) | (positions >= key_count)).any()
+                or counter_sizes.sum() != counter_count or member_sizes.sum() != member_count):
+            raise ValueError("Corrupt Leaderboard")
+        keys = [text[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+
+        board = cls(k, windows.tolist())
+        if board.windows != tuple(windows.tolist()):
+            raise ValueError("Corrupt Leaderboard")
+        board._end = None if end == _NO_END else int(end)
+        for day, key, count in zip(days.tolist(), bucket_keys.tolist(), bucket_counts.tolist()):
+            board._buckets.setdefault(day, {})[keys[key]] = count
+
+        counter_ends, member_ends = np.cumsum(counter_sizes), np.cumsum(member_sizes)
+        for i, topk in enumerate([board._all, *(board._boards[days] for days in board.windows)]):
+            span = slice(counter_ends[i] - counter_sizes[i], counter_ends[i])
+            counters = {keys[key]: count for key, count in zip(counter_keys[span].tolist(), counter_values[span].tolist())}
+            span = slice(member_ends[i] - member_sizes[i], member_ends[i])
+            topk._restore(counters, [keys[key] for key in members[span].tolist()], bool(stale[i]))
+        return board
@@ -0,0 +1,406 @@
+"""Server-side pagination for large tables (Week 8).
+
+A page source returns one page of rows with sorting and filtering pushed
+down to where the data lives:
+
+- FramePageSource slices a cached DataFrame. Each filter mask and sort
+  order is computed once and reused, so later pages are O(page size).
+- SqlPageSource queries a SQLite table with keyset pagination
+  (`WHERE (sort, id) > (?, ?) ORDER BY sort, id LIMIT n`). Sequential page
+  turns never scan skipped rows; a jump falls back to LIMIT/OFFSET once
+  (as a deferred join on the key) and keyset takes over from there.
+
+A Paginator wraps a source with a page-size setting, an LRU cache of pages
+and background prefetching of the pages next to the one being shown.
+"""
+
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from contextlib import closing
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.services.query import quote_identifier
+
+# column -> allowed values
+Filters = Dict[str, Sequence[Any]]
+
+
+def _filters_key(filters: Optional[Filters]) -> Tuple:
+    """Turn filters into a hashable cache key."""
+    return tuple(sorted((column, tuple(values)) for column, values in (filters or {}).items()))
+
+
+class PageSource:
+    """Interface of a paginated data source."""
+
+    def columns(self) -> List[str]:
+        """Get the column names."""
+        raise NotImplementedError
+
+    def count(self, filters: Optional[Filters] = None) -> int:
+        """Count the rows matching the filters."""
+        raise NotImplementedError
+
+    def fetch(self, page: int, page_size: int, sort: Optional[str] = None,
+              descending: bool = False, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """Fetch one page (0-based) of rows.
+
+        Args:
+            page: Page number
+            page_size: Rows per page
+            sort: Column to sort by (optional)
+            descending: Sort in descending order
+            filters: Column -> allowed values (optional)
+
+        Returns:
+            The page's rows
+        """
+        raise NotImplementedError
+
+    def refresh(self) -> None:
+        """Forget cached counts and orderings after the data changed."""
+
+
+class FramePageSource(PageSource):
+    """Pages over an in-memory DataFrame.
+
+    Pages within the first `head_rows` of a numeric or datetime sort are
+    served from a partial sort (O(n) selection of the leading rows), so the
+    first screen of a ten-million-row table doesn't wait for a full sort.
+    The full order is only computed once a page beyond that is requested.
+    """
+
+    head_rows = 5_000
+
+    def __init__(self, df: pd.DataFrame, max_cached_orders: int = 8):
+        """Initialize a FramePageSource.
+
+        Args:
+            df: DataFrame to page through (not copied)
+            max_cached_orders: Filter/sort combinations whose row order is kept
+        """
+        self.df = df
+        self.max_cached_orders = max_cached_orders
+        self._orders: "OrderedDict[Tuple, Optional[np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def columns(self) -> List[str]:
+        return list(self.df.columns)
+
+    def _cached(self, key: Tuple, compute) -> Optional[np.ndarray]:
+        """Get a cached row order, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._orders:
+                self._orders.move_to_end(key)
+                return self._orders[key]
+        positions = compute()
+        with self._lock:
+            self._orders[key] = positions
+            while len(self._orders) > self.max_cached_orders:
+                self._orders.popitem(last=False)
+        return positions
+
+    def nbytes(self) -> int:
+        """Get the bytes held by cached row orders (the DataFrame itself is not counted)."""
+        with self._lock:
+            return sum(positions.nbytes for positions in self._orders.values() if positions is not None)
+
+    def _filtered(self, filters: Optional[Filters]) -> Optional[np.ndarray]:
+        """Get the positions of the rows matching the filters (None means all rows)."""
+        def compute():
+            mask = np.ones(len(self.df), dtype=bool)
+            for column, values in filters.items():
+                mask &= self.df[column].isin(list(values)).to_numpy()
+            return np.flatnonzero(mask)
+
+        if not filters:
+            return None
+        return self._cached(("filter", _filters_key(filters)), compute)
+
+    def _positions(self, sort: str, descending: bool, filters: Optional[Filters]) -> np.ndarray:
+        """Get the positions of all matching rows in sort order."""
+        def compute():
+            positions = self._filtered(filters)
+            values = self.df[sort] if positions is None else self.df[sort].iloc[positions]
+            order = values.reset_index(drop=True).sort_values(
+                ascending=not descending, kind="stable", na_position="last"
+            ).index.to_numpy()
+            return order if positions is None else positions[order]
+
+        return self._cached(("sort", sort, descending, _filters_key(filters)), compute)
+
+    def _head(self, sort: str, descending: bool, filters: Optional[Filters]) -> Optional[np.ndarray]:
+        """Get the first `head_rows` positions in sort order without a full sort.
+
+        Returns None when the column can't be partially sorted (text or
+        missing values) or the selection is small enough to sort outright.
+        """
+        def compute():
+            column = self.df[sort]
+            if column.dtype.kind not in "iufM" or column.hasnans or self.count(filters) <= self.head_rows:
+                return None
+            positions = self._filtered(filters)
+            values = column.to_numpy() if positions is None else self.df[sort].to_numpy()[positions]
+            if values.dtype.kind == "M":
+                values = values.view("i8")
+            elif values.dtype.kind == "u":
+                values = values.astype("f8")
+            # Every row tied with the cut-off value is kept, so the stable
+            # sort below yields exactly the prefix of the full stable sort
+            if descending:
+                values = -values
+            threshold = np.partition(values, self.head_rows - 1)[self.head_rows - 1]
+            selected = np.flatnonzero(values <= threshold)
+            selected = selected[np.argsort(values[selected], kind="stable")]
+            return selected if positions is None else positions[selected]
+
+        return self._cached(("head", sort, descending, _filters_key(filters)), compute)
+
+    def count(self, filters: Optional[Filters] = None) -> int:
+        positions = self._filtered(filters)
+        return len(self.df) if positions is None else len(positions)
+
+    def fetch(self, page: int, page_size: int, sort: Optional[str] = None,
+              descending: bool = False, filters: Optional[Filters] = None) -> pd.DataFrame:
+        start, end = page * page_size, (page + 1) * page_size
+        if sort is None:
+            positions = self._filtered(filters)
+        else:
+            full_key = ("sort", sort, descending, _filters_key(filters))
+            positions = None
+            if end <= self.head_rows and full_key not in self._orders:
+                positions = self._head(sort, descending, filters)
+            if positions is None:
+                positions = self._positions(sort, descending, filters)
+        if positions is None:
+            return self.df.iloc[start:end]
+        return self.df.iloc[positions[start:end]]
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._orders.clear()
+
+
+class SqlPageSource(PageSource):
+    """Pages over a SQLite table using keyset pagination."""
+
+    def __init__(self, db_path: Path, table: str, key: str = "id"):
+        """Initialize a SqlPageSource.
+
+        Args:
+            db_path: SQLite database
+            table: Table name
+            key: Unique column used as the keyset tie-breaker
+        """
+        self.db_path = Path(db_path)
+        self.table = table
+        self.key = key
+        self._counts: Dict[Tuple, int] = {}
+        # (page_size, sort, descending, filters, page) -> last (sort value, key) of that page
+        self._boundaries: Dict[Tuple, Tuple[Any, Any]] = {}
+        self._columns: Optional[List[str]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read-only connection."""
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def columns(self) -> List[str]:
+        if self._columns is None:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(f"PRAGMA table_info({quote_identifier(self.table)})").fetchall()
+            if not rows:
+                raise ValueError(f"Table '{self.table}' not found in {self.db_path}")
+            self._columns = [row[1] for row in rows]
+        return self._columns
+
+    def _where(self, filters: Optional[Filters]) -> Tuple[List[str], List[Any]]:
+        """Build WHERE clauses and params for the filters."""
+        clauses, params = [], []
+        for column, values in (filters or {}).items():
+            if column not in self.columns():
+                raise ValueError(f"Column '{column}' not found in '{self.table}'")
+            values = list(values)
+            clauses.append(f"{quote_identifier(column)} IN ({', '.join('?' * len(values))})" if values else "0")
+            params.extend(values)
+        return clauses, params
+
+    def count(self, filters: Optional[Filters] = None) -> int:
+        key = _filters_key(filters)
+        if key not in self._counts:
+            clauses, params = self._where(filters)
+            sql = f"SELECT COUNT(*) FROM {quote_identifier(self.table)}"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            with closing(self._connect()) as conn:
+                self._counts[key] = conn.execute(sql, params).fetchone()[0]
+        return self._counts[key]
+
+    def fetch(self, page: int, page_size: int, sort: Optional[str] = None,
+              descending: bool = False, filters: Optional[Filters] = None) -> pd.DataFrame:
+        if sort is not None and sort not in self.columns():
+            raise ValueError(f"Column '{sort}' not found in '{self.table}'")
+
+        order_columns = [sort, self.key] if sort and sort != self.key else [self.key]
+        direction = " DESC" if descending else ""
+        clauses, params = self._where(filters)
+        state = (page_size, sort, descending, _filters_key(filters))
+        boundary = self._boundaries.get(state + (page - 1,)) if page > 0 else None
+
+        offset = 0
+        if boundary is not None and None not in boundary:
+            # Keyset: continue right after the previous page's last row
+            # (NULL sort values compare as unknown, so those pages use OFFSET)
+            columns = ", ".join(quote_identifier(c) for c in order_columns)
+            marks = ", ".join("?" * len(order_columns))
+            keyset = f"({columns}) {'<' if descending else '>'} ({marks})"
+            if descending and len(order_columns) > 1:
+                # NULLs sort last under DESC and still lie ahead of the boundary
+                keyset = f"({keyset} OR {quote_identifier(sort)} IS NULL)"
+            clauses.append(keyset)
+            params.extend(boundary)
+        else:
+            offset = page * page_size
+
+        table = quote_identifier(self.table)
+        order_by = " ORDER BY " + ", ".join(f"{quote_identifier(c)}{direction}" for c in order_columns)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        if offset:
+            # Deferred join: skip rows on the (covering) index of key and
+            # sort columns, then read full rows for the page only
+            key = quote_identifier(self.key)
+            sql = (f"SELECT * FROM {table} WHERE {key} IN "
+                   f"(SELECT {key} FROM {table}{where}{order_by} LIMIT ? OFFSET ?){order_by}")
+            params.extend([page_size, offset])
+        else:
+            sql = f"SELECT * FROM {table}{where}{order_by} LIMIT ?"
+            params.append(page_size)
+
+        with closing(self._connect()) as conn:
+            rows = pd.read_sql_query(sql, conn, params=params)
+        if len(rows):
+            last = [rows[c].iloc[-1] for c in order_columns]
+            self._boundaries[state + (page,)] = tuple(
+                None if pd.isna(value) else value.item() if hasattr(value, "item") else value
+                for value in last
+            )
+        return rows
+
+    def refresh(self) -> None:
+        self._counts.clear()
+        self._boundaries.clear()
+
+
+class Paginator:
+    """Page cache with adjacent-page prefetching on top of a PageSource."""
+
+    _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+    def __init__(self, source: PageSource, page_size: int = 50, max_cached_pages: int = 16):
+        """Initialize a Paginator.
+
+        Args:
+            source: Where pages come from
+            page_size: Rows per page
+            max_cached_pages: Pages kept in the LRU cache
+
+        Raises:
+            ValueError: If page_size is not positive
+        """
+        if page_size <= 0:
+            raise ValueError("Page size must be positive")
+        self.source = source
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self.sort: Optional[str] = None
+        self.descending = False
+        self.filters: Filters = {}
+        self._pages: "OrderedDict[Tuple, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, page_size: Optional[int] = None, sort: Optional[str] = None,
+                  descending: bool = False, filters: Optional[Filters] = None) -> None:
+        """Change page size, sorting or filters (cached pages stay keyed by them)."""
+        if page_size is not None:
+            if page_size <= 0:
+                raise ValueError("Page size must be positive")
+            self.page_size = page_size
+        self.sort = sort
+        self.descending = descending
+        self.filters = dict(filters or {})
+
+    def total_rows(self) -> int:
+        """Count the rows matching the current filters."""
+        return self.source.count(self.filters)
+
+    def page_count(self) -> int:
+        """Get the number of pages (at least 1)."""
+        return max(1, -(-self.total_rows() // self.page_size))
+
+    def _key(self, page: int) -> Tuple:
+        return (page, self.page_size, self.sort, self.descending, _filters_key(self.filters))
+
+    def _request(self, page: int, background: bool) -> Future:
+        """Get the future of a page, fetching it if not cached."""
+        key = self._key(page)
+        with self._lock:
+            future = self._pages.get(key)
+            if future is not None:
+                self._pages.move_to_end(key)
+                return future
+
+            args = (page, self.page_size, self.sort, self.descending, dict(self.filters))
+            if background:
+                future = self._executor.submit(self.source.fetch, *args)
+            else:
+                future = Future()
+                try:
+                    future.set_result(self.source.fetch(*args))
+                except Exception as e:
+                    future.set_exception(e)
+            self._pages[key] = future
+            while len(self._pages) > self.max_cached_pages:
+                self._pages.popitem(last=False)
+            return future
+
+    def get_page(self, page: int, prefetch: bool = True) -> pd.DataFrame:
+        """Get one page of rows (0-based), prefetching its neighbours.
+
+        Args:
+            page: Page number (clamped to the valid range)
+            prefetch: Fetch the previous and next pages in the background
+
+        Returns:
+            The page's rows
+        """
+        page = min(max(page, 0), self.page_count() - 1)
+        cached = self._key(page) in self._pages
+        self.hits += cached
+        self.misses += not cached
+        rows = self._request(page, background=False).result()
+
+        if prefetch:
+            for neighbour in (page + 1, page - 1):
+                if 0 <= neighbour < self.page_count():
+                    self._request(neighbour, background=True)
+        return rows
+
+    def nbytes(self) -> int:
+        """Get the bytes held by cached pages plus the source's cached orders, if it reports them."""
+        with self._lock:
+            pages = [future.result() for future in self._pages.values()
+                     if future.done() and future.exception() is None]
+        source = self.source.nbytes() if hasattr(self.source, "nbytes") else 0
+        return source + sum(int(page.memory_usage(deep=True).sum()) for page in pages)
+
+    def clear(self) -> None:
+        """Drop all cached pages and the source's cached counts and orderings."""
+        with self._lock:
+            self._pages.clear()
+        self.source.refresh()
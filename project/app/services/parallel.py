@@ -0,0 +1,81 @@
+"""Parallel file loading and partial aggregation (Week 8).
+
+Helpers used by DataService to parse several CSV files concurrently and to
+combine per-file aggregation partials with a pairwise tree reduction.
+"""
+
+import os
+import pandas as pd
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.services.streaming import Aggregation, StreamingPipeline
+
+
+def default_workers() -> int:
+    """Get the default worker count (CPU count, capped at 8)."""
+    return min(8, os.cpu_count() or 1)
+
+
+def make_executor(workers: int, use_processes: bool = False) -> Executor:
+    """Create a thread or process pool.
+
+    Args:
+        workers: Number of workers
+        use_processes: Use a process pool instead of threads
+
+    Returns:
+        The executor
+
+    Raises:
+        ValueError: If workers is not positive
+    """
+    if workers <= 0:
+        raise ValueError("Worker count must be positive")
+    if use_processes:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def read_csv_file(filepath: Path) -> pd.DataFrame:
+    """Parse one CSV file (module-level so process pools can pickle it).
+
+    Raises:
+        ValueError: If the file is not a valid CSV
+    """
+    try:
+        return pd.read_csv(filepath)
+    except pd.errors.ParserError as e:
+        raise ValueError(f"Invalid CSV format in {filepath.name}: {e}")
+
+
+def aggregate_file(pipeline: StreamingPipeline, aggregations: Dict[str, Aggregation]) -> Dict[str, Aggregation]:
+    """Run a streaming pipeline over one file and return its partials."""
+    return pipeline.aggregate(**aggregations)
+
+
+def merge_partials(left: Dict[str, Aggregation], right: Dict[str, Aggregation]) -> Dict[str, Aggregation]:
+    """Merge two sets of partials name by name."""
+    for name, aggregation in left.items():
+        aggregation.merge(right[name])
+    return left
+
+
+def tree_reduce(executor: Executor, partials: List[Dict[str, Aggregation]]) -> Optional[Dict[str, Aggregation]]:
+    """Combine partials pairwise in parallel until one remains.
+
+    Args:
+        executor: Pool used to run the merges
+        partials: Per-file partials
+
+    Returns:
+        The merged partials, or None if there were none
+    """
+    while len(partials) > 1:
+        pairs = list(zip(partials[0::2], partials[1::2]))
+        merged = list(executor.map(merge_partials, *zip(*pairs)))
+        if len(partials) % 2:
+            merged.append(partials[-1])
+        partials = merged
+    return partials[0] if partials else None
@@ -0,0 +1,338 @@
+"""Lazy query builder for DataService (Week 8).
+
+Queries are composed with `where`, `select`, `group_by`, `agg`, `order_by`
+and `limit`, and nothing runs until `collect()`. A query over a database
+table compiles to one parameterized SQL statement pushed down into SQLite;
+a query over a CSV file runs as a single optimized pass over the cached
+frame. `explain()` shows the plan either way.
+"""
+
+import sqlite3
+import pandas as pd
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.profiling import timed
+from app.services.indexing import intersect_positions
+from app.services.streaming import FILTER_OPERATORS
+
+AGG_FUNCTIONS = {
+    "count": "COUNT({})",
+    "sum": "SUM({})",
+    "mean": "AVG({})",
+    "min": "MIN({})",
+    "max": "MAX({})",
+    "nunique": "COUNT(DISTINCT {})",
+}
+
+_SQL_OPERATORS = {"==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=", "in": "IN"}
+
+
+def quote_identifier(identifier: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class Query:
+    """Immutable, lazily evaluated query over a table or cached CSV.
+
+    Every builder method returns a new Query, so partial queries can be
+    shared and extended safely between page sections.
+    """
+
+    def __init__(self, service: Any, name: str, db_path: Optional[Path] = None):
+        """Initialize a query.
+
+        Args:
+            service: DataService used to load and filter CSV sources
+            name: Table name (db_path given) or CSV filename
+            db_path: SQLite database holding the table (optional)
+        """
+        self._service = service
+        self._name = name
+        self._db_path = db_path
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._columns: Optional[List[str]] = None
+        self._group_by: List[str] = []
+        self._aggs: Dict[str, Tuple[Optional[str], str]] = {}
+        self._order_by: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+
+    def _copy(self) -> "Query":
+        """Get a shallow copy with independent plan lists."""
+        query = Query(self._service, self._name, self._db_path)
+        query._filters = list(self._filters)
+        query._columns = None if self._columns is None else list(self._columns)
+        query._group_by = list(self._group_by)
+        query._aggs = dict(self._aggs)
+        query._order_by = list(self._order_by)
+        query._limit = self._limit
+        return query
+
+    @property
+    def is_sql(self) -> bool:
+        """Whether the query is pushed down to SQLite."""
+        return self._db_path is not None
+
+    def where(self, column: str, value: Any, op: str = "==") -> "Query":
+        """Add a row filter.
+
+        Args:
+            column: Column to compare
+            value: Value to compare against (a list for "in")
+            op: One of ==, !=, <, <=, >, >=, in
+
+        Returns:
+            New Query
+
+        Raises:
+            ValueError: If the operator is unknown
+        """
+        if op not in _SQL_OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'")
+        query = self._copy()
+        query._filters.append((column, op, value))
+        return query
+
+    def select(self, *columns: str) -> "Query":
+        """Project onto a subset of columns."""
+        query = self._copy()
+        query._columns = list(columns)
+        return query
+
+    def group_by(self, *columns: str) -> "Query":
+        """Group rows by one or more columns."""
+        query = self._copy()
+        query._group_by = list(columns)
+        return query
+
+    def agg(self, **aggregations: Union[str, Tuple[str, str]]) -> "Query":
+        """Add named aggregations.
+
+        Args:
+            **aggregations: name=(column, func) pairs, or name="count" for a
+                row count; func is one of count, sum, mean, min, max, nunique
+
+        Returns:
+            New Query
+
+        Raises:
+            ValueError: If an aggregation function is unknown or lacks a column
+        """
+        query = self._copy()
+        for name, spec in aggregations.items():
+            column, func = (None, spec) if isinstance(spec, str) else spec
+            if column is None and func != "count":
+                raise ValueError(f"Aggregation '{func}' needs a column")
+            if func not in AGG_FUNCTIONS:
+                raise ValueError(f"Unknown aggregation '{func}'")
+            query._aggs[name] = (column, func)
+        return query
+
+    def order_by(self, column: str, descending: bool = False) -> "Query":
+        """Sort the result by a column (output or aggregation name)."""
+        query = self._copy()
+        query._order_by.append((column, descending))
+        return query
+
+    def limit(self, n: int) -> "Query":
+        """Keep at most n result rows.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Limit must be non-negative")
+        query = self._copy()
+        query._limit = n
+        return query
+
+    def _source_columns(self) -> List[str]:
+        """Get the column names of the underlying table or CSV."""
+        if self.is_sql:
+            with closing(sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True)) as conn:
+                rows = conn.execute(f"PRAGMA table_info({quote_identifier(self._name)})").fetchall()
+            if not rows:
+                raise ValueError(f"Table '{self._name}' not found in {self._db_path}")
+            return [row[1] for row in rows]
+        return list(self._frame().columns)
+
+    def _validate(self) -> None:
+        """Check that every referenced column exists in the source."""
+        available = set(self._source_columns())
+        referenced = [column for column, _, _ in self._filters] + (self._columns or []) + self._group_by
+        referenced += [column for column, _ in self._aggs.values() if column]
+        missing = [column for column in referenced if column not in available]
+        if missing:
+            raise ValueError(f"Columns not found in '{self._name}': {missing}")
+
+        outputs = set(self._aggs) | set(self._group_by) if self._group_by or self._aggs else available
+        for column, _ in self._order_by:
+            if column not in outputs and column not in available:
+                raise ValueError(f"Cannot order by unknown column '{column}'")
+
+    def _aggregations(self) -> Dict[str, Tuple[Optional[str], str]]:
+        """Get the aggregations, defaulting to a row count for group-bys."""
+        if self._group_by and not self._aggs:
+            return {"count": (None, "count")}
+        return self._aggs
+
+    def to_sql(self) -> Tuple[str, List[Any]]:
+        """Compile the query to a parameterized SQL statement.
+
+        Returns:
+            Tuple of (sql, params)
+        """
+        aggs = self._aggregations()
+        if aggs:
+            select = [quote_identifier(column) for column in self._group_by]
+            for name, (column, func) in aggs.items():
+                select.append(f"{AGG_FUNCTIONS[func].format(quote_identifier(column) if column else '*')} AS {quote_identifier(name)}")
+        else:
+            select = [quote_identifier(column) for column in self._columns] if self._columns else ["*"]
+
+        sql = f"SELECT {', '.join(select)} FROM {quote_identifier(self._name)}"
+        params: List[Any] = []
+
+        if self._filters:
+            clauses = []
+            for column, op, value in self._filters:
+                if op == "in":
+                    values = list(value)
+                    clauses.append(f"{quote_identifier(column)} IN ({', '.join('?' * len(values))})")
+                    params.extend(values)
+                else:
+                    clauses.append(f"{quote_identifier(column)} {_SQL_OPERATORS[op]} ?")
+                    params.append(value)
+            sql += " WHERE " + " AND ".join(clauses)
+
+        if self._group_by:
+            sql += " GROUP BY " + ", ".join(quote_identifier(column) for column in self._group_by)
+        if self._order_by:
+            sql += " ORDER BY " + ", ".join(
+                f"{quote_identifier(column)}{' DESC' if descending else ''}" for column, descending in self._order_by
+            )
+        if self._limit is not None:
+            sql += " LIMIT ?"
+            params.append(self._limit)
+
+        return sql, params
+
+    def _frame(self) -> pd.DataFrame:
+        """Get the cached frame for a CSV source, loading it if needed."""
+        df = self._service.get_cached_data(self._name)
+        if df is None:
+            df = self._service.load_csv(self._name)
+        return df
+
+    def _pandas_steps(self) -> List[str]:
+        """Describe the pandas execution plan."""
+        indexes = self._service.get_indexes(self._name)
+        steps = [f"scan cached frame '{self._name}'"]
+
+        indexed = [column for column, op, _ in self._filters if op == "==" and column in indexes]
+        if indexed:
+            steps.append(f"index lookup + intersect on {indexed}")
+        masked = [f"{column} {op} {value!r}" for column, op, value in self._filters
+                  if not (op == "==" and column in indexes)]
+        if masked:
+            steps.append(f"single combined mask: {' AND '.join(masked)}")
+
+        aggs = self._aggregations()
+        if self._group_by:
+            steps.append(f"groupby {self._group_by} agg {aggs}")
+        elif aggs:
+            steps.append(f"agg {aggs}")
+        elif self._columns:
+            steps.append(f"project {self._columns}")
+        if self._order_by:
+            steps.append(f"sort by {self._order_by}")
+        if self._limit is not None:
+            steps.append(f"head({self._limit})")
+        return steps
+
+    def explain(self) -> str:
+        """Describe how the query would run, without running it.
+
+        Returns:
+            Multi-line plan description
+        """
+        self._validate()
+        if self.is_sql:
+            sql, params = self.to_sql()
+            with closing(sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True)) as conn:
+                plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            lines = [f"source: table '{self._name}' in {self._db_path}", "strategy: SQL pushdown",
+                     f"sql: {sql}", f"params: {params}"]
+            lines += [f"sqlite: {row[-1]}" for row in plan]
+            return "\n".join(lines)
+
+        lines = [f"source: CSV '{self._name}'", "strategy: single pass over cached frame"]
+        lines += [f"step {i}: {step}" for i, step in enumerate(self._pandas_steps(), 1)]
+        return "\n".join(lines)
+
+    @timed("data: query")
+    def collect(self) -> pd.DataFrame:
+        """Plan and run the query.
+
+        Returns:
+            Result DataFrame
+
+        Raises:
+            ValueError: If a referenced column doesn't exist
+        """
+        self._validate()
+        if self.is_sql:
+            sql, params = self.to_sql()
+            with closing(sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True)) as conn:
+                return pd.read_sql_query(sql, conn, params=params)
+        return self._collect_frame()
+
+    def _collect_frame(self) -> pd.DataFrame:
+        """Run the query as one pass over the cached frame."""
+        df = self._frame()
+
+        # Equality filters on indexed columns resolve through position
+        # intersection; everything else is folded into one boolean mask
+        indexes = self._service.get_indexes(self._name)
+        lookups = [(column, value) for column, op, value in self._filters
+                   if op == "==" and column in indexes]
+        if lookups:
+            df = df.iloc[intersect_positions([indexes[column].lookup(value) for column, value in lookups])]
+
+        remaining = [(column, op, value) for column, op, value in self._filters
+                     if not (op == "==" and column in indexes)]
+        if remaining:
+            mask = pd.Series(True, index=df.index)
+            for column, op, value in remaining:
+                mask &= FILTER_OPERATORS[op](df[column], value)
+            df = df[mask]
+
+        aggs = self._aggregations()
+        if aggs:
+            named = {}
+            for name, (column, func) in aggs.items():
+                if column is None:
+                    column = self._group_by[0] if self._group_by else df.columns[0]
+                    func = "size"
+                named[name] = (column, func)
+
+            if self._group_by:
+                result = df.groupby(self._group_by, sort=False, dropna=False).agg(**named).reset_index()
+            else:
+                result = pd.DataFrame({
+                    name: [len(df) if func == "size" else df[column].agg(func)]
+                    for name, (column, func) in named.items()
+                })
+        else:
+            result = df[self._columns] if self._columns else df
+
+        if self._order_by:
+            result = result.sort_values(
+                [column for column, _ in self._order_by],
+                ascending=[not descending for _, descending in self._order_by]
+            )
+        if self._limit is not None:
+            result = result.head(self._limit)
+        return result.reset_index(drop=True)
@@ -0,0 +1,362 @@
+"""Time-bucketed rollups for incident and ticket timelines (Week 8).
+
+A TimeRollup keeps event counts per minute, hour and day, broken down by a
+few dimensions such as severity and status. New rows are folded in as they
+arrive, date-range questions are answered by combining whole days with
+hour and minute buckets at the edges, and the rollup persists to disk so it
+survives restarts.
+"""
+
+import json
+import struct
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+ROLLUP_FORMAT_VERSION = 3
+
+_ROLLUP_MAGIC = b"ROL3"
+_ROLLUP_HEADER = "<4sIQ"  # magic, format version, meta JSON length
+
+RESOLUTIONS = {"day": "D", "hour": "h", "minute": "min"}
+
+TimeLike = Union[str, pd.Timestamp]
+
+
+def _aggregate(buckets: np.ndarray, codes: np.ndarray,
+               counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sum counts per (bucket, *codes), sorted by bucket, then codes."""
+    if not len(buckets):
+        return buckets, codes, counts
+    order = np.lexsort((*codes.T[::-1], buckets))
+    buckets, codes, counts = buckets[order], codes[order], counts[order]
+    starts = np.ones(len(buckets), dtype=bool)
+    starts[1:] = (buckets[1:] != buckets[:-1]) | (codes[1:] != codes[:-1]).any(axis=1)
+    starts = np.flatnonzero(starts)
+    return buckets[starts], codes[starts], np.add.reduceat(counts, starts)
+
+
+class TimeRollup:
+    """Multi-resolution event counts by time bucket and dimensions.
+
+    Each resolution holds three parallel arrays sorted by bucket: the
+    bucket start (int64 nanoseconds), the dimension value codes and the
+    count, so storage grows with the number of non-empty buckets, not with
+    rows. Sorted buckets let a date range be found by binary search, and
+    new rows only rewrite the bucket range they fall in.
+    """
+
+    def __init__(self, time_column: str = "date", dimensions: Tuple[str, ...] = ("severity", "status")):
+        """Initialize an empty rollup.
+
+        Args:
+            time_column: Column holding event timestamps
+            dimensions: Columns to break counts down by
+        """
+        self.time_column = time_column
+        self.dimensions = tuple(dimensions)
+        self.rows_seen = 0
+        self.source_fingerprint: Optional[Tuple] = None
+        self._tz: Optional[str] = None
+        self._values: Dict[str, pd.Index] = {dim: pd.Index([], dtype=object) for dim in self.dimensions}
+        self._buckets: Dict[str, np.ndarray] = {res: np.empty(0, dtype=np.int64) for res in RESOLUTIONS}
+        self._codes: Dict[str, np.ndarray] = {
+            res: np.empty((0, len(self.dimensions)), dtype=np.int32) for res in RESOLUTIONS
+        }
+        self._counts: Dict[str, np.ndarray] = {res: np.empty(0, dtype=np.int64) for res in RESOLUTIONS}
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold new rows into every resolution.
+
+        Only the stored buckets between the earliest and latest new bucket
+        are merged; appends in time order touch just the tail.
+
+        Args:
+            df: New rows containing the time column and dimensions
+
+        Raises:
+            ValueError: If a required column is missing, or the rows' time
+                zone differs from the rows already counted
+        """
+        missing = [col for col in (self.time_column, *self.dimensions) if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found in DataFrame: {missing}")
+        if df.empty:
+            return
+
+        times = pd.to_datetime(df[self.time_column], errors="coerce")
+        valid = times.notna().to_numpy()
+        times = pd.DatetimeIndex(times[valid]).as_unit("ns")
+        tz = None if times.tz is None else str(times.tz)
+        if len(self._buckets["minute"]) and len(times) and tz != self._tz:
+            raise ValueError(f"Rollup times are in {self._tz or 'naive time'}, new rows in {tz or 'naive time'}")
+        if len(times):
+            self._tz = tz
+
+        codes = np.empty((len(times), len(self.dimensions)), dtype=np.int32)
+        for i, dim in enumerate(self.dimensions):
+            codes[:, i] = self._encode(dim, df.loc[valid, dim].fillna("Unknown").astype(str))
+
+        # Minute buckets from the rows, coarser ones from the minute buckets
+        buckets, codes, counts = _aggregate(times.floor("min").asi8, codes, np.ones(len(times), dtype=np.int64))
+        for resolution in ("minute", "hour", "day"):
+            if resolution != "minute":
+                coarse = self._decode(buckets).floor(RESOLUTIONS[resolution]).as_unit("ns").asi8
+                buckets, codes, counts = _aggregate(coarse, codes, counts)
+            self._merge(resolution, buckets, codes, counts)
+
+        self.rows_seen += len(df)
+
+    def _encode(self, dimension: str, values: pd.Series) -> np.ndarray:
+        """Map dimension values to codes, registering unseen values."""
+        codes, uniques = pd.factorize(values)
+        known = self._values[dimension]
+        mapping = known.get_indexer(uniques)
+        unseen = mapping < 0
+        if unseen.any():
+            self._values[dimension] = known.append(pd.Index(uniques[unseen], dtype=object))
+            mapping[unseen] = np.arange(len(known), len(known) + unseen.sum())
+        return mapping[codes]
+
+    def _decode(self, buckets: np.ndarray) -> pd.DatetimeIndex:
+        """Turn stored bucket nanoseconds back into timestamps."""
+        index = pd.DatetimeIndex(buckets.astype("datetime64[ns]"))
+        return index if self._tz is None else index.tz_localize("UTC").tz_convert(self._tz)
+
+    def _timestamp(self, when: TimeLike) -> pd.Timestamp:
+        """Parse a range bound, in the rollup's time zone when it has one."""
+        when = pd.Timestamp(when)
+        if self._tz is None:
+            return when
+        return when.tz_localize(self._tz) if when.tzinfo is None else when.tz_convert(self._tz)
+
+    def _position(self, resolution: str, when: pd.Timestamp) -> int:
+        """Get the first stored bucket of a resolution at or after `when`."""
+        when = self._timestamp(when)
+        return int(np.searchsorted(self._buckets[resolution], when.as_unit("ns").value, side="left"))
+
+    def _merge(self, resolution: str, buckets: np.ndarray, codes: np.ndarray, counts: np.ndarray) -> None:
+        """Add aggregated counts, re-aggregating only the bucket range they touch."""
+        if not len(buckets):
+            return
+        stored = self._buckets[resolution]
+        lo = int(np.searchsorted(stored, buckets[0], side="left"))
+        hi = int(np.searchsorted(stored, buckets[-1], side="right"))
+        merged = _aggregate(np.concatenate((stored[lo:hi], buckets)),
+                            np.concatenate((self._codes[resolution][lo:hi], codes)),
+                            np.concatenate((self._counts[resolution][lo:hi], counts)))
+        for arrays, part in zip((self._buckets, self._codes, self._counts), merged):
+            arrays[resolution] = np.concatenate((arrays[resolution][:lo], part, arrays[resolution][hi:]))
+
+    def _cover(self, start: pd.Timestamp, end: pd.Timestamp,
+               levels: Tuple[str, ...] = tuple(RESOLUTIONS)) -> List[Tuple[str, pd.Timestamp, pd.Timestamp]]:
+        """Split [start, end) into the coarsest aligned bucket segments."""
+        if start >= end:
+            return []
+
+        resolution, finer = levels[0], levels[1:]
+        if not finer:
+            return [(resolution, start, end)]
+
+        aligned_start = start.ceil(RESOLUTIONS[resolution])
+        aligned_end = end.floor(RESOLUTIONS[resolution])
+        if aligned_start >= aligned_end:
+            return self._cover(start, end, finer)
+
+        return (self._cover(start, aligned_start, finer)
+                + [(resolution, aligned_start, aligned_end)]
+                + self._cover(aligned_end, end, finer))
+
+    def _slice(self, resolution: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.Series:
+        """Get the counts of one resolution with buckets in [start, end)."""
+        lo, hi = self._position(resolution, start), self._position(resolution, end)
+        codes = self._codes[resolution][lo:hi]
+        index = pd.MultiIndex.from_arrays(
+            [self._decode(self._buckets[resolution][lo:hi]),
+             *(self._values[dim].take(codes[:, i]) for i, dim in enumerate(self.dimensions))],
+            names=["bucket", *self.dimensions])
+        return pd.Series(self._counts[resolution][lo:hi], index=index, dtype="int64")
+
+    def plan(self, start: TimeLike, end: TimeLike) -> List[Tuple[str, pd.Timestamp, pd.Timestamp]]:
+        """Show which bucket resolutions answer a date range.
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+
+        Returns:
+            List of (resolution, segment start, segment end)
+        """
+        return self._cover(self._timestamp(start), self._timestamp(end))
+
+    def total(self, start: TimeLike, end: TimeLike, by: Optional[str] = None) -> Union[int, pd.Series]:
+        """Count events in [start, end), combining coarse and fine buckets.
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+            by: Dimension to break the total down by (optional)
+
+        Returns:
+            Total count, or counts per value of `by`
+
+        Raises:
+            ValueError: If `by` is not a tracked dimension
+        """
+        if by is not None and by not in self.dimensions:
+            raise ValueError(f"'{by}' is not a rollup dimension")
+
+        parts = [self._slice(res, seg_start, seg_end) for res, seg_start, seg_end in self.plan(start, end)]
+        parts = [part for part in parts if not part.empty]
+        if by is None:
+            return int(sum(part.sum() for part in parts))
+        if not parts:
+            return pd.Series(dtype="int64", name="count")
+        return pd.concat(parts).groupby(level=by).sum().rename("count")
+
+    def series(self, start: TimeLike, end: TimeLike, freq: str = "day",
+               by: Optional[str] = None) -> pd.DataFrame:
+        """Get a timeline of counts per bucket.
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+            freq: "minute", "hour", "day" or "week"
+            by: Dimension to split into columns (optional)
+
+        Returns:
+            DataFrame indexed by bucket start, one column per `by` value
+            (or a single "count" column), with empty buckets filled with 0
+
+        Raises:
+            ValueError: If freq or `by` is unknown
+        """
+        if freq not in (*RESOLUTIONS, "week"):
+            raise ValueError(f"Unknown frequency '{freq}'")
+        if by is not None and by not in self.dimensions:
+            raise ValueError(f"'{by}' is not a rollup dimension")
+
+        start, end = self._timestamp(start), self._timestamp(end)
+        resolution = "day" if freq == "week" else freq
+        counts = self._slice(resolution, start, end)
+        levels = ["bucket"] + ([by] if by else [])
+        grouped = counts.groupby(level=levels).sum()
+
+        table = grouped.unstack(by, fill_value=0) if by else grouped.to_frame("count")
+        if freq == "week":
+            table = table.resample("W-MON", label="left", closed="left").sum()
+            monday = start.normalize() - pd.Timedelta(days=start.weekday())
+            index = pd.date_range(monday, end, freq="W-MON", inclusive="left")
+        else:
+            index = pd.date_range(start.floor(RESOLUTIONS[freq]), end, freq=RESOLUTIONS[freq], inclusive="left")
+        return table.reindex(index, fill_value=0).rename_axis("bucket")
+
+    def bucket_count(self) -> Dict[str, int]:
+        """Get the number of stored buckets per resolution."""
+        return {resolution: len(buckets) for resolution, buckets in self._buckets.items()}
+
+    def to_bytes(self) -> bytes:
+        """Serialize the rollup to a versioned binary blob.
+
+        A struct header is followed by a JSON section with the settings,
+        dimension values and per-resolution bucket counts, then the raw
+        little-endian bucket, code and count arrays of each resolution.
+        """
+        meta = {
+            "time_column": self.time_column,
+            "dimensions": list(self.dimensions),
+            "rows_seen": self.rows_seen,
+            "source_fingerprint": None if self.source_fingerprint is None else list(self.source_fingerprint),
+            "tz": self._tz,
+            "values": {dim: [str(value) for value in values] for dim, values in self._values.items()},
+            "buckets": {resolution: len(buckets) for resolution, buckets in self._buckets.items()},
+        }
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        parts = [struct.pack(_ROLLUP_HEADER, _ROLLUP_MAGIC, ROLLUP_FORMAT_VERSION, len(meta_bytes)), meta_bytes]
+        for resolution in RESOLUTIONS:
+            parts.append(self._buckets[resolution].astype("<i8").tobytes())
+            parts.append(self._codes[resolution].astype("<i4").tobytes())
+            parts.append(self._counts[resolution].astype("<i8").tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TimeRollup":
+        """Deserialize a rollup produced by `to_bytes`.
+
+        Raises:
+            ValueError: If the blob is not a serialized TimeRollup
+        """
+        size = struct.calcsize(_ROLLUP_HEADER)
+        if len(data) < size:
+            raise ValueError("Not a serialized TimeRollup: blob too short")
+        magic, version, meta_length = struct.unpack_from(_ROLLUP_HEADER, data)
+        if magic != _ROLLUP_MAGIC:
+            raise ValueError("Not a serialized TimeRollup")
+        if version != ROLLUP_FORMAT_VERSION:
+            raise ValueError("Unsupported rollup format version")
+        try:
+            meta = json.loads(data[size:size + meta_length].decode("utf-8"))
+            rollup = cls(meta["time_column"], meta["dimensions"])
+            rollup.rows_seen = int(meta["rows_seen"])
+            fingerprint = meta["source_fingerprint"]
+            rollup.source_fingerprint = None if fingerprint is None else tuple(fingerprint)
+            rollup._tz = meta["tz"]
+            rollup._values = {dim: pd.Index(meta["values"][dim], dtype=object) for dim in rollup.dimensions}
+            width = len(rollup.dimensions)
+            lengths = {resolution: int(meta["buckets"][resolution]) for resolution in RESOLUTIONS}
+        except (KeyError, TypeError, ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Not a serialized TimeRollup: {e}") from e
+        if len(data) != size + meta_length + sum(n * (16 + 4 * width) for n in lengths.values()):
+            raise ValueError("Not a serialized TimeRollup: truncated arrays")
+
+        offset = size + meta_length
+        for resolution in RESOLUTIONS:
+            n = lengths[resolution]
+            buckets = np.frombuffer(data, dtype="<i8", count=n, offset=offset).astype(np.int64)
+            offset += 8 * n
+            codes = np.frombuffer(data, dtype="<i4", count=n * width, offset=offset).astype(np.int32)
+            offset += 4 * n * width
+            counts = np.frombuffer(data, dtype="<i8", count=n, offset=offset).astype(np.int64)
+            offset += 8 * n
+            rollup._buckets[resolution] = buckets
+            rollup._codes[resolution] = codes.reshape(n, width)
+            rollup._counts[resolution] = counts
+
+        for i, dim in enumerate(rollup.dimensions):
+            if any(len(codes) and not 0 <= codes[:, i].min() <= codes[:, i].max() < len(rollup._values[dim])
+                   for codes in rollup._codes.values()):
+                raise ValueError(f"Rollup codes out of range for '{dim}'")
+        return rollup
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist the rollup to disk atomically.
+
+        Args:
+            path: Destination file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(self.to_bytes())
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TimeRollup":
+        """Load a rollup saved with `save`.
+
+        Args:
+            path: File written by `save`
+
+        Returns:
+            The restored rollup
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not a rollup or has an unsupported
+                format version
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        return cls.from_bytes(path.read_bytes())
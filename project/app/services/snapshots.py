@@ -0,0 +1,446 @@
+"""Snapshots of warm cache state across restarts (Week 8).
+
+A restarted server otherwise rebuilds every cached frame, index, sketch,
+rollup, the KPI cube and the analysis metric frames from the sources.
+Snapshotter periodically writes that derived state to disk and, at boot
+(the "snapshot" warm-up step), loads back every entry whose source is
+unchanged, so warm-up is a file read instead of a rebuild.
+
+Each entry is stored under a key (e.g. "data:incidents.csv") together
+with the fingerprint of its source (DataService.source_fingerprint for
+tables, size and mtime for CSVs); an entry whose fingerprint no longer
+matches is skipped and its cache is built on first use, as before. The
+snapshot directory (DATA/.snapshot, or SNAPSHOT_DIR) holds:
+
+    manifest.json   format version, and per key the fingerprint and metadata
+    <key>.feather   the entry's frame (a dataset, the KPI cube cells, a
+                    metric frame), Arrow IPC (Feather v2, lz4)
+    <key>.bin       named binary sections (indexes, sketches, rollups, the
+                    KPI cube's leaderboard) in a versioned container
+
+Both data files repeat the fingerprint, so a crash between writing a file
+and the manifest can't pair a file with the wrong source. Services take
+part through `save_snapshot(store)` (returning the keys they hold) and
+`restore_snapshot(store)` (returning the entries restored).
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_SECTIONS_MAGIC = b"SNP1"
+_SECTIONS_HEADER = "<4sHI"  # magic, format version, section count
+_SECTION_HEADER = "<HQ"  # name length, payload length
+_FINGERPRINT_SECTION = "__fingerprint__"
+
+# Next to DataService.data_dir (resolved the same way); not read from the
+# service so that starting snapshots doesn't import pandas on the caller's thread
+DEFAULT_DIR = Path(__file__).resolve().parents[2] / "DATA" / ".snapshot"
+
+# Seconds between periodic snapshots (0 disables them)
+DEFAULT_INTERVAL = 300.0
+
+
+def pack_sections(sections: Dict[str, bytes]) -> bytes:
+    """Pack named binary payloads into one versioned blob.
+
+    Args:
+        sections: Section name to payload
+
+    Returns:
+        The packed blob
+    """
+    parts = [struct.pack(_SECTIONS_HEADER, _SECTIONS_MAGIC, SNAPSHOT_FORMAT_VERSION, len(sections))]
+    for name, payload in sections.items():
+        encoded = name.encode("utf-8")
+        parts += [struct.pack(_SECTION_HEADER, len(encoded), len(payload)), encoded, payload]
+    return b"".join(parts)
+
+
+def unpack_sections(data: bytes) -> Dict[str, bytes]:
+    """Unpack a blob written by `pack_sections`.
+
+    Args:
+        data: Packed blob
+
+    Returns:
+        Section name to payload
+
+    Raises:
+        ValueError: If the blob is truncated or has an unsupported version
+    """
+    size = struct.calcsize(_SECTIONS_HEADER)
+    if len(data) < size:
+        raise ValueError("Not a snapshot section file")
+    magic, version, count = struct.unpack_from(_SECTIONS_HEADER, data)
+    if magic != _SECTIONS_MAGIC or version != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError("Unsupported snapshot section format")
+
+    view = memoryview(data)
+    sections = {}
+    offset = size
+    entry_size = struct.calcsize(_SECTION_HEADER)
+    for _ in range(count):
+        if offset + entry_size > len(data):
+            raise ValueError("Truncated snapshot section file")
+        name_length, length = struct.unpack_from(_SECTION_HEADER, data, offset)
+        start = offset + entry_size + name_length
+        if start + length > len(data):
+            raise ValueError("Truncated snapshot section file")
+        sections[bytes(view[offset + entry_size:start]).decode("utf-8")] = bytes(view[start:start + length])
+        offset = start + length
+    return sections
+
+
+@dataclass
+class SnapshotEntry:
+    """State loaded back from a snapshot entry."""
+
+    frame: Optional[Any] = None  # pandas DataFrame
+    sections: Dict[str, bytes] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class SnapshotStore:
+    """Snapshot entries in one directory, validated by source fingerprint."""
+
+    def __init__(self, directory: Path):
+        """Initialize the store (nothing is read until first use).
+
+        Args:
+            directory: Directory holding the manifest and entry files
+        """
+        self.directory = Path(directory)
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+        self.stats = {"saved": 0, "unchanged": 0, "restored": 0, "stale": 0, "failed": 0, "bytes_written": 0}
+        self.last_error: Optional[str] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the manifest file."""
+        return self.directory / "manifest.json"
+
+    def _manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Get the manifest entries, reading them on first use."""
+        if self._entries is None:
+            try:
+                manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+                valid = isinstance(manifest, dict) and manifest.get("version") == SNAPSHOT_FORMAT_VERSION
+                self._entries = manifest.get("entries", {}) if valid else {}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _path(self, key: str, suffix: str) -> Path:
+        """Get a file name for a key that is safe on every filesystem."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=4).hexdigest()
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', key)}-{digest}{suffix}"
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """Get the keys of the stored entries starting with a prefix."""
+        with self._lock:
+            return [key for key in self._manifest() if key.startswith(prefix)]
+
+    def unchanged(self, key: str, fingerprint: Any, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Check whether an entry already holds this version of the state.
+
+        Args:
+            key: Entry key
+            fingerprint: Source fingerprint of the state
+            meta: Metadata describing the state (e.g. row count, indexed
+                columns); it must match too
+
+        Returns:
+            True if saving again would write the same entry
+        """
+        with self._lock:
+            entry = self._manifest().get(key)
+            same = entry is not None and entry["fingerprint"] == str(fingerprint) and entry["meta"] == (meta or {})
+            if same:
+                self.stats["unchanged"] += 1
+            return same
+
+    def save(self, key: str, fingerprint: Any, frame: Optional[Any] = None,
+             sections: Optional[Dict[str, bytes]] = None, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Write an entry (the manifest is updated by `commit`).
+
+        Args:
+            key: Entry key, e.g. "data:incidents.csv"
+            fingerprint: Source fingerprint the state was derived from
+            frame: DataFrame to store as Arrow IPC (optional)
+            sections: Named binary payloads (optional)
+            meta: JSON-serializable metadata returned on restore
+
+        Returns:
+            False if the entry couldn't be written (e.g. a column Arrow
+            can't represent, or pyarrow missing for a frame)
+        """
+        from app.services.arrow_storage import write_frame
+
+        fingerprint = str(fingerprint)
+        entry = {"fingerprint": fingerprint, "meta": meta or {}, "frame": None, "sections": None}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            written = 0
+            if frame is not None:
+                path = self._path(key, ".feather")
+                arrow_strings = any(getattr(dtype, "storage", None) == "pyarrow" for dtype in frame.dtypes)
+                write_frame(frame, path, metadata={"source_fingerprint": fingerprint})
+                entry["frame"], entry["arrow_strings"] = path.name, arrow_strings
+                written += path.stat().st_size
+            if sections:
+                path = self._path(key, ".bin")
+                tmp = path.with_suffix(".bin.tmp")
+                tmp.write_bytes(pack_sections({_FINGERPRINT_SECTION: fingerprint.encode("utf-8"), **sections}))
+                tmp.replace(path)
+                entry["sections"] = path.name
+                written += path.stat().st_size
+        except (ImportError, OSError, TypeError, ValueError) as e:
+            with self._lock:
+                self.stats["failed"] += 1
+                self.last_error = f"{key}: {type(e).__name__}: {e}"
+            return False
+
+        with self._lock:
+            self._manifest()[key] = entry
+            self.stats["saved"] += 1
+            self.stats["bytes_written"] += written
+        return True
+
+    def load(self, key: str, fingerprint: Any) -> Optional[SnapshotEntry]:
+        """Load an entry if it was saved for this source fingerprint.
+
+        Args:
+            key: Entry key
+            fingerprint: Current fingerprint of the entry's source
+
+        Returns:
+            The entry, or None if it is missing, stale or unreadable
+        """
+        from app.services.arrow_storage import read_frame, read_metadata
+
+        fingerprint = str(fingerprint)
+        with self._lock:
+            entry = self._manifest().get(key)
+        if entry is None:
+            return None
+        if entry["fingerprint"] != fingerprint:
+            with self._lock:
+                self.stats["stale"] += 1
+            return None
+
+        try:
+            loaded = SnapshotEntry(meta=dict(entry["meta"]))
+            if entry["frame"]:
+                path = self.directory / entry["frame"]
+                if read_metadata(path).get("source_fingerprint") != fingerprint:
+                    raise ValueError("frame file doesn't match the manifest")
+                loaded.frame = read_frame(path, arrow_strings=entry.get("arrow_strings", False))
+            if entry["sections"]:
+                loaded.sections = unpack_sections((self.directory / entry["sections"]).read_bytes())
+                if loaded.sections.pop(_FINGERPRINT_SECTION, b"").decode("utf-8") != fingerprint:
+                    raise ValueError("section file doesn't match the manifest")
+        except (ImportError, OSError, ValueError) as e:
+            with self._lock:
+                self.stats["failed"] += 1
+                self.last_error = f"{key}: {type(e).__name__}: {e}"
+            return None
+
+        with self._lock:
+            self.stats["restored"] += 1
+        return loaded
+
+    def commit(self, keep: Iterable[str]) -> None:
+        """Write the manifest, dropping entries not in `keep` and their files.
+
+        Args:
+            keep: Keys of the entries that are still current
+        """
+        keep = set(keep)
+        with self._lock:
+            entries = {key: entry for key, entry in self._manifest().items() if key in keep}
+            self._entries = entries
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps({"version": SNAPSHOT_FORMAT_VERSION, "saved_at": time.time(),
+                                       "entries": entries}, indent=1), encoding="utf-8")
+            tmp.replace(self.manifest_path)
+
+            referenced = {name for entry in entries.values() for name in (entry["frame"], entry["sections"]) if name}
+            for path in self.directory.iterdir():
+                if path.suffix in (".feather", ".bin") and path.name not in referenced:
+                    path.unlink(missing_ok=True)
+
+
+def _services() -> List[Any]:
+    """Get the services taking part in snapshots, in restore order.
+
+    DataService comes first: a CSV-backed KPI cube catches up through its
+    cached frame.
+    """
+    from app.services.analysis import get_analysis_service
+    from app.services.data_service import get_data_service
+    from app.services.kpis import get_kpi_service
+
+    return [get_data_service(), get_kpi_service(), get_analysis_service()]
+
+
+class Snapshotter:
+    """Saves service state to a SnapshotStore periodically and restores it at boot."""
+
+    def __init__(self, store: SnapshotStore, interval: float = DEFAULT_INTERVAL,
+                 services: Optional[Callable[[], List[Any]]] = None):
+        """Initialize the Snapshotter.
+
+        Args:
+            store: Where snapshots are kept
+            interval: Seconds between periodic snapshots (0 disables them)
+            services: Returns the services to snapshot (default: DataService,
+                KpiService and AnalysisService)
+        """
+        self.store = store
+        self.interval = interval
+        self.services = services or _services
+        self.last_saved: Optional[float] = None
+        self.last_save_seconds: Optional[float] = None
+        self.last_restore: Optional[Dict[str, Any]] = None
+        self._save_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_saving = False
+
+    def save(self) -> List[str]:
+        """Snapshot every service now; entries whose state is unchanged aren't rewritten.
+
+        Returns:
+            Keys held in the snapshot afterwards
+        """
+        with self._save_lock:
+            started = time.perf_counter()
+            keys = []
+            for service in self.services():
+                keys += service.save_snapshot(self.store)
+            self.store.commit(keys)
+            self.last_saved = time.time()
+            self.last_save_seconds = round(time.perf_counter() - started, 3)
+            return keys
+
+    def restore(self) -> Dict[str, Any]:
+        """Load every entry that is still valid into the services.
+
+        Returns:
+            Dictionary with restored (entries per service), stale and
+            failed counts and seconds
+        """
+        started = time.perf_counter()
+        before = dict(self.store.stats)
+        restored = {type(service).__name__: service.restore_snapshot(self.store) for service in self.services()}
+        self.last_restore = {
+            "restored": restored,
+            "stale": self.store.stats["stale"] - before["stale"],
+            "failed": self.store.stats["failed"] - before["failed"],
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        return self.last_restore
+
+    def start(self, after: Optional[Callable[[], Any]] = None) -> bool:
+        """Start periodic snapshots in a daemon thread, plus one at exit.
+
+        Args:
+            after: Called (and waited for) before the first snapshot, e.g.
+                the warm-up manager's wait, so a half-warm process doesn't
+                replace a complete snapshot
+
+        Returns:
+            False if already started or the interval is 0
+        """
+        if self._thread is not None or self.interval <= 0:
+            return False
+        self._thread = threading.Thread(target=self._run, args=(after,), name="snapshots", daemon=True)
+        self._thread.start()
+        atexit.register(self._save_at_exit)
+        return True
+
+    def stop(self) -> None:
+        """Stop periodic snapshots."""
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        """Get snapshot state for monitoring.
+
+        Returns:
+            Dictionary with directory, interval, last_saved, last_save_seconds,
+            last_restore, last_error and the store counters
+        """
+        return {
+            "directory": str(self.store.directory),
+            "interval": self.interval,
+            "last_saved": self.last_saved,
+            "last_save_seconds": self.last_save_seconds,
+            "last_restore": self.last_restore,
+            "last_error": self.store.last_error,
+            **self.store.stats,
+        }
+
+    def _run(self, after: Optional[Callable[[], Any]]) -> None:
+        """Wait for `after`, then snapshot every interval until stopped."""
+        if after is not None:
+            after()
+        self._started_saving = True
+        while not self._stop.wait(self.interval):
+            try:
+                self.save()
+            except Exception as e:  # a failed snapshot must not stop the next one
+                self.store.last_error = f"{type(e).__name__}: {e}"
+
+    def _save_at_exit(self) -> None:
+        """Take a last snapshot when the process shuts down cleanly."""
+        if self._started_saving and not self._stop.is_set():
+            try:
+                self.save()
+            except Exception:
+                pass  # the previous snapshot stays valid
+
+
+_snapshotter: Optional[Snapshotter] = None
+_snapshotter_lock = threading.Lock()
+
+
+def get_snapshotter() -> Snapshotter:
+    """Get the Snapshotter instance (directory from SNAPSHOT_DIR, interval from SNAPSHOT_INTERVAL).
+
+    Returns:
+        The Snapshotter singleton
+    """
+    global _snapshotter
+    with _snapshotter_lock:
+        if _snapshotter is None:
+            directory = os.getenv("SNAPSHOT_DIR", DEFAULT_DIR)
+            interval = float(os.getenv("SNAPSHOT_INTERVAL", str(DEFAULT_INTERVAL)))
+            _snapshotter = Snapshotter(SnapshotStore(Path(directory)), interval)
+        return _snapshotter
+
+
+def start_snapshots(after: Optional[Callable[[], Any]] = None) -> Snapshotter:
+    """Start periodic snapshots (once per process).
+
+    Args:
+        after: Called before the first snapshot (see `Snapshotter.start`)
+
+    Returns:
+        The Snapshotter, for save(), restore() and status()
+    """
+    snapshotter = get_snapshotter()
+    snapshotter.start(after)
+    return snapshotter
@@ -0,0 +1,204 @@
+"""Vectorized and incremental summary statistics (Week 8).
+
+Provides a one-pass summary over all numeric columns of a DataFrame and an
+incremental statistics object that folds in new chunks using the parallel
+variance (Welford/Chan) formulas, so a growing dataset never has to be
+rescanned.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from app.services.sketches import TDigest
+
+
+def summarize_columns(df: pd.DataFrame, columns: List[str]) -> Dict:
+    """Compute mean, median, std, min and max for several columns at once.
+
+    The columns are converted to one float matrix and every statistic is
+    computed column-wise in a single vectorized call.
+
+    Args:
+        df: DataFrame to analyze
+        columns: Numeric columns to summarize
+
+    Returns:
+        Dictionary of column name to statistics
+    """
+    if not columns:
+        return {}
+
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    counts = np.count_nonzero(~np.isnan(values), axis=0)
+
+    # The NaN-aware reductions are several times slower, so only pay for
+    # them when some value is actually missing
+    if counts.min() == len(values):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = values.mean(axis=0)
+            stds = values.std(axis=0, ddof=1)
+            mins = values.min(axis=0)
+            maxs = values.max(axis=0)
+            medians = np.median(values, axis=0)
+    else:
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            means = np.nanmean(values, axis=0)
+            stds = np.nanstd(values, axis=0, ddof=1)
+            mins = np.nanmin(values, axis=0)
+            maxs = np.nanmax(values, axis=0)
+            medians = np.nanmedian(values, axis=0)
+
+    stds[counts < 2] = np.nan
+
+    stats = {
+        col: {
+            'mean': means[i],
+            'median': medians[i],
+            'std': stds[i],
+            'min': mins[i],
+            'max': maxs[i]
+        }
+        for i, col in enumerate(columns)
+    }
+
+    # Integer columns report min and max in their own type (and exactly,
+    # beyond the 2**53 a float can hold)
+    for col in columns:
+        if pd.api.types.is_integer_dtype(df[col].dtype):
+            stats[col]['min'], stats[col]['max'] = df[col].min(), df[col].max()
+    return stats
+
+
+class IncrementalStats:
+    """Running summary statistics for a set of numeric columns.
+
+    Count, mean and the sum of squared deviations are merged with the
+    parallel variance formulas; medians come from a mergeable TDigest per
+    column. Updating costs time proportional to the new rows only.
+    """
+
+    def __init__(self, columns: List[str], compression: float = 200.0):
+        """Initialize empty running statistics.
+
+        Args:
+            columns: Numeric columns to track
+            compression: TDigest compression used for medians
+        """
+        self.columns = list(columns)
+        width = len(self.columns)
+        self._count = np.zeros(width, dtype=np.float64)
+        self._mean = np.zeros(width, dtype=np.float64)
+        self._m2 = np.zeros(width, dtype=np.float64)
+        self._min = np.full(width, np.inf)
+        self._max = np.full(width, -np.inf)
+        self._digests = [TDigest(compression) for _ in self.columns]
+        self._integer_types: Dict[str, type] = {}
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold a chunk of new rows into the statistics.
+
+        Args:
+            df: New rows containing the tracked columns
+
+        Raises:
+            ValueError: If a tracked column is missing from the chunk
+        """
+        missing = [col for col in self.columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found in DataFrame: {missing}")
+        if df.empty:
+            return
+
+        for col in self.columns:
+            if pd.api.types.is_integer_dtype(df[col].dtype):
+                self._integer_types.setdefault(col, df[col].dtype.type)
+
+        values = df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0).astype(np.float64)
+        filled = np.where(valid, values, 0.0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, filled.sum(axis=0) / count, 0.0)
+        m2 = (np.where(valid, values - mean, 0.0) ** 2).sum(axis=0)
+
+        self._combine(count, mean, m2,
+                      np.where(valid, values, np.inf).min(axis=0),
+                      np.where(valid, values, -np.inf).max(axis=0))
+
+        for i, digest in enumerate(self._digests):
+            digest.update(values[valid[:, i], i])
+
+    def merge(self, other: "IncrementalStats") -> "IncrementalStats":
+        """Merge statistics computed over another set of rows.
+
+        Args:
+            other: Statistics over the same columns
+
+        Returns:
+            This object, for chaining
+
+        Raises:
+            ValueError: If the tracked columns differ
+        """
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge statistics over different columns")
+
+        self._combine(other._count, other._mean, other._m2, other._min, other._max)
+        for col, integer_type in other._integer_types.items():
+            self._integer_types.setdefault(col, integer_type)
+        for digest, other_digest in zip(self._digests, other._digests):
+            digest.merge(other_digest)
+        return self
+
+    def _combine(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray,
+                 mins: np.ndarray, maxs: np.ndarray) -> None:
+        """Combine partial moments with the parallel variance formulas."""
+        total = self._count + count
+        delta = mean - self._mean
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, count / total, 0.0)
+            self._m2 = self._m2 + m2 + delta ** 2 * self._count * weight
+
+        self._mean = self._mean + delta * weight
+        self._count = total
+        self._min = np.minimum(self._min, mins)
+        self._max = np.maximum(self._max, maxs)
+
+    def row_count(self) -> int:
+        """Get the largest number of non-missing values seen in any column."""
+        return int(self._count.max()) if len(self._count) else 0
+
+    def summary(self, columns: Optional[List[str]] = None) -> Dict:
+        """Get the current statistics.
+
+        Args:
+            columns: Subset of tracked columns (optional)
+
+        Returns:
+            Dictionary in the same shape as DataService.get_summary_stats
+        """
+        stats = {}
+        for i, col in enumerate(self.columns):
+            if columns is not None and col not in columns:
+                continue
+
+            count = self._count[i]
+            if count == 0:
+                stats[col] = dict.fromkeys(['mean', 'median', 'std', 'min', 'max'], np.nan)
+                continue
+
+            # min and max are tracked as floats; integer columns get their type back
+            integer_type = self._integer_types.get(col)
+            stats[col] = {
+                'mean': self._mean[i],
+                'median': self._digests[i].median(),
+                'std': np.sqrt(self._m2[i] / (count - 1)) if count > 1 else np.nan,
+                'min': integer_type(self._min[i]) if integer_type else self._min[i],
+                'max': integer_type(self._max[i]) if integer_type else self._max[i]
+            }
+        return stats
@@ -0,0 +1,327 @@
+"""Out-of-core chunked analytics (Week 8).
+
+Streams a CSV through `pd.read_csv(chunksize=...)` and pushes each chunk
+through a filter → projection → aggregation pipeline. Aggregations are
+mergeable partials, so the full file is never materialized and results from
+several files or workers can be combined afterwards.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.services.sketches import TDigest
+
+FILTER_OPERATORS = {
+    "==": lambda col, value: col == value,
+    "!=": lambda col, value: col != value,
+    "<": lambda col, value: col < value,
+    "<=": lambda col, value: col <= value,
+    ">": lambda col, value: col > value,
+    ">=": lambda col, value: col >= value,
+    "in": lambda col, value: col.isin(value),
+}
+
+
+class Aggregation:
+    """Base class for mergeable chunk aggregations.
+
+    Subclasses fold chunks in with `update`, combine partials with `merge`
+    and report the final value with `result`.
+    """
+
+    def columns(self) -> List[str]:
+        """Get the columns this aggregation reads."""
+        return []
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold a chunk into the partial result."""
+        raise NotImplementedError
+
+    def merge(self, other: "Aggregation") -> "Aggregation":
+        """Merge another partial of the same kind into this one."""
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        """Get the aggregated value."""
+        raise NotImplementedError
+
+    def empty_copy(self) -> "Aggregation":
+        """Get a fresh aggregation with the same configuration."""
+        raise NotImplementedError
+
+
+class Count(Aggregation):
+    """Count rows, or non-missing values of a column."""
+
+    def __init__(self, column: Optional[str] = None):
+        self.column = column
+        self._count = 0
+
+    def columns(self) -> List[str]:
+        return [self.column] if self.column else []
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self._count += int(chunk[self.column].count()) if self.column else len(chunk)
+
+    def merge(self, other: "Count") -> "Count":
+        self._count += other._count
+        return self
+
+    def result(self) -> int:
+        return self._count
+
+    def empty_copy(self) -> "Count":
+        return Count(self.column)
+
+
+class Sum(Aggregation):
+    """Sum a numeric column."""
+
+    def __init__(self, column: str):
+        self.column = column
+        self._total = 0.0
+
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self._total += float(chunk[self.column].sum())
+
+    def merge(self, other: "Sum") -> "Sum":
+        self._total += other._total
+        return self
+
+    def result(self) -> float:
+        return self._total
+
+    def empty_copy(self) -> "Sum":
+        return Sum(self.column)
+
+
+class MinMax(Aggregation):
+    """Track the minimum and maximum of a column."""
+
+    def __init__(self, column: str):
+        self.column = column
+        self._min = None
+        self._max = None
+
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        values = chunk[self.column].dropna()
+        if not values.empty:
+            self._fold(values.min(), values.max())
+
+    def _fold(self, low: Any, high: Any) -> None:
+        self._min = low if self._min is None else min(self._min, low)
+        self._max = high if self._max is None else max(self._max, high)
+
+    def merge(self, other: "MinMax") -> "MinMax":
+        if other._min is not None:
+            self._fold(other._min, other._max)
+        return self
+
+    def result(self) -> Tuple[Any, Any]:
+        return self._min, self._max
+
+    def empty_copy(self) -> "MinMax":
+        return MinMax(self.column)
+
+
+class Quantiles(Aggregation):
+    """Approximate quantiles of a numeric column via a TDigest."""
+
+    def __init__(self, column: str, quantiles: Sequence[float] = (0.5,), compression: float = 200.0):
+        self.column = column
+        self.quantiles = tuple(quantiles)
+        self.compression = compression
+        self._digest = TDigest(compression)
+
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self._digest.update(chunk[self.column].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def merge(self, other: "Quantiles") -> "Quantiles":
+        self._digest.merge(other._digest)
+        return self
+
+    def result(self) -> Dict[float, float]:
+        return {q: self._digest.quantile(q) for q in self.quantiles}
+
+    def empty_copy(self) -> "Quantiles":
+        return Quantiles(self.column, self.quantiles, self.compression)
+
+
+class GroupBy(Aggregation):
+    """Group-by partials: row counts and optional sums per group.
+
+    Each chunk is reduced with `groupby` and the small partial frames are
+    re-reduced, so memory is bounded by the number of groups.
+    """
+
+    def __init__(self, by: Union[str, List[str]], sum_columns: Optional[List[str]] = None):
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.sum_columns = list(sum_columns or [])
+        self._partial: Optional[pd.DataFrame] = None
+
+    def columns(self) -> List[str]:
+        return self.by + self.sum_columns
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        grouped = chunk.groupby(self.by, dropna=False)
+        partial = grouped[self.sum_columns].sum() if self.sum_columns else pd.DataFrame(index=grouped.size().index)
+        partial["count"] = grouped.size()
+        self._combine(partial)
+
+    def _combine(self, partial: pd.DataFrame) -> None:
+        if self._partial is None:
+            self._partial = partial
+        else:
+            merged = pd.concat([self._partial, partial])
+            self._partial = merged.groupby(level=list(range(merged.index.nlevels)), dropna=False).sum()
+
+    def merge(self, other: "GroupBy") -> "GroupBy":
+        if other._partial is not None:
+            self._combine(other._partial)
+        return self
+
+    def result(self) -> pd.DataFrame:
+        if self._partial is None:
+            return pd.DataFrame(columns=self.sum_columns + ["count"])
+        return self._partial.sort_index()
+
+    def empty_copy(self) -> "GroupBy":
+        return GroupBy(self.by, self.sum_columns)
+
+
+class StreamingPipeline:
+    """Chunked filter → projection → aggregation pipeline over a CSV file.
+
+    Only the columns needed by filters, projection and aggregations are
+    parsed, and at most one chunk is held in memory at a time.
+    """
+
+    def __init__(self, filepath: Union[str, Path], chunksize: int = 100_000):
+        """Initialize a pipeline.
+
+        Args:
+            filepath: Path to the CSV file
+            chunksize: Rows parsed per chunk
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If chunksize is not positive
+        """
+        self.filepath = Path(filepath)
+        if not self.filepath.exists():
+            raise FileNotFoundError(f"File not found: {self.filepath}")
+        if chunksize <= 0:
+            raise ValueError("Chunk size must be positive")
+
+        self.chunksize = chunksize
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._columns: Optional[List[str]] = None
+
+    def where(self, column: str, value: Any, op: str = "==") -> "StreamingPipeline":
+        """Add a row filter.
+
+        Args:
+            column: Column to compare
+            value: Value to compare against
+            op: One of ==, !=, <, <=, >, >=, in
+
+        Returns:
+            The pipeline, for chaining
+
+        Raises:
+            ValueError: If the operator is unknown
+        """
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'")
+        self._filters.append((column, op, value))
+        return self
+
+    def select(self, columns: List[str]) -> "StreamingPipeline":
+        """Project the chunks onto a subset of columns.
+
+        Args:
+            columns: Columns to keep
+
+        Returns:
+            The pipeline, for chaining
+        """
+        self._columns = list(columns)
+        return self
+
+    def _usecols(self, extra: List[str]) -> Optional[List[str]]:
+        """Get the columns to parse, or None for all columns."""
+        if self._columns is None and not extra:
+            return None
+        needed = list(self._columns or []) + [column for column, _, _ in self._filters] + extra
+        return list(dict.fromkeys(needed))
+
+    def iter_chunks(self, extra_columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Iterate over filtered, projected chunks.
+
+        Args:
+            extra_columns: Additional columns to parse (used by aggregations)
+
+        Yields:
+            DataFrame chunks
+
+        Raises:
+            ValueError: If the file is not a valid CSV
+        """
+        extra_columns = extra_columns or []
+        usecols = self._usecols(extra_columns)
+        keep = None
+        if self._columns is not None:
+            keep = list(dict.fromkeys(self._columns + extra_columns))
+
+        try:
+            reader = pd.read_csv(self.filepath, chunksize=self.chunksize, usecols=usecols)
+            for chunk in reader:
+                for column, op, value in self._filters:
+                    chunk = chunk[FILTER_OPERATORS[op](chunk[column], value)]
+                if keep is not None:
+                    chunk = chunk[keep]
+                yield chunk
+        except pd.errors.ParserError as e:
+            raise ValueError(f"Invalid CSV format: {e}")
+
+    def aggregate(self, **aggregations: Aggregation) -> Dict[str, Aggregation]:
+        """Run the pipeline and fold every chunk into the aggregations.
+
+        Args:
+            **aggregations: Name=Aggregation pairs
+
+        Returns:
+            The same aggregations holding partial state (mergeable); call
+            `result()` on each for the final values
+        """
+        extra = []
+        for aggregation in aggregations.values():
+            extra.extend(aggregation.columns())
+
+        for chunk in self.iter_chunks(extra_columns=extra or None):
+            for aggregation in aggregations.values():
+                aggregation.update(chunk)
+
+        return aggregations
+
+    def run(self, **aggregations: Aggregation) -> Dict[str, Any]:
+        """Run the pipeline and return final aggregation results.
+
+        Args:
+            **aggregations: Name=Aggregation pairs
+
+        Returns:
+            Dictionary of name to result
+        """
+        return {name: agg.result() for name, agg in self.aggregate(**aggregations).items()}
@@ -0,0 +1,122 @@
+"""Tail-following refresh for append-only CSV exports (Week 8).
+
+Remembers how far into a file the cached frame goes (byte offset, row
+count, header) plus small signatures of the parsed region. A refresh then
+parses only the bytes appended since, and reports a rewrite or truncation
+so the caller can fall back to a full reload.
+"""
+
+import hashlib
+import io
+import pandas as pd
+from pathlib import Path
+from typing import Optional
+
+SIGNATURE_BYTES = 4096
+
+
+def _signature(f, start: int, length: int) -> str:
+    """Hash `length` bytes of an open file starting at `start`."""
+    f.seek(start)
+    return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+class TailState:
+    """How much of a CSV file has been parsed into the cache."""
+
+    def __init__(self, offset: int, rows: int, header: bytes, head_sig: str, tail_sig: str):
+        """Initialize a TailState.
+
+        Args:
+            offset: Byte offset just past the last parsed row
+            rows: Number of rows parsed so far
+            header: Raw header line (including newline)
+            head_sig: Signature of the first bytes of the file
+            tail_sig: Signature of the bytes just before `offset`
+        """
+        self.offset = offset
+        self.rows = rows
+        self.header = header
+        self.head_sig = head_sig
+        self.tail_sig = tail_sig
+
+    @classmethod
+    def capture(cls, filepath: Path, size: int, rows: int) -> Optional["TailState"]:
+        """Record the state after parsing the first `size` bytes of a file.
+
+        Args:
+            filepath: CSV file that was parsed
+            size: File size observed before parsing
+            rows: Rows the parse produced
+
+        Returns:
+            TailState, or None if the parsed region doesn't end on a row
+            boundary (the next refresh must then reload fully)
+        """
+        if size == 0:
+            return None
+
+        with filepath.open("rb") as f:
+            header = f.readline()
+            f.seek(size - 1)
+            if f.read(1) != b"\n" or len(header) > size:
+                return None
+            head_sig = _signature(f, 0, min(size, SIGNATURE_BYTES))
+            tail_start = max(0, size - SIGNATURE_BYTES)
+            tail_sig = _signature(f, tail_start, size - tail_start)
+
+        return cls(size, rows, header, head_sig, tail_sig)
+
+    def is_rewritten(self, filepath: Path) -> bool:
+        """Check whether the parsed region changed or the file shrank."""
+        try:
+            size = filepath.stat().st_size
+            if size < self.offset:
+                return True
+            with filepath.open("rb") as f:
+                tail_start = max(0, self.offset - SIGNATURE_BYTES)
+                return (_signature(f, 0, min(self.offset, SIGNATURE_BYTES)) != self.head_sig
+                        or _signature(f, tail_start, self.offset - tail_start) != self.tail_sig)
+        except OSError:
+            return True
+
+    def read_appended(self, filepath: Path) -> pd.DataFrame:
+        """Parse complete rows appended after the recorded offset.
+
+        A trailing partial row (still being written) is left for the next
+        refresh. The state is advanced past the parsed rows.
+
+        Args:
+            filepath: CSV file to read
+
+        Returns:
+            DataFrame of new rows (possibly empty)
+
+        Raises:
+            ValueError: If the appended bytes are not valid CSV
+        """
+        with filepath.open("rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return pd.read_csv(io.BytesIO(self.header)).iloc[0:0]
+
+        data = data[:end]
+        try:
+            new_rows = pd.read_csv(io.BytesIO(self.header + data))
+        except pd.errors.ParserError as e:
+            raise ValueError(f"Invalid CSV format in appended rows: {e}")
+
+        with filepath.open("rb") as f:
+            new_offset = self.offset + end
+            tail_start = max(0, new_offset - SIGNATURE_BYTES)
+            self.tail_sig = _signature(f, tail_start, new_offset - tail_start)
+            if self.offset < SIGNATURE_BYTES:
+                self.head_sig = _signature(f, 0, min(new_offset, SIGNATURE_BYTES))
+
+        new_rows.index = pd.RangeIndex(self.rows, self.rows + len(new_rows))
+        self.offset = new_offset
+        self.rows += len(new_rows)
+        return new_rows
@@ -0,0 +1,281 @@
+"""Background cache warm-up (Week 8).
+
+Without warm-up the first user after a deploy pays for parsing CSVs,
+building indexes and rollups, reading the SQLite tables and building the
+KPI cube and analysis metric frames. WarmupManager runs a configurable
+list of steps in a daemon thread at process start (see serve.py), so the
+server accepts requests at once and the caches fill behind it; a request
+that needs a cache still being built waits for that build instead of
+starting a second one wherever the service holds a lock (KpiService).
+
+Steps come from warmup.json next to Home.py, or the file named by
+WARMUP_CONFIG:
+
+    {"steps": [
+        {"kind": "snapshot"},
+        {"kind": "kpis"},
+        {"kind": "metrics", "dataset": "cyber_incidents"},
+        {"kind": "dataset", "file": "incidents.csv", "index_columns": ["severity"]},
+        {"kind": "index", "file": "incidents.csv", "columns": ["status"]},
+        {"kind": "rollup", "file": "incidents.csv", "time_column": "date"}
+    ]}
+
+A "snapshot" step loads the state saved by the previous process (see
+app.services.snapshots); put it first so the steps after it find their
+caches restored and return at once, rebuilding only what changed.
+
+Readiness is reported by `status()` and over HTTP by
+`start_readiness_server`: GET /ready answers 503 while warming and 200
+once every step has finished, so a load balancer can hold traffic back
+from cold workers. Failed steps are listed but don't keep a worker out of
+rotation; its caches are then simply built on first use, as before.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CONFIG = Path(__file__).parent.parent.parent / "warmup.json"
+
+# Options each step kind needs
+STEP_OPTIONS = {
+    "snapshot": (),
+    "dataset": ("file",),
+    "index": ("file", "columns"),
+    "rollup": ("file",),
+    "kpis": (),
+    "metrics": ("dataset",),
+}
+
+
+@dataclass
+class WarmupStep:
+    """One warm-up step and its outcome."""
+
+    kind: str
+    options: Dict[str, Any]
+    status: str = "pending"  # pending, running, done or failed
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """Short description, e.g. "metrics cyber_incidents"."""
+        target = self.options.get("file") or self.options.get("dataset") or ""
+        return f"{self.kind} {target}".strip()
+
+
+def load_steps(path: Path) -> List[WarmupStep]:
+    """Read warm-up steps from a JSON config file.
+
+    Args:
+        path: Config file ({"steps": [{"kind": ..., ...}, ...]})
+
+    Returns:
+        The steps in order (none if the file doesn't exist)
+
+    Raises:
+        ValueError: If a step has an unknown kind or lacks an option
+    """
+    if not path.exists():
+        return []
+    steps = []
+    for number, spec in enumerate(json.loads(path.read_text(encoding="utf-8")).get("steps", []), 1):
+        spec = dict(spec)
+        kind = spec.pop("kind", None)
+        if kind not in STEP_OPTIONS:
+            raise ValueError(f"Warm-up step {number}: unknown kind '{kind}'; use one of {list(STEP_OPTIONS)}")
+        missing = [option for option in STEP_OPTIONS[kind] if option not in spec]
+        if missing:
+            raise ValueError(f"Warm-up step {number} ({kind}): missing {', '.join(missing)}")
+        steps.append(WarmupStep(kind, spec))
+    return steps
+
+
+class WarmupManager:
+    """Runs warm-up steps once in a background thread and reports readiness."""
+
+    def __init__(self, steps: List[WarmupStep]):
+        """Initialize the manager.
+
+        Args:
+            steps: Steps to run, in order
+        """
+        self.steps = steps
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """Start warming in a daemon thread.
+
+        Returns:
+            False if warm-up was already started
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    @property
+    def ready(self) -> bool:
+        """Whether every step has finished (done or failed)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finishes.
+
+        Returns:
+            True if it finished within the timeout
+        """
+        return self._done.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """Get the warm-up state for readiness checks and monitoring.
+
+        Returns:
+            Dictionary with state ("idle", "warming", "ready" or
+            "degraded" when a step failed), ready, seconds and the steps
+        """
+        with self._lock:
+            steps = [{"step": step.label, "status": step.status, "seconds": step.seconds, "error": step.error}
+                     for step in self.steps]
+        if self.started_at is None:
+            state = "idle"
+        elif not self.ready:
+            state = "warming"
+        else:
+            state = "degraded" if any(step["status"] == "failed" for step in steps) else "ready"
+        end = self.finished_at or time.time()
+        return {
+            "state": state,
+            "ready": self.ready,
+            "seconds": round(end - self.started_at, 3) if self.started_at else None,
+            "steps": steps,
+        }
+
+    def _run(self) -> None:
+        """Run every step, recording how each went."""
+        for step in self.steps:
+            with self._lock:
+                step.status = "running"
+            started = time.perf_counter()
+            try:
+                self._run_step(step)
+                status, error = "done", None
+            except Exception as e:  # a failed step must not stop the others
+                status, error = "failed", f"{type(e).__name__}: {e}"
+            with self._lock:
+                step.status, step.error = status, error
+                step.seconds = round(time.perf_counter() - started, 3)
+        self.finished_at = time.time()
+        self._done.set()
+
+    @staticmethod
+    def _run_step(step: WarmupStep) -> None:
+        """Fill the caches one step stands for."""
+        # Imported here so starting warm-up doesn't import pandas on the caller's thread
+        from app.services.data_service import get_data_service
+
+        data_service = get_data_service()
+        options = step.options
+        if step.kind == "snapshot":
+            from app.services.snapshots import get_snapshotter
+            get_snapshotter().restore()
+        elif step.kind == "dataset":
+            if data_service.get_cached_data(options["file"]) is not None:  # restored from a snapshot
+                indexes = data_service.get_indexes(options["file"])
+                missing = [column for column in options.get("index_columns") or [] if column not in indexes]
+                if missing:
+                    data_service.build_index(options["file"], missing)
+            elif data_service.load_csv(options["file"], index_columns=options.get("index_columns")) is None:
+                raise ValueError(f"Could not load {options['file']}")
+        elif step.kind == "index":
+            if data_service.get_cached_data(options["file"]) is None:
+                data_service.load_csv(options["file"])
+            data_service.build_index(options["file"], list(options["columns"]))
+        elif step.kind == "rollup":
+            data_service.get_rollup(options["file"], time_column=options.get("time_column", "date"),
+                                    dimensions=tuple(options.get("dimensions", ("severity", "status"))))
+        elif step.kind == "kpis":
+            from app.services.kpis import get_kpi_service
+            get_kpi_service().kpis()
+        elif step.kind == "metrics":
+            from app.services.analysis import get_analysis_service
+            get_analysis_service().metrics(options["dataset"])
+
+
+class _ReadinessHandler(BaseHTTPRequestHandler):
+    """GET /ready: 200 when warm, 503 while warming. GET /warmup: full status."""
+
+    def do_GET(self) -> None:
+        status = get_warmup_manager().status()
+        if self.path.rstrip("/") == "/ready":
+            code = 200 if status["ready"] else 503
+        elif self.path.rstrip("/") == "/warmup":
+            code = 200
+        else:
+            self.send_error(404)
+            return
+        body = json.dumps(status).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # load balancers poll often; keep the server log quiet
+
+
+def start_readiness_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /ready and /warmup over HTTP from a daemon thread.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    server = ThreadingHTTPServer((host, port), _ReadinessHandler)
+    threading.Thread(target=server.serve_forever, name="warmup-readiness", daemon=True).start()
+    return server
+
+
+_warmup_manager: Optional[WarmupManager] = None
+_warmup_manager_lock = threading.Lock()
+
+
+def get_warmup_manager() -> WarmupManager:
+    """Get the WarmupManager instance (steps read from WARMUP_CONFIG or warmup.json).
+
+    Returns:
+        The WarmupManager singleton
+    """
+    global _warmup_manager
+    with _warmup_manager_lock:
+        if _warmup_manager is None:
+            _warmup_manager = WarmupManager(load_steps(Path(os.getenv("WARMUP_CONFIG", DEFAULT_CONFIG))))
+        return _warmup_manager
+
+
+def start_warmup() -> WarmupManager:
+    """Start warming the caches in the background (once per process).
+
+    Returns:
+        The WarmupManager, for status() and wait()
+    """
+    manager = get_warmup_manager()
+    manager.start()
+    return manager
@@ -0,0 +1,400 @@
+"""Session-state memory accounting and budgets (Week 9).
+
+Streamlit keeps every session's `st.session_state` in the server process
+until the session closes, so per-session objects (chat histories, table
+paginators with their cached sort orders, rerun profiles) add up over a
+long-lived deployment. SessionMemoryManager measures the approximate size
+of every key per session and enforces two budgets:
+
+- per session (SESSION_MEMORY_MB, default 256 MB)
+- for all sessions together (SESSION_MEMORY_TOTAL_MB, default 2048 MB)
+
+When a budget is exceeded, the least recently used keys that have a
+policy are shed first: "evict" keys are deleted (the page rebuilds them on
+its next run), "spill" keys are pickled to disk and replaced by a
+SpilledValue, which `app.session_state.get_value` loads back on first use.
+Keys without a policy (login state, widget values) are counted only.
+
+Sizes are estimates: pandas/NumPy objects report their own buffers,
+builtin containers are walked (large ones by sampling), and objects that
+share data with other sessions define `nbytes()` to report only what they
+own. `stats()` returns the totals for monitoring.
+
+A session's accounting and spill files live as long as the session does:
+`sweep()` is given the ids Streamlit still holds and drops the rest.
+"""
+
+import fnmatch
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Sequence, Tuple
+
+MB = 2 ** 20
+
+# First matching pattern wins; keys matching none are only counted
+DEFAULT_POLICIES: Sequence[Tuple[str, str]] = (
+    ("*_paginator", "evict"),  # paginated_table: page cache and sort orders, rebuilt on demand
+    ("rerun_profiles", "evict"),
+    ("*_export", "evict"),  # prepared downloads: spooled export files, prepared again on request
+    ("chat_history", "spill"),
+    ("filters", "spill"),
+)
+POLICIES = ("evict", "spill")
+
+# Containers with more items than this are measured from an even sample
+SAMPLE_SIZE = 256
+MAX_DEPTH = 16
+# Unchanged values are re-measured at most this often (seconds)
+REMEASURE_AFTER = 60.0
+
+
+def _sized(value: Any) -> Optional[int]:
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def estimate_bytes(value: Any, _seen: Optional[set] = None, _depth: int = 0) -> int:
+    """Estimate the memory held by a value.
+
+    Args:
+        value: Any object
+        _seen: Ids already counted (shared references count once)
+        _depth: Nesting depth (deeper values are counted shallowly)
+
+    Returns:
+        Approximate size in bytes
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    nbytes = getattr(value, "nbytes", None)
+    if callable(nbytes):
+        return int(nbytes())  # objects that know what they own (ColumnIndex, Paginator)
+    if type(value).__module__.startswith("pandas") and hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(nbytes, int):
+        # NumPy arrays (a view shares its base's buffer) and other buffer objects
+        return sys.getsizeof(value) if getattr(value, "base", None) is not None else nbytes + sys.getsizeof(value)
+
+    size = sys.getsizeof(value)
+    if _depth >= MAX_DEPTH or isinstance(value, (str, bytes, bytearray, int, float, bool)):
+        return size
+
+    if isinstance(value, dict):
+        items = list(value.keys()) + list(value.values())
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        items = list(value)
+    elif hasattr(value, "__dict__"):
+        items = list(vars(value).values())
+    else:
+        return size
+    if not items:
+        return size
+
+    sample = items if len(items) <= SAMPLE_SIZE else items[::len(items) // SAMPLE_SIZE][:SAMPLE_SIZE]
+    sampled = sum(estimate_bytes(item, seen, _depth + 1) for item in sample)
+    return size + sampled * len(items) // len(sample)
+
+
+class SpilledValue:
+    """Placeholder left in session state for a value spilled to disk."""
+
+    __slots__ = ("path", "size")
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.size = size
+
+    def load(self) -> Any:
+        """Read the value back and delete the spill file."""
+        with open(self.path, "rb") as f:
+            value = pickle.load(f)
+        self.path.unlink(missing_ok=True)
+        return value
+
+    def __repr__(self) -> str:
+        return f"<spilled {self.size / MB:.1f} MB: {self.path.name}>"
+
+
+@dataclass
+class KeyUsage:
+    """Measured size and recency of one session-state key."""
+
+    bytes: int
+    signature: Tuple
+    measured_at: float
+    last_used: float
+    spilled: bool = False
+
+
+class SessionMemoryManager:
+    """Tracks session-state memory per key and session, and enforces budgets."""
+
+    def __init__(self, session_budget: int = 256 * MB, global_budget: int = 2048 * MB,
+                 spill_dir: Optional[Path] = None,
+                 policies: Sequence[Tuple[str, str]] = DEFAULT_POLICIES):
+        """Initialize the manager.
+
+        Args:
+            session_budget: Bytes one session may hold
+            global_budget: Bytes all sessions together may hold
+            spill_dir: Directory for spilled values (default: a temp directory)
+            policies: (key pattern, "evict" or "spill") pairs, first match wins
+
+        Raises:
+            ValueError: If a budget is not positive or a policy is unknown
+        """
+        if session_budget <= 0 or global_budget <= 0:
+            raise ValueError("Memory budgets must be positive")
+        for pattern, policy in policies:
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown policy '{policy}' for '{pattern}'; use one of {POLICIES}")
+        self.session_budget = session_budget
+        self.global_budget = global_budget
+        self.spill_dir = Path(spill_dir or Path(tempfile.gettempdir()) / "session_spill")
+        self.policies = list(policies)
+        self.counters = {"evictions": 0, "spills": 0, "restores": 0, "bytes_evicted": 0, "bytes_spilled": 0}
+        self._sessions: Dict[str, Dict[str, KeyUsage]] = {}
+        self._spilling_sessions: set = set()  # sessions that may have spill files
+        self._lock = threading.Lock()
+
+    def policy(self, key: str) -> Optional[str]:
+        """Get the policy of a key ("evict", "spill" or None)."""
+        for pattern, policy in self.policies:
+            if fnmatch.fnmatchcase(key, pattern):
+                return policy
+        return None
+
+    def touch(self, session_id: str, key: str) -> None:
+        """Mark a key as used now (it is shed after colder keys)."""
+        with self._lock:
+            usage = self._sessions.get(session_id, {}).get(key)
+            if usage is not None:
+                usage.last_used = time.time()
+
+    def account(self, session_id: str, state: MutableMapping[str, Any]) -> int:
+        """Measure a session's state.
+
+        Values whose identity and length haven't changed since the last
+        call keep their measurement (re-measured every REMEASURE_AFTER s).
+
+        Args:
+            session_id: Session the state belongs to
+            state: The session's state (st.session_state)
+
+        Returns:
+            The session's total in bytes
+        """
+        now = time.time()
+        with self._lock:
+            old = self._sessions.get(session_id, {})
+        usages = {}
+        for key in list(state.keys()):
+            value = state[key]
+            signature = (id(value), type(value), _sized(value))
+            usage = old.get(key)
+            if usage is not None and usage.signature == signature and now - usage.measured_at < REMEASURE_AFTER:
+                usages[key] = usage
+                continue
+            spilled = isinstance(value, SpilledValue)
+            size = value.size if spilled else estimate_bytes(value)
+            changed = usage is None or usage.signature != signature
+            usages[key] = KeyUsage(size, signature, now, now if changed else usage.last_used, spilled)
+        with self._lock:
+            self._sessions[session_id] = usages
+        return self._resident(usages)
+
+    def enforce(self, session_id: str, state: MutableMapping[str, Any]) -> List[Tuple[str, str, int]]:
+        """Measure a session and shed its coldest keys while a budget is exceeded.
+
+        Only this session's state is changed (other sessions belong to
+        other script threads), so when the global budget is exceeded the
+        session running now gives up what it can.
+
+        Args:
+            session_id: Session the state belongs to
+            state: The session's state (st.session_state)
+
+        Returns:
+            (key, "evict" or "spill", bytes) for every key shed
+        """
+        resident = self.account(session_id, state)
+        with self._lock:
+            total = sum(self._resident(usages) for usages in self._sessions.values())
+            usages = dict(self._sessions[session_id])
+        excess = max(resident - self.session_budget, total - self.global_budget)
+        if excess <= 0:
+            return []
+
+        shed = []
+        candidates = sorted(
+            (usage.last_used, key) for key, usage in usages.items()
+            if not usage.spilled and self.policy(key) is not None
+        )
+        for _, key in candidates:
+            if excess <= 0:
+                break
+            usage, action = usages[key], self.policy(key)
+            if action == "spill" and not self._spill(session_id, state, key, usage):
+                continue
+            if action == "evict":
+                del state[key]
+            excess -= usage.bytes
+            shed.append((key, action, usage.bytes))
+
+        with self._lock:
+            current = self._sessions.get(session_id, {})
+            for key, action, size in shed:
+                self.counters["evictions" if action == "evict" else "spills"] += 1
+                self.counters["bytes_evicted" if action == "evict" else "bytes_spilled"] += size
+                if action == "evict":
+                    current.pop(key, None)
+        return shed
+
+    def restore(self, session_id: str, state: MutableMapping[str, Any], key: str, default: Any = None) -> Any:
+        """Load a spilled value back into session state.
+
+        Args:
+            session_id: Session the state belongs to
+            state: The session's state (st.session_state)
+            key: State key
+            default: Returned (and the key dropped) if the spill file is gone
+
+        Returns:
+            The value (unchanged if it wasn't spilled)
+        """
+        value = state[key]
+        if isinstance(value, SpilledValue):
+            try:
+                value = value.load()
+            except FileNotFoundError:
+                del state[key]
+                return default
+            state[key] = value
+            with self._lock:
+                self.counters["restores"] += 1
+                self._sessions.get(session_id, {}).pop(key, None)  # re-measured on the next account
+        return value
+
+    def forget(self, session_id: str) -> None:
+        """Drop a closed session's accounting and spill files."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._spilling_sessions.discard(session_id)
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def sweep(self, live_sessions: Iterable[str]) -> List[str]:
+        """Forget every session that is no longer live.
+
+        Args:
+            live_sessions: Ids of the sessions the server still holds
+                (including disconnected ones that may reconnect)
+
+        Returns:
+            Ids of the sessions forgotten
+        """
+        live = set(live_sessions)
+        with self._lock:
+            gone = [sid for sid in set(self._sessions) | self._spilling_sessions if sid not in live]
+        for session_id in gone:
+            self.forget(session_id)
+        return gone
+
+    def session_usage(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get a session's keys: key -> {bytes, policy, spilled, idle_s}, largest first."""
+        now = time.time()
+        with self._lock:
+            usages = dict(self._sessions.get(session_id, {}))
+        return {
+            key: {"bytes": usage.bytes, "policy": self.policy(key), "spilled": usage.spilled,
+                  "idle_s": round(now - usage.last_used, 1)}
+            for key, usage in sorted(usages.items(), key=lambda item: -item[1].bytes)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get totals for monitoring.
+
+        Returns:
+            Dictionary with sessions, resident_bytes, spilled_bytes (on
+            disk now), the budgets, counters of keys shed and restored so
+            far and per-session resident bytes
+        """
+        with self._lock:
+            per_session = {sid: self._resident(usages) for sid, usages in self._sessions.items()}
+            spilled = sum(usage.bytes for usages in self._sessions.values()
+                          for usage in usages.values() if usage.spilled)
+            counters = dict(self.counters)
+        return {
+            "sessions": len(per_session),
+            "resident_bytes": sum(per_session.values()),
+            "spilled_bytes": spilled,
+            "session_budget": self.session_budget,
+            "global_budget": self.global_budget,
+            **counters,
+            "per_session": per_session,
+        }
+
+    @staticmethod
+    def _resident(usages: Dict[str, KeyUsage]) -> int:
+        return sum(usage.bytes for usage in usages.values() if not usage.spilled)
+
+    def _session_dir(self, session_id: str) -> Path:
+        return self.spill_dir / hashlib.sha1(session_id.encode()).hexdigest()[:16]
+
+    def _spill(self, session_id: str, state: MutableMapping[str, Any], key: str, usage: KeyUsage) -> bool:
+        """Pickle a value to disk and leave a SpilledValue (False if it can't be pickled)."""
+        directory = self._session_dir(session_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._spilling_sessions.add(session_id)
+        path = directory / f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.pkl"
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(state[key], f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            path.unlink(missing_ok=True)
+            return False
+        placeholder = SpilledValue(path, usage.bytes)
+        state[key] = placeholder
+        with self._lock:
+            usage.spilled = True
+            usage.signature = (id(placeholder), SpilledValue, None)
+        return True
+
+
+_session_memory: Optional[SessionMemoryManager] = None
+_session_memory_lock = threading.Lock()
+
+
+def get_session_memory() -> SessionMemoryManager:
+    """Get the process-wide SessionMemoryManager.
+
+    Budgets come from SESSION_MEMORY_MB and SESSION_MEMORY_TOTAL_MB, the
+    spill directory from SESSION_SPILL_DIR.
+
+    Returns:
+        Singleton SessionMemoryManager instance
+    """
+    global _session_memory
+    with _session_memory_lock:
+        if _session_memory is None:
+            _session_memory = SessionMemoryManager(
+                session_budget=int(float(os.getenv("SESSION_MEMORY_MB", "256")) * MB),
+                global_budget=int(float(os.getenv("SESSION_MEMORY_TOTAL_MB", "2048")) * MB),
+                spill_dir=os.getenv("SESSION_SPILL_DIR") or None,
+            )
+        return _session_memory
@@ -3,10 +3,26 @@
 References Week 9 Streamlit state management patterns.
 """
 
+import os
+import time
 import streamlit as st
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple
 
+from app.profiling import timed
+from app.session_memory import get_session_memory
 
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # moved in Streamlit 1.38
+    from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+# Closed sessions' accounting and spill files are dropped at most this often (seconds)
+SWEEP_INTERVAL = 60.0
+
+_last_sweep = 0.0
+
+
+@timed("session: init")
 def init_session():
     """Initialize session state keys for the application."""
     if "logged_in" not in st.session_state:
@@ -45,10 +61,13 @@ def set_value(key: str, value: Any) -> None:
         value: Value to set
     """
     st.session_state[key] = value
+    session_id = current_session_id()
+    if session_id is not None:
+        get_session_memory().touch(session_id, key)
 
 
 def get_value(key: str, default: Any = None) -> Any:
-    """Get a session state value.
+    """Get a session state value, loading it back if it was spilled to disk.
     
     Args:
         key: State key
@@ -57,9 +76,18 @@ def get_value(key: str, default: Any = None) -> Any:
     Returns:
         The session value or default
     """
-    return st.session_state.get(key, default)
+    if key not in st.session_state:
+        return default
+    session_id = current_session_id()
+    if session_id is None:
+        return st.session_state[key]  # nothing is spilled outside a Streamlit session
+    memory = get_session_memory()
+    value = memory.restore(session_id, st.session_state, key, default)
+    memory.touch(session_id, key)
+    return value
 
 
+@timed("session: auth check")
 def is_logged_in() -> bool:
     """Check if user is logged in.
     
@@ -76,3 +104,66 @@ def get_current_user() -> Optional[str]:
         Username if logged in, None otherwise
     """
     return st.session_state.get("username") if is_logged_in() else None
+
+
+def is_admin() -> bool:
+    """Check if the logged-in user is an administrator.
+    
+    Admins have the "admin" user role or are listed in the ADMIN_USERS
+    environment variable (comma-separated usernames).
+    
+    Returns:
+        True for a logged-in admin, False otherwise
+    """
+    if not is_logged_in():
+        return False
+    if st.session_state.get("user_role") == "admin":
+        return True
+    admins = {name.strip() for name in os.getenv("ADMIN_USERS", "").split(",") if name.strip()}
+    return st.session_state.get("username") in admins
+
+
+def current_session_id() -> Optional[str]:
+    """Get the id of the session running this script (None outside Streamlit)."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+@timed("session: memory budget")
+def enforce_memory_budget() -> List[Tuple[str, str, int]]:
+    """Account this session's state and shed cold keys over budget.
+    
+    Call at the end of a page run. Keys are evicted or spilled to disk as
+    configured in app.session_memory. Every SWEEP_INTERVAL seconds the
+    accounting and spill files of sessions the server no longer holds are
+    dropped.
+    
+    Returns:
+        (key, "evict" or "spill", bytes) for every key shed
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return []
+    global _last_sweep
+    memory = get_session_memory()
+    shed = memory.enforce(ctx.session_id, st.session_state)
+    # ctx.session_state is a per-run wrapper, so its lifetime says nothing
+    # about the session's; ask the runtime which sessions still exist
+    now = time.monotonic()
+    if now - _last_sweep >= SWEEP_INTERVAL:
+        _last_sweep = now
+        live = _live_session_ids()
+        if live is not None:
+            memory.sweep(live)
+    return shed
+
+
+def _live_session_ids() -> Optional[List[str]]:
+    """Get the ids of the sessions the Streamlit server holds (None without a server)."""
+    try:
+        from streamlit.runtime import Runtime
+        if not Runtime.exists():
+            return None
+        return [info.session.id for info in Runtime.instance()._session_mgr.list_sessions()]
+    except (ImportError, AttributeError, RuntimeError):
+        return None  # runtime internals differ; keep everything rather than guess
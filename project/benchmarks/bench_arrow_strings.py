@@ -0,0 +1,87 @@
+"""Benchmark: Arrow-backed vs object-dtype string columns.
+
+Builds a synthetic incidents frame with free-text descriptions and compares
+memory usage, `str.contains` latency and Feather/CSV export time for the
+object-dtype baseline and `string[pyarrow]`.
+
+Usage:
+    python benchmarks/bench_arrow_strings.py --rows 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.arrow_storage import HAS_PYARROW, to_arrow_strings, write_frame
+
+WORDS = np.array([
+    "phishing", "email", "targeting", "finance", "team", "workstation", "infected",
+    "trojan", "credential", "reset", "vpn", "outage", "ransomware", "server", "lateral",
+    "movement", "detected", "firewall", "blocked", "suspicious", "login", "attempt",
+])
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Build a synthetic incidents frame with object-dtype text."""
+    rng = np.random.default_rng(11)
+    words = rng.choice(WORDS, size=(rows, 8))
+    return pd.DataFrame({
+        "incident_type": rng.choice(["Phishing", "Malware", "DDoS", "Ransomware"], rows).astype(object),
+        "severity": rng.choice(["Low", "Medium", "High", "Critical"], rows).astype(object),
+        "description": pd.Series([" ".join(row) for row in words], dtype=object),
+        "reported_by": rng.choice(["alice", "bob", "charlie", "diana"], rows).astype(object),
+    })
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Get the best wall time of several runs in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return min(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if not HAS_PYARROW:
+        print("pyarrow is not installed; nothing to compare.")
+        return
+
+    baseline = make_frame(args.rows)
+    arrow = to_arrow_strings(baseline)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results = []
+        for label, df in (("object", baseline), ("string[pyarrow]", arrow)):
+            memory_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+            contains_ms = best_of(lambda: df["description"].str.contains("ransomware", regex=False))
+            equals_ms = best_of(lambda: df["severity"] == "Critical")
+            feather_ms = best_of(lambda: write_frame(df, tmp / "frame.feather"), repeat=3)
+            csv_ms = best_of(lambda: df.to_csv(tmp / "frame.csv", index=False), repeat=1)
+            results.append((label, memory_mb, contains_ms, equals_ms, feather_ms, csv_ms))
+
+    print(f"Rows: {args.rows:,}\n")
+    print(f"{'storage':<18}{'memory (MB)':>12}{'contains (ms)':>15}{'== (ms)':>10}{'feather (ms)':>14}{'csv (ms)':>10}")
+    for label, memory_mb, contains_ms, equals_ms, feather_ms, csv_ms in results:
+        print(f"{label:<18}{memory_mb:>12.1f}{contains_ms:>15.1f}{equals_ms:>10.1f}{feather_ms:>14.1f}{csv_ms:>10.1f}")
+
+    base, arr = results
+    print(f"\nMemory saved:        {100 * (1 - arr[1] / base[1]):.0f}%")
+    print(f"str.contains speedup: {base[2] / arr[2]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark: chunked correlation and group comparison over a wide table.
+
+Streams a synthetic 200-column × 5M-row table (8 GB as float64, never
+materialized) chunk by chunk through the correlation engine and reports
+time and peak RSS for Pearson, Spearman (two passes: quantile summary,
+then approximate ranks) and a group comparison. Afterwards a smaller
+in-memory sample checks the results against pandas' exact
+`DataFrame.corr`.
+
+Usage:
+    python benchmarks/bench_correlation.py --rows 5000000 --columns 200
+"""
+
+import argparse
+import resource
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.analysis import CHUNK_BYTES, compare_groups, correlation_matrix, rows_per_chunk
+
+
+def peak_rss_mb() -> float:
+    """Get this process's peak resident set size in megabytes."""
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_source(rows: int, columns: int, factors: int = 10, chunk_bytes: int = CHUNK_BYTES):
+    """Build a chunk source of correlated metrics driven by a few latent factors."""
+    names = [f"m{i:03d}" for i in range(columns)]
+    loadings = np.random.default_rng(0).normal(size=(factors, columns))
+    step = rows_per_chunk(columns + 1, chunk_bytes)
+
+    def chunks():
+        for number, start in enumerate(range(0, rows, step)):
+            rng = np.random.default_rng(number + 1)
+            size = min(step, rows - start)
+            values = rng.normal(size=(size, factors)) @ loadings + rng.normal(scale=2.0, size=(size, columns))
+            chunk = pd.DataFrame(values, columns=names)
+            chunk["group"] = np.array(["A", "B", "C", "D"])[rng.integers(0, 4, size)]
+            yield chunk
+
+    return chunks, names
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28}{time.perf_counter() - start:>9.1f} s{peak_rss_mb():>10,.0f} MB peak RSS")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--check-rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    source, names = make_source(args.rows, args.columns)
+    gigabytes = args.rows * args.columns * 8 / 1024 ** 3
+    print(f"{args.columns} columns × {args.rows:,} rows ({gigabytes:.1f} GB as float64), "
+          f"{rows_per_chunk(args.columns):,} rows per chunk\n")
+    timed("generate chunks only", lambda: sum(len(chunk) for chunk in source()))
+    timed("pearson", lambda: correlation_matrix(source, names, "pearson"))
+    timed("spearman (approx ranks)", lambda: correlation_matrix(source, names, "spearman"))
+    timed("compare 4 groups", lambda: compare_groups(source, "group", names))
+
+    # Accuracy on a sample small enough for pandas
+    sample_source, names = make_source(args.check_rows, args.columns)
+    sample = pd.concat(sample_source(), ignore_index=True)
+    for method in ("pearson", "spearman"):
+        exact = sample[names].corr(method=method).to_numpy()
+        chunked = correlation_matrix(sample_source, names, method).to_numpy()
+        print(f"{method} max |error| vs pandas on {args.check_rows:,} rows: {np.abs(chunked - exact).max():.2e}")
+
+
+
+if __name__ == "__main__":
+    main()
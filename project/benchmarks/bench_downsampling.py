@@ -0,0 +1,71 @@
+"""Benchmark: LTTB downsampling of long time series for charts.
+
+For series of increasing length, compares the chart payload of the raw
+series with the LTTB-reduced one, times the reduction, and checks shape
+fidelity against naive every-k-th-point decimation with the same budget:
+how much of the global min/max range survives, and the error of the
+reduced line interpolated back onto the original timestamps.
+
+Usage:
+    python benchmarks/bench_downsampling.py --lengths 10000 1000000 5000000 --points 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.downsampling import downsample_frame
+
+
+def make_series(length: int) -> pd.DataFrame:
+    """Build a random-walk incident rate with a few sharp spikes."""
+    rng = np.random.default_rng(3)
+    values = rng.standard_normal(length).cumsum()
+    spikes = rng.choice(length, 5, replace=False)
+    values[spikes] += 40 * values.std()
+    index = pd.date_range("2015-01-01", periods=length, freq="min", name="Date")
+    return pd.DataFrame({"Incidents": values}, index=index)
+
+
+def fidelity(original: pd.DataFrame, reduced: pd.DataFrame) -> tuple:
+    """Get (share of min-max range kept, mean interpolation error / range)."""
+    y, x = original["Incidents"].to_numpy(), original.index.asi8
+    ry, rx = reduced["Incidents"].to_numpy(), reduced.index.asi8
+    span = y.max() - y.min()
+    kept = (ry.max() - ry.min()) / span
+    error = np.abs(np.interp(x, rx, ry) - y).mean() / span
+    return kept, error
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10_000, 1_000_000, 5_000_000])
+    parser.add_argument("--points", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'points':>11}{'raw JSON':>11}{'LTTB JSON':>11}{'LTTB ms':>9}"
+          f"{'range kept':>12}{'err LTTB':>10}{'err stride':>11}")
+    for length in args.lengths:
+        df = make_series(length)
+        raw_kb = len(df.reset_index().to_json(orient="records", date_format="iso")) / 1024
+
+        start = time.perf_counter()
+        reduced = downsample_frame(df, args.points)
+        elapsed = (time.perf_counter() - start) * 1000
+        lttb_kb = len(reduced.reset_index().to_json(orient="records", date_format="iso")) / 1024
+
+        stride = df.iloc[np.linspace(0, length - 1, args.points).astype(int)]
+        kept, error = fidelity(df, reduced)
+        stride_kept, stride_error = fidelity(df, stride)
+        print(f"{length:>11,}{raw_kb:>9,.0f}KB{lttb_kb:>9,.0f}KB{elapsed:>9.1f}"
+              f"{kept:>7.0%} ({stride_kept:.0%}){error:>10.4f}{stride_error:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
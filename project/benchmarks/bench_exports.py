@@ -0,0 +1,90 @@
+"""Benchmark: streaming exports vs building the CSV string in memory.
+
+Writes a synthetic CSV, then exports it once per format in a fresh
+subprocess so each run's peak RSS is measured independently. The baseline
+loads the whole file and calls `df.to_csv()`, which is what the Data
+Manager download used to do.
+
+Usage:
+    python benchmarks/bench_exports.py --rows 2000000
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.exports import available_formats, csv_chunks, export_chunks
+
+
+def make_csv(path: Path, rows: int) -> None:
+    """Write a synthetic incidents CSV."""
+    rng = np.random.default_rng(5)
+    pd.DataFrame({
+        "id": np.arange(rows),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, rows), unit="min"),
+        "severity": rng.choice(["Low", "Medium", "High", "Critical"], rows),
+        "status": rng.choice(["Open", "In Progress", "Resolved", "Closed"], rows),
+        "description": rng.choice(["Phishing email targeting finance team", "Workstation infected with trojan",
+                                   "Suspicious login attempt blocked"], rows),
+        "score": rng.random(rows).round(4),
+    }).to_csv(path, index=False)
+
+
+def peak_rss_mb() -> float:
+    """Get this process's peak resident set size in megabytes.
+
+    Prefers VmHWM on Linux: ru_maxrss survives exec, so a subprocess would
+    report the parent's peak from writing the test file.
+    """
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(fmt: str, path: Path) -> None:
+    """Export one format (subprocess entry point) and print a result line."""
+    started = time.perf_counter()
+    if fmt == "baseline":
+        data = pd.read_csv(path).to_csv(index=False).encode()
+        rows, size = data.count(b"\n") - 1, len(data)
+    else:
+        result = export_chunks(csv_chunks(path), fmt)
+        rows, size = result.rows, result.size
+    elapsed = time.perf_counter() - started
+    print(f"{fmt:<10}{rows:>12,}{size / 1024 ** 2:>11.1f}{elapsed:>9.2f}{rows / elapsed:>14,.0f}{peak_rss_mb():>11.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_one(args.run, Path(args.path))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "incidents.csv"
+        make_csv(path, args.rows)
+        print(f"Rows: {args.rows:,}  source: {path.stat().st_size / 1024 ** 2:.1f} MB\n")
+        print(f"{'format':<10}{'rows':>12}{'size (MB)':>11}{'time (s)':>9}{'rows/s':>14}{'peak RSS':>11}")
+        for fmt in ["baseline", *available_formats()]:
+            subprocess.run([sys.executable, __file__, "--run", fmt, "--path", str(path)], check=True)
+
+
+if __name__ == "__main__":
+    main()
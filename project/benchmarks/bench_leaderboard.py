@@ -0,0 +1,89 @@
+"""Benchmark: incremental top-K leaderboards vs value_counts per render.
+
+Builds a history of resolved incidents spread over a year and many
+analysts, then compares what one Dashboard render costs: a full
+`value_counts` plus top-K over the rows (all time and last 7 days)
+against reading the incremental Leaderboard. Also times folding a batch
+of new incidents into the leaderboard, and checks both give the same
+counts.
+
+Usage:
+    python benchmarks/bench_leaderboard.py --rows 1000000 5000000 --analysts 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.leaderboards import Leaderboard
+
+
+def make_events(rows: int, analysts: int, seed: int = 0) -> pd.DataFrame:
+    """Build resolved incidents with Zipf-distributed analysts over 365 days."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"analyst_{i:05d}" for i in range(analysts)])
+    ranks = np.minimum(rng.zipf(1.3, rows), analysts) - 1
+    days = pd.Timestamp("2025-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 365, rows)), unit="D")
+    return pd.DataFrame({"reported_by": names[ranks], "day": days})
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    """Get the fastest of several runs, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--analysts", type=int, default=5_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>11}{'build s':>9}{'value_counts ms':>17}{'leaderboard ms':>16}"
+          f"{'speedup':>9}{'fold batch ms':>15}  same")
+    for rows in args.rows:
+        events = make_events(rows, args.analysts)
+        board = Leaderboard(k=25, windows=(7,))
+
+        start = time.perf_counter()
+        board.update_frame(events["reported_by"], events["day"])
+        build = time.perf_counter() - start
+
+        end = events["day"].max()
+
+        def recount():
+            week = events[events["day"] > end - pd.Timedelta(days=7)]
+            return (events["reported_by"].value_counts().head(args.k),
+                    week["reported_by"].value_counts().head(args.k))
+
+        def read():
+            return board.top(None, args.k), board.top(7, args.k)
+
+        full, week = recount()
+        same = [c for _, c in board.top(None, args.k)] == list(full.values) \
+            and [c for _, c in board.top(7, args.k)] == list(week.values)
+        scan_ms = best_of(recount)
+        read_ms = best_of(read, repeat=50)
+
+        batch = make_events(args.batch, args.analysts, seed=1)
+        batch["day"] = end
+        fold_ms = best_of(lambda: board.update_frame(batch["reported_by"], batch["day"]), repeat=1)
+
+        print(f"{rows:>11,}{build:>9.1f}{scan_ms:>17.1f}{read_ms:>16.3f}"
+              f"{scan_ms / read_ms:>8,.0f}x{fold_ms:>15.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark: paginated table fetches vs sending the whole table.
+
+For tables of increasing size, measures the cost of what `st.dataframe(df)`
+has to do (serialize every row to Arrow for the browser) against fetching
+one page through FramePageSource and SqlPageSource: first page, a
+sequential page turn (keyset for SQL), a deep jump, and a cached page.
+
+Usage:
+    python benchmarks/bench_pagination.py --sizes 100 100000 10000000
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.pagination import FramePageSource, Paginator, SqlPageSource
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Build a synthetic incidents frame."""
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({
+        "id": np.arange(1, rows + 1),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, rows), unit="min"),
+        "severity": pd.Categorical.from_codes(rng.integers(0, 4, rows), ["Low", "Medium", "High", "Critical"]),
+        "status": pd.Categorical.from_codes(rng.integers(0, 4, rows), ["Open", "In Progress", "Resolved", "Closed"]),
+        "score": rng.random(rows).round(4),
+    })
+
+
+def timed_ms(fn) -> float:
+    """Run fn once and return the elapsed milliseconds."""
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_paginator(source, sort: str, page_size: int) -> dict:
+    """Time the typical page requests against one source."""
+    paginator = Paginator(source, page_size)
+    paginator.configure(sort=sort, descending=True, filters={"severity": ["Critical", "High"]})
+    deep = paginator.page_count() // 2
+    return {
+        "first page": timed_ms(lambda: paginator.get_page(0, prefetch=False)),
+        "next page": timed_ms(lambda: paginator.get_page(1, prefetch=False)),
+        "deep jump": timed_ms(lambda: paginator.get_page(deep, prefetch=False)),
+        "after jump": timed_ms(lambda: paginator.get_page(deep + 1, prefetch=False)),
+        "cached": timed_ms(lambda: paginator.get_page(1, prefetch=False)),
+    }
+
+
+def print_row(label: str, rows: int, results: dict) -> None:
+    print(f"{label:<10}{rows:>12,}" + "".join(f"{value:>12.1f}" for value in results.values()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 100_000, 10_000_000])
+    parser.add_argument("--sql-max", type=int, default=2_000_000, help="Largest size also loaded into SQLite")
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    columns = ["first page", "next page", "deep jump", "after jump", "cached"]
+    print(f"Filter severity in (Critical, High), sort by score desc, {args.page_size} rows per page (ms)\n")
+    print(f"{'source':<10}{'rows':>12}" + "".join(f"{c:>12}" for c in columns))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            df = make_frame(rows)
+            if HAS_PYARROW:
+                whole = timed_ms(lambda: pa.Table.from_pandas(df))
+                size = pa.Table.from_pandas(df).nbytes / 1024 ** 2
+                print(f"{'whole':<10}{rows:>12,}{whole:>12.1f}   (st.dataframe: serialize every row, {size:,.1f} MB)")
+            print_row("frame", rows, bench_paginator(FramePageSource(df), "score", args.page_size))
+
+            if rows <= args.sql_max:
+                db_path = Path(tmp) / f"bench_{rows}.db"
+                with closing(sqlite3.connect(db_path)) as conn, conn:
+                    conn.execute("CREATE TABLE incidents (id INTEGER PRIMARY KEY, date TEXT, severity TEXT, "
+                                 "status TEXT, score REAL)")
+                    conn.executemany(
+                        "INSERT INTO incidents VALUES (?, ?, ?, ?, ?)",
+                        zip(df["id"].tolist(), df["date"].astype(str), df["severity"].astype(str),
+                            df["status"].astype(str), df["score"].tolist())
+                    )
+                    conn.execute("CREATE INDEX idx_severity_score ON incidents (severity, score, id)")
+                    conn.execute("CREATE INDEX idx_score ON incidents (score, id)")
+                print_row("sqlite", rows, bench_paginator(SqlPageSource(db_path, "incidents"), "score", args.page_size))
+            del df
+
+
+if __name__ == "__main__":
+    main()
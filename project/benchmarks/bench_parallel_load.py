@@ -0,0 +1,80 @@
+"""Benchmark: parallel multi-file loading and glob aggregation.
+
+Writes monthly shards of a synthetic incident export and times
+`DataService.load_many` and `DataService.aggregate_glob` with 1, 2, 4 and 8
+workers, in both thread and process pools.
+
+Usage:
+    python benchmarks/bench_parallel_load.py --shards 12 --rows 500000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.data_service import DataService
+from app.services.streaming import Count, GroupBy
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def write_shards(directory: Path, shards: int, rows: int) -> None:
+    """Write one synthetic incidents CSV per month."""
+    rng = np.random.default_rng(7)
+    for month in range(1, shards + 1):
+        pd.DataFrame({
+            "date": pd.Timestamp(2024, (month - 1) % 12 + 1, 1).strftime("%Y-%m-%d"),
+            "incident_type": rng.choice(["Phishing", "Malware", "DDoS", "Ransomware"], rows),
+            "severity": rng.choice(["Low", "Medium", "High", "Critical"], rows),
+            "status": rng.choice(["Open", "In Progress", "Resolved"], rows),
+            "response_hours": rng.exponential(4.0, rows).round(2),
+            "reported_by": rng.choice(["alice", "bob", "charlie", "diana"], rows),
+        }).to_csv(directory / f"incidents_{month:02d}.csv", index=False)
+
+
+def time_call(func) -> float:
+    """Time a single call in seconds."""
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, default=12)
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shard_dir = Path(tmp)
+        print(f"Writing {args.shards} shards x {args.rows:,} rows ...")
+        write_shards(shard_dir, args.shards, args.rows)
+
+        service = DataService()
+        service.data_dir = shard_dir
+
+        print(f"\n{'mode':<10}{'workers':>8}{'load_many (s)':>16}{'speedup':>10}{'aggregate_glob (s)':>21}{'speedup':>10}")
+        for use_processes in (False, True):
+            mode = "process" if use_processes else "thread"
+            base_load = base_agg = None
+            for workers in WORKER_COUNTS:
+                load = time_call(lambda: service.load_many(["incidents_*.csv"], workers=workers, use_processes=use_processes))
+                service.invalidate()
+                agg = time_call(lambda: service.aggregate_glob(
+                    "incidents_*.csv", workers=workers, use_processes=use_processes,
+                    rows=Count(), by_severity=GroupBy(["severity", "status"], ["response_hours"]),
+                ))
+                base_load = base_load or load
+                base_agg = base_agg or agg
+                print(f"{mode:<10}{workers:>8}{load:>16.2f}{base_load / load:>9.2f}x{agg:>21.2f}{base_agg / agg:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark: session-state growth with and without memory budgets.
+
+Simulates a long-lived deployment: many sessions rerun pages that keep a
+growing chat history and a paginated table over a shared frame (each new
+sort adds a cached row order). Every mode runs in a fresh interpreter so
+peak RSS is its own:
+
+- unbounded: state is only accounted (budgets too large to matter)
+- budget: per-session and global budgets; cold paginators are evicted and
+  chat histories spilled to disk
+
+Reports peak and final RSS, what the manager thinks is resident, keys shed
+and the cost of enforce() per rerun. Also checks estimate_bytes against
+tracemalloc for a chat history and a DataFrame.
+
+Usage:
+    python benchmarks/bench_session_memory.py --sessions 40 --reruns 30
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.pagination import FramePageSource, Paginator
+from app.session_memory import MB, SessionMemoryManager, estimate_bytes
+
+
+def rss_mb(field: str = "VmHWM:") -> float:
+    """Get this process's peak (VmHWM) or current (VmRSS) resident set size in megabytes."""
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith(field):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(rows), "score": rng.random(rows), "hours": rng.exponential(5, rows),
+        "severity": rng.choice(["Low", "Medium", "High", "Critical"], rows),
+    })
+
+
+def message(i: int) -> dict:
+    return {"role": "assistant", "content": f"Answer {i}: " + "lorem ipsum dolor sit amet " * 60,
+            "timestamp": time.time()}
+
+
+def simulate(mode: str, sessions: int, reruns: int, rows: int) -> dict:
+    """Run the simulation in this process and report memory and timings."""
+    shared = make_frame(rows)
+    budgets = dict(session_budget=2 ** 40, global_budget=2 ** 40) if mode == "unbounded" else \
+        dict(session_budget=24 * MB, global_budget=96 * MB)
+    memory = SessionMemoryManager(spill_dir=Path(tempfile.mkdtemp(prefix="bench_spill_")), **budgets)
+    states = [{} for _ in range(sessions)]
+    columns = ["score", "hours", "id"]
+    enforce_ms = []
+
+    for rerun in range(reruns):
+        for number, state in enumerate(states):
+            history = state.get("chat_history")
+            if history is None:
+                history = state["chat_history"] = []
+            elif not isinstance(history, list):
+                history = state["chat_history"] = memory.restore(str(number), state, "chat_history", [])
+            history.append(message(rerun))
+
+            key = f"table_{rerun % 3}_paginator"
+            paginator = state.get(key) or Paginator(FramePageSource(shared), page_size=50)
+            paginator.configure(sort=columns[rerun % len(columns)], descending=bool(rerun % 2))
+            paginator.get_page(200 + rerun, prefetch=False)  # past the partial-sort head: full order cached
+            state[key] = paginator
+
+            started = time.perf_counter()
+            memory.enforce(str(number), state)
+            enforce_ms.append((time.perf_counter() - started) * 1000)
+
+    stats = memory.stats()
+    return {
+        "mode": mode, "peak_rss_mb": rss_mb(), "final_rss_mb": rss_mb("VmRSS:"),
+        "resident_mb": stats["resident_bytes"] / MB, "spilled_mb": stats["spilled_bytes"] / MB,
+        "evictions": stats["evictions"], "spills": stats["spills"], "restores": stats["restores"],
+        "enforce_p50_ms": float(np.percentile(enforce_ms, 50)),
+        "enforce_p95_ms": float(np.percentile(enforce_ms, 95)),
+    }
+
+
+def traced_bytes(build) -> Tuple[int, Any]:
+    """Get the bytes allocated (and still held) by build(), and its result."""
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, value
+
+
+def check_estimates() -> None:
+    for label, build in (("chat history (500 messages)", lambda: [message(i) for i in range(500)]),
+                         ("DataFrame (200k rows)", lambda: make_frame(200_000))):
+        actual, value = traced_bytes(build)
+        estimate = estimate_bytes(value)
+        print(f"{label:<30}estimate {estimate / MB:>7.2f} MB  tracemalloc {actual / MB:>7.2f} MB  "
+              f"ratio {estimate / actual:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows of the shared table")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(simulate(args.child, args.sessions, args.reruns, args.rows)))
+        return
+
+    check_estimates()
+    print(f"\n{args.sessions} sessions x {args.reruns} reruns, shared table of {args.rows:,} rows")
+    print(f"{'mode':<11}{'peak MB':>9}{'final MB':>10}{'resident MB':>13}{'spilled MB':>12}"
+          f"{'evicted':>9}{'spilled':>9}{'restored':>10}{'enforce p50/p95 ms':>20}")
+    for mode in ("unbounded", "budget"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--sessions", str(args.sessions),
+             "--reruns", str(args.reruns), "--rows", str(args.rows)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        r = json.loads(out.splitlines()[-1])
+        print(f"{mode:<11}{r['peak_rss_mb']:>9.0f}{r['final_rss_mb']:>10.0f}{r['resident_mb']:>13.1f}"
+              f"{r['spilled_mb']:>12.1f}{r['evictions']:>9}{r['spills']:>9}{r['restores']:>10}"
+              f"{r['enforce_p50_ms']:>12.2f} / {r['enforce_p95_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
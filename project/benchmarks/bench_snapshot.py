@@ -0,0 +1,134 @@
+"""Benchmark: time-to-warm after a restart, rebuild vs snapshot restore.
+
+Builds a SQLite database with many incidents and tickets plus an
+incidents CSV, then runs warm-up in fresh interpreters (each one a
+"restart"):
+
+- rebuild: no snapshot; warm-up parses the CSV, builds its indexes,
+  sketches and rollup, the KPI cube and both metric frames, then saves a
+  snapshot
+- restore: the snapshot step loads everything back (fingerprints match)
+- stale: rows were appended to the database and CSV since the snapshot;
+  every entry fails validation and warm-up rebuilds
+
+Each run checks its KPIs and metric frames against the rebuild.
+
+Usage:
+    python benchmarks/bench_snapshot.py --incidents 1000000 --tickets 200000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT = Path(__file__).parent.parent
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_warmup import make_database
+
+STEPS = {"steps": [{"kind": "snapshot"},
+                   {"kind": "dataset", "file": "incidents.csv", "index_columns": ["severity", "status"]},
+                   {"kind": "rollup", "file": "incidents.csv"},
+                   {"kind": "kpis"},
+                   {"kind": "metrics", "dataset": "cyber_incidents"},
+                   {"kind": "metrics", "dataset": "it_tickets"}]}
+
+
+def child(mode: str, tmp: str) -> dict:
+    """Warm up in this (fresh) process and report timings."""
+    sys.path.insert(0, str(PROJECT))
+    from app.services.analysis import get_analysis_service
+    from app.services.data_service import get_data_service
+    from app.services.kpis import get_kpi_service
+    from app.services.snapshots import get_snapshotter
+    from app.services.warmup import start_warmup
+
+    data_service = get_data_service()
+    data_service.data_dir, data_service.db_path = Path(tmp), Path(tmp) / "platform.db"
+
+    started = time.perf_counter()
+    start_warmup().wait()
+    result = {"mode": mode, "warm_s": time.perf_counter() - started,
+              "restored": sum(get_snapshotter().last_restore["restored"].values())}
+
+    df = data_service.get_cached_data("incidents.csv")
+    data_service.count_distinct(df, ["reported_by"], engine="approx")
+    started = time.perf_counter()
+    kpis = get_kpi_service().kpis(["High", "Critical"])
+    data_service.filter_data(df, severity="Critical", status="Open")
+    result["first_request_ms"] = (time.perf_counter() - started) * 1000
+    result["check"] = {
+        "kpis": kpis,
+        "metrics": [float(get_analysis_service().metrics(name).select_dtypes("number").sum().sum())
+                    for name in ("cyber_incidents", "it_tickets")],
+        "rows": len(df),
+        "rollup_days": data_service.get_rollup("incidents.csv").bucket_count()["day"],
+    }
+
+    if mode == "rebuild":
+        started = time.perf_counter()
+        get_snapshotter().save()
+        result["save_s"] = time.perf_counter() - started
+        result["snapshot_mb"] = sum(p.stat().st_size for p in get_snapshotter().store.directory.iterdir()) / 2**20
+    return result
+
+
+def append_rows(tmp: Path) -> None:
+    """Append one incident to the database and the CSV."""
+    with closing(sqlite3.connect(tmp / "platform.db")) as conn, conn:
+        conn.execute("INSERT INTO cyber_incidents (id, date, incident_type, severity, status, description, reported_by) "
+                     "SELECT MAX(id) + 1, '2025-12-01', 'Phishing', 'High', 'Open', 'Fake email', 'analyst_1' "
+                     "FROM cyber_incidents")
+    with (tmp / "incidents.csv").open("a") as f:
+        f.write("9999999,2025-12-01,Phishing,High,Open,Fake email,analyst_1\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--incidents", type=int, default=1_000_000)
+    parser.add_argument("--tickets", type=int, default=200_000)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(*args.child), default=str))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        started = time.perf_counter()
+        make_database(tmp / "platform.db", args.incidents, args.tickets)
+        with closing(sqlite3.connect(tmp / "platform.db")) as conn:
+            pd.read_sql("SELECT * FROM cyber_incidents", conn).to_csv(tmp / "incidents.csv", index=False)
+        (tmp / "warmup.json").write_text(json.dumps(STEPS))
+        print(f"Database: {args.incidents:,} incidents, {args.tickets:,} tickets; CSV "
+              f"{(tmp / 'incidents.csv').stat().st_size / 2**20:.0f} MB (built in {time.perf_counter() - started:.1f} s)")
+
+        env = dict(os.environ, WARMUP_CONFIG=str(tmp / "warmup.json"), SNAPSHOT_DIR=str(tmp / ".snapshot"))
+        print(f"{'mode':<9}{'restored':>9}{'time-to-warm s':>16}{'first request ms':>18}{'matches rebuild':>17}")
+        reference = None
+        for mode in ("rebuild", "restore", "stale"):
+            if mode == "stale":
+                append_rows(tmp)
+            out = subprocess.run([sys.executable, __file__, "--child", mode, str(tmp)], capture_output=True,
+                                 text=True, check=True, cwd=PROJECT.parent, env=env).stdout
+            r = json.loads(out.splitlines()[-1])
+            reference = reference or r
+            same = "-" if mode == "stale" else str(r["check"] == reference["check"])
+            print(f"{mode:<9}{r['restored']:>9}{r['warm_s']:>16.2f}{r['first_request_ms']:>18.2f}{same:>17}")
+            if mode == "rebuild":
+                print(f"         snapshot saved in {r['save_s']:.2f} s, {r['snapshot_mb']:.0f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
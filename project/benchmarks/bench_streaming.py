@@ -0,0 +1,122 @@
+"""Benchmark: memory-bounded streaming analytics over a large CSV.
+
+Generates a synthetic incident export of the requested size (20 GB by
+default) and runs a filter → projection → aggregation pipeline over it,
+sampling the process RSS after every chunk. RSS should stay flat no matter
+how large the file is.
+
+Usage:
+    python benchmarks/bench_streaming.py --size-gb 20 --path /data/incidents_20gb.csv
+    python benchmarks/bench_streaming.py --size-gb 0.5   # quick run
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.streaming import Count, GroupBy, MinMax, Quantiles, StreamingPipeline, Sum
+
+SEVERITIES = np.array(["Low", "Medium", "High", "Critical"])
+STATUSES = np.array(["Open", "In Progress", "Resolved", "Closed"])
+TYPES = np.array(["Phishing", "Malware", "DDoS", "SQL Injection", "Ransomware"])
+ANALYSTS = np.array(["alice", "bob", "charlie", "diana", "eve"])
+
+
+def current_rss_mb() -> float:
+    """Get the current resident set size in MB."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def generate_file(path: Path, size_gb: float, block_rows: int = 500_000) -> None:
+    """Append synthetic incident rows to a CSV until it reaches size_gb."""
+    target = size_gb * 1024 ** 3
+    rng = np.random.default_rng(42)
+    start = pd.Timestamp("2024-01-01")
+    written = 0
+
+    with path.open("w", newline="") as out:
+        header = True
+        while path.stat().st_size < target:
+            block = pd.DataFrame({
+                "id": np.arange(written, written + block_rows),
+                "date": (start + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, block_rows), unit="s")).strftime("%Y-%m-%d %H:%M:%S"),
+                "incident_type": rng.choice(TYPES, block_rows),
+                "severity": rng.choice(SEVERITIES, block_rows),
+                "status": rng.choice(STATUSES, block_rows),
+                "response_hours": rng.exponential(4.0, block_rows).round(2),
+                "reported_by": rng.choice(ANALYSTS, block_rows),
+            })
+            block.to_csv(out, header=header, index=False)
+            out.flush()
+            header = False
+            written += block_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-gb", type=float, default=20.0)
+    parser.add_argument("--path", type=Path, default=Path("synthetic_incidents.csv"))
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    args = parser.parse_args()
+
+    if not args.path.exists() or args.path.stat().st_size < args.size_gb * 1024 ** 3:
+        print(f"Generating {args.size_gb} GB synthetic file at {args.path} ...")
+        generate_file(args.path, args.size_gb)
+
+    file_gb = args.path.stat().st_size / 1024 ** 3
+    pipeline = StreamingPipeline(args.path, chunksize=args.chunksize).where("severity", ["High", "Critical"], op="in")
+    aggregations = {
+        "rows": Count(),
+        "hours": Sum("response_hours"),
+        "range": MinMax("response_hours"),
+        "quantiles": Quantiles("response_hours", (0.5, 0.95, 0.99)),
+        "by_status": GroupBy(["severity", "status"], ["response_hours"]),
+    }
+
+    extra = [column for agg in aggregations.values() for column in agg.columns()]
+    samples = []
+    baseline = current_rss_mb()
+    started = time.perf_counter()
+
+    for chunk in pipeline.iter_chunks(extra_columns=extra):
+        for aggregation in aggregations.values():
+            aggregation.update(chunk)
+        samples.append(current_rss_mb())
+        del chunk
+
+    elapsed = time.perf_counter() - started
+    samples = np.array(samples)
+
+    print(f"File size:        {file_gb:.2f} GB")
+    print(f"Chunks:           {len(samples)} x {args.chunksize:,} rows")
+    print(f"Elapsed:          {elapsed:.1f} s ({file_gb * 1024 / elapsed:.0f} MB/s)")
+    print(f"RSS before run:   {baseline:.0f} MB")
+    if len(samples):
+        deciles = np.percentile(samples, [10, 50, 90, 100])
+        print(f"RSS p10/p50/p90:  {deciles[0]:.0f} / {deciles[1]:.0f} / {deciles[2]:.0f} MB")
+        print(f"RSS peak:         {deciles[3]:.0f} MB")
+        half = len(samples) // 2
+        if half:
+            print(f"RSS drift:        {samples[half:].mean() - samples[:half].mean():+.1f} MB (2nd half vs 1st half)")
+    print()
+    print(f"Matching rows:    {aggregations['rows'].result():,}")
+    print(f"Quantiles:        {aggregations['quantiles'].result()}")
+    print(aggregations["by_status"].result())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark: first-request latency with and without background warm-up.
+
+Builds a SQLite database with many incidents and tickets, then runs, each
+in a fresh interpreter, what the first Dashboard/Analytics request needs
+(KPIs, timeline, analyst board and both analysis metric frames):
+
+- cold: no warm-up, the request builds everything
+- during: warm-up started, the request arrives at once (it must not be
+  slower than cold; it waits for builds already in progress)
+- warm: the request arrives after the worker reported ready
+
+Usage:
+    python benchmarks/bench_warmup.py --incidents 1000000 --tickets 200000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT = Path(__file__).parent.parent
+STEPS = {"steps": [{"kind": "kpis"},
+                   {"kind": "metrics", "dataset": "cyber_incidents"},
+                   {"kind": "metrics", "dataset": "it_tickets"}]}
+
+
+def make_database(path: Path, incidents: int, tickets: int) -> None:
+    """Write cyber_incidents and it_tickets tables shaped like the Week 8 database."""
+    rng = np.random.default_rng(0)
+    days = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 700, incidents), unit="D")
+    incident_rows = pd.DataFrame({
+        "id": np.arange(1, incidents + 1),
+        "date": days.strftime("%Y-%m-%d"),
+        "incident_type": rng.choice(["Phishing", "Malware", "DDoS", "Intrusion"], incidents),
+        "severity": rng.choice(["Low", "Medium", "High", "Critical"], incidents),
+        "status": rng.choice(["Open", "In Progress", "Resolved", "Closed"], incidents),
+        "description": rng.choice(["Fake email", "Suspicious binary", "Traffic spike", "Bad login"], incidents),
+        "reported_by": np.char.add("analyst_", rng.integers(0, 500, incidents).astype(str)),
+    })
+    created = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 700, tickets), unit="D")
+    ticket_rows = pd.DataFrame({
+        "id": np.arange(1, tickets + 1),
+        "ticket_id": [f"TCK-{i:07d}" for i in range(tickets)],
+        "title": rng.choice(["Email outage", "VPN down", "Password reset", "Printer jam"], tickets),
+        "priority": rng.choice(["Low", "Medium", "High"], tickets),
+        "status": rng.choice(["Open", "In Progress", "Closed"], tickets),
+        "assignee": np.char.add("tech_", rng.integers(0, 100, tickets).astype(str)),
+        "created_date": created.strftime("%Y-%m-%d"),
+    })
+    with closing(sqlite3.connect(path)) as conn:
+        incident_rows.to_sql("cyber_incidents", conn, index=False)
+        ticket_rows.to_sql("it_tickets", conn, index=False)
+
+
+def child(mode: str, db: str) -> dict:
+    """Run one mode in this (fresh) process."""
+    sys.path.insert(0, str(PROJECT))
+    from app.services.analysis import get_analysis_service
+    from app.services.data_service import get_data_service
+    from app.services.kpis import get_kpi_service
+    from app.services.warmup import start_warmup
+
+    get_data_service().db_path = Path(db)
+    result = {"mode": mode}
+    if mode != "cold":
+        started = time.perf_counter()
+        manager = start_warmup()
+        if mode == "warm":
+            manager.wait()
+            result["warmup_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    kpis = get_kpi_service()
+    kpis.kpis()
+    kpis.timeline(max_points=1000)
+    kpis.top_analysts(7)
+    get_analysis_service().metrics("cyber_incidents")
+    get_analysis_service().metrics("it_tickets")
+    result["first_request_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    kpis.kpis(["High", "Critical"])
+    result["second_request_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--incidents", type=int, default=1_000_000)
+    parser.add_argument("--tickets", type=int, default=200_000)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(*args.child)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, config = Path(tmp) / "platform.db", Path(tmp) / "warmup.json"
+        started = time.perf_counter()
+        make_database(db, args.incidents, args.tickets)
+        config.write_text(json.dumps(STEPS))
+        print(f"Database: {args.incidents:,} incidents, {args.tickets:,} tickets "
+              f"({db.stat().st_size / 2**20:.0f} MB, built in {time.perf_counter() - started:.1f} s)")
+
+        print(f"{'mode':<8}{'warm-up s':>11}{'first request s':>17}{'next request ms':>17}")
+        for mode in ("cold", "during", "warm"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(db)], capture_output=True, text=True,
+                check=True, cwd=PROJECT.parent, env=dict(os.environ, WARMUP_CONFIG=str(config)),
+            ).stdout
+            r = json.loads(out.splitlines()[-1])
+            warmup = f"{r['warmup_s']:.2f}" if "warmup_s" in r else "-"
+            print(f"{mode:<8}{warmup:>11}{r['first_request_s']:>17.3f}{r['second_request_ms']:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Profile what each page imports on its first run, and enforce a budget.
+
+Every page (Home.py and pages/*.py) is run with Streamlit's AppTest in a
+fresh interpreter started with `-X importtime`, logged out and logged in
+(a few times each; the fastest run is kept, as timings are noisy). Only
+modules first imported while the page script runs are counted (Streamlit
+and the test harness are excluded), so the numbers show what a cold
+worker pays for that page on top of Streamlit itself.
+
+The report lists per page and state the total import time, the script's
+wall time and the slowest top-level imports. With `--budget` the totals
+are checked against `benchmarks/import_budget.json`, which also lists
+modules a page must not import in a state (e.g. pandas on a logged-out
+page). Any violation makes the script exit with status 1, so it can run as
+a check in CI.
+
+Usage:
+    python benchmarks/profile_imports.py --budget
+    python benchmarks/profile_imports.py --report import_report.json --top 15
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT = Path(__file__).parent.parent
+BUDGET_FILE = Path(__file__).parent / "import_budget.json"
+START, END = "--- page run start ---", "--- page run end ---"
+
+# Runs in the child interpreter: argv = page path, "1"/"0" (logged in)
+CHILD = f"""
+import sys, time
+from streamlit.testing.v1 import AppTest
+page, logged_in = sys.argv[1], sys.argv[2] == "1"
+app = AppTest.from_file(page, default_timeout=120)
+if logged_in:
+    app.session_state["logged_in"] = True
+    app.session_state["username"] = "profiler"
+sys.stderr.write("{START}\\n"); sys.stderr.flush()
+started = time.perf_counter()
+app.run()
+elapsed = (time.perf_counter() - started) * 1000
+sys.stderr.write("{END}\\n"); sys.stderr.flush()
+print(elapsed, len(app.exception))
+"""
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def profile_page(page: Path, logged_in: bool) -> Dict:
+    """Run one page in a fresh interpreter and collect its imports.
+
+    Returns:
+        Dictionary with import_ms, run_ms, exceptions, modules (every
+        module imported during the run) and top (top-level imports with
+        their cumulative ms, slowest first)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, str(page), "1" if logged_in else "0"],
+        cwd=PROJECT.parent, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Profiling {page.name} failed:\n{result.stderr[-2000:]}")
+
+    lines = result.stderr.splitlines()
+    window = lines[lines.index(START) + 1:lines.index(END)]
+    modules, top = [], {}
+    for line in window:
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        modules.append(name)
+        if indent == 0:
+            top[name] = top.get(name, 0) + cumulative_us / 1000
+
+    run_ms, exceptions = result.stdout.split()
+    return {
+        "import_ms": round(sum(top.values()), 1),
+        "run_ms": round(float(run_ms), 1),
+        "exceptions": int(exceptions),
+        "modules": sorted(set(modules)),
+        "top": [[name, round(ms, 1)] for name, ms in sorted(top.items(), key=lambda item: -item[1])],
+    }
+
+
+def check_budget(report: Dict, budget: Dict) -> List[str]:
+    """Compare a report with the budget.
+
+    Args:
+        report: {page: {state: profile}}
+        budget: {page or "*": {state: {"max_import_ms": ms, "forbid": [modules]}}}
+
+    Returns:
+        One message per violation
+    """
+    violations = []
+    for page, states in report.items():
+        for state, profile in states.items():
+            limits = dict(budget.get("*", {}).get(state, {}))
+            limits.update(budget.get(page, {}).get(state, {}))
+            max_ms = limits.get("max_import_ms")
+            if max_ms is not None and profile["import_ms"] > max_ms:
+                violations.append(f"{page} ({state}): imports took {profile['import_ms']:.0f} ms "
+                                  f"(budget {max_ms} ms)")
+            for module in limits.get("forbid", []):
+                if module in profile["modules"]:
+                    violations.append(f"{page} ({state}): imports '{module}'")
+            if profile["exceptions"]:
+                violations.append(f"{page} ({state}): raised {profile['exceptions']} exception(s)")
+    return violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="*", help="Page files (default: Home.py and pages/*.py)")
+    parser.add_argument("--report", type=Path, help="Write the full report as JSON to this file")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports listed per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per page and state (fastest is kept)")
+    parser.add_argument("--budget", action="store_true", help=f"Check against {BUDGET_FILE.name}")
+    args = parser.parse_args()
+
+    pages = [Path(page) for page in args.pages] if args.pages else \
+        [PROJECT / "Home.py"] + sorted(p for p in (PROJECT / "pages").glob("*.py") if p.name != "__init__.py")
+
+    report: Dict[str, Dict] = {}
+    print(f"{'page':<22}{'state':<11}{'imports ms':>11}{'run ms':>9}  slowest imports")
+    for page in pages:
+        report[page.name] = {}
+        for state, logged_in in (("logged_out", False), ("logged_in", True)):
+            runs = [profile_page(page.resolve(), logged_in) for _ in range(max(args.repeat, 1))]
+            profile = min(runs, key=lambda run: run["import_ms"])
+            report[page.name][state] = profile
+            slowest = ", ".join(f"{name} {ms:.0f}" for name, ms in profile["top"][:args.top])
+            print(f"{page.name:<22}{state:<11}{profile['import_ms']:>11.0f}{profile['run_ms']:>9.0f}  {slowest}")
+
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\nReport written to {args.report}")
+
+    if args.budget:
+        violations = check_budget(report, json.loads(BUDGET_FILE.read_text(encoding="utf-8")))
+        print()
+        for violation in violations:
+            print(f"OVER BUDGET: {violation}")
+        if violations:
+            sys.exit(1)
+        print("All pages within the import budget")
+
+
+if __name__ == "__main__":
+    main()
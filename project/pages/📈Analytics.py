@@ -1,22 +1,34 @@
 """Analytics Page - Multi-page Streamlit app (Week 9)"""
 
 import streamlit as st
-import pandas as pd
-import numpy as np
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.session_state import is_logged_in, get_current_user
+from app.lazy_imports import lazy_import
+from app.session_state import enforce_memory_budget, is_logged_in, get_current_user
+from app.components.memory_panel import render_memory_panel
+from app.components.profiler_panel import begin_rerun, end_rerun, render_profiler_panel
+from app.profiling import span
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 st.set_page_config(page_title="Analytics", page_icon="📈", layout="wide")
+begin_rerun("analytics")
 
 # Check authentication
 if not is_logged_in():
     st.error("⚠️ Please log in first!")
     st.stop()
 
+# Services (and the pandas/NumPy they import) load only past the login check
+from app.components.paginated_table import paginated_table
+from app.services.analysis import CORRELATION_METHODS, METRIC_BUILDERS, get_analysis_service
+from app.services.downsampling import DEFAULT_MAX_POINTS
+from app.services.kpis import get_kpi_service
+
 st.title("📈 Advanced Analytics")
 
 with st.sidebar:
@@ -30,7 +42,7 @@ with st.sidebar:
 # Analytics content
 tabs = st.tabs(["Incidents", "Tickets", "Users", "Custom Analysis"])
 
-with tabs[0]:
+with tabs[0], span("analytics: incidents"):
     st.subheader("Cyber Incidents Analytics")
     
     # Sample incident data
@@ -47,7 +59,11 @@ with tabs[0]:
                     "alice", "charlie", "bob", "alice", "charlie"]
     })
     
-    st.dataframe(incidents, use_container_width=True)
+    severity_filter = st.multiselect("Severity", ["Low", "Medium", "High", "Critical"], key="incident_severity")
+    paginated_table(
+        incidents, key="analytics_incidents", default_sort="Date", descending=True,
+        filters={"Severity": severity_filter} if severity_filter else None
+    )
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -63,7 +79,7 @@ with tabs[0]:
     severity_counts = incidents["Severity"].value_counts()
     st.bar_chart(severity_counts)
 
-with tabs[1]:
+with tabs[1], span("analytics: tickets"):
     st.subheader("IT Tickets Analytics")
     
     # Sample ticket data
@@ -79,7 +95,7 @@ with tabs[1]:
                         "tech2", "tech1", "tech3", "tech2", "tech1"]
     })
     
-    st.dataframe(tickets, use_container_width=True)
+    paginated_table(tickets, key="analytics_tickets")
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -90,7 +106,7 @@ with tabs[1]:
     with col3:
         st.metric("Total Tickets", len(tickets))
 
-with tabs[2]:
+with tabs[2], span("analytics: users"):
     st.subheader("User Activity Analytics")
     
     # Sample user data
@@ -104,7 +120,7 @@ with tabs[2]:
         "Status": ["Active", "Active", "Active", "Inactive", "Active"]
     })
     
-    st.dataframe(users, use_container_width=True)
+    paginated_table(users, key="analytics_users")
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -115,7 +131,7 @@ with tabs[2]:
     with col3:
         st.metric("Avg Logins", int(users["Logins"].mean()))
 
-with tabs[3]:
+with tabs[3], span("analytics: custom analysis"):
     st.subheader("Custom Analysis")
     
     analysis_type = st.selectbox(
@@ -124,15 +140,41 @@ with tabs[3]:
     )
     
     if analysis_type == "Time Series":
-        st.line_chart({
-            "Events": np.cumsum(np.random.randint(0, 10, 30)),
-            "Alerts": np.cumsum(np.random.randint(0, 5, 30))
-        })
+        # Daily incident history, reduced with LTTB to a bounded number of points
+        max_points = st.select_slider("Chart points", [250, 500, 1000, 2000], value=DEFAULT_MAX_POINTS)
+        try:
+            timeline = get_kpi_service().timeline(max_points=max_points)
+            st.line_chart(timeline.rename_axis("Date"))
+            st.caption(f"{len(timeline):,} points plotted")
+        except FileNotFoundError as e:
+            st.error(f"❌ Incident data is unavailable: {e}")
     elif analysis_type == "Distribution":
         st.bar_chart(np.random.randn(30).cumsum())
-    elif analysis_type == "Correlation":
-        st.write("Correlation matrix would be displayed here")
-        corr_data = pd.DataFrame(np.random.randn(10, 3), columns=["A", "B", "C"])
-        st.dataframe(corr_data.corr())
     else:
-        st.write("Comparison analysis would be displayed here")
+        # Metrics derived from the incidents/tickets tables; results are
+        # cached per dataset version
+        analysis = get_analysis_service()
+        dataset = st.selectbox("Dataset", list(METRIC_BUILDERS), key="analysis_dataset")
+        try:
+            metric_options = analysis.metric_columns(dataset)
+            metrics = st.multiselect("Metrics", metric_options, default=metric_options, key=f"{dataset}_metrics")
+            if not metrics:
+                st.info("Select at least one metric")
+            elif analysis_type == "Correlation":
+                method = st.radio("Method", CORRELATION_METHODS, horizontal=True, key="correlation_method")
+                with span("analysis: correlation"):
+                    matrix = analysis.correlation(dataset, metrics, method)
+                st.dataframe(matrix.style.format(precision=2), use_container_width=True)
+            else:
+                by = st.selectbox("Compare groups of", analysis.group_columns(dataset), key=f"{dataset}_group_by")
+                with span("analysis: group comparison"):
+                    comparison = analysis.compare(dataset, by, metrics)
+                st.dataframe(comparison.style.format(precision=2), use_container_width=True)
+                st.caption("diff_vs_rest, cohens_d and welch_t compare each group with all other rows")
+        except (FileNotFoundError, ValueError) as e:
+            st.error(f"❌ {e}")
+
+enforce_memory_budget()
+end_rerun()
+render_profiler_panel()
+render_memory_panel()
@@ -1,22 +1,30 @@
 """Dashboard Page - Data visualization (Week 9)"""
 
 import streamlit as st
-import pandas as pd
-import numpy as np
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.session_state import is_logged_in, get_current_user
+from app.session_state import enforce_memory_budget, is_logged_in, get_current_user
+from app.components.fragments import finish_page_timer, render_timings, start_page_timer, timed_fragment
+from app.components.memory_panel import render_memory_panel
+from app.components.profiler_panel import begin_rerun, end_rerun, render_profiler_panel
+from app.profiling import span
 
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
+start_page_timer("dashboard")
+begin_rerun("dashboard")
 
 # Check authentication
 if not is_logged_in():
     st.error("⚠️ Please log in first!")
     st.stop()
 
+# Services (and the pandas/NumPy they import) load only past the login check
+from app.services.downsampling import DEFAULT_MAX_POINTS
+from app.services.kpis import get_kpi_service
+
 st.title("📊 Executive Dashboard")
 
 with st.sidebar:
@@ -26,77 +34,106 @@ with st.sidebar:
         from app.session_state import logout
         logout()
         st.rerun()
-    
-    # Filters
-    st.divider()
-    st.subheader("Filters")
-    date_range = st.date_input("Select Date Range", value=[])
-    severity_filter = st.multiselect(
-        "Severity Level",
-        ["Low", "Medium", "High", "Critical"],
-        default=["High", "Critical"]
-    )
-
-# Dashboard metrics
-st.subheader("Key Performance Indicators")
-
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    st.metric(label="Total Incidents", value="487")
-with col2:
-    st.metric(label="Critical", value="23")
-with col3:
-    st.metric(label="Resolved", value="412")
-with col4:
-    st.metric(label="Avg Response", value="2.4h")
-with col5:
-    st.metric(label="MTTR", value="4.8h")
 
-st.divider()
 
-# Charts
-tab1, tab2, tab3, tab4 = st.tabs(["Incidents by Severity", "Status Distribution", "Timeline", "Top Analysts"])
-
-with tab1:
-    severity_data = pd.DataFrame({
-        "Severity": ["Critical", "High", "Medium", "Low"],
-        "Count": [23, 145, 210, 109]
-    })
-    st.bar_chart(severity_data.set_index("Severity"))
-
-with tab2:
-    status_data = pd.DataFrame({
-        "Status": ["Resolved", "In Progress", "Open", "On Hold"],
-        "Count": [412, 34, 28, 13]
-    })
-    st.bar_chart(status_data.set_index("Status"))
-
-with tab3:
-    timeline_data = pd.DataFrame({
-        "Date": pd.date_range("2024-01-01", periods=30),
-        "Incidents": np.random.randint(10, 30, 30),
-        "Resolved": np.random.randint(5, 20, 30)
-    })
-    st.area_chart(timeline_data.set_index("Date"))
-
-with tab4:
-    analyst_data = pd.DataFrame({
-        "Analyst": ["alice", "bob", "charlie", "diana"],
-        "Resolved": [87, 64, 92, 58]
-    })
-    st.bar_chart(analyst_data.set_index("Analyst"))
+ANALYST_WINDOWS = {"Last 7 days": 7, "Last 30 days": 30, "All time": None, "Filters above": "filters"}
 
-st.divider()
 
-st.subheader("Recent Incidents")
-recent_incidents = pd.DataFrame({
-    "Incident ID": [101, 102, 103, 104, 105],
-    "Type": ["Phishing", "Malware", "DDoS", "SQL Injection", "Ransomware"],
-    "Severity": ["High", "Critical", "Critical", "High", "Critical"],
-    "Status": ["Resolved", "In Progress", "Resolved", "In Progress", "Resolved"],
-    "Assigned To": ["alice", "bob", "charlie", "alice", "diana"],
-    "Created": pd.date_range("2024-01-27", periods=5)
-})
-
-st.dataframe(recent_incidents, use_container_width=True)
+def format_hours(hours):
+    """Format a duration in hours, or "n/a" without timing data."""
+    return f"{hours:.1f}h" if hours is not None else "n/a"
+
+
+# Filter widgets live inside the fragment, so changing one reruns only the
+# KPIs and charts below (resolved against the cached KPI cube), not the page
+@timed_fragment("dashboard: KPIs and charts", page="dashboard")
+def kpi_overview():
+    """Filters, KPI cards and charts."""
+    st.subheader("Filters")
+    col_dates, col_severity = st.columns(2)
+    with col_dates:
+        date_range = st.date_input("Select Date Range", value=[])
+    with col_severity:
+        severity_filter = st.multiselect(
+            "Severity Level",
+            ["Low", "Medium", "High", "Critical"],
+            default=["High", "Critical"]
+        )
+
+    start_date, end_date = (date_range[0], date_range[-1]) if date_range else (None, None)
+    severities = severity_filter or None
+    with span("dashboard: KPI cube"):
+        kpi_service = get_kpi_service()
+        try:
+            kpis = kpi_service.kpis(severities, start_date, end_date)
+        except FileNotFoundError as e:
+            st.error(f"❌ Incident data is unavailable: {e}")
+            return
+
+    # Dashboard metrics
+    st.subheader("Key Performance Indicators")
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.metric(label="Total Incidents", value=f"{kpis['total']:,}")
+    with col2:
+        st.metric(label="Critical", value=f"{kpis['critical']:,}")
+    with col3:
+        st.metric(label="Resolved", value=f"{kpis['resolved']:,}")
+    with col4:
+        st.metric(label="Avg Response", value=format_hours(kpis["avg_response_hours"]))
+    with col5:
+        st.metric(label="MTTR", value=format_hours(kpis["mttr_hours"]))
+
+    st.divider()
+
+    # Charts
+    tab1, tab2, tab3, tab4 = st.tabs(["Incidents by Severity", "Status Distribution", "Timeline", "Top Analysts"])
+
+    with tab1:
+        severity_data = kpi_service.breakdown("severity", severities, start_date, end_date)
+        st.bar_chart(severity_data.rename_axis("Severity").rename("Count"))
+
+    with tab2:
+        status_data = kpi_service.breakdown("status", severities, start_date, end_date)
+        st.bar_chart(status_data.rename_axis("Status").rename("Count"))
+
+    with tab3:
+        # Long histories are reduced (LTTB) to about one point per pixel
+        timeline_data = kpi_service.timeline(severities, start_date, end_date, max_points=DEFAULT_MAX_POINTS)
+        st.area_chart(timeline_data.rename_axis("Date"))
+
+    with tab4:
+        # Windowed boards come from the incremental leaderboard (all
+        # severities, windows ending at the newest incident); "Filters
+        # above" breaks the KPI cube down by the selected filters instead
+        window = st.radio("Resolved in", list(ANALYST_WINDOWS), horizontal=True, key="analyst_window")
+        if ANALYST_WINDOWS[window] == "filters":
+            analyst_data = kpi_service.breakdown("reported_by", severities, start_date, end_date, resolved_only=True)
+        else:
+            analyst_data = kpi_service.top_analysts(ANALYST_WINDOWS[window])
+        st.bar_chart(analyst_data.rename_axis("Analyst").rename("Resolved"))
+
+
+@timed_fragment("dashboard: recent incidents", page="dashboard")
+def recent_incidents_table():
+    """Most recent incidents with their own row-count control."""
+    st.subheader("Recent Incidents")
+    limit = st.selectbox("Show", [5, 10, 25, 50], key="recent_incident_limit")
+    try:
+        st.dataframe(get_kpi_service().recent(limit=limit), use_container_width=True)
+    except FileNotFoundError:
+        st.info("No incidents to show yet.")
+
+
+kpi_overview()
+st.divider()
+recent_incidents_table()
+
+enforce_memory_budget()
+finish_page_timer("dashboard")
+end_rerun()
+render_timings()
+render_profiler_panel()
+render_memory_panel()
@@ -1,22 +1,70 @@
 """Data Manager Page - CRUD operations"""
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.session_state import is_logged_in, get_current_user
-from app.data.models import AnalyticsRecord
+from app.lazy_imports import lazy_import
+from app.session_state import enforce_memory_budget, get_current_user, get_value, is_logged_in, set_value
+from app.components.memory_panel import render_memory_panel
+from app.components.profiler_panel import begin_rerun, end_rerun, render_profiler_panel
+from app.profiling import span
+
+pd = lazy_import("pandas")
 
 st.set_page_config(page_title="Data Manager", page_icon="📋", layout="wide")
+begin_rerun("data manager")
 
 # Check authentication
 if not is_logged_in():
     st.error("⚠️ Please log in first!")
     st.stop()
 
+# Services (and the pandas/NumPy they import) load only past the login check
+from app.components.paginated_table import paginated_table
+from app.data.models import AnalyticsRecord
+from app.services.data_service import get_data_service
+from app.services.exports import available_formats, export_chunks, frame_chunks
+from app.services.ingest import get_ingest_manager
+from app.services.validation import SCHEMAS, detect_schema, validate_upload
+
+
+def prepare_export(key: str, inputs: tuple, run) -> None:
+    """Run an export and keep it in session state, replacing the previous one.
+    
+    Args:
+        key: Session state key
+        inputs: What the export was built from (dataset, format)
+        run: Callable returning an ExportResult
+    """
+    export = run()
+    previous = get_value(key)
+    if previous is not None:
+        previous[1].close()
+    set_value(key, (inputs, export))
+
+
+def offer_export(key: str, inputs: tuple, label: str, name: str):
+    """Show the download button for the export prepared under `key` from `inputs`.
+    
+    Streamlit copies the file into its in-memory media store on every run
+    that shows the button; only the encoding is streamed.
+    
+    Returns:
+        The ExportResult on offer, or None if there is none for `inputs`
+    """
+    prepared = get_value(key)
+    if prepared is None or prepared[0] != inputs:
+        return None
+    export = prepared[1]
+    with export.reader() as data:
+        st.download_button(label=label, data=data, file_name=f"{name}{export.extension}", mime=export.mime,
+                           key=f"{key}_download")
+    return export
+
+
 st.title("📋 Data Manager")
 
 with st.sidebar:
@@ -30,7 +78,7 @@ with st.sidebar:
 # Tabs for different operations
 tabs = st.tabs(["View Data", "Upload Data", "Create Record", "Settings"])
 
-with tabs[0]:
+with tabs[0], span("data manager: view data"):
     st.subheader("View Dataset")
     
     dataset = st.selectbox(
@@ -69,18 +117,41 @@ with tabs[0]:
             "Value": [12.5, 125, 99.9, 95.2, 98.5]
         })
     
-    st.dataframe(df, use_container_width=True)
+    paginated_table(df, key="view_table")
     
-    # Download option
-    csv = df.to_csv(index=False)
-    st.download_button(
-        label=f"Download {dataset} as CSV",
-        data=csv,
-        file_name=f"{dataset}.csv",
-        mime="text/csv"
-    )
+    with st.expander("Browse a database table"):
+        browse_table = st.selectbox("Table", ["cyber_incidents", "it_tickets", "datasets_metadata"], key="browse_table")
+        try:
+            paginated_table(get_data_service().page_source(browse_table), key=f"browse_{browse_table}")
+        except (FileNotFoundError, ValueError) as e:
+            st.error(f"❌ {e}")
+    
+    # Download option (encoded chunk by chunk into a spooled file, only on
+    # request). The prepared export is kept in session state so the download
+    # button survives reruns until the dataset or format changes.
+    export_format = st.selectbox("Export format", available_formats(), key="view_export_format")
+    if st.button("Prepare Download", key="view_export"):
+        prepare_export("view_data_export", (dataset, export_format), lambda: export_chunks(frame_chunks(df), export_format))
+    offer_export("view_data_export", (dataset, export_format), f"Download {dataset} as {export_format}", dataset)
+    
+    with st.expander("Export a database table"):
+        table_name = st.selectbox("Table", ["cyber_incidents", "it_tickets", "datasets_metadata"])
+        table_format = st.selectbox("Format", available_formats(), key="table_export_format")
+        if st.button("Prepare Export"):
+            try:
+                prepare_export("table_data_export", (table_name, table_format),
+                               lambda: get_data_service().export(table_name, table_format))
+            except (FileNotFoundError, ValueError) as e:
+                st.error(f"❌ {e}")
+        table_export = offer_export("table_data_export", (table_name, table_format),
+                                    f"Download {table_name} as {table_format}", table_name)
+        if table_export is not None:
+            st.caption(
+                f"{table_export.rows:,} rows · {table_export.size / 1024 / 1024:.1f} MB · "
+                f"{table_export.elapsed:.2f}s ({table_export.rows_per_sec:,.0f} rows/s)"
+            )
 
-with tabs[1]:
+with tabs[1], span("data manager: upload"):
     st.subheader("Upload Data")
     
     uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
@@ -90,10 +161,65 @@ with tabs[1]:
         st.success("File uploaded successfully!")
         st.dataframe(df.head())
         
-        if st.button("Save to Database"):
-            st.info("Data would be saved to database here (Week 8 integration)")
+        # Validate whole columns at once against the matching schema (once per upload)
+        schema_keys = list(SCHEMAS)
+        detected = detect_schema(df)
+        schema_key = st.selectbox(
+            "Validate against schema",
+            schema_keys,
+            index=schema_keys.index(detected) if detected else 0,
+            format_func=lambda key: SCHEMAS[key].name
+        )
+        with span("validation"):
+            result = validate_upload(uploaded_file.getvalue(), df, schema_key)
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows", f"{result.row_count:,}")
+        col2.metric("Invalid Rows", f"{result.invalid_count:,}")
+        col3.metric("Validation Time", f"{result.elapsed:.2f}s")
+        
+        for error in result.schema_errors:
+            st.error(f"❌ {error}")
+        
+        if result.is_valid:
+            st.success("✅ All rows passed validation")
+        elif result.invalid_count:
+            st.warning(f"⚠️ {result.invalid_count:,} rows failed validation")
+            st.dataframe(result.summary(), use_container_width=True)
+            st.markdown("**First invalid rows**")
+            st.dataframe(result.invalid_rows(df, limit=100), use_container_width=True)
+        
+        # Only schemas backed by a database table can be ingested
+        if schema_key not in get_ingest_manager().targets():
+            st.info(f"{SCHEMAS[schema_key].name} has no database table; the upload can be validated but not saved")
+        elif st.button("Save to Database"):
+            try:
+                job_id = get_ingest_manager().submit(
+                    uploaded_file.getvalue(), uploaded_file.name, schema_key
+                )
+                st.info(f"Ingest job #{job_id} queued → {schema_key} (invalid rows will be skipped)")
+            except (FileNotFoundError, ValueError) as e:
+                st.error(f"❌ {e}")
+    
+    # Background ingest progress (jobs keep running between reruns)
+    jobs = get_ingest_manager().jobs()
+    if jobs:
+        st.markdown("**Ingest Jobs**")
+        st.button("🔄 Refresh progress")
+        for job in jobs[:10]:
+            progress = job.progress()
+            label = (f"#{progress['job_id']} {progress['filename']} → {progress['table']}: "
+                     f"{progress['status']} · {progress['rows_staged']:,} rows staged · "
+                     f"{progress['rows_written']:,} written · "
+                     f"{progress['rows_per_sec']:,.0f} rows/s · {progress['rows_rejected']:,} rejected")
+            st.progress(progress["fraction"], text=label)
+            if progress["errors"]:
+                with st.expander(f"Errors for job #{progress['job_id']}"):
+                    st.code("\n".join(progress["errors"]))
+            if job.is_active and st.button("Cancel", key=f"cancel_{job.job_id}"):
+                get_ingest_manager().cancel(job.job_id)
 
-with tabs[2]:
+with tabs[2], span("data manager: create record"):
     st.subheader("Create Analytics Record")
     
     col1, col2 = st.columns(2)
@@ -114,7 +240,7 @@ with tabs[2]:
         except ValueError as e:
             st.error(f"❌ Error: {e}")
 
-with tabs[3]:
+with tabs[3], span("data manager: settings"):
     st.subheader("Settings")
     
     col1, col2 = st.columns(2)
@@ -131,3 +257,8 @@ with tabs[3]:
     
     if st.button("Save Settings"):
         st.success("✅ Settings saved!")
+
+enforce_memory_budget()
+end_rerun()
+render_profiler_panel()
+render_memory_panel()
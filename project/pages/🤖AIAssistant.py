@@ -9,28 +9,32 @@ import sys
 from pathlib import Path
 from datetime import datetime
 import os
-from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.session_state import is_logged_in, get_current_user
+from app.lazy_imports import is_available, lazy_import
+from app.session_state import enforce_memory_budget, get_current_user, get_value, is_logged_in
+from app.components.memory_panel import render_memory_panel
+from app.components.profiler_panel import begin_rerun, end_rerun, render_profiler_panel
+from app.profiling import span
 
-# Load environment variables
-load_dotenv()
-
-try:
-    from openai import OpenAI
-    HAS_OPENAI = True
-except ImportError:
-    HAS_OPENAI = False
+# The OpenAI client is imported only when a key is configured and used
+openai = lazy_import("openai")
+HAS_OPENAI = is_available("openai")
 
 st.set_page_config(page_title="AI Assistant", page_icon="🤖", layout="wide")
+begin_rerun("ai assistant")
 
 # Check authentication
 if not is_logged_in():
     st.error("⚠️ Please log in first!")
     st.stop()
 
+# Load environment variables (from .env when python-dotenv is installed)
+if is_available("dotenv"):
+    from dotenv import load_dotenv
+    load_dotenv()
+
 st.title("🤖 AI Assistant")
 st.markdown("### Your Intelligent Platform Guide")
 
@@ -51,7 +55,7 @@ with st.sidebar:
         
         # Try to validate the key
         try:
-            client = OpenAI(api_key=openai_api_key)
+            client = openai.OpenAI(api_key=openai_api_key)
             client.models.list()
             st.session_state.openai_api_key = openai_api_key
         except Exception as e:
@@ -79,8 +83,8 @@ with st.sidebar:
         logout()
         st.rerun()
 
-# Initialize chat history
-if "chat_history" not in st.session_state:
+# Initialize chat history (loaded back here if it was spilled to disk)
+if get_value("chat_history") is None:
     st.session_state.chat_history = []
 
 if "chat_session_id" not in st.session_state:
@@ -168,7 +172,7 @@ def generate_ai_response(user_input):
     # Use OpenAI if API key is available
     if openai_api_key:
         try:
-            client = OpenAI(api_key=openai_api_key)
+            client = openai.OpenAI(api_key=openai_api_key)
             
             # System prompt for the AI
             system_prompt = """You are an intelligent assistant for a Portfolio Analytics Dashboard platform.
@@ -232,8 +236,8 @@ with col1:
     
     # Display chat history
     chat_container = st.container()
-    with chat_container:
-        for message in st.session_state.chat_history:
+    with chat_container, span("assistant: chat history"):
+        for message in get_value("chat_history"):
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
 
@@ -242,17 +246,18 @@ with col1:
     
     if user_input:
         # Add user message to history
-        st.session_state.chat_history.append({
+        get_value("chat_history").append({
             "role": "user",
             "content": user_input,
             "timestamp": datetime.now()
         })
         
         # Generate AI response
-        ai_response = generate_ai_response(user_input)
+        with span("assistant: response"):
+            ai_response = generate_ai_response(user_input)
         
         # Add AI message to history
-        st.session_state.chat_history.append({
+        get_value("chat_history").append({
             "role": "assistant",
             "content": ai_response,
             "timestamp": datetime.now()
@@ -269,3 +274,8 @@ with col2:
         st.rerun()
 
 st.divider()
+
+enforce_memory_budget()
+end_rerun()
+render_profiler_panel()
+render_memory_panel()
@@ -0,0 +1,41 @@
+"""Run the app with its caches warmed in the background (Week 9).
+
+`streamlit run Home.py` executes app code only when the first session
+connects, so that user pays for every cold cache. This launcher starts
+the warm-up thread (app.services.warmup) and its readiness endpoint
+first, then runs the Streamlit server in the same process: the server
+accepts connections at once while the caches fill behind it. Once warm,
+the cache state is snapshotted every $SNAPSHOT_INTERVAL seconds (default
+300) and at shutdown, and the next start restores it instead of
+rebuilding (app.services.snapshots).
+
+Usage:
+    python serve.py [streamlit run options, e.g. --server.port 8501]
+
+Load balancers poll http://<host>:$WARMUP_READY_PORT/ready (default 8502):
+503 while warming, 200 once warm. /warmup returns the per-step status.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+PROJECT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT))
+
+from app.services.snapshots import start_snapshots
+from app.services.warmup import start_readiness_server, start_warmup
+
+
+def main() -> None:
+    manager = start_warmup()
+    start_snapshots(after=manager.wait)
+    start_readiness_server(int(os.getenv("WARMUP_READY_PORT", "8502")))
+
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", str(PROJECT / "Home.py"), *sys.argv[1:]]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
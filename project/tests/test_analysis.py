@@ -0,0 +1,66 @@
+"""Tests for the chunked correlation and group comparison engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.analysis import compare_groups, correlation_matrix
+
+
+def _metrics(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(1000, 5, n)  # a large offset tests the shifted one-pass sums
+    df = pd.DataFrame({"a": base,
+                       "b": 2 * base + rng.normal(0, 3, n),
+                       "c": np.exp(rng.normal(0, 1, n)),
+                       "group": rng.choice(["High", "Low", "Medium"], n)})
+    df.loc[rng.choice(n, n // 40, replace=False), "b"] = np.nan
+    return df
+
+
+def _chunked(df, size=3000):
+    return lambda: (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+
+def test_pearson_matches_pandas_for_frames_and_chunks():
+    df = _metrics()
+    columns = ["a", "b", "c"]
+    expected = df[columns].corr()
+
+    pd.testing.assert_frame_equal(correlation_matrix(df, columns, chunk_bytes=4096), expected, rtol=1e-10)
+    pd.testing.assert_frame_equal(correlation_matrix(_chunked(df), columns), expected, rtol=1e-10)
+
+
+def test_spearman_is_exact_in_memory_and_close_for_chunks():
+    df = _metrics().dropna()  # pandas re-ranks each pair's complete rows; see the module docstring
+    columns = ["a", "b", "c"]
+    expected = df[columns].corr(method="spearman")
+
+    pd.testing.assert_frame_equal(correlation_matrix(df, columns, "spearman"), expected, rtol=1e-10)
+    approx = correlation_matrix(_chunked(df), columns, "spearman")
+    assert np.abs(approx.to_numpy() - expected.to_numpy()).max() < 1e-3
+
+
+def test_group_comparison_matches_a_groupby():
+    df = _metrics()
+    result = compare_groups(_chunked(df), "group", ["a", "c"])
+
+    for (group, metric), row in result.iterrows():
+        inside, rest = df.loc[df["group"] == group, metric], df.loc[df["group"] != group, metric]
+        assert row["count"] == len(inside)
+        assert row["mean"] == pytest.approx(inside.mean()) and row["std"] == pytest.approx(inside.std())
+        assert row["min"] == pytest.approx(inside.min()) and row["max"] == pytest.approx(inside.max())
+        assert row["diff_vs_rest"] == pytest.approx(inside.mean() - rest.mean(), abs=1e-9)
+        welch = (inside.mean() - rest.mean()) / np.sqrt(inside.var() / len(inside) + rest.var() / len(rest))
+        assert row["welch_t"] == pytest.approx(welch, rel=1e-6)
+    assert list(result.index.get_level_values("group").unique()) == ["High", "Low", "Medium"]
+
+
+def test_invalid_requests_are_rejected():
+    df = _metrics(100)
+    with pytest.raises(ValueError):
+        correlation_matrix(df, ["a", "b"], method="kendall")
+    with pytest.raises(ValueError):
+        correlation_matrix(df, [])
+    with pytest.raises(ValueError):
+        compare_groups(df, "group", [])
@@ -0,0 +1,62 @@
+"""Tests for Arrow-backed string columns and Feather/Parquet round trips."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import arrow_storage
+from app.services.data_service import DataService
+
+pytest.importorskip("pyarrow")
+
+
+def _incidents():
+    return pd.DataFrame({"id": np.arange(4),
+                         "severity": ["High", "Low", None, "High"],
+                         "description": ["Phishing mail", "", "Laptop lost", "Ransomware note"],
+                         "mixed": [1, "two", 3.0, None],
+                         "hours": [1.5, 2.0, np.nan, 4.0]})
+
+
+def test_only_string_columns_become_arrow_backed():
+    df = arrow_storage.to_arrow_strings(_incidents())
+
+    assert all(df[c].dtype == arrow_storage.ARROW_STRING for c in ("severity", "description"))
+    assert df["mixed"].dtype == object and df["hours"].dtype == np.float64
+    assert df["description"].str.contains("note").tolist() == [False, False, False, True]
+
+
+@pytest.mark.parametrize("suffix", [".feather", ".parquet"])
+def test_frames_round_trip_with_metadata(tmp_path, suffix):
+    df = arrow_storage.to_arrow_strings(_incidents().drop(columns="mixed"))
+    path = tmp_path / f"incidents{suffix}"
+    arrow_storage.write_frame(df, path, metadata={"source_fingerprint": "(1, 2)"})
+
+    pd.testing.assert_frame_equal(arrow_storage.read_frame(path), df)
+    assert arrow_storage.read_frame(path, arrow_strings=False)["severity"].dtype != arrow_storage.ARROW_STRING
+    assert arrow_storage.read_metadata(path)["source_fingerprint"] == "(1, 2)"
+    assert not path.with_suffix(suffix + ".tmp").exists()
+
+
+def test_unknown_suffix_and_unreadable_metadata(tmp_path):
+    with pytest.raises(ValueError):
+        arrow_storage.write_frame(_incidents(), tmp_path / "incidents.csv")
+    (tmp_path / "broken.feather").write_bytes(b"not arrow")
+    assert arrow_storage.read_metadata(tmp_path / "broken.feather") == {}
+
+
+def test_cached_load_reuses_the_feather_copy_until_the_csv_changes(tmp_path):
+    _incidents().drop(columns="mixed").to_csv(tmp_path / "incidents.csv", index=False)
+    service = DataService()
+    service.data_dir = tmp_path
+
+    first = service.load_csv("incidents.csv", arrow_strings=True)
+    assert first["description"].dtype == arrow_storage.ARROW_STRING
+    feather_copy = tmp_path / ".cache" / "incidents.csv.feather"
+    written = feather_copy.stat().st_mtime_ns
+    pd.testing.assert_frame_equal(service.load_csv("incidents.csv", arrow_strings=True), first)
+    assert feather_copy.stat().st_mtime_ns == written
+
+    with (tmp_path / "incidents.csv").open("a") as f:
+        f.write("4,Low,Late row,5.0\n")
+    assert len(service.load_csv("incidents.csv", arrow_strings=True)) == 5
@@ -0,0 +1,53 @@
+"""Tests for LTTB downsampling of chart series."""
+
+import numpy as np
+import pandas as pd
+
+from app.services.downsampling import downsample_frame, lttb_indices
+
+
+def _reference_lttb(x, y, threshold):
+    """Textbook LTTB, one bucket and one point at a time."""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    selected, a = [0], 0
+    for i in range(threshold - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt_lo, nxt_hi = hi, min(int((i + 2) * every) + 1, n - 1)
+        avg_x, avg_y = (x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()) if nxt_hi > nxt_lo else (x[-1], y[-1])
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) for j in range(lo, hi)]
+        a = lo + int(np.argmax(areas))
+        selected.append(a)
+    return np.array(selected + [n - 1])
+
+
+def test_keeps_the_endpoints_and_the_point_budget():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000, dtype=float)
+    y = rng.normal(size=10_000).cumsum()
+    y[4321] = 1e6  # a spike must survive
+
+    kept = lttb_indices(x, y, 500)
+    assert len(kept) == 500 and kept[0] == 0 and kept[-1] == 9_999
+    assert np.all(np.diff(kept) > 0) and 4321 in kept
+    np.testing.assert_array_equal(kept, _reference_lttb(x, y, 500))
+
+
+def test_small_inputs_are_returned_whole():
+    x = np.arange(10, dtype=float)
+    np.testing.assert_array_equal(lttb_indices(x, x, 10), np.arange(10))
+    np.testing.assert_array_equal(lttb_indices(x, x, 2), np.arange(10))
+
+
+def test_frames_keep_every_series_shape_under_one_index():
+    index = pd.date_range("2020-01-01", periods=20_000, freq="h")
+    df = pd.DataFrame({"High": np.sin(np.arange(20_000) / 50), "Low": np.cos(np.arange(20_000) / 70),
+                       "label": "incidents"}, index=index)
+
+    small = downsample_frame(df, max_points=300)
+    assert 300 <= len(small) <= 600 and small.index.is_monotonic_increasing
+    assert small.index[0] == index[0] and small.index[-1] == index[-1]
+    assert small["High"].max() > 0.99 and small["Low"].min() < -0.99
+    pd.testing.assert_frame_equal(small, df.loc[small.index])
+    head = df.head(100)
+    assert downsample_frame(head, max_points=300) is head
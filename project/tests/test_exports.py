@@ -0,0 +1,53 @@
+"""Tests for chunked exports and prepared downloads on the Data Manager page."""
+
+import gzip
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from app.services.exports import available_formats, export_chunks, frame_chunks
+
+PROJECT = Path(__file__).parent.parent
+
+
+def _frame(n=2500):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"id": np.arange(n), "severity": rng.choice(["Low", "High"], n),
+                         "score": rng.random(n).round(6)})
+
+
+@pytest.mark.parametrize("fmt", [fmt for fmt in available_formats() if fmt != "csv.zst"])
+def test_chunked_export_round_trips(fmt):
+    df = _frame()
+    with export_chunks(frame_chunks(df, chunksize=1000), fmt, spool_limit=4096) as export, \
+            export.reader() as reader:
+        data = reader.read()
+        assert export.rows == len(df) and export.size == len(data)
+        assert export.rolled_to_disk and export.nbytes() == 0
+
+    if fmt == "parquet":
+        loaded = pd.read_parquet(io.BytesIO(data))
+    elif fmt == "ndjson":
+        loaded = pd.read_json(io.BytesIO(data), lines=True)
+    else:
+        loaded = pd.read_csv(io.BytesIO(gzip.decompress(data) if fmt == "csv.gz" else data))
+    pd.testing.assert_frame_equal(loaded, df)
+
+
+def test_prepared_download_survives_reruns():
+    at = AppTest.from_file(str(PROJECT / "pages" / "📋DataManager.py"), default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = "alice"
+    at.run()
+    assert not at.get("download_button")
+
+    at.button(key="view_export").click().run()
+    at.run()  # an unrelated rerun keeps the prepared export
+    assert [button.proto.label for button in at.get("download_button")] == ["Download Cyber Incidents as csv"]
+
+    at.selectbox(key="view_export_format").select("ndjson").run()
+    assert not at.get("download_button")  # prepared for other inputs
@@ -0,0 +1,44 @@
+"""Tests for timed fragments and rerun timings (run with AppTest)."""
+
+from streamlit.testing.v1 import AppTest
+
+
+def _page():
+    import streamlit as st
+    from app.components.fragments import finish_page_timer, start_page_timer, timed_fragment
+
+    @timed_fragment("Filters", page="Page")
+    def filters():
+        choice = st.selectbox("Severity", ["All", "High"], key="severity")
+        st.write(f"Showing {choice}")
+
+    start_page_timer("Page")
+    if not st.session_state.get("fragment_only"):
+        filters()
+    finish_page_timer("Page")
+    if st.session_state.get("fragment_only"):
+        filters()  # runs like a fragment-only rerun: no page timer pending
+
+
+def _run(fragment_only=False):
+    at = AppTest.from_function(_page)
+    at.session_state["fragment_only"] = fragment_only
+    return at.run()
+
+
+def test_page_and_fragment_runs_are_timed():
+    at = _run()
+    at.selectbox(key="severity").select("High").run()
+
+    timings = at.session_state["rerun_timings"]
+    assert not at.exception and at.markdown[0].value == "Showing High"
+    assert timings["Page"]["runs"] == timings["Filters"]["runs"] == 2
+    assert timings["Filters"]["total"] >= timings["Filters"]["last"] > 0
+    assert not at.caption  # no comparison during a full page run
+
+
+def test_fragment_only_runs_are_compared_with_the_full_rerun():
+    at = _run(fragment_only=True)
+
+    assert not at.exception
+    assert "Rerun of this section" in at.caption[0].value and "full page rerun" in at.caption[0].value
@@ -0,0 +1,56 @@
+"""Tests for secondary column indexes and indexed filtering."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_service import DataService
+from app.services.indexing import ColumnIndex, intersect_positions
+
+
+def _incidents(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"id": np.arange(n),
+                         "severity": rng.choice(["Low", "High", "Critical", None], n),
+                         "status": rng.choice(["Open", "Closed"], n),
+                         "score": rng.integers(0, 20, n)})
+
+
+def test_lookup_matches_a_column_scan():
+    df = _incidents()
+    for column in ("severity", "score"):
+        index = ColumnIndex(df[column])
+        for value in df[column].dropna().unique():
+            np.testing.assert_array_equal(index.lookup(value), np.flatnonzero(df[column] == value))
+    assert len(ColumnIndex(df["severity"]).lookup("Unknown")) == 0
+
+
+def test_intersection_of_position_sets():
+    sets = [np.array([1, 3, 5, 7, 9]), np.array([0, 3, 4, 9]), np.array([3, 9, 12])]
+    np.testing.assert_array_equal(intersect_positions(sets), [3, 9])
+    assert len(intersect_positions([np.array([1, 2]), np.array([], dtype=np.int64)])) == 0
+
+
+def test_appended_rows_and_bytes_round_trip():
+    df = _incidents()
+    index = ColumnIndex(df["severity"].iloc[:2000])
+    index.append(df["severity"].iloc[2000:].replace("Low", "Medium"), 2000)
+    expected = pd.concat([df["severity"].iloc[:2000], df["severity"].iloc[2000:].replace("Low", "Medium")])
+
+    loaded = ColumnIndex.from_bytes(index.to_bytes())
+    for value in ("Low", "Medium", "High"):
+        np.testing.assert_array_equal(loaded.lookup(value), np.flatnonzero(expected.to_numpy() == value))
+    with pytest.raises(ValueError):
+        ColumnIndex.from_bytes(b"not an index")
+
+
+def test_indexed_filter_matches_an_unindexed_one(tmp_path):
+    _incidents().to_csv(tmp_path / "incidents.csv", index=False)
+    service = DataService()
+    service.data_dir = tmp_path
+    df = service.load_csv("incidents.csv", index_columns=["severity", "status"])
+    plain = df.copy()
+
+    indexed = service.filter_data(df, severity="High", status="Open", score=7)
+    pd.testing.assert_frame_equal(indexed, service.filter_data(plain, severity="High", status="Open", score=7))
+    assert service.get_cache_stats()["index_hits"] == 1
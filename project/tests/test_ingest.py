@@ -0,0 +1,97 @@
+"""Tests for background ingest targets, natural-key merges and journal mode."""
+
+import shutil
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from app.services.ingest import IngestManager
+
+DATABASE = Path(__file__).parents[2] / "Week_08_Lab" / "DATA" / "intelligence_platform.db"
+
+TICKETS = b"ticket_id,title,priority,status,assignee,created_date\nTCK-9001,Printer jam,Low,Open,bob,2025-11-03\n"
+
+
+def _database(tmp_path):
+    db_path = tmp_path / "platform.db"
+    shutil.copy(DATABASE, db_path)
+    return db_path
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = IngestManager(_database(tmp_path))
+    yield manager
+    manager.shutdown()
+
+
+def test_only_schemas_with_a_table_are_targets(manager):
+    assert manager.targets() == ["cyber_incidents", "it_tickets", "datasets_metadata"]
+    with pytest.raises(ValueError, match="analytics_records"):
+        manager.submit(b"ID,Title,Type,Value\n1,Growth,count,3\n", "records.csv", "analytics_records")
+    assert manager.jobs() == []
+
+
+def test_ingest_keeps_the_rollback_journal(manager):
+    job_id = manager.submit(TICKETS, "tickets.csv", "it_tickets")
+    manager.shutdown()
+
+    assert manager.get_job(job_id).progress()["rows_written"] == 1
+    with closing(sqlite3.connect(manager.db_path)) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert not manager.db_path.with_name(manager.db_path.name + "-wal").exists()
+
+
+INCIDENTS = (b"date,incident_type,severity,status,description,reported_by\n"
+             b"2025-11-05,Phishing,High,Open,,alice\n"
+             b"2025-11-06,Malware,Low,Closed,Laptop,bob\n"
+             b"2025-11-05,Phishing,High,Open,,alice\n")
+
+
+def _count(manager, table):
+    with closing(sqlite3.connect(manager.db_path)) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def _ingest(manager, data, filename, table):
+    job_id = manager.submit(data, filename, table)
+    manager._executor.submit(lambda: None).result()  # single worker: queued after the job
+    return manager.get_job(job_id).progress()
+
+
+def test_reuploading_without_a_unique_key_adds_no_duplicates(tmp_path):
+    manager = IngestManager(_database(tmp_path), max_workers=1)
+    before = _count(manager, "cyber_incidents")
+
+    assert _ingest(manager, INCIDENTS, "incidents.csv", "cyber_incidents")["rows_written"] == 2
+    assert _ingest(manager, INCIDENTS, "incidents.csv", "cyber_incidents")["rows_written"] == 0
+    assert _count(manager, "cyber_incidents") == before + 2
+    manager.shutdown()
+
+
+def test_schema_unique_column_updates_existing_rows(tmp_path):
+    manager = IngestManager(_database(tmp_path), max_workers=1)
+    header = b"dataset_name,source,size_mb,records,last_updated\n"
+    before = _count(manager, "datasets_metadata")
+
+    _ingest(manager, header + b"feeds,Vendor,1.5,10,2025-11-01\n", "meta.csv", "datasets_metadata")
+    _ingest(manager, header + b"feeds,Vendor,2.5,20,2025-11-02\n", "meta.csv", "datasets_metadata")
+    with closing(sqlite3.connect(manager.db_path)) as conn:
+        rows = conn.execute("SELECT size_mb, records FROM datasets_metadata WHERE dataset_name = 'feeds'").fetchall()
+    assert rows == [(2.5, 20)] and _count(manager, "datasets_metadata") == before + 1
+    manager.shutdown()
+
+
+def test_failure_in_a_later_chunk_writes_nothing(tmp_path):
+    manager = IngestManager(_database(tmp_path), max_workers=1, chunksize=1000)
+    before = _count(manager, "cyber_incidents")
+    lines = b"".join(b"2025-11-07,DDoS,High,Open,host %d,bob\n" % i for i in range(50_000))
+
+    # Undecodable bytes far past the first chunks
+    progress = _ingest(manager, INCIDENTS + lines + b"2025-11-07,DDoS,High,Open,\xff\xfe,bob\n",
+                       "incidents.csv", "cyber_incidents")
+    assert progress["status"] == "failed" and progress["rows_staged"] >= 1000
+    assert progress["rows_written"] == 0 and _count(manager, "cyber_incidents") == before
+    manager.shutdown()
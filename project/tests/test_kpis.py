@@ -0,0 +1,93 @@
+"""Tests for the KpiService result cache and incremental catch-up."""
+
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from app.services.data_service import DataService
+from app.services.kpis import KpiCube, KpiService
+
+
+def _service(max_results=128):
+    service = KpiService(data_service=None, max_results=max_results)
+    service.cube = lambda: KpiCube()  # no source; results only depend on the key
+    return service
+
+
+def test_results_are_bounded_lru():
+    service = _service(max_results=2)
+    service._cached(("a",), lambda cube: 1)
+    service._cached(("b",), lambda cube: 2)
+    service._cached(("a",), lambda cube: 0)  # hit; "b" becomes least recent
+    service._cached(("c",), lambda cube: 3)
+
+    assert list(service._results) == [("a",), ("c",)]
+    assert service.stats["hits"] == 1 and service.stats["misses"] == 3
+
+
+def test_concurrent_misses_compute_once_outside_the_lock():
+    service = _service()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(cube):
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service._cached(("slow",), slow))) for _ in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+
+    # Other keys are served while the slow one is computing
+    began = time.perf_counter()
+    assert service._cached(("fast",), lambda cube: "fast") == "fast"
+    assert time.perf_counter() - began < 1
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["slow"] * 3 and len(calls) == 1
+
+
+def test_invalidate_discards_results_computed_before_it():
+    service = _service()
+    service._cached(("k",), lambda cube: (service.invalidate(), "old")[1])
+    assert service._cached(("k",), lambda cube: "new") == "new"
+
+
+def test_sql_catch_up_counts_rows_inserted_during_it_once(tmp_path):
+    db_path = tmp_path / "platform.db"
+
+    def insert(*ids):
+        with closing(sqlite3.connect(db_path)) as conn, conn:
+            conn.executemany("INSERT INTO cyber_incidents VALUES (?, '2024-01-02', 'Phishing', 'High', 'Open', '', 'bob')",
+                             [(i,) for i in ids])
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.execute("CREATE TABLE cyber_incidents (id INTEGER PRIMARY KEY, date TEXT, incident_type TEXT, "
+                     "severity TEXT, status TEXT, description TEXT, reported_by TEXT)")
+    insert(1, 2, 3)
+    data_service = DataService()
+    data_service.data_dir, data_service.db_path = tmp_path, db_path
+    service = KpiService(data_service, ttl=0)
+    assert service.kpis()["total"] == 3
+
+    fingerprint = service._source_fingerprint
+
+    def fingerprint_then_insert():
+        current = fingerprint()
+        insert(5)  # lands between the fingerprint and the catch-up query
+        return current
+
+    insert(4)
+    service._source_fingerprint = fingerprint_then_insert
+    service.kpis()
+    service._source_fingerprint = fingerprint
+    assert service.kpis()["total"] == 5
@@ -0,0 +1,31 @@
+"""Tests for deferred imports of heavy modules."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from app.lazy_imports import LazyModule, is_available, lazy_import
+
+PROJECT = Path(__file__).parent.parent
+
+
+def _loaded_after(statement, modules):
+    """Run an import in a fresh interpreter and report which modules it loaded."""
+    check = f"import sys; {statement}; print(','.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", check], cwd=PROJECT, capture_output=True, text=True, check=True)
+    return [module for module in output.stdout.strip().split(",") if module]
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    assert _loaded_after("from app.lazy_imports import lazy_import; json = lazy_import('json')", ["json"]) == []
+    assert _loaded_after("from app.lazy_imports import lazy_import; lazy_import('json').dumps", ["json"]) == ["json"]
+
+    module = lazy_import("app.services.no_such_module")
+    assert isinstance(module, LazyModule) and "not loaded" in repr(module)
+    assert lazy_import("sys") is sys and is_available("pandas") and not is_available("no_such_module")
+
+
+def test_data_service_defers_heavy_service_modules():
+    heavy = ["pyarrow.parquet", "pyarrow.feather", "multiprocessing", "app.services.exports",
+             "app.services.pagination", "app.services.parallel", "app.services.tailing"]
+    assert _loaded_after("import app.services.kpis, app.services.data_service", heavy) == []
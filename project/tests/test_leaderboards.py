@@ -0,0 +1,57 @@
+"""Tests for incremental top-K boards and windowed leaderboards."""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.leaderboards import Leaderboard, TopK
+
+
+def _exact(counts, k):
+    ranked = sorted(((key, count) for key, count in counts.items() if count > 0),
+                    key=lambda item: (-item[1], str(item[0])))
+    return ranked[:k]
+
+
+def test_topk_matches_an_exact_count_under_increments_and_decrements():
+    rng = np.random.default_rng(0)
+    board, exact = TopK(5), Counter()
+    for step in range(20_000):
+        key = f"analyst_{int(rng.zipf(1.3)) % 60}"
+        delta = -1 if exact[key] > 0 and rng.random() < 0.3 else 1  # reopened or reassigned
+        board.update(key, delta)
+        exact[key] += delta
+        if step % 997 == 0:
+            assert board.top() == _exact(exact, 5)
+
+    assert board.top() == _exact(exact, 5) and board.top(2) == _exact(exact, 2)
+    assert all(board.count(key) == count for key, count in exact.items())
+    assert len(board._heap) <= 2 * board.k + 32  # outdated heap entries are pruned
+    with pytest.raises(ValueError):
+        TopK(0)
+
+
+def test_windows_match_exact_counts_as_time_advances():
+    rng = np.random.default_rng(1)
+    n = 5000
+    df = pd.DataFrame({"key": rng.choice([f"analyst_{i}" for i in range(25)], n),
+                       "day": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, n), unit="D")})
+    board = Leaderboard(4, (7, 30))
+    for _, month in df.groupby(df["day"].dt.month):
+        board.update_frame(month["key"], month["day"])  # arrives in batches, roughly in order
+
+    end = df["day"].max()
+    for window in (7, 30):
+        recent = df[df["day"] > end - pd.Timedelta(days=window)]
+        assert board.top(window) == _exact(Counter(recent["key"]), 4)
+    assert board.top() == _exact(Counter(df["key"]), 4)
+
+    board.advance(end + pd.Timedelta(days=5))
+    recent = df[df["day"] > end - pd.Timedelta(days=2)]
+    assert board.top(7) == _exact(Counter(recent["key"]), 4)
+    board.advance(end + pd.Timedelta(days=40))
+    assert board.top(30) == [] and board.top() == _exact(Counter(df["key"]), 4)
+    with pytest.raises(ValueError):
+        board.top(14)
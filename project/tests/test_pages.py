@@ -0,0 +1,54 @@
+"""Smoke tests for the Streamlit pages (run with AppTest)."""
+
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import app.services.kpis as kpis
+from app.services.data_service import get_data_service
+
+PROJECT = Path(__file__).parent.parent
+
+
+def _run(page):
+    at = AppTest.from_file(str(PROJECT / "pages" / page), default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = "alice"
+    return at.run()
+
+
+@pytest.fixture
+def missing_source(tmp_path, monkeypatch):
+    """Point the data service at an empty directory with no database."""
+    service = get_data_service()
+    monkeypatch.setattr(service, "data_dir", tmp_path)
+    monkeypatch.setattr(service, "db_path", tmp_path / "missing.db")
+    monkeypatch.setattr(kpis, "_kpi_service", kpis.KpiService(service))
+
+
+def test_dashboard_runs_from_the_project_directory(monkeypatch):
+    monkeypatch.chdir(PROJECT)
+    at = _run("📊Dashboard.py")
+    assert not at.exception
+    assert [metric.label for metric in at.metric][:1] == ["Total Incidents"]
+    assert not (PROJECT / "project").exists()
+
+
+def test_dashboard_reports_a_missing_source(missing_source):
+    at = _run("📊Dashboard.py")
+    assert not at.exception
+    assert "unavailable" in at.error[0].value
+
+
+def test_analytics_time_series_runs_from_the_project_directory(monkeypatch):
+    monkeypatch.chdir(PROJECT)
+    at = _run("📈Analytics.py")
+    assert not at.exception
+    assert any("points plotted" in caption.value for caption in at.caption)
+
+
+def test_analytics_time_series_reports_a_missing_source(missing_source):
+    at = _run("📈Analytics.py")
+    assert not at.exception
+    assert "unavailable" in at.error[0].value
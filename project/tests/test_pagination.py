@@ -0,0 +1,50 @@
+"""Tests for SQL keyset pagination and in-memory page sources."""
+
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.pagination import FramePageSource, SqlPageSource
+
+
+@pytest.fixture
+def scores(tmp_path):
+    """30 rows whose sort column `s` is NULL for every third row."""
+    db_path = tmp_path / "scores.db"
+    rows = [(i, None if i % 3 == 0 else i % 7) for i in range(1, 31)]
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY, s INTEGER)")
+        conn.executemany("INSERT INTO scores VALUES (?, ?)", rows)
+    return db_path, pd.DataFrame(rows, columns=["id", "s"])
+
+
+def _pages(source, page_size, **kwargs):
+    pages = [source.fetch(page, page_size, **kwargs) for page in range(-(-source.count() // page_size))]
+    return pd.concat(pages, ignore_index=True)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_sql_pages_keep_null_sort_values(scores, descending):
+    db_path, df = scores
+    rows = _pages(SqlPageSource(db_path, "scores"), 10, sort="s", descending=descending)
+
+    # SQLite puts NULLs first ascending and last descending, ties broken by id
+    expected = df.assign(null=df["s"].isna()).sort_values(
+        ["null", "s", "id"], ascending=[descending, not descending, not descending])
+    assert len(rows) == 30
+    assert rows["id"].tolist() == expected["id"].tolist()
+
+
+def test_frame_pages_match_a_full_sort():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"id": np.arange(500), "severity": rng.choice(["Low", "High", "Critical"], 500),
+                       "score": rng.integers(0, 50, 500)})
+    source = FramePageSource(df)
+
+    rows = _pages(source, 40, sort="score", descending=True)
+    assert rows["score"].tolist() == sorted(df["score"], reverse=True)
+    filtered = source.fetch(0, 1000, sort="id", filters={"severity": ["High"]})
+    assert filtered["id"].tolist() == df.loc[df["severity"] == "High", "id"].tolist()
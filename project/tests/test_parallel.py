@@ -0,0 +1,55 @@
+"""Tests for parallel multi-file loading and glob aggregation in DataService."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_service import DataService
+from app.services.streaming import Count, GroupBy, MinMax, Sum
+
+
+def _shards(tmp_path, count=5, rows=700):
+    rng = np.random.default_rng(0)
+    (tmp_path / "shards").mkdir()
+    frames = []
+    for i in range(count):
+        df = pd.DataFrame({"severity": rng.choice(["Low", "High", "Critical"], rows),
+                           "hours": rng.integers(0, 100, rows)})
+        df.to_csv(tmp_path / "shards" / f"incidents_{i}.csv", index=False)
+        frames.append(df)
+    service = DataService()
+    service.data_dir = tmp_path
+    return service, pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_aggregate_glob_matches_a_single_pass(tmp_path, use_processes):
+    service, whole = _shards(tmp_path)
+    results = service.aggregate_glob("shards/incidents_*.csv", workers=2, use_processes=use_processes,
+                                     chunksize=250, rows=Count(), hours=Sum("hours"), span=MinMax("hours"),
+                                     by_severity=GroupBy("severity", ["hours"]))
+
+    single = GroupBy("severity", ["hours"])
+    single.update(whole)
+    assert results["rows"] == len(whole)
+    assert results["hours"] == whole["hours"].sum()
+    assert results["span"] == (whole["hours"].min(), whole["hours"].max())
+    pd.testing.assert_frame_equal(results["by_severity"], single.result())
+
+
+def test_load_many_expands_globs_and_caches_each_file(tmp_path):
+    service, _ = _shards(tmp_path, count=3)
+    loaded = service.load_many(["shards/incidents_*.csv", "shards/incidents_0.csv"], workers=2)
+
+    assert list(loaded) == [f"shards/incidents_{i}.csv" for i in range(3)]
+    for filename, df in loaded.items():
+        pd.testing.assert_frame_equal(df, pd.read_csv(tmp_path / filename))
+    assert set(service.get_cache_stats()["datasets"]) == set(loaded)
+
+
+def test_missing_inputs_are_reported(tmp_path):
+    service, _ = _shards(tmp_path, count=1)
+    with pytest.raises(FileNotFoundError):
+        service.load_many(["shards/incidents_0.csv", "shards/missing.csv"])
+    with pytest.raises(FileNotFoundError):
+        service.aggregate_glob("other_*.csv", rows=Count())
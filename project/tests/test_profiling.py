@@ -0,0 +1,67 @@
+"""Tests for rerun profiles, span nesting and timing helpers."""
+
+import threading
+import time
+
+import pytest
+
+from app.profiling import current_profile, percentile, span, start_profile, stop_profile, timed
+
+
+@timed("data: load")
+def _load(depth=0):
+    time.sleep(0.005)
+    if depth:
+        _load(depth - 1)  # recursion must not be counted twice
+
+
+@pytest.fixture
+def profile():
+    profile = start_profile("Dashboard")
+    yield profile
+    stop_profile()
+
+
+def test_spans_record_nesting_and_totals(profile):
+    with span("page"):
+        with span("aggregate"):
+            _load(depth=2)
+        with pytest.raises(KeyError):
+            with span("render"):
+                raise KeyError("chart")
+    stop_profile()
+
+    by_name = {}
+    for name, depth, start, end in profile.spans:
+        by_name.setdefault(name, []).append((depth, start, end))
+    assert [depth for depth, _, _ in by_name["data: load"]] == [4, 3, 2]
+    assert by_name["page"][0][0] == 0 and by_name["aggregate"][0][0] == by_name["render"][0][0] == 1
+    outer = by_name["data: load"][-1]
+    assert all(outer[1] <= start and end <= outer[2] for _, start, end in by_name["data: load"])
+
+    totals = profile.span_totals()
+    assert totals["data: load"] == pytest.approx(outer[2] - outer[1])
+    assert totals["data: load"] >= 15 and totals["page"] >= totals["aggregate"] >= totals["data: load"]
+    assert profile.unaccounted_ms() == pytest.approx(profile.total_ms - totals["page"])
+    assert profile._depth == 0  # the failing span was closed
+
+
+def test_nothing_is_recorded_without_an_active_profile(profile):
+    recorded = []
+    worker = threading.Thread(target=lambda: recorded.append((current_profile(), span("x"), _load())))
+    worker.start()
+    worker.join(5)
+    assert recorded[0][0] is None  # other threads don't see this run's profile
+
+    stop_profile()
+    assert current_profile() is None and stop_profile() is None
+    with span("ignored"):
+        _load()
+    assert profile.spans == []
+
+
+def test_percentile_uses_the_nearest_rank():
+    values = [15, 20, 35, 40, 50]
+    assert [percentile(values, q) for q in (0, 30, 40, 50, 100)] == [15, 20, 20, 35, 50]
+    with pytest.raises(ValueError):
+        percentile([], 50)
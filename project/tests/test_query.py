@@ -0,0 +1,54 @@
+"""Tests for lazy queries pushed down to SQLite or run over cached CSVs."""
+
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import query as query_module
+from app.services.data_service import DataService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """The same incidents as a database table and as a CSV file."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"id": np.arange(1, 2001), "severity": rng.choice(["Low", "High", "Critical"], 2000),
+                       "status": rng.choice(["Open", "Closed"], 2000), "score": rng.integers(0, 100, 2000)})
+    with closing(sqlite3.connect(tmp_path / "platform.db")) as conn:
+        df.to_sql("incidents", conn, index=False)
+    df.to_csv(tmp_path / "incidents.csv", index=False)
+    service = DataService()
+    service.data_dir, service.db_path = tmp_path, tmp_path / "platform.db"
+    return service
+
+
+def _plan(source):
+    return (source.where("severity", ["High", "Critical"], "in").where("score", 50, ">=")
+            .group_by("status").agg(incidents="count", top=("score", "max"), mean=("score", "mean"))
+            .order_by("status"))
+
+
+def test_sql_and_csv_queries_agree(service):
+    sql, csv = _plan(service.table("incidents")), _plan(service.table("incidents.csv"))
+    assert sql.is_sql and not csv.is_sql
+    statement, params = sql.to_sql()
+    assert "WHERE" in statement and "GROUP BY" in statement and params == ["High", "Critical", 50]
+    pd.testing.assert_frame_equal(sql.collect(), csv.collect(), check_dtype=False)
+
+
+def test_sql_queries_close_their_connections(service, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(query_module.sqlite3, "connect",
+                        lambda *args, **kwargs: opened.append(connect(*args, **kwargs)) or opened[-1])
+    query = service.table("incidents").where("status", "Open").limit(5)
+    query.collect()
+    query.explain()
+
+    assert opened
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
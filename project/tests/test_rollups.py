@@ -0,0 +1,118 @@
+"""Tests for incremental TimeRollup updates and binary persistence."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_service import DataService
+from app.services.rollups import TimeRollup
+
+
+def _rows(n, start, seconds, seed):
+    rng = np.random.default_rng(seed)
+    times = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, seconds, n), unit="s")
+    return pd.DataFrame({"date": times,
+                         "severity": rng.choice(["Low", "High", None], n),
+                         "status": rng.choice(["Open", "Closed"], n)})
+
+
+def test_incremental_updates_match_a_single_build():
+    parts = [_rows(5000, "2024-01-01", 60 * 86400, 0),
+             _rows(200, "2024-03-01", 3600, 1),     # appended at the tail
+             _rows(200, "2024-01-20", 86400, 2)]    # late rows in the middle
+    incremental, whole = TimeRollup(), TimeRollup()
+    for part in parts:
+        incremental.update(part)
+    whole.update(pd.concat(parts, ignore_index=True))
+
+    assert incremental.bucket_count() == whole.bucket_count()
+    for start, end in [("2024-01-05 13:17", "2024-02-11 04:03"), ("2024-03-01", "2024-03-01 00:30")]:
+        assert incremental.total(start, end) == whole.total(start, end)
+        pd.testing.assert_frame_equal(incremental.series(start, end, "hour", by="severity"),
+                                      whole.series(start, end, "hour", by="severity"))
+
+
+def test_bytes_round_trip(tmp_path):
+    rollup = TimeRollup()
+    rollup.update(_rows(1000, "2024-01-01", 7 * 86400, 3))
+    rollup.source_fingerprint = (1234, 5678)
+    rollup.save(tmp_path / "incidents.rollup")
+
+    loaded = TimeRollup.load(tmp_path / "incidents.rollup")
+    assert loaded.source_fingerprint == (1234, 5678)
+    assert loaded.bucket_count() == rollup.bucket_count()
+    pd.testing.assert_series_equal(loaded.total("2024-01-01", "2024-02-01", by="status"),
+                                   rollup.total("2024-01-01", "2024-02-01", by="status"))
+
+
+def test_tz_aware_series_and_round_trip():
+    rows = _rows(2000, "2024-03-25", 13 * 86400, 7)  # spans the BST change
+    rows["date"] = rows["date"].dt.tz_localize("UTC").dt.tz_convert("Europe/London")
+    rollup = TimeRollup()
+    rollup.update(rows)
+
+    for freq in ("hour", "day", "week"):
+        series = rollup.series("2024-03-25", "2024-04-08", freq)
+        assert series.index.tz is not None and series["count"].sum() == 2000
+    daily = rollup.series("2024-03-25", "2024-04-08", "day")
+    assert daily.index[0] == pd.Timestamp("2024-03-25", tz="Europe/London")
+
+    loaded = TimeRollup.from_bytes(rollup.to_bytes())
+    pd.testing.assert_frame_equal(loaded.series("2024-03-25", "2024-04-08", "hour", by="status"),
+                                  rollup.series("2024-03-25", "2024-04-08", "hour", by="status"))
+
+
+def test_from_bytes_rejects_other_blobs():
+    with pytest.raises(ValueError):
+        TimeRollup.from_bytes(b"\x80\x05not a rollup")
+    rollup = TimeRollup()
+    rollup.update(_rows(100, "2024-01-01", 86400, 8))
+    with pytest.raises(ValueError):
+        TimeRollup.from_bytes(rollup.to_bytes()[:-8])
+
+
+def _csv_service(tmp_path, rows):
+    rows.to_csv(tmp_path / "incidents.csv", index=False)
+    service = DataService()
+    service.data_dir = tmp_path
+    return service
+
+
+def _append(tmp_path, rows):
+    rows.to_csv(tmp_path / "incidents.csv", mode="a", header=False, index=False)
+
+
+def test_rollup_from_a_stale_frame_is_not_reused_after_restart(tmp_path):
+    rows = _rows(300, "2024-01-01", 86400, 4)
+    service = _csv_service(tmp_path, rows.iloc[:200])
+    service.load_csv("incidents.csv")
+    _append(tmp_path, rows.iloc[200:])  # not refreshed into the cache yet
+    assert service.get_rollup("incidents.csv").total("2024", "2025") == 200
+
+    restarted = DataService()
+    restarted.data_dir = tmp_path
+    assert restarted.get_rollup("incidents.csv").total("2024", "2025") == 300
+
+
+def test_update_rollup_without_a_rollup_counts_new_rows_once(tmp_path):
+    rows = _rows(300, "2024-01-01", 86400, 5)
+    service = _csv_service(tmp_path, rows.iloc[:200])
+    service.load_csv("incidents.csv")
+    _append(tmp_path, rows.iloc[200:])
+    new_rows = service.refresh_csv("incidents.csv")
+
+    assert service.update_rollup("incidents.csv", new_rows).total("2024", "2025") == 300
+
+
+def test_refreshed_rollup_is_reused_after_restart(tmp_path):
+    rows = _rows(300, "2024-01-01", 86400, 6)
+    service = _csv_service(tmp_path, rows.iloc[:200])
+    service.load_csv("incidents.csv")
+    service.get_rollup("incidents.csv")
+    _append(tmp_path, rows.iloc[200:])
+    service.refresh_csv("incidents.csv")
+
+    restarted = DataService()
+    restarted.data_dir = tmp_path
+    rollup = restarted._load_rollup("incidents.csv", "date", ("severity", "status"))
+    assert rollup is not None and rollup.total("2024", "2025") == 300
@@ -0,0 +1,55 @@
+"""Tests for session-state memory budgets (app.session_memory)."""
+
+import gc
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import app.session_memory as session_memory
+from app.session_memory import SessionMemoryManager, SpilledValue
+
+
+def _chat_page():
+    import streamlit as st
+    from app.session_state import enforce_memory_budget, get_value, set_value
+
+    history = get_value("chat_history")
+    if history is None:
+        set_value("chat_history", ["message " * 100] * 200)
+    else:
+        st.write(f"restored {len(history)}")
+    enforce_memory_budget()
+
+
+@pytest.fixture
+def tiny_budget(tmp_path, monkeypatch):
+    """Install a session memory manager that spills almost everything."""
+    manager = SessionMemoryManager(session_budget=1024, global_budget=1024, spill_dir=tmp_path)
+    monkeypatch.setattr(session_memory, "_session_memory", manager)
+    return manager
+
+
+def test_spilled_value_survives_rerun_after_gc(tiny_budget):
+    at = AppTest.from_function(_chat_page)
+    at.run()
+    placeholder = at.session_state["chat_history"]
+    assert isinstance(placeholder, SpilledValue)
+
+    gc.collect()  # drops the previous run's session-state wrapper
+    assert placeholder.path.exists()
+
+    at.run()
+    assert not at.exception
+    assert [element.value for element in at.markdown] == ["restored 200"]
+
+
+def test_sweep_forgets_only_closed_sessions(tiny_budget):
+    for session_id in ("open", "closed"):
+        state = {"chat_history": ["message " * 100] * 200}
+        tiny_budget.enforce(session_id, state)
+        assert isinstance(state["chat_history"], SpilledValue)
+
+    assert tiny_budget.sweep(["open"]) == ["closed"]
+    assert tiny_budget.stats()["sessions"] == 1
+    assert tiny_budget._session_dir("open").exists()
+    assert not tiny_budget._session_dir("closed").exists()
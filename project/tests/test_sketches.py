@@ -0,0 +1,70 @@
+"""Tests for HyperLogLog and TDigest error bounds, merging and serialization."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_service import DataService
+from app.services.sketches import HyperLogLog, TDigest, loads_sketch
+
+
+@pytest.mark.parametrize("distinct", [50, 5000, 200_000])
+def test_hyperloglog_stays_within_its_error_bound(distinct):
+    rng = np.random.default_rng(distinct)
+    values = rng.integers(0, distinct, distinct * 3).astype(str)
+    exact = len(np.unique(values))
+    sketch = HyperLogLog()
+    sketch.update(values)
+
+    assert abs(sketch.count() - exact) <= 3 * sketch.relative_error() * exact
+
+
+def test_hyperloglog_merge_equals_a_single_sketch():
+    values = pd.Series([f"analyst_{i}" for i in range(30_000)])
+    whole, left, right = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    whole.update(values)
+    left.update(values.iloc[:20_000])
+    right.update(values.iloc[10_000:])
+
+    merged = left.merge(right)
+    assert merged.count() == whole.count()
+    assert loads_sketch(merged.to_bytes()).count() == whole.count()
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=10))
+
+
+def test_tdigest_quantiles_stay_within_rank_error():
+    values = np.random.default_rng(0).lognormal(2, 1, 100_000)
+    digest = TDigest()
+    for chunk in np.array_split(values, 7):
+        part = TDigest()
+        part.update(chunk)
+        digest.merge(part)
+
+    ordered = np.sort(values)
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+        rank = np.searchsorted(ordered, digest.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.005
+    assert digest.quantile(0) == values.min() and digest.quantile(1) == values.max()
+    assert TDigest.from_bytes(digest.to_bytes()).quantile(0.5) == digest.quantile(0.5)
+
+
+def test_sketches_reject_other_blobs():
+    for data in (b"", b"HLL1", b"\x80\x05not a sketch"):
+        with pytest.raises(ValueError):
+            loads_sketch(data)
+
+
+def test_approx_distinct_counts_follow_appended_rows(tmp_path):
+    pd.DataFrame({"reported_by": [f"analyst_{i % 400}" for i in range(2000)]}).to_csv(
+        tmp_path / "incidents.csv", index=False)
+    service = DataService()
+    service.data_dir = tmp_path
+    df = service.load_csv("incidents.csv")
+
+    first = service.count_distinct(df, ["reported_by"], engine="approx")["reported_by"]
+    assert first == pytest.approx(400, rel=0.03)
+    service.update_running_stats("incidents.csv", pd.DataFrame({"reported_by": [f"new_{i}" for i in range(100)]}))
+    assert service.count_distinct(df, ["reported_by"], engine="approx")["reported_by"] == pytest.approx(500, rel=0.03)
+    with pytest.raises(ValueError):
+        service.count_distinct(df, ["reported_by"], engine="fast")
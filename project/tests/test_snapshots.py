@@ -0,0 +1,68 @@
+"""Tests for snapshot round trips of the KPI cube, leaderboards and rollups."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_service import DataService
+from app.services.kpis import KpiCube
+from app.services.leaderboards import Leaderboard
+from app.services.snapshots import SnapshotStore
+
+
+def _incidents(n, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90 * 24, n), unit="h")
+    return pd.DataFrame({"id": np.arange(n), "date": days.strftime("%Y-%m-%d %H:%M"),
+                         "severity": rng.choice(["Low", "High", "Critical"], n),
+                         "status": rng.choice(["Open", "Resolved", "Closed"], n),
+                         "reported_by": rng.choice([f"analyst_{i}" for i in range(40)], n)})
+
+
+def test_leaderboard_bytes_round_trip():
+    board = Leaderboard(5, (7, 30))
+    df = _incidents(2000)
+    board.update_frame(df["reported_by"], df["date"])
+    board.update("analyst_1", "2024-03-30", -3)
+
+    loaded = Leaderboard.from_bytes(board.to_bytes())
+    assert loaded.end == board.end
+    for window in (None, 7, 30):
+        assert loaded.top(window) == board.top(window)
+
+    loaded.advance("2024-04-10")
+    board.advance("2024-04-10")
+    assert loaded.top(7) == board.top(7) and loaded.top(30) == board.top(30)
+
+
+def test_leaderboard_rejects_other_blobs():
+    with pytest.raises(ValueError):
+        Leaderboard.from_bytes(b"\x80\x05not a leaderboard")
+
+
+def test_kpi_cube_snapshot_round_trip():
+    cube = KpiCube()
+    cube.update(_incidents(3000))
+    cells, blob = cube.to_snapshot()
+
+    loaded = KpiCube.from_snapshot(cells, blob)
+    assert loaded.kpis(["High"]) == cube.kpis(["High"])
+    assert loaded.leaderboard.top(7) == cube.leaderboard.top(7)
+    with pytest.raises(ValueError):
+        KpiCube.from_snapshot(cells, b"not a cube")
+
+
+def test_rollup_is_restored_from_the_snapshot(tmp_path):
+    _incidents(500).to_csv(tmp_path / "incidents.csv", index=False)
+    service = DataService()
+    service.data_dir = tmp_path
+    service.load_csv("incidents.csv")
+    rollup = service.get_rollup("incidents.csv")
+    store = SnapshotStore(tmp_path / ".snapshot")
+    store.commit(service.save_snapshot(store))
+
+    (tmp_path / ".rollups" / "incidents.csv.rollup").unlink()
+    restarted = DataService()
+    restarted.data_dir = tmp_path
+    assert restarted.restore_snapshot(SnapshotStore(tmp_path / ".snapshot")) == 1
+    assert restarted._rollups["incidents.csv"].total("2024", "2025") == rollup.total("2024", "2025") == 500
@@ -0,0 +1,46 @@
+"""Tests for vectorized and incremental summary statistics."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.stats import IncrementalStats, summarize_columns
+
+
+def test_integer_min_max_keep_the_column_type():
+    df = pd.DataFrame({"count": [3, 1, 2**60], "ratio": [0.5, np.nan, 2.0],
+                       "score": pd.array([5, None, 7], dtype="Int64")})
+
+    stats = summarize_columns(df, list(df.columns))
+    for col in df.columns:
+        assert stats[col]["min"] == df[col].min() and type(stats[col]["min"]) is type(df[col].min())
+        assert stats[col]["max"] == df[col].max() and type(stats[col]["max"]) is type(df[col].max())
+
+    running = IncrementalStats(list(df.columns))
+    running.update(df.iloc[:2])
+    running.update(df.iloc[2:])
+    summary = running.summary()
+    assert isinstance(summary["count"]["max"], np.int64) and summary["count"]["min"] == 1
+    assert isinstance(summary["score"]["min"], np.int64) and isinstance(summary["ratio"]["min"], np.float64)
+
+
+def test_merged_chunks_match_a_single_pass():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"hours": rng.normal(1e6, 3, 30_000), "score": rng.uniform(0, 100, 30_000)})
+    df.loc[rng.choice(30_000, 1000, replace=False), "score"] = np.nan
+
+    merged = IncrementalStats(list(df.columns))
+    for start in range(0, len(df), 4321):
+        part = IncrementalStats(list(df.columns))
+        part.update(df.iloc[start:start + 4321])
+        merged.merge(part)
+
+    exact = summarize_columns(df, list(df.columns))
+    for col, stats in merged.summary().items():
+        assert stats["mean"] == pytest.approx(exact[col]["mean"], rel=1e-12)
+        assert stats["std"] == pytest.approx(exact[col]["std"], rel=1e-9)
+        assert stats["min"] == exact[col]["min"] and stats["max"] == exact[col]["max"]
+        assert stats["median"] == pytest.approx(exact[col]["median"], rel=1e-3)
+    assert merged.row_count() == 30_000
+    with pytest.raises(ValueError):
+        merged.merge(IncrementalStats(["hours"]))
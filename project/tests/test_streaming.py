@@ -0,0 +1,70 @@
+"""Tests for the chunked StreamingPipeline and its mergeable aggregations."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.streaming import Count, GroupBy, MinMax, Quantiles, StreamingPipeline, Sum
+
+
+def _incidents(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"id": np.arange(n),
+                         "severity": rng.choice(["Low", "High", "Critical"], n),
+                         "status": rng.choice(["Open", "Closed"], n),
+                         "hours": rng.exponential(10, n).round(2)})
+
+
+@pytest.fixture
+def incidents(tmp_path):
+    df = _incidents(10_000)
+    df.to_csv(tmp_path / "incidents.csv", index=False)
+    return df, tmp_path / "incidents.csv"
+
+
+def test_chunked_results_match_in_memory_pandas(incidents):
+    df, path = incidents
+    results = (StreamingPipeline(path, chunksize=777)
+               .where("status", "Open")
+               .where("severity", ["High", "Critical"], op="in")
+               .run(rows=Count(), hours=Sum("hours"), span=MinMax("hours"),
+                    median=Quantiles("hours", (0.5,)), by_severity=GroupBy("severity", ["hours"])))
+
+    expected = df[(df["status"] == "Open") & df["severity"].isin(["High", "Critical"])]
+    assert results["rows"] == len(expected)
+    assert results["hours"] == pytest.approx(expected["hours"].sum())
+    assert results["span"] == (expected["hours"].min(), expected["hours"].max())
+    assert results["median"][0.5] == pytest.approx(expected["hours"].median(), rel=0.05)
+    grouped = expected.groupby("severity").agg(hours=("hours", "sum"), count=("id", "size"))
+    pd.testing.assert_frame_equal(results["by_severity"], grouped, check_dtype=False)
+
+
+def test_chunks_are_bounded_and_projected(incidents):
+    _, path = incidents
+    chunks = list(StreamingPipeline(path, chunksize=1000).where("hours", 5, op=">").select(["id"]).iter_chunks())
+
+    assert len(chunks) == 10 and all(len(chunk) <= 1000 for chunk in chunks)
+    assert all(list(chunk.columns) == ["id"] for chunk in chunks)
+
+
+def test_partials_merge_like_a_single_pass(tmp_path):
+    df = _incidents(6000, seed=1)
+    halves = [df.iloc[:2500], df.iloc[2500:]]
+    for i, half in enumerate(halves):
+        half.to_csv(tmp_path / f"part{i}.csv", index=False)
+
+    whole = GroupBy(["severity", "status"])
+    whole.update(df)
+    parts = [StreamingPipeline(tmp_path / f"part{i}.csv", chunksize=500).aggregate(g=GroupBy(["severity", "status"]))["g"]
+             for i in range(2)]
+    pd.testing.assert_frame_equal(parts[0].merge(parts[1]).result(), whole.result())
+
+
+def test_invalid_arguments_are_rejected(incidents):
+    _, path = incidents
+    with pytest.raises(FileNotFoundError):
+        StreamingPipeline(path.with_name("missing.csv"))
+    with pytest.raises(ValueError):
+        StreamingPipeline(path, chunksize=0)
+    with pytest.raises(ValueError):
+        StreamingPipeline(path).where("status", "Open", op="~")
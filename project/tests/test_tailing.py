@@ -0,0 +1,68 @@
+"""Tests for tail-following refresh of cached CSV datasets."""
+
+import pandas as pd
+import pytest
+
+from app.services.data_service import DataService
+from app.services.tailing import TailState
+
+HEADER = b"id,severity,reported_by\n"
+
+
+def _rows(start, stop):
+    return b"".join(b"%d,%s,analyst_%d\n" % (i, (b"High", b"Low")[i % 2], i % 7) for i in range(start, stop))
+
+
+def test_read_appended_advances_the_offset_by_complete_rows(tmp_path):
+    path = tmp_path / "incidents.csv"
+    path.write_bytes(HEADER + _rows(0, 10))
+    state = TailState.capture(path, path.stat().st_size, 10)
+    offset = state.offset
+
+    with path.open("ab") as f:
+        f.write(_rows(10, 13) + b"13,Hig")  # last row still being written
+    new_rows = state.read_appended(path)
+    assert list(new_rows["id"]) == [10, 11, 12] and list(new_rows.index) == [10, 11, 12]
+    assert state.offset == offset + len(_rows(10, 13)) and state.rows == 13
+
+    with path.open("ab") as f:
+        f.write(b"h,analyst_6\n")
+    assert list(state.read_appended(path)["id"]) == [13] and state.offset == path.stat().st_size
+
+
+def test_capture_requires_a_row_boundary(tmp_path):
+    path = tmp_path / "incidents.csv"
+    path.write_bytes(HEADER + _rows(0, 3) + b"3,Low")
+    assert TailState.capture(path, path.stat().st_size, 3) is None
+    assert TailState.capture(path, 0, 0) is None
+
+
+@pytest.fixture
+def service(tmp_path):
+    (tmp_path / "incidents.csv").write_bytes(HEADER + _rows(0, 100))
+    service = DataService()
+    service.data_dir = tmp_path
+    service.load_csv("incidents.csv", index_columns=["severity"])
+    return service
+
+
+def test_refresh_appends_only_new_rows(service, tmp_path):
+    with (tmp_path / "incidents.csv").open("ab") as f:
+        f.write(_rows(100, 120))
+
+    new_rows = service.refresh_csv("incidents.csv")
+    assert list(new_rows["id"]) == list(range(100, 120))
+    assert service.refresh_csv("incidents.csv").empty
+
+    cached = service.get_cached_data("incidents.csv")
+    pd.testing.assert_frame_equal(cached, pd.read_csv(tmp_path / "incidents.csv"))
+    high = service.filter_data(cached, severity="High")
+    assert list(high["id"]) == list(range(0, 120, 2)) and service.get_cache_stats()["index_hits"] == 1
+
+
+def test_rewritten_file_is_reloaded_fully(service, tmp_path):
+    (tmp_path / "incidents.csv").write_bytes(HEADER + _rows(500, 530))
+
+    refreshed = service.refresh_csv("incidents.csv")
+    assert list(refreshed["id"]) == list(range(500, 530))
+    assert len(service.get_cached_data("incidents.csv")) == 30
@@ -0,0 +1,126 @@
+"""Tests for the Week 9 ticket store, its copy-on-write overlays and commits."""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2] / "Week_09_lab"))
+
+from ticket_store import FIELDS, TicketOverlay, TicketStore  # noqa: E402
+
+
+def _tickets(count=50):
+    return pd.DataFrame({
+        "ticket_id": [f"TCK-{1001 + i:04d}" for i in range(count)],
+        "title": [f"Issue {i}" for i in range(count)],
+        "priority": ["Low", "High"] * (count // 2),
+        "status": ["Open", "Closed"] * (count // 2),
+        "assignee": ["alice", "bob", "carol", "dave", "erin"] * (count // 5),
+        "created_date": "2025-11-01",
+    })
+
+
+def _frozen(df):
+    store = TicketStore(df)
+    store.freeze()
+    return store
+
+
+def test_crud_and_the_id_sequence():
+    store = TicketStore(_tickets())
+    assert store.next_id() == "TCK-1051"
+
+    new_id = store.create("VPN down", "High", "Open", "zoe", "2025-11-05")
+    store.update(new_id, status="Closed")
+    assert store.get(new_id) == {"ticket_id": "TCK-1051", "title": "VPN down", "priority": "High",
+                                 "status": "Closed", "assignee": "zoe", "created_date": "2025-11-05"}
+    store.delete(new_id)
+    assert new_id not in store and store.get(new_id) is None
+    assert store.create("Printer", "Low", "Open", "bob") == "TCK-1052"  # deleted IDs are not reused
+
+    with pytest.raises(KeyError):
+        store.update("TCK-0001", status="Closed")
+    with pytest.raises(ValueError):
+        store.update("TCK-1001", created_date="2020-01-01")
+    with pytest.raises(KeyError):
+        store.delete(new_id)
+
+
+def test_compaction_keeps_order_and_lookups():
+    df = _tickets()
+    store = TicketStore(df)
+    removed = set(df["ticket_id"].iloc[::3]) | set(df["ticket_id"].iloc[1::3])
+    for ticket_id in removed:
+        store.delete(ticket_id)
+
+    kept = df[~df["ticket_id"].isin(removed)].reset_index(drop=True)
+    assert store._size < len(df)  # tombstones were dropped
+    pd.testing.assert_frame_equal(store.to_frame(), kept)
+    assert store.ids() == kept["ticket_id"].tolist()
+    assert all(store.get(ticket_id)["title"] == title for ticket_id, title in zip(kept["ticket_id"], kept["title"]))
+    expected = kept[kept["status"] == "Closed"]["assignee"].value_counts()
+    assert store.top_assignees(closed=True).to_dict() == expected.to_dict()
+
+
+def test_invalid_and_frozen_stores_are_rejected():
+    df = _tickets()
+    with pytest.raises(ValueError):
+        TicketStore(pd.concat([df, df.head(1)]))
+    with pytest.raises(RuntimeError):
+        _frozen(df).create("VPN down", "High", "Open", "zoe")
+
+
+def test_overlay_matches_a_store_with_the_same_edits():
+    base, direct = _frozen(_tickets()), TicketStore(_tickets())
+    overlay = TicketOverlay(base)
+    for target in (overlay, direct):
+        target.update("TCK-1003", status="Closed", assignee="zoe")
+        target.delete("TCK-1010")
+        target.create("New", "High", "Open", "bob", "2025-11-05")
+    before = base.to_frame().copy()
+
+    pd.testing.assert_frame_equal(overlay.to_frame(), direct.to_frame())
+    pd.testing.assert_frame_equal(base.to_frame(), before)  # the shared base is untouched
+    assert overlay.top_assignees(closed=True).equals(direct.top_assignees(closed=True))
+
+
+def test_updates_copy_only_the_edited_columns():
+    base = _frozen(_tickets())
+    overlay = TicketOverlay(base)
+    assert overlay.to_frame() is base.to_frame()
+
+    overlay.update("TCK-1003", status="Closed")
+    frame = overlay.to_frame()
+    assert frame.loc[2, "status"] == "Closed"
+    for field in FIELDS:
+        shared = np.shares_memory(frame[field].to_numpy(), base.to_frame()[field].to_numpy())
+        assert shared == (field != "status")
+
+
+def test_concurrent_commits_keep_every_session_edit(tmp_path):
+    path = tmp_path / "tickets.csv"
+    _tickets().to_csv(path, index=False)
+    versions = {}
+
+    def latest():
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key not in versions:
+            versions[key] = _frozen(pd.read_csv(path, dtype=str, keep_default_na=False))
+        return versions[key]
+
+    overlays = [TicketOverlay(latest()) for _ in range(4)]  # all start from the same version
+    for i, overlay in enumerate(overlays):
+        overlay.update(f"TCK-{1001 + i:04d}", title=f"Edited by session {i}")
+    threads = [threading.Thread(target=overlay.commit, args=(path, latest)) for overlay in overlays]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    titles = pd.read_csv(path)["title"].head(4).tolist()
+    assert titles == [f"Edited by session {i}" for i in range(4)]
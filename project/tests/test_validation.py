@@ -0,0 +1,47 @@
+"""Tests for vectorized schema validation and cached upload results."""
+
+import io
+
+import pandas as pd
+
+from app.services import validation
+from app.services.validation import SCHEMAS, detect_schema, validate_upload
+
+UPLOAD = (b"ticket_id,title,priority,status,assignee,created_date\n"
+          b"TCK-1001,Email outage,High,Open,alice,2025-11-02\n"
+          b"TCK-1002,,Urgent,Open,bob,2025-11-31\n"
+          b"TCK-1001,Printer jam,Low,Closed,,2025-11-03\n")
+
+
+def test_failures_are_reported_per_row_and_check():
+    df = pd.read_csv(io.BytesIO(UPLOAD))
+    assert detect_schema(df) == "it_tickets"
+    result = SCHEMAS["it_tickets"].validate(df)
+
+    assert not result.is_valid and result.invalid_count == 3 and result.row_count == 3
+    failures = {(row["column"], row["check"]): row["failures"] for _, row in result.summary().iterrows()}
+    assert failures[("title", "null")] == 1
+    assert failures[("priority", "allowed")] == 1
+    assert failures[("created_date", "type")] == 1
+    assert failures[("ticket_id", "unique")] == 2
+    assert result.valid_rows(df).empty
+    assert "priority: allowed" in result.invalid_rows(df).loc[1, "errors"]
+
+
+def test_missing_columns_are_schema_errors():
+    result = SCHEMAS["it_tickets"].validate(pd.DataFrame({"ticket_id": ["TCK-1"]}))
+    assert "Missing required column 'title'" in result.schema_errors and not result.is_valid
+
+
+def test_upload_results_are_reused_for_the_same_bytes(monkeypatch):
+    monkeypatch.setattr(validation, "_upload_results", type(validation._upload_results)())
+    calls = []
+    validate = validation.Schema.validate
+    monkeypatch.setattr(validation.Schema, "validate", lambda self, df: calls.append(1) or validate(self, df))
+    df = pd.read_csv(io.BytesIO(UPLOAD))
+
+    first = validate_upload(UPLOAD, df, "it_tickets")
+    assert validate_upload(UPLOAD, df, "it_tickets") is first and len(calls) == 1
+    validate_upload(UPLOAD, df, "cyber_incidents")
+    validate_upload(UPLOAD + b"TCK-1003,New,Low,Open,bob,2025-11-04\n", df, "it_tickets")
+    assert len(calls) == 3
@@ -0,0 +1,85 @@
+"""Tests for background cache warm-up and readiness reporting."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import app.services.warmup as warmup
+from app.services.data_service import get_data_service
+from app.services.warmup import WarmupManager, WarmupStep, load_steps
+
+
+def _config(tmp_path, steps):
+    path = tmp_path / "warmup.json"
+    path.write_text(json.dumps({"steps": steps}), encoding="utf-8")
+    return path
+
+
+def test_load_steps_validates_kinds_and_options(tmp_path):
+    assert load_steps(tmp_path / "missing.json") == []
+    steps = load_steps(_config(tmp_path, [{"kind": "kpis"}, {"kind": "index", "file": "a.csv", "columns": ["x"]}]))
+    assert [(step.kind, step.options, step.label) for step in steps] == [
+        ("kpis", {}, "kpis"), ("index", {"file": "a.csv", "columns": ["x"]}, "index a.csv")]
+
+    with pytest.raises(ValueError, match="unknown kind"):
+        load_steps(_config(tmp_path, [{"kind": "everything"}]))
+    with pytest.raises(ValueError, match="missing columns"):
+        load_steps(_config(tmp_path, [{"kind": "index", "file": "a.csv"}]))
+
+
+def test_steps_fill_the_caches_and_failures_are_reported(tmp_path, monkeypatch):
+    service = get_data_service()
+    monkeypatch.setattr(service, "data_dir", tmp_path)
+    service.invalidate()
+    pd.DataFrame({"date": ["2024-01-01", "2024-01-02"], "severity": ["High", "Low"],
+                  "status": ["Open", "Closed"]}).to_csv(tmp_path / "incidents.csv", index=False)
+    manager = WarmupManager(load_steps(_config(tmp_path, [
+        {"kind": "dataset", "file": "incidents.csv", "index_columns": ["severity"]},
+        {"kind": "index", "file": "incidents.csv", "columns": ["status"]},
+        {"kind": "dataset", "file": "missing.csv"},
+        {"kind": "rollup", "file": "incidents.csv"},
+    ])))
+    assert manager.status()["state"] == "idle"
+
+    assert manager.start() and not manager.start()
+    assert manager.wait(60)
+    status = manager.status()
+    assert status["state"] == "degraded" and status["ready"]
+    assert [step["status"] for step in status["steps"]] == ["done", "done", "failed", "done"]
+    assert status["steps"][2]["error"].startswith("FileNotFoundError")
+    assert set(service.get_indexes("incidents.csv")) == {"severity", "status"}
+    assert service._rollups["incidents.csv"].total("2024", "2025") == 2
+    service.invalidate()
+
+
+def test_readiness_endpoint_follows_the_warmup_state(monkeypatch):
+    running, release = threading.Event(), threading.Event()
+    manager = WarmupManager([WarmupStep("kpis", {})])
+    monkeypatch.setattr(manager, "_run_step", lambda step: (running.set(), release.wait(10)))
+    monkeypatch.setattr(warmup, "_warmup_manager", manager)
+    server = warmup.start_readiness_server(0, host="127.0.0.1")
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(url + path, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read()) if e.code != 404 else None
+
+    try:
+        manager.start()
+        running.wait(10)
+        code, status = get("/ready")
+        assert code == 503 and status["state"] == "warming" and status["steps"][0]["status"] == "running"
+        release.set()
+        manager.wait(10)
+        assert get("/ready")[0] == 200 and get("/warmup")[1]["state"] == "ready"
+        assert get("/other")[0] == 404
+    finally:
+        release.set()
+        server.shutdown()